@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
 from sqlalchemy.pool import QueuePool, NullPool
 from datetime import datetime
@@ -90,7 +90,10 @@ class Player(Base):
 
 class Game(Base):
     __tablename__ = "games"
-    
+    __table_args__ = (
+        Index("ix_games_sport_start_status", "sport", "start_time", "status"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     sport = Column(String(50), nullable=False, index=True)
     home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
@@ -113,7 +116,10 @@ class Game(Base):
 
 class Market(Base):
     __tablename__ = "markets"
-    
+    __table_args__ = (
+        Index("ix_markets_game_type", "game_id", "market_type"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
     market_type = Column(String(50), nullable=False)
@@ -126,7 +132,10 @@ class Market(Base):
 
 class Line(Base):
     __tablename__ = "lines"
-    
+    __table_args__ = (
+        Index("ix_lines_market_book", "market_id", "sportsbook"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     market_id = Column(Integer, ForeignKey("markets.id"), nullable=False)
     sportsbook = Column(String(100), nullable=False)
@@ -232,6 +241,23 @@ class ELORatingHistory(Base):
     draws = Column(Integer, default=0)
 
 
+class EloCheckpoint(Base):
+    """Latest rating state of a sport's ELO model, up to a watermark game."""
+    __tablename__ = "elo_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sport = Column(String(50), nullable=False, unique=True, index=True)
+    parameters = Column(Text, nullable=False)  # JSON of the model parameters the state was built with
+
+    # Last processed HistoricalGameResult, in (game_date, id) order
+    last_game_date = Column(DateTime, nullable=True)
+    last_game_id = Column(Integer, nullable=True)
+    games_processed = Column(Integer, default=0)
+
+    state = Column(Text, nullable=False)  # JSON: team ids, ratings, games played, form
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class PlayerStats(Base):
     __tablename__ = "player_stats"
     
@@ -538,7 +564,10 @@ class User(Base):
 
 class UserSession(Base):
     __tablename__ = "user_sessions"
-    
+    __table_args__ = (
+        Index("ix_user_sessions_user_valid", "user_id", "is_valid"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
@@ -609,6 +638,9 @@ class UserAlert(Base):
 
 class TrackedBet(Base):
     __tablename__ = "tracked_bets"
+    __table_args__ = (
+        Index("ix_tracked_bets_user_status_settled", "user_id", "status", "settled_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -838,18 +870,55 @@ class DiscordWebhook(Base):
 
 class OddsSnapshot(Base):
     __tablename__ = "odds_snapshots"
+    # One time series per (game, market, book); history reads scan this index
+    __table_args__ = (
+        Index("ix_odds_snapshots_series", "game_id", "market_type", "sportsbook", "captured_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
     market_type = Column(String(50), nullable=False)
     
     sportsbook = Column(String(100), nullable=False)
+    selection = Column(String(50), nullable=True)  # Outcome name; NULL on points captured before it was stored
     odds = Column(Integer, nullable=False)
     line_value = Column(Float, nullable=True)
     
     captured_at = Column(DateTime, default=datetime.utcnow, index=True)
 
 
+class OddsRollup(Base):
+    """Hourly open/high/low/close of one outcome of an odds series, built from OddsSnapshot."""
+    __tablename__ = "odds_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "game_id", "market_type", "sportsbook", "selection", "bucket_start",
+            name="uq_odds_rollups_series_bucket"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
+    market_type = Column(String(50), nullable=False)
+    sportsbook = Column(String(100), nullable=False)
+    # Outcome name; "" for snapshots without one, so the unique constraint still applies
+    selection = Column(String(50), nullable=False, default="", server_default="")
+    bucket_start = Column(DateTime, nullable=False, index=True)  # Start of the hour
+
+    open_odds = Column(Integer, nullable=False)
+    high_odds = Column(Integer, nullable=False)
+    low_odds = Column(Integer, nullable=False)
+    close_odds = Column(Integer, nullable=False)
+
+    open_line = Column(Float, nullable=True)
+    high_line = Column(Float, nullable=True)
+    low_line = Column(Float, nullable=True)
+    close_line = Column(Float, nullable=True)
+
+    samples = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 class PasswordResetToken(Base):
     __tablename__ = "password_reset_tokens"
 
@@ -878,6 +947,9 @@ class TelegramLinkCode(Base):
 
 class LineMovement(Base):
     __tablename__ = "line_movements"
+    __table_args__ = (
+        Index("ix_line_movements_series", "game_id", "market_type", "sportsbook", "recorded_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
@@ -897,6 +969,9 @@ class LineMovement(Base):
 
 class BankrollHistory(Base):
     __tablename__ = "bankroll_history"
+    __table_args__ = (
+        Index("ix_bankroll_history_user_recorded", "user_id", "recorded_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -2562,3 +2637,38 @@ class BankrollSnapshot(Base):
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+
+
+def bulk_upsert(db, model, rows, conflict_columns, update_columns):
+    """
+    Insert rows, updating ``update_columns`` where ``conflict_columns`` already exist.
+
+    Uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite, issued
+    as one executemany. ``conflict_columns`` must be covered by a primary
+    key or unique index. Other dialects fall back to a bulk UPDATE by
+    primary key, so rows must then carry their ``id``.
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy import update
+        db.execute(update(model), rows)
+        return len(rows)
+
+    stmt = dialect_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={col: stmt.excluded[col] for col in update_columns},
+    )
+    # render_nulls stops the ORM splitting the batch on rows with None values
+    db.execute(stmt, rows, execution_options={"render_nulls": True})
+    return len(rows)
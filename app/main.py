@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import time
 import os
+import asyncio
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -18,7 +19,7 @@ try:
 except AttributeError:
     pass  # tzset not available on Windows
 
-from app.db import init_db
+from app.db import init_db, engine
 from app.services.data_ingestion import seed_sample_data
 from app.routers import health, clients, recommendations, games
 from app.routers.historical import router as historical_router
@@ -74,12 +75,21 @@ from app.routers.live_betting import router as live_betting_router
 from app.routers.neural_ensemble import router as neural_ensemble_router
 from app.middleware.rate_limit import RateLimitMiddleware, AuthRateLimitMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
+from app.utils.query_audit import QUERY_AUDIT_ENABLED, query_audit, query_audit_middleware
 from app.utils.logging import setup_logging, request_logger
 from app.services.currency import seed_default_rates
 from app.services.data_scheduler import start_schedulers, stop_schedulers
 from app.services.background_jobs import alert_scheduler
 from app.services.odds_scheduler import odds_scheduler
+from app.services.line_movement import warm_line_state
+from app.models.advanced_elo import sync_advanced_models
+from app.services.steam_detector import steam_detector
+from app.services.price_index import price_index
 from app.services.email_digest import digest_scheduler
+from app.services.monte_carlo import shutdown_process_pool
+from app.services.neural_training import shutdown_training
+from app.utils.cache import cache
+from app.utils.http_client import http_clients
 
 logger = setup_logging(level=os.environ.get("LOG_LEVEL", "DEBUG"))
 
@@ -99,11 +109,32 @@ async def lifespan(app: FastAPI):
 
     # Skip schedulers during tests to prevent hanging
     if not is_testing:
+        # Load last-known lines so movement tracking starts without per-snapshot lookups
+        db = SessionLocal()
+        try:
+            warm_line_state(db)
+        except Exception as e:
+            logger.error(f"Error warming line state: {e}")
+        finally:
+            db.close()
+
+        # Restore ELO ratings from their checkpoints and apply results recorded since
+        db = SessionLocal()
+        try:
+            sync_advanced_models(db)
+        except Exception as e:
+            logger.error(f"Error syncing ELO models: {e}")
+        finally:
+            db.close()
+
         # Start data refresh schedulers for MLB/NBA/CBB/Soccer
         start_schedulers()
         logger.info("MLB, NBA, CBB, and Soccer data schedulers started")
 
         # Start alert, odds, and digest schedulers
+        # Detect steam as odds batches land, before the odds scheduler starts publishing
+        steam_detector.start(asyncio.get_running_loop())
+        price_index.start()
         await alert_scheduler.start()
         await odds_scheduler.start()
         await digest_scheduler.start()
@@ -117,8 +148,15 @@ async def lifespan(app: FastAPI):
         await alert_scheduler.stop()
         await odds_scheduler.stop()
         await digest_scheduler.stop()
+        steam_detector.stop()
+        price_index.stop()
         logger.info("All schedulers stopped")
 
+    shutdown_process_pool()
+    shutdown_training()
+    await cache.aclose()
+    await http_clients.aclose()
+
 
 app = FastAPI(
     title="EdgeBet - Multi-Sport Betting & DFS Platform",
@@ -246,6 +284,11 @@ app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(AuthRateLimitMiddleware, login_attempts_per_minute=5, register_attempts_per_hour=10)
 app.add_middleware(RateLimitMiddleware, requests_per_minute=100, requests_per_hour=2000, burst_limit=20)
 
+if QUERY_AUDIT_ENABLED:
+    # Development only: log full-table scans and N+1 patterns per request path
+    query_audit.install(engine)
+    app.middleware("http")(query_audit_middleware)
+
 app.include_router(health.router)
 app.include_router(auth_router)
 app.include_router(security_router)
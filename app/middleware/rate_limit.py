@@ -14,6 +14,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import time
 import os
 from typing import Dict, List, Tuple, Optional, Any
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -22,6 +23,8 @@ import json
 logger = logging.getLogger(__name__)
 
 MAX_TRACKED_IPS = 10000
+# Each client holds one burst counter plus minute/hour counters per endpoint
+MAX_TRACKED_COUNTERS = MAX_TRACKED_IPS * 10
 
 # Allow disabling rate limiting via environment variable (for testing)
 RATE_LIMIT_DISABLED = os.environ.get("DISABLE_RATE_LIMIT", "").lower() in ("true", "1", "yes")
@@ -78,21 +81,124 @@ ENDPOINT_LIMITS: Dict[str, EndpointLimits] = {
 }
 
 
+# Limit used when only counting, so a window never rejects
+NO_LIMIT = 1 << 30
+
+# Window name -> length in seconds
+WINDOWS: Dict[str, int] = {"burst": 1, "minute": 60, "hour": 3600}
+
+# Sliding-window counter check for several windows in one atomic call.
+# KEYS: one hash per window. ARGV: mode ("hit"/"peek"), then window
+# length and limit per key. Each hash holds the current window index (w),
+# its count (c) and the previous window's count (p); the estimate weights
+# the previous count by how much of it still overlaps the sliding window.
+# A hit is recorded in every window only if all of them allow it.
+# Returns {allowed, index of the first exceeded window (0 if none), estimates...}.
+SLIDING_WINDOW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local hit = ARGV[1] == 'hit'
+local states = {}
+local result = {1, 0}
+for i = 1, #KEYS do
+    local window = tonumber(ARGV[2 * i])
+    local limit = tonumber(ARGV[2 * i + 1])
+    local idx = math.floor(now / window)
+    local s = redis.call('HMGET', KEYS[i], 'w', 'c', 'p')
+    local w = tonumber(s[1]) or idx
+    local c = tonumber(s[2]) or 0
+    local p = tonumber(s[3]) or 0
+    if w == idx - 1 then
+        p = c
+        c = 0
+    elseif w < idx - 1 then
+        p = 0
+        c = 0
+    end
+    local est = p * (1 - (now - idx * window) / window) + c
+    if hit and est + 1 > limit and result[2] == 0 then
+        result[1] = 0
+        result[2] = i
+    end
+    states[i] = {idx, c, p, window}
+    result[i + 2] = math.floor(est)
+end
+if hit and result[1] == 1 then
+    for i = 1, #KEYS do
+        local st = states[i]
+        redis.call('HSET', KEYS[i], 'w', st[1], 'c', st[2] + 1, 'p', st[3])
+        redis.call('EXPIRE', KEYS[i], 2 * st[4])
+        result[i + 2] = result[i + 2] + 1
+    end
+end
+return result
+"""
+
+
+class SlidingWindowCounter:
+    """
+    Fixed-size sliding-window counter (same algorithm as the Lua script).
+
+    Keeps the current and previous window counts instead of one timestamp
+    per request, so memory per client is constant.
+    """
+    __slots__ = ("window", "index", "current", "previous")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.index = 0
+        self.current = 0
+        self.previous = 0
+
+    def _roll(self, now: float) -> int:
+        idx = int(now // self.window)
+        if self.index == idx - 1:
+            self.previous = self.current
+            self.current = 0
+        elif self.index < idx - 1:
+            self.previous = 0
+            self.current = 0
+        self.index = idx
+        return idx
+
+    def estimate(self, now: float) -> float:
+        idx = self._roll(now)
+        elapsed = (now - idx * self.window) / self.window
+        return self.previous * (1 - elapsed) + self.current
+
+    def add(self, now: float) -> None:
+        self._roll(now)
+        self.current += 1
+
+    def expired(self, now: float) -> bool:
+        return self.index < int(now // self.window) - 1
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate-limit check across all windows."""
+    allowed: bool
+    exceeded: Optional[str]  # Window name that rejected the request
+    counts: Dict[str, int]   # Estimated requests per window, including this one if allowed
+
+
 class RateLimitStorage:
     """
-    Abstract storage interface for rate limiting.
-    Supports Redis and in-memory backends.
+    Storage for sliding-window rate limit counters.
+
+    On Redis every check is one atomic Lua script call covering the burst,
+    minute and hour windows. The in-memory fallback runs the same
+    algorithm over fixed-size counters.
     """
 
     def __init__(self):
         self._redis_client = None
         self._use_redis = False
+        self._script = None
         self._init_storage()
 
-        # In-memory fallback storage
-        self.minute_requests: Dict[str, List[float]] = {}
-        self.hour_requests: Dict[str, List[float]] = {}
-        self.burst_tracker: Dict[str, Tuple[float, int]] = {}
+        # In-memory fallback storage: counter key -> SlidingWindowCounter, LRU ordered
+        self.counters: "OrderedDict[str, SlidingWindowCounter]" = OrderedDict()
         self._last_cleanup = time.time()
 
     def _init_storage(self):
@@ -103,6 +209,7 @@ class RateLimitStorage:
                 import redis
                 self._redis_client = redis.from_url(redis_url, decode_responses=True)
                 self._redis_client.ping()
+                self._script = self._redis_client.register_script(SLIDING_WINDOW_SCRIPT)
                 self._use_redis = True
                 logger.info("Rate limiter using Redis backend")
             except Exception as e:
@@ -113,127 +220,117 @@ class RateLimitStorage:
 
     def _redis_key(self, key_type: str, identifier: str, endpoint: str = "") -> str:
         """Generate Redis key for rate limiting."""
+        # Hash tag keeps all of a client's windows in one cluster slot for the script
         if endpoint:
-            return f"ratelimit:{key_type}:{identifier}:{endpoint}"
-        return f"ratelimit:{key_type}:{identifier}"
+            return f"ratelimit:sw:{{{identifier}}}:{key_type}:{endpoint}"
+        return f"ratelimit:sw:{{{identifier}}}:{key_type}"
+
+    def _checks(
+        self,
+        identifier: str,
+        endpoint: str,
+        limits: Dict[str, int]
+    ) -> List[Tuple[str, str, int, int]]:
+        """(window name, key, window seconds, limit) per window; burst is per client."""
+        return [
+            (name, self._redis_key(name, identifier, "" if name == "burst" else endpoint),
+             WINDOWS[name], limit)
+            for name, limit in limits.items()
+        ]
+
+    def _run(self, mode: str, identifier: str, endpoint: str, limits: Dict[str, int]) -> RateLimitDecision:
+        checks = self._checks(identifier, endpoint, limits)
 
-    def get_minute_count(self, identifier: str, endpoint: str = "") -> int:
-        """Get request count for the last minute."""
         if self._use_redis:
             try:
-                key = self._redis_key("minute", identifier, endpoint)
-                count = self._redis_client.get(key)
-                return int(count) if count else 0
+                args: List[Any] = [mode]
+                for _, _, window, limit in checks:
+                    args.extend([window, limit])
+                result = self._script(keys=[key for _, key, _, _ in checks], args=args)
+                exceeded = checks[result[1] - 1][0] if result[1] else None
+                counts = {name: int(count) for (name, _, _, _), count in zip(checks, result[2:])}
+                return RateLimitDecision(bool(result[0]), exceeded, counts)
             except Exception as e:
-                logger.error(f"Redis error in get_minute_count: {e}")
+                logger.error(f"Redis error in rate limit script: {e}")
                 # Fall through to in-memory
 
-        cache_key = f"{identifier}:{endpoint}" if endpoint else identifier
         now = time.time()
-        minute_ago = now - 60
-        if cache_key in self.minute_requests:
-            return len([t for t in self.minute_requests[cache_key] if t > minute_ago])
-        return 0
+        counters = []
+        exceeded = None
+        counts = {}
+        for name, key, window, limit in checks:
+            counter = self.counters.get(key)
+            if counter is None:
+                counter = SlidingWindowCounter(window)
+                if mode == "hit":
+                    self.counters[key] = counter
+            else:
+                self.counters.move_to_end(key)
+            estimate = counter.estimate(now)
+            if mode == "hit" and exceeded is None and estimate + 1 > limit:
+                exceeded = name
+            counters.append(counter)
+            counts[name] = int(estimate)
+
+        if mode == "hit" and exceeded is None:
+            for (name, _, _, _), counter in zip(checks, counters):
+                counter.add(now)
+                counts[name] += 1
+        return RateLimitDecision(exceeded is None, exceeded, counts)
+
+    def hit(
+        self,
+        identifier: str,
+        endpoint: str,
+        limits: "TierLimits"
+    ) -> RateLimitDecision:
+        """
+        Check the burst, minute and hour windows and record the request
+        in all of them if none is exceeded.
+
+        Args:
+            identifier: Client identifier (API key prefix or IP)
+            endpoint: Path used for per-endpoint minute/hour windows
+            limits: Effective limits for this request
+
+        Returns:
+            RateLimitDecision with the first exceeded window, if any
+        """
+        return self._run("hit", identifier, endpoint, {
+            "burst": limits.burst_limit,
+            "minute": limits.requests_per_minute,
+            "hour": limits.requests_per_hour,
+        })
+
+    def _count(self, window: str, identifier: str, endpoint: str = "") -> int:
+        return self._run("peek", identifier, endpoint, {window: NO_LIMIT}).counts[window]
+
+    def _increment(self, window: str, identifier: str, endpoint: str = "") -> int:
+        return self._run("hit", identifier, endpoint, {window: NO_LIMIT}).counts[window]
+
+    def get_minute_count(self, identifier: str, endpoint: str = "") -> int:
+        """Get request count for the last minute."""
+        return self._count("minute", identifier, endpoint)
 
     def get_hour_count(self, identifier: str, endpoint: str = "") -> int:
         """Get request count for the last hour."""
-        if self._use_redis:
-            try:
-                key = self._redis_key("hour", identifier, endpoint)
-                count = self._redis_client.get(key)
-                return int(count) if count else 0
-            except Exception as e:
-                logger.error(f"Redis error in get_hour_count: {e}")
-
-        cache_key = f"{identifier}:{endpoint}" if endpoint else identifier
-        now = time.time()
-        hour_ago = now - 3600
-        if cache_key in self.hour_requests:
-            return len([t for t in self.hour_requests[cache_key] if t > hour_ago])
-        return 0
+        return self._count("hour", identifier, endpoint)
 
     def increment_minute(self, identifier: str, endpoint: str = "") -> int:
         """Increment minute counter, returns new count."""
-        if self._use_redis:
-            try:
-                key = self._redis_key("minute", identifier, endpoint)
-                pipe = self._redis_client.pipeline()
-                pipe.incr(key)
-                pipe.expire(key, 60)
-                results = pipe.execute()
-                return results[0]
-            except Exception as e:
-                logger.error(f"Redis error in increment_minute: {e}")
-
-        cache_key = f"{identifier}:{endpoint}" if endpoint else identifier
-        now = time.time()
-        if cache_key not in self.minute_requests:
-            self.minute_requests[cache_key] = []
-        self.minute_requests[cache_key].append(now)
-        return len(self.minute_requests[cache_key])
+        return self._increment("minute", identifier, endpoint)
 
     def increment_hour(self, identifier: str, endpoint: str = "") -> int:
         """Increment hour counter, returns new count."""
-        if self._use_redis:
-            try:
-                key = self._redis_key("hour", identifier, endpoint)
-                pipe = self._redis_client.pipeline()
-                pipe.incr(key)
-                pipe.expire(key, 3600)
-                results = pipe.execute()
-                return results[0]
-            except Exception as e:
-                logger.error(f"Redis error in increment_hour: {e}")
-
-        cache_key = f"{identifier}:{endpoint}" if endpoint else identifier
-        now = time.time()
-        if cache_key not in self.hour_requests:
-            self.hour_requests[cache_key] = []
-        self.hour_requests[cache_key].append(now)
-        return len(self.hour_requests[cache_key])
+        return self._increment("hour", identifier, endpoint)
 
     def check_burst(self, identifier: str) -> bool:
-        """Check and update burst limit. Returns True if allowed."""
-        now = time.time()
-
-        if self._use_redis:
-            try:
-                key = self._redis_key("burst", identifier)
-                pipe = self._redis_client.pipeline()
-                pipe.get(key)
-                pipe.incr(key)
-                pipe.expire(key, 1)
-                results = pipe.execute()
-                count = int(results[0]) if results[0] else 0
-                return True  # Actual check happens in middleware
-            except Exception as e:
-                logger.error(f"Redis error in check_burst: {e}")
-
-        if identifier in self.burst_tracker:
-            last_time, count = self.burst_tracker[identifier]
-            if now - last_time < 1:
-                self.burst_tracker[identifier] = (last_time, count + 1)
-                return count < 100  # Max burst
-            else:
-                self.burst_tracker[identifier] = (now, 1)
-        else:
-            self.burst_tracker[identifier] = (now, 1)
-        return True
+        """Record a request in the burst window. Returns True if allowed."""
+        return self._run("hit", identifier, "", {"burst": 100}).allowed  # Max burst
 
     def get_burst_count(self, identifier: str) -> int:
         """Get current burst count."""
-        if self._use_redis:
-            try:
-                key = self._redis_key("burst", identifier)
-                count = self._redis_client.get(key)
-                return int(count) if count else 0
-            except Exception as e:
-                logger.error(f"Redis error in get_burst_count: {e}")
-
-        if identifier in self.burst_tracker:
-            _, count = self.burst_tracker[identifier]
-            return count
-        return 0
+        return self._count("burst", identifier)
 
     def get_reset_time(self, window: str = "minute") -> int:
         """Get Unix timestamp when rate limit resets."""
@@ -254,35 +351,12 @@ class RateLimitStorage:
             return
 
         self._last_cleanup = now
-        minute_ago = now - 60
-        hour_ago = now - 3600
+        for key in [k for k, counter in self.counters.items() if counter.expired(now)]:
+            del self.counters[key]
 
-        # Cleanup minute requests
-        for key in list(self.minute_requests.keys()):
-            self.minute_requests[key] = [t for t in self.minute_requests[key] if t > minute_ago]
-            if not self.minute_requests[key]:
-                del self.minute_requests[key]
-
-        # Cleanup hour requests
-        for key in list(self.hour_requests.keys()):
-            self.hour_requests[key] = [t for t in self.hour_requests[key] if t > hour_ago]
-            if not self.hour_requests[key]:
-                del self.hour_requests[key]
-
-        # Cleanup burst tracker
-        for key in list(self.burst_tracker.keys()):
-            last_time, _ = self.burst_tracker[key]
-            if now - last_time > 10:
-                del self.burst_tracker[key]
-
-        # Limit memory usage
-        if len(self.minute_requests) > MAX_TRACKED_IPS:
-            oldest_keys = sorted(
-                self.minute_requests.keys(),
-                key=lambda k: min(self.minute_requests[k]) if self.minute_requests[k] else 0
-            )
-            for key in oldest_keys[:len(self.minute_requests) - MAX_TRACKED_IPS]:
-                del self.minute_requests[key]
+        # Limit memory usage: drop least recently used counters
+        while len(self.counters) > MAX_TRACKED_COUNTERS:
+            self.counters.popitem(last=False)
 
 
 # Global storage instance
@@ -411,9 +485,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # For per-endpoint limits, use path-specific tracking
         endpoint_key = path.split("?")[0]  # Remove query params
 
-        # Check burst limit
-        burst_count = _storage.get_burst_count(identifier)
-        if burst_count >= limits.burst_limit:
+        # One atomic check across the burst, minute and hour windows
+        decision = _storage.hit(identifier, endpoint_key, limits)
+
+        if decision.exceeded == "burst":
             logger.warning(f"Burst limit exceeded for {identifier}")
             return self._rate_limit_response(
                 "Too many requests. Please slow down.",
@@ -422,12 +497,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 remaining=0,
                 reset=_storage.get_reset_time("minute")
             )
-        _storage.check_burst(identifier)
 
-        # Check minute limit
-        minute_count = _storage.get_minute_count(identifier, endpoint_key)
-        if minute_count >= limits.requests_per_minute:
-            logger.warning(f"Minute rate limit exceeded for {identifier}: {minute_count} requests")
+        if decision.exceeded == "minute":
+            logger.warning(f"Minute rate limit exceeded for {identifier}: {decision.counts['minute']} requests")
             return self._rate_limit_response(
                 "Rate limit exceeded. Too many requests per minute.",
                 retry_after=60,
@@ -436,10 +508,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 reset=_storage.get_reset_time("minute")
             )
 
-        # Check hour limit
-        hour_count = _storage.get_hour_count(identifier, endpoint_key)
-        if hour_count >= limits.requests_per_hour:
-            logger.warning(f"Hourly rate limit exceeded for {identifier}: {hour_count} requests")
+        if decision.exceeded == "hour":
+            logger.warning(f"Hourly rate limit exceeded for {identifier}: {decision.counts['hour']} requests")
             return self._rate_limit_response(
                 "Rate limit exceeded. Too many requests per hour.",
                 retry_after=3600,
@@ -448,17 +518,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 reset=_storage.get_reset_time("hour")
             )
 
-        # Record the request
-        _storage.increment_minute(identifier, endpoint_key)
-        _storage.increment_hour(identifier, endpoint_key)
-
         # Process request
         response = await call_next(request)
 
         # Add rate limit headers
-        new_minute_count = _storage.get_minute_count(identifier, endpoint_key)
         response.headers["X-RateLimit-Limit"] = str(limits.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(max(0, limits.requests_per_minute - new_minute_count))
+        response.headers["X-RateLimit-Remaining"] = str(max(0, limits.requests_per_minute - decision.counts["minute"]))
         response.headers["X-RateLimit-Reset"] = str(_storage.get_reset_time("minute"))
         response.headers["X-RateLimit-Tier"] = tier.value
 
@@ -614,7 +679,7 @@ def get_rate_limit_stats() -> Dict[str, Any]:
     """Get current rate limiting statistics."""
     return {
         "backend": "redis" if _storage._use_redis else "memory",
-        "tracked_identifiers": len(_storage.minute_requests) if not _storage._use_redis else "N/A",
+        "tracked_identifiers": len(_storage.counters) if not _storage._use_redis else "N/A",
         "rate_limit_disabled": RATE_LIMIT_DISABLED,
         "tiers": {tier.value: {
             "requests_per_minute": limits.requests_per_minute,
@@ -1,11 +1,17 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, update
 from sqlalchemy.orm import Session
 import numpy as np
+import json
 import math
 
 from app.models.base import BaseSportModel
-from app.db import SessionLocal, Team, HistoricalGameResult, ELORatingHistory
+from app.models.rating_state import RatingState, form_score
+from app.db import SessionLocal, Team, HistoricalGameResult, ELORatingHistory, EloCheckpoint
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class AdvancedELOModel(BaseSportModel):
@@ -27,10 +33,49 @@ class AdvancedELOModel(BaseSportModel):
         self.avg_total = avg_total
         self.is_fitted = False
         
-        self.team_ratings: Dict[int, float] = {}
-        self.team_games_played: Dict[int, int] = {}
-        self.team_form: Dict[int, List[str]] = {}
+        self.state = RatingState()
         self.last_update: Optional[datetime] = None
+
+        # Watermark of the last applied HistoricalGameResult, in (game_date, id) order
+        self.last_game_date: Optional[datetime] = None
+        self.last_game_id: Optional[int] = None
+        self.games_processed = 0
+        self._dirty: Set[int] = set()
+
+    def reset(self) -> None:
+        """Forget all ratings and the watermark."""
+        self.state = RatingState()
+        self.last_update = None
+        self.last_game_date = None
+        self.last_game_id = None
+        self.games_processed = 0
+        self._dirty = set()
+        self.is_fitted = False
+
+    @property
+    def team_ratings(self) -> Dict[int, float]:
+        return self.state.ratings_by_team()
+
+    @property
+    def team_games_played(self) -> Dict[int, int]:
+        n = len(self.state)
+        return dict(zip(self.state.team_ids, self.state.games_played[:n].tolist()))
+
+    @property
+    def team_form(self) -> Dict[int, List[str]]:
+        return {
+            team_id: list(form)
+            for team_id, form in zip(self.state.team_ids, self.state.to_dict()["form"])
+        }
+
+    def parameters(self) -> Dict[str, float]:
+        return {
+            "base_k_factor": self.base_k_factor,
+            "home_advantage": self.home_advantage,
+            "recency_weight": self.recency_weight,
+            "margin_factor": self.margin_factor,
+            "avg_total": self.avg_total,
+        }
     
     def _get_k_factor(self, games_played: int) -> float:
         if games_played < 10:
@@ -63,11 +108,15 @@ class AdvancedELOModel(BaseSportModel):
         game_date: datetime,
         is_draw: bool = False
     ) -> tuple:
-        winner_rating = self.team_ratings.get(winner_id, 1500.0)
-        loser_rating = self.team_ratings.get(loser_id, 1500.0)
+        state = self.state
+        w = state.row(winner_id)
+        l = state.row(loser_id)
+        
+        winner_rating = float(state.ratings[w])
+        loser_rating = float(state.ratings[l])
         
-        winner_games = self.team_games_played.get(winner_id, 0)
-        loser_games = self.team_games_played.get(loser_id, 0)
+        winner_games = int(state.games_played[w])
+        loser_games = int(state.games_played[l])
         
         expected_winner = 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400))
         expected_loser = 1 - expected_winner
@@ -87,95 +136,179 @@ class AdvancedELOModel(BaseSportModel):
         change_winner = k_winner * margin_mult * (actual_winner - expected_winner)
         change_loser = k_loser * margin_mult * (actual_loser - expected_loser)
         
-        self.team_ratings[winner_id] = winner_rating + change_winner
-        self.team_ratings[loser_id] = loser_rating + change_loser
+        state.ratings[w] = winner_rating + change_winner
+        state.ratings[l] = loser_rating + change_loser
         
-        self.team_games_played[winner_id] = winner_games + 1
-        self.team_games_played[loser_id] = loser_games + 1
-        
-        if winner_id not in self.team_form:
-            self.team_form[winner_id] = []
-        if loser_id not in self.team_form:
-            self.team_form[loser_id] = []
+        state.games_played[w] = winner_games + 1
+        state.games_played[l] = loser_games + 1
         
         if is_draw:
-            self.team_form[winner_id].append("D")
-            self.team_form[loser_id].append("D")
+            state.record(w, "D")
+            state.record(l, "D")
         else:
-            self.team_form[winner_id].append("W")
-            self.team_form[loser_id].append("L")
-        
-        self.team_form[winner_id] = self.team_form[winner_id][-10:]
-        self.team_form[loser_id] = self.team_form[loser_id][-10:]
+            state.record(w, "W")
+            state.record(l, "L")
         
+        self._dirty.add(winner_id)
+        self._dirty.add(loser_id)
         self.last_update = game_date
         
         return change_winner, change_loser
     
     def get_form_factor(self, team_id: int, num_games: int = 5) -> float:
-        form = self.team_form.get(team_id, [])
-        if not form:
+        score = form_score(self.state.recent_form(team_id, num_games))
+        if score is None:
             return 1.0
+        return 0.9 + score * 0.2
+    
+    def apply_game(self, game: HistoricalGameResult) -> None:
+        """Apply one result and advance the watermark past it."""
+        if game.home_team_id is not None and game.away_team_id is not None:
+            if game.winner == "home":
+                self.update_rating(
+                    game.home_team_id,
+                    game.away_team_id,
+                    game.margin or 0,
+                    game.game_date
+                )
+            elif game.winner == "away":
+                self.update_rating(
+                    game.away_team_id,
+                    game.home_team_id,
+                    -(game.margin or 0),
+                    game.game_date
+                )
+            else:
+                self.update_rating(
+                    game.home_team_id,
+                    game.away_team_id,
+                    0,
+                    game.game_date,
+                    is_draw=True
+                )
         
-        recent = form[-num_games:]
-        wins = sum(1 for r in recent if r == "W")
-        draws = sum(1 for r in recent if r == "D")
+        self.last_game_date = game.game_date
+        self.last_game_id = game.id
+        self.games_processed += 1
+    
+    def apply_new_results(self, db: Session) -> int:
+        """
+        Apply results past the watermark, oldest first.
+
+        Results are read in (game_date, id) order, so only games after the
+        last applied one are fetched. A result backfilled with an earlier
+        date than the watermark is not picked up; refit with ``fit``.
+        """
+        query = db.query(HistoricalGameResult).filter(
+            HistoricalGameResult.sport == self.sport
+        )
+        if self.last_game_date is not None:
+            query = query.filter(or_(
+                HistoricalGameResult.game_date > self.last_game_date,
+                and_(
+                    HistoricalGameResult.game_date == self.last_game_date,
+                    HistoricalGameResult.id > self.last_game_id
+                )
+            ))
+        games = query.order_by(
+            HistoricalGameResult.game_date.asc(), HistoricalGameResult.id.asc()
+        ).all()
         
-        form_score = (wins + draws * 0.5) / len(recent)
-        return 0.9 + form_score * 0.2
+        for game in games:
+            self.apply_game(game)
+        return len(games)
     
-    def fit(self, data: Any = None, db: Session = None) -> None:
+    def write_ratings(self, db: Session) -> int:
+        """Write ratings changed since the last write to ``Team.rating`` in one bulk update."""
+        if not self._dirty:
+            return 0
+        
+        existing = db.query(Team.id).filter(Team.id.in_(self._dirty)).all()
+        rows = [
+            {"id": team_id, "rating": self.state.rating(team_id)}
+            for (team_id,) in existing
+        ]
+        if rows:
+            db.execute(update(Team), rows)
+        self._dirty = set()
+        return len(rows)
+    
+    def load_checkpoint(self, db: Session) -> bool:
+        """Restore the saved state, unless it was built with other parameters."""
+        checkpoint = db.query(EloCheckpoint).filter(
+            EloCheckpoint.sport == self.sport
+        ).first()
+        if checkpoint is None:
+            return False
+        if json.loads(checkpoint.parameters) != self.parameters():
+            logger.info(f"Ignoring {self.sport} ELO checkpoint built with other parameters")
+            return False
+        
+        self.state = RatingState.from_dict(json.loads(checkpoint.state))
+        self.last_game_date = checkpoint.last_game_date
+        self.last_game_id = checkpoint.last_game_id
+        self.last_update = checkpoint.last_game_date
+        self.games_processed = checkpoint.games_processed or 0
+        self._dirty = set()
+        self.is_fitted = True
+        return True
+    
+    def save_checkpoint(self, db: Session) -> None:
+        checkpoint = db.query(EloCheckpoint).filter(
+            EloCheckpoint.sport == self.sport
+        ).first()
+        if checkpoint is None:
+            checkpoint = EloCheckpoint(sport=self.sport)
+            db.add(checkpoint)
+        
+        checkpoint.parameters = json.dumps(self.parameters())
+        checkpoint.last_game_date = self.last_game_date
+        checkpoint.last_game_id = self.last_game_id
+        checkpoint.games_processed = self.games_processed
+        checkpoint.state = json.dumps(self.state.to_dict())
+    
+    def sync(self, db: Session = None, load: bool = True) -> int:
+        """
+        Bring ratings up to date incrementally.
+
+        Loads the checkpoint (unless ``load`` is False and the model already
+        holds state), applies new results, writes changed team ratings and
+        saves the checkpoint. Returns the number of newly applied results.
+        """
         close_db = False
         if db is None:
             db = SessionLocal()
             close_db = True
         
         try:
-            games = db.query(HistoricalGameResult).filter(
-                HistoricalGameResult.sport == self.sport
-            ).order_by(HistoricalGameResult.game_date.asc()).all()
-            
-            self.team_ratings = {}
-            self.team_games_played = {}
-            self.team_form = {}
-            
-            for game in games:
-                if game.home_team_id is None or game.away_team_id is None:
-                    continue
-                
-                if game.home_team_id not in self.team_ratings:
-                    self.team_ratings[game.home_team_id] = 1500.0
-                if game.away_team_id not in self.team_ratings:
-                    self.team_ratings[game.away_team_id] = 1500.0
-                
-                if game.winner == "home":
-                    self.update_rating(
-                        game.home_team_id,
-                        game.away_team_id,
-                        game.margin or 0,
-                        game.game_date
-                    )
-                elif game.winner == "away":
-                    self.update_rating(
-                        game.away_team_id,
-                        game.home_team_id,
-                        -(game.margin or 0),
-                        game.game_date
-                    )
-                else:
-                    self.update_rating(
-                        game.home_team_id,
-                        game.away_team_id,
-                        0,
-                        game.game_date,
-                        is_draw=True
-                    )
-            
-            for team_id, rating in self.team_ratings.items():
-                team = db.query(Team).filter(Team.id == team_id).first()
-                if team:
-                    team.rating = rating
+            if load or not self.is_fitted:
+                if not self.load_checkpoint(db):
+                    self.reset()
             
+            applied = self.apply_new_results(db)
+            if applied or not self.is_fitted:
+                self.write_ratings(db)
+                self.save_checkpoint(db)
+                db.commit()
+            self.is_fitted = True
+            return applied
+        
+        finally:
+            if close_db:
+                db.close()
+    
+    def fit(self, data: Any = None, db: Session = None) -> None:
+        """Replay the sport's full history from scratch."""
+        close_db = False
+        if db is None:
+            db = SessionLocal()
+            close_db = True
+        
+        try:
+            self.reset()
+            self.apply_new_results(db)
+            self.write_ratings(db)
+            self.save_checkpoint(db)
             db.commit()
             self.is_fitted = True
             
@@ -196,10 +329,10 @@ class AdvancedELOModel(BaseSportModel):
             home_id = game.get("home_team_id")
             away_id = game.get("away_team_id")
             
-            if home_id and home_id in self.team_ratings:
-                home_rating = self.team_ratings[home_id]
-            if away_id and away_id in self.team_ratings:
-                away_rating = self.team_ratings[away_id]
+            if home_id and home_id in self.state:
+                home_rating = self.state.rating(home_id)
+            if away_id and away_id in self.state:
+                away_rating = self.state.rating(away_id)
             
             home_form = self.get_form_factor(home_id) if home_id else 1.0
             away_form = self.get_form_factor(away_id) if away_id else 1.0
@@ -246,10 +379,10 @@ class AdvancedELOModel(BaseSportModel):
         return results
     
     def get_rating(self, team_id: int) -> float:
-        return self.team_ratings.get(team_id, 1500.0)
+        return self.state.rating(team_id)
     
     def get_all_ratings(self) -> Dict[int, float]:
-        return self.team_ratings.copy()
+        return self.state.ratings_by_team()
 
 
 class NFLAdvancedModel(AdvancedELOModel):
@@ -318,3 +451,15 @@ def fit_all_advanced_models(db: Session = None) -> Dict[str, bool]:
             print(f"Error fitting {sport} model: {e}")
             results[sport] = False
     return results
+
+
+def sync_advanced_models(db: Session = None) -> Dict[str, int]:
+    """Load each model's checkpoint and apply results recorded since."""
+    results = {}
+    for sport, model in ADVANCED_MODEL_REGISTRY.items():
+        try:
+            results[sport] = model.sync(db=db)
+        except Exception as e:
+            logger.error(f"Error syncing {sport} model: {e}")
+            results[sport] = -1
+    return results
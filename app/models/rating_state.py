@@ -0,0 +1,119 @@
+"""
+Compact ELO rating state.
+
+Ratings, games played and recent form of every team live in NumPy arrays
+indexed through a team id -> row map, so a sport's whole state is a few
+contiguous arrays that serialize into one checkpoint.
+
+Form keeps the last FORM_LENGTH results per team as codes (0 loss,
+1 draw, 2 win, -1 empty), newest last.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_RATING = 1500.0
+FORM_LENGTH = 10
+FORM_EMPTY = -1
+FORM_CODES = {"L": 0, "D": 1, "W": 2}
+FORM_LETTERS = "LDW"
+
+
+class RatingState:
+    """Per-team ratings, games played and form for one sport."""
+
+    def __init__(self, capacity: int = 64):
+        self.index: Dict[int, int] = {}
+        self.team_ids: List[int] = []
+        self.ratings = np.full(capacity, DEFAULT_RATING)
+        self.games_played = np.zeros(capacity, dtype=np.int32)
+        self.form = np.full((capacity, FORM_LENGTH), FORM_EMPTY, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.team_ids)
+
+    def __contains__(self, team_id: int) -> bool:
+        return team_id in self.index
+
+    def row(self, team_id: int) -> int:
+        """Row of ``team_id``, adding the team at the default rating if new."""
+        row = self.index.get(team_id)
+        if row is not None:
+            return row
+        row = len(self.team_ids)
+        if row == len(self.ratings):
+            self._grow(max(64, row * 2))
+        self.index[team_id] = row
+        self.team_ids.append(team_id)
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        size = len(self.ratings)
+        ratings = np.full(capacity, DEFAULT_RATING)
+        ratings[:size] = self.ratings
+        games_played = np.zeros(capacity, dtype=np.int32)
+        games_played[:size] = self.games_played
+        form = np.full((capacity, FORM_LENGTH), FORM_EMPTY, dtype=np.int8)
+        form[:size] = self.form
+        self.ratings, self.games_played, self.form = ratings, games_played, form
+
+    def rating(self, team_id: int, default: float = DEFAULT_RATING) -> float:
+        row = self.index.get(team_id)
+        return float(self.ratings[row]) if row is not None else default
+
+    def record(self, row: int, result: str) -> None:
+        """Append a W/D/L result to a team's form."""
+        self.form[row, :-1] = self.form[row, 1:]
+        self.form[row, -1] = FORM_CODES[result]
+
+    def recent_form(self, team_id: int, num_games: int) -> np.ndarray:
+        """Codes of a team's last ``num_games`` results, oldest first."""
+        row = self.index.get(team_id)
+        if row is None:
+            return self.form[:0, 0]
+        codes = self.form[row, -num_games:]
+        return codes[codes != FORM_EMPTY]
+
+    def ratings_by_team(self) -> Dict[int, float]:
+        n = len(self.team_ids)
+        return dict(zip(self.team_ids, self.ratings[:n].tolist()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        n = len(self.team_ids)
+        return {
+            "team_ids": self.team_ids,
+            "ratings": self.ratings[:n].tolist(),
+            "games_played": self.games_played[:n].tolist(),
+            "form": ["".join(FORM_LETTERS[c] for c in row if c != FORM_EMPTY) for row in self.form[:n]],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RatingState":
+        team_ids = [int(team_id) for team_id in data.get("team_ids", [])]
+        state = cls(capacity=max(64, len(team_ids)))
+        for team_id, rating, played, form in zip(
+            team_ids, data["ratings"], data["games_played"], data["form"]
+        ):
+            row = state.row(team_id)
+            state.ratings[row] = rating
+            state.games_played[row] = played
+            for result in form[-FORM_LENGTH:]:
+                state.record(row, result)
+        return state
+
+    def copy(self) -> "RatingState":
+        other = RatingState(capacity=len(self.ratings))
+        other.index = dict(self.index)
+        other.team_ids = list(self.team_ids)
+        other.ratings = self.ratings.copy()
+        other.games_played = self.games_played.copy()
+        other.form = self.form.copy()
+        return other
+
+
+def form_score(codes: np.ndarray) -> Optional[float]:
+    """Share of points from form codes (win 1, draw 0.5), or None with no games."""
+    if not len(codes):
+        return None
+    return float(codes.sum()) / 2 / len(codes)
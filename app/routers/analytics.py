@@ -21,6 +21,10 @@ from app.services.odds_scheduler import (
     get_line_movements,
     get_odds_history
 )
+from app.services.odds_timeseries import get_odds_rollups
+from app.services.steam_detector import steam_detector
+from app.services.price_index import price_index
+from app.services.middles import scan_middles
 from app.services.arbitrage import (
     scan_for_arbitrage,
     calculate_arb_stakes,
@@ -165,6 +169,29 @@ def get_odds_history_endpoint(
     return [OddsHistoryResponse(**h) for h in history]
 
 
+@router.get("/odds-rollups/{game_id}")
+def get_odds_rollups_endpoint(
+    game_id: int,
+    market_type: Optional[str] = None,
+    sportsbook: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Get hourly open/high/low/close odds for a specific game."""
+    return get_odds_rollups(db, game_id, market_type, sportsbook)
+
+
+@router.get("/steam-events")
+def get_steam_events(
+    game_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Get recent steam and sharp-book-first events from the streaming detector."""
+    return {
+        "events": steam_detector.get_recent_events(game_id, limit),
+        "detector": steam_detector.stats(),
+    }
+
+
 # Odds Scheduler Status
 
 class SchedulerStatusResponse(BaseModel):
@@ -173,6 +200,11 @@ class SchedulerStatusResponse(BaseModel):
     refresh_count: int
     error_count: int
     refresh_interval_minutes: int
+    concurrency: Optional[int] = None
+    last_cycle_ms: Optional[float] = None
+    quota_remaining: Optional[int] = None
+    line_state: Dict[str, Any] = {}
+    sports: Dict[str, Dict[str, Any]] = {}
 
 
 @router.get("/scheduler/status", response_model=SchedulerStatusResponse)
@@ -469,6 +501,38 @@ def get_arbitrage_opportunities(
     ]
 
 
+@router.get("/best-prices/{game_id}")
+def get_best_prices(game_id: int, db: Session = Depends(get_db)):
+    """Get the top prices per side across sportsbooks for a game."""
+    price_index.ensure_loaded(db)
+    return {
+        "game_id": game_id,
+        "markets": price_index.get_best_prices(game_id),
+    }
+
+
+@router.get("/middles")
+def get_middles(
+    sport: Optional[str] = Query(None, description="Filter by sport"),
+    min_profit: float = Query(0.0, ge=0, le=20, description="Minimum guaranteed profit margin %"),
+    min_ev: float = Query(0.0, ge=0, le=50, description="Minimum expected value % for middles"),
+    total_stake: float = Query(100.0, gt=0, description="Total stake for the stake breakdown"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Scan spread and total ladders, including alternate lines, for
+    cross-line arbitrage and positive-EV middles.
+
+    Guaranteed profits come first, then middles by expected value.
+    """
+    opportunities = scan_middles(db, sport, min_profit, min_ev, total_stake)
+    return {
+        "count": len(opportunities),
+        "opportunities": [opp.to_dict() for opp in opportunities[:limit]],
+    }
+
+
 class StakeCalculatorRequest(BaseModel):
     odds1: int
     odds2: int
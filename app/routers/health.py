@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from app.utils.cache import cache
+from app.utils.http_client import http_clients
 from app.middleware.rate_limit import get_rate_limit_stats
 
 router = APIRouter(tags=["Health"])
@@ -16,7 +17,7 @@ def health_check():
 
 @router.get("/health/cache")
 def cache_stats():
-    """Get cache statistics."""
+    """Get cache statistics, per tier when Redis is fronted by the local cache."""
     stats = cache.stats()
     return {
         "status": "ok",
@@ -32,3 +33,12 @@ def rate_limit_stats():
         "status": "ok",
         "rate_limit": stats
     }
+
+
+@router.get("/health/http")
+def http_client_stats():
+    """Get per-provider request, error and latency metrics for outbound HTTP."""
+    return {
+        "status": "ok",
+        "http": http_clients.stats()
+    }
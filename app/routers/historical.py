@@ -1,3 +1,4 @@
+import math
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -6,10 +7,15 @@ from datetime import datetime, timedelta
 from app.db import get_db, HistoricalGameResult, BacktestResult, Team, ELORatingHistory
 from app.services.historical_data import seed_historical_data, get_team_form, get_head_to_head
 from app.services.backtesting import run_full_backtest, get_backtest_summary, BacktestEngine
-from app.models.advanced_elo import ADVANCED_MODEL_REGISTRY, fit_all_advanced_models
+from app.services.backtest_sweep import run_parameter_sweep
+from app.models.advanced_elo import ADVANCED_MODEL_REGISTRY, fit_all_advanced_models, sync_advanced_models
 
 router = APIRouter(prefix="/historical", tags=["historical"])
 
+# Sweeps run inside the request, so the grid a caller can ask for is bounded
+MAX_SWEEP_COMBINATIONS = 256
+MAX_SWEEP_MIN_EDGES = 10
+
 
 @router.post("/seed")
 def seed_data(
@@ -27,9 +33,15 @@ def seed_data(
 
 
 @router.post("/train-models")
-def train_models(db: Session = Depends(get_db)):
+def train_models(
+    full: bool = Query(False, description="Replay all history instead of applying new results"),
+    db: Session = Depends(get_db)
+):
     try:
-        results = fit_all_advanced_models(db)
+        if full:
+            results = fit_all_advanced_models(db)
+        else:
+            results = sync_advanced_models(db)
         return {
             "message": "Models trained successfully",
             "results": results
@@ -209,6 +221,49 @@ def run_backtest(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/backtest/{sport}/sweep")
+def run_backtest_sweep(
+    sport: str,
+    seasons: int = Query(2, ge=1, le=5),
+    base_k_factor: Optional[List[float]] = Query(None),
+    home_advantage: Optional[List[float]] = Query(None),
+    recency_weight: Optional[List[float]] = Query(None),
+    margin_factor: Optional[List[float]] = Query(None),
+    min_edge: List[float] = Query([0.03]),
+    top: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    if sport not in ADVANCED_MODEL_REGISTRY:
+        raise HTTPException(status_code=400, detail=f"Sport {sport} not supported for backtesting")
+    _check_sweep_size([base_k_factor, home_advantage, recency_weight, margin_factor], min_edge)
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365 * seasons)
+    try:
+        return run_parameter_sweep(
+            db, sport, start_date, end_date,
+            min_edges=min_edge,
+            top=top,
+            base_k_factor=base_k_factor,
+            home_advantage=home_advantage,
+            recency_weight=recency_weight,
+            margin_factor=margin_factor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _check_sweep_size(axes: List[Optional[List[float]]], min_edges: List[float]):
+    combinations = math.prod(len(values) if values else 1 for values in axes)
+    if combinations > MAX_SWEEP_COMBINATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_SWEEP_COMBINATIONS} parameter combinations per sweep (got {combinations})"
+        )
+    if len(min_edges) > MAX_SWEEP_MIN_EDGES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SWEEP_MIN_EDGES} min_edge values per sweep")
+
+
 @router.get("/backtest/results")
 def get_backtest_results(
     sport: Optional[str] = None,
@@ -265,7 +320,8 @@ def get_model_status():
     for sport, model in ADVANCED_MODEL_REGISTRY.items():
         status[sport] = {
             "is_fitted": model.is_fitted,
-            "teams_tracked": len(model.team_ratings),
+            "teams_tracked": len(model.state),
+            "games_processed": model.games_processed,
             "k_factor": model.base_k_factor,
             "home_advantage": model.home_advantage,
             "last_update": model.last_update.isoformat() if model.last_update else None
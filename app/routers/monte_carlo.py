@@ -4,6 +4,8 @@ Monte Carlo Simulation Router
 Bankroll growth projections and risk analysis.
 """
 
+import asyncio
+
 from fastapi import APIRouter, Query, HTTPException
 from typing import List, Optional
 from pydantic import BaseModel, Field
@@ -13,7 +15,7 @@ from app.services.monte_carlo import (
     BetScenario,
     run_monte_carlo,
     calculate_risk_of_ruin,
-    compare_strategies,
+    compare_strategies_parallel,
     analyze_variance,
     create_bet_scenarios_from_edge,
     kelly_fraction,
@@ -47,6 +49,7 @@ class SimulationRequest(BaseModel):
     unit_size: float = Field(0.01, ge=0.001, le=0.1, description="Base unit size (fraction)")
     max_bet_pct: float = Field(0.05, ge=0.01, le=0.25, description="Max bet (fraction)")
     bust_threshold: float = Field(0.0, ge=0, description="Bankroll level considered bust")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed for reproducible results")
 
 
 class QuickSimulationRequest(BaseModel):
@@ -58,6 +61,7 @@ class QuickSimulationRequest(BaseModel):
     strategy: BetSizingStrategy = Field(BetSizingStrategy.HALF_KELLY, description="Strategy")
     num_bets: int = Field(100, ge=10, le=10000, description="Number of bets")
     num_simulations: int = Field(1000, ge=100, le=10000, description="Simulation runs")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed for reproducible results")
 
 
 class RiskOfRuinRequest(BaseModel):
@@ -74,6 +78,10 @@ class StrategyComparisonRequest(BaseModel):
     bet_scenarios: List[BetScenarioInput] = Field(..., min_length=1, description="Bet scenarios")
     num_bets: int = Field(100, ge=10, le=5000, description="Number of bets")
     num_simulations: int = Field(500, ge=100, le=5000, description="Simulations per strategy")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed for reproducible results")
+    time_budget_seconds: Optional[float] = Field(
+        None, gt=0, le=120, description="Max seconds to spend before giving up"
+    )
 
 
 class KellyRequest(BaseModel):
@@ -126,7 +134,8 @@ def run_simulation(request: SimulationRequest):
             num_simulations=request.num_simulations,
             unit_size=request.unit_size,
             max_bet_pct=request.max_bet_pct,
-            bust_threshold=request.bust_threshold
+            bust_threshold=request.bust_threshold,
+            seed=request.seed
         )
 
         return result
@@ -159,7 +168,8 @@ def run_quick_simulation(request: QuickSimulationRequest):
             avg_edge=request.avg_edge,
             edge_variance=request.edge_variance,
             avg_odds=request.avg_odds,
-            num_scenarios=10
+            num_scenarios=10,
+            seed=request.seed
         )
 
         result = run_monte_carlo(
@@ -167,7 +177,8 @@ def run_quick_simulation(request: QuickSimulationRequest):
             bet_scenarios=scenarios,
             strategy=request.strategy,
             num_bets=request.num_bets,
-            num_simulations=request.num_simulations
+            num_simulations=request.num_simulations,
+            seed=request.seed
         )
 
         return result
@@ -200,7 +211,7 @@ def calculate_ror(request: RiskOfRuinRequest):
 
 
 @router.post("/compare-strategies")
-def compare_betting_strategies(request: StrategyComparisonRequest):
+async def compare_betting_strategies(request: StrategyComparisonRequest):
     """
     Compare different bet sizing strategies.
 
@@ -211,6 +222,10 @@ def compare_betting_strategies(request: StrategyComparisonRequest):
     - Full Kelly (aggressive)
     - Percentage betting
 
+    Strategies and simulation chunks run across a process pool so the
+    event loop stays free; the request fails with 504 if it exceeds
+    its time budget.
+
     Returns which strategy is best for growth, safety, or balance.
     """
     try:
@@ -223,15 +238,19 @@ def compare_betting_strategies(request: StrategyComparisonRequest):
             for s in request.bet_scenarios
         ]
 
-        result = compare_strategies(
+        result = await compare_strategies_parallel(
             starting_bankroll=request.starting_bankroll,
             bet_scenarios=scenarios,
             num_bets=request.num_bets,
-            num_simulations=request.num_simulations
+            num_simulations=request.num_simulations,
+            seed=request.seed,
+            timeout=request.time_budget_seconds
         )
 
         return result
 
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Strategy comparison exceeded time budget")
     except Exception as e:
         logger.error(f"Strategy comparison error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
@@ -264,7 +283,8 @@ def variance_analysis(request: SimulationRequest):
             bet_scenarios=scenarios,
             strategy=request.strategy,
             num_bets=request.num_bets,
-            num_simulations=request.num_simulations
+            num_simulations=request.num_simulations,
+            seed=request.seed
         )
 
         return result
@@ -7,26 +7,31 @@ API endpoints for neural network predictions:
 - Training and model management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 from app.db import get_db, User, Game, Team, HistoricalGameResult
 from app.routers.auth import require_auth
 from app.services.neural_ensemble import (
+    ArtifactError,
     NeuralEnsemble,
     ModelManager,
     ModelConfig,
     FeatureEngineering,
     predict_game,
+    predict_games,
     get_model_comparison,
-    train_ensemble,
+    get_model_comparisons,
 )
+from app.services.neural_training import start_training, get_training_job
 
 router = APIRouter(prefix="/neural", tags=["Neural Ensemble"])
 
+MAX_BATCH_GAMES = 512
+
 
 # =============================================================================
 # Request/Response Models
@@ -89,8 +94,10 @@ class GamePredictionRequest(BaseModel):
 class TrainingRequest(BaseModel):
     """Request model for model training."""
     sport: Optional[str] = Field(None, description="Limit training to specific sport")
-    max_games: int = Field(1000, ge=100, le=10000, description="Maximum games to use")
+    max_games: int = Field(1000, ge=100, le=200000, description="Maximum games to use")
     validation_split: float = Field(0.2, ge=0.1, le=0.4, description="Validation data fraction")
+    epochs: int = Field(100, ge=1, le=500, description="Maximum training epochs")
+    batch_size: int = Field(256, ge=8, le=4096, description="Games per gradient step")
 
 
 class ModelWeightsUpdate(BaseModel):
@@ -119,55 +126,11 @@ async def predict_game_outcome(
 
     Returns combined prediction with confidence and component breakdowns.
     """
-    # Build stats dictionaries
-    home_stats = {
-        "elo_rating": request.home_elo,
-        "recent_win_pct": request.home_recent_win_pct,
-        "home_win_pct": 0.55,  # Default
-        "offensive_rating": 100,
-        "defensive_rating": 100,
-        "pace": 100,
-        "score_std": 10,
-    }
-
-    away_stats = {
-        "elo_rating": request.away_elo,
-        "recent_win_pct": request.away_recent_win_pct,
-        "away_win_pct": 0.45,  # Default
-        "offensive_rating": 100,
-        "defensive_rating": 100,
-        "pace": 100,
-        "score_std": 10,
-    }
-
-    game_context = {
-        "home_rest_days": request.home_rest_days,
-        "away_rest_days": request.away_rest_days,
-        "away_travel_miles": request.away_travel_miles,
-        "is_primetime": request.is_primetime,
-        "h2h_home_win_pct": 0.5,
-        "h2h_total_games": 0,
-    }
-
-    factor_scores = {
-        "line_movement": request.line_movement_score,
-        "coach_dna": request.coach_dna_score,
-        "situational": request.situational_score,
-        "weather": request.weather_score,
-        "officials": request.officials_score,
-        "public_fade": request.public_fade_score,
-        "elo": request.elo_score,
-        "social": request.social_score,
-    }
-
     prediction = predict_game(
-        sport=request.sport,
         home_team=request.home_team,
         away_team=request.away_team,
-        home_stats=home_stats,
-        away_stats=away_stats,
-        game_context=game_context,
-        factor_scores=factor_scores,
+        routing_key=str(user.id),
+        **_request_inputs(request),
     )
 
     return {
@@ -249,7 +212,7 @@ async def predict_by_game_id(
     home_history = _get_team_game_history(db, game.home_team, game.sport, limit=10)
     away_history = _get_team_game_history(db, game.away_team, game.sport, limit=10)
 
-    model = ModelManager.get_active_model()
+    model = ModelManager.get_model(str(user.id))
     prediction = model.predict(
         sport=game.sport,
         home_team_stats=home_stats,
@@ -287,53 +250,7 @@ async def compare_models(
 
     Shows how each component (feedforward, LSTM, ELO) predicts differently.
     """
-    home_stats = {
-        "elo_rating": request.home_elo,
-        "recent_win_pct": request.home_recent_win_pct,
-        "home_win_pct": 0.55,
-        "offensive_rating": 100,
-        "defensive_rating": 100,
-        "pace": 100,
-        "score_std": 10,
-    }
-
-    away_stats = {
-        "elo_rating": request.away_elo,
-        "recent_win_pct": request.away_recent_win_pct,
-        "away_win_pct": 0.45,
-        "offensive_rating": 100,
-        "defensive_rating": 100,
-        "pace": 100,
-        "score_std": 10,
-    }
-
-    game_context = {
-        "home_rest_days": request.home_rest_days,
-        "away_rest_days": request.away_rest_days,
-        "away_travel_miles": request.away_travel_miles,
-        "is_primetime": request.is_primetime,
-        "h2h_home_win_pct": 0.5,
-        "h2h_total_games": 0,
-    }
-
-    factor_scores = {
-        "line_movement": request.line_movement_score,
-        "coach_dna": request.coach_dna_score,
-        "situational": request.situational_score,
-        "weather": request.weather_score,
-        "officials": request.officials_score,
-        "public_fade": request.public_fade_score,
-        "elo": request.elo_score,
-        "social": request.social_score,
-    }
-
-    comparison = get_model_comparison(
-        sport=request.sport,
-        home_stats=home_stats,
-        away_stats=away_stats,
-        game_context=game_context,
-        factor_scores=factor_scores,
-    )
+    comparison = get_model_comparison(**_request_inputs(request))
 
     return {
         "game": {
@@ -346,6 +263,68 @@ async def compare_models(
     }
 
 
+@router.post("/predict/batch")
+async def predict_game_outcomes(
+    requests: List[GamePredictionRequest],
+    user: User = Depends(require_auth)
+):
+    """
+    Get neural ensemble predictions for a slate of games.
+
+    All games are scored in one batched pass through the networks.
+    """
+    _check_batch_size(requests)
+    predictions = predict_games([_request_inputs(request) for request in requests], routing_key=str(user.id))
+
+    return {
+        "count": len(predictions),
+        "predictions": [
+            {
+                "game": {
+                    "sport": request.sport,
+                    "home_team": request.home_team,
+                    "away_team": request.away_team,
+                },
+                "prediction": prediction["prediction"],
+                "recommended_side": prediction["recommended_side"],
+                "edge_pct": round(prediction["edge"], 2),
+                "confidence": round(prediction["confidence"], 3),
+                "components": prediction["components"],
+            }
+            for request, prediction in zip(requests, predictions)
+        ],
+        "model_version": predictions[0]["model_version"] if predictions else ModelManager.get_model(str(user.id)).version,
+    }
+
+
+@router.post("/compare/batch")
+async def compare_models_batch(
+    requests: List[GamePredictionRequest],
+    user: User = Depends(require_auth)
+):
+    """
+    Compare component predictions for a slate of games in one batch.
+    """
+    _check_batch_size(requests)
+    comparisons = get_model_comparisons([_request_inputs(request) for request in requests])
+
+    return {
+        "count": len(comparisons),
+        "comparisons": [
+            {
+                "game": {
+                    "sport": request.sport,
+                    "home_team": request.home_team,
+                    "away_team": request.away_team,
+                },
+                "comparison": comparison,
+                "analysis": _analyze_model_differences(comparison),
+            }
+            for request, comparison in zip(requests, comparisons)
+        ],
+    }
+
+
 # =============================================================================
 # Model Management Endpoints
 # =============================================================================
@@ -428,7 +407,7 @@ async def save_model(
     """
     model = ModelManager.get_active_model()
     path = model.save()
-    model_id = ModelManager.register_model(model, name, description)
+    model_id = ModelManager.register_model(model, name, description, path=path)
 
     return {
         "message": "Model saved successfully",
@@ -438,6 +417,51 @@ async def save_model(
     }
 
 
+@router.post("/model/activate/{model_id}")
+async def activate_model(
+    model_id: str,
+    user: User = Depends(require_auth)
+):
+    """
+    Make a saved model the active model in every worker, without a restart.
+    """
+    try:
+        model = ModelManager.activate(model_id)
+    except ArtifactError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {
+        "message": "Model activated",
+        "model_id": model_id,
+        "version": model.version,
+    }
+
+
+@router.put("/model/ab-split")
+async def set_ab_split(
+    split: Dict[str, float],
+    user: User = Depends(require_auth)
+):
+    """
+    Split prediction traffic between saved models, e.g.
+    {"ensemble_a": 0.9, "ensemble_b": 0.1}.
+
+    Each user is routed to the same model for as long as the split is
+    unchanged. An empty object routes everyone to the active model.
+    """
+    try:
+        normalized = ModelManager.set_ab_split(split)
+    except ArtifactError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "message": "A/B split updated",
+        "split": normalized,
+    }
+
+
 # =============================================================================
 # Training Endpoints
 # =============================================================================
@@ -445,14 +469,14 @@ async def save_model(
 @router.post("/train")
 async def trigger_training(
     request: TrainingRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(require_auth)
 ):
     """
     Trigger model training on historical data.
 
-    Training runs in the background. Check /model/info for progress.
+    Training runs in a separate process and the trained model is activated
+    when it finishes. Check /train/status for progress.
     """
     # Gather training data
     query = db.query(HistoricalGameResult)
@@ -470,18 +494,21 @@ async def trigger_training(
     # Prepare training data
     training_data = _prepare_training_data(db, games)
 
-    # Run training in background
-    background_tasks.add_task(
-        _run_training,
-        training_data,
-        request.validation_split
-    )
+    try:
+        job = start_training(
+            training_data,
+            request.validation_split,
+            ModelConfig(epochs=request.epochs, batch_size=request.batch_size),
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
     return {
         "message": "Training started",
         "games_to_train": len(games),
         "sport": request.sport or "ALL",
         "validation_split": request.validation_split,
+        "job": job,
     }
 
 
@@ -492,6 +519,7 @@ async def get_training_status(user: User = Depends(require_auth)):
     """
     model = ModelManager.get_active_model()
     return {
+        "job": get_training_job(),
         "trained_on_games": model.trained_on_games,
         "accuracy_history": model.accuracy_history[-20:],
         "current_accuracy": model.accuracy_history[-1] if model.accuracy_history else None,
@@ -668,6 +696,62 @@ async def get_demo_prediction():
 # Helper Functions
 # =============================================================================
 
+def _check_batch_size(requests: List[GamePredictionRequest]):
+    if len(requests) > MAX_BATCH_GAMES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_GAMES} games per batch")
+
+
+def _request_inputs(request: GamePredictionRequest) -> dict:
+    """Model inputs for a prediction request, with defaults for stats it does not carry."""
+    home_stats = {
+        "elo_rating": request.home_elo,
+        "recent_win_pct": request.home_recent_win_pct,
+        "home_win_pct": 0.55,  # Default
+        "offensive_rating": 100,
+        "defensive_rating": 100,
+        "pace": 100,
+        "score_std": 10,
+    }
+
+    away_stats = {
+        "elo_rating": request.away_elo,
+        "recent_win_pct": request.away_recent_win_pct,
+        "away_win_pct": 0.45,  # Default
+        "offensive_rating": 100,
+        "defensive_rating": 100,
+        "pace": 100,
+        "score_std": 10,
+    }
+
+    game_context = {
+        "home_rest_days": request.home_rest_days,
+        "away_rest_days": request.away_rest_days,
+        "away_travel_miles": request.away_travel_miles,
+        "is_primetime": request.is_primetime,
+        "h2h_home_win_pct": 0.5,
+        "h2h_total_games": 0,
+    }
+
+    factor_scores = {
+        "line_movement": request.line_movement_score,
+        "coach_dna": request.coach_dna_score,
+        "situational": request.situational_score,
+        "weather": request.weather_score,
+        "officials": request.officials_score,
+        "public_fade": request.public_fade_score,
+        "elo": request.elo_score,
+        "social": request.social_score,
+    }
+
+    return {
+        "sport": request.sport,
+        "home_stats": home_stats,
+        "away_stats": away_stats,
+        "game_context": game_context,
+        "factor_scores": factor_scores,
+    }
+
+
 def _get_team_game_history(
     db: Session,
     team_name: str,
@@ -747,21 +831,6 @@ def _prepare_training_data(db: Session, games: List[HistoricalGameResult]) -> Li
     return training_data
 
 
-def _run_training(training_data: List[dict], validation_split: float):
-    """Run model training (background task)."""
-    from app.utils.logging import get_logger
-    logger = get_logger(__name__)
-
-    try:
-        logger.info(f"Starting training on {len(training_data)} games")
-        model = train_ensemble(training_data, validation_split)
-        model.save()
-        ModelManager.set_active_model(model)
-        logger.info("Training complete, new model activated")
-    except Exception as e:
-        logger.error(f"Training failed: {e}")
-
-
 def _analyze_model_differences(comparison: dict) -> dict:
     """Analyze differences between model predictions."""
     components = ["feedforward", "lstm", "elo"]
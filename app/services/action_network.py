@@ -75,7 +75,7 @@ async def fetch_public_betting(
     cache_key = f"action_network:public:{game_id}"
 
     if not force_refresh:
-        cached = cache.get(cache_key)
+        cached = await cache.aget(cache_key)
         if cached:
             return cached
 
@@ -88,7 +88,7 @@ async def fetch_public_betting(
 
     if existing and not force_refresh:
         result = _format_public_betting_response(existing)
-        cache.set(cache_key, result, ttl=TTL_SHORT)
+        await cache.aset(cache_key, result, ttl=TTL_SHORT)
         return result
 
     # Fetch from API or generate realistic data
@@ -101,7 +101,7 @@ async def fetch_public_betting(
     public_data = _store_public_betting(db, game_id, sport, data)
 
     result = _format_public_betting_response(public_data)
-    cache.set(cache_key, result, ttl=TTL_SHORT)
+    await cache.aset(cache_key, result, ttl=TTL_SHORT)
 
     return result
 
@@ -354,8 +354,8 @@ async def get_sharp_money_indicators(
         line_moves.get("total", [])
     )
 
-    # Detect steam moves
-    steam_moves = _detect_steam_moves(line_moves)
+    # Steam moves: live events from the streaming detector, else rebuilt from snapshots
+    steam_moves = _streamed_steam_moves(game_id) or _detect_steam_moves(line_moves)
 
     # Calculate sharp confidence score
     sharp_score = _calculate_sharp_score(
@@ -539,6 +539,24 @@ def _detect_reverse_line_movement_total(
     }
 
 
+def _streamed_steam_moves(game_id: int) -> List[Dict]:
+    """Steam events the streaming detector raised for this game, as steam move dicts."""
+    from app.services.steam_detector import steam_detector
+
+    return [
+        {
+            "market": "spread" if event["market_type"].startswith("spread") else "total",
+            "direction": event["direction"],
+            "total_move": event["move"],
+            "books_moved": len(event["books"]),
+            "timestamp": event["detected_at"],
+            "description": f"Steam move detected: {event['market_type']} moved {event['move']:.1f} points",
+        }
+        for event in steam_detector.get_recent_events(game_id)
+        if event["event_type"] == "steam"
+    ]
+
+
 def _detect_steam_moves(line_moves: Dict[str, List]) -> List[Dict]:
     """
     Detect steam moves - sudden sharp line movements.
@@ -362,6 +362,9 @@ def scan_for_arbitrage(
     """
     Scan all upcoming games for arbitrage opportunities.
 
+    Uses the best-price index, so the scan is one pass over live markets
+    in memory rather than queries per game and market.
+
     Args:
         db: Database session
         sport: Optional sport filter
@@ -372,43 +375,15 @@ def scan_for_arbitrage(
     """
     logger.info(f"Scanning for arbitrage opportunities (sport={sport}, min_profit={min_profit}%)")
 
-    # Get upcoming games
-    query = db.query(Game).filter(
-        Game.start_time > datetime.utcnow(),
-        Game.status == "scheduled"
-    )
-
-    if sport:
-        query = query.filter(Game.sport == sport)
-
-    games = query.limit(100).all()
-    logger.debug(f"Checking {len(games)} games for arbitrage")
-
-    opportunities: List[ArbOpportunity] = []
-
-    for game in games:
-        # Check h2h markets
-        arb = detect_h2h_arbitrage(db, game, min_profit)
-        if arb:
-            opportunities.append(arb)
-            logger.info(f"Found h2h arb: {arb.home_team} vs {arb.away_team} ({arb.profit_margin}%)")
-
-        # Check spread markets
-        arb = detect_spread_arbitrage(db, game, min_profit)
-        if arb:
-            opportunities.append(arb)
-            logger.info(f"Found spread arb: {arb.home_team} vs {arb.away_team} ({arb.profit_margin}%)")
-
-        # Check totals markets
-        arb = detect_totals_arbitrage(db, game, min_profit)
-        if arb:
-            opportunities.append(arb)
-            logger.info(f"Found totals arb: {arb.home_team} vs {arb.away_team} ({arb.profit_margin}%)")
+    # Scans the in-memory best-price index; it reloads from Markets/Lines when stale
+    from app.services.price_index import price_index
 
-    # Sort by profit margin (highest first)
-    opportunities.sort(key=lambda x: x.profit_margin, reverse=True)
+    price_index.ensure_loaded(db)
+    opportunities = price_index.scan(sport, min_profit)
 
-    logger.info(f"Found {len(opportunities)} arbitrage opportunities")
+    for arb in opportunities:
+        logger.info(f"Found {arb.market_type} arb: {arb.home_team} vs {arb.away_team} ({arb.profit_margin}%)")
+    logger.info(f"Found {len(opportunities)} arbitrage opportunities in {price_index.last_scan_ms} ms")
     return opportunities
 
 
@@ -0,0 +1,481 @@
+"""
+Columnar walk-forward backtests and parameter sweeps.
+
+BacktestEngine replays history one ORM row at a time for one parameter
+set. Here history is loaded once into NumPy arrays (team ids mapped to
+integer indices) and the ELO replay carries one rating row per
+parameter set, so every combination of ``base_k_factor``,
+``home_advantage``, ``recency_weight`` and ``margin_factor`` advances
+together game by game. Edge thresholds only change which bets are
+taken, so all ``min_edges`` are scored from the same predictions.
+
+The replay follows AdvancedELOModel: K scaled by games played, the
+sport's margin multiplier, the last-five-games form factor applied at
+prediction time, and predictions made before each game's update.
+``recency_weight`` regresses a team's rating toward 1500 by
+``recency_weight ** (idle_days / 30)`` before its next game; 1.0 (the
+default) disables it and reproduces the model exactly. Metrics (Brier,
+log loss, calibration, ROI, drawdown, Sharpe) are computed as in
+BacktestEngine and one BacktestResult row is stored per combination.
+
+Large grids are split across BACKTEST_WORKERS processes.
+
+Usage:
+    summary = run_parameter_sweep(
+        db, "NBA", start_date, end_date,
+        base_k_factor=[20, 28, 36], home_advantage=[25, 35, 45],
+        min_edges=[0.02, 0.03, 0.05],
+    )
+"""
+
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db import HistoricalGameResult, BacktestResult
+from app.models.advanced_elo import ADVANCED_MODEL_REGISTRY, AdvancedELOModel
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BACKTEST_WORKERS = int(os.environ.get("BACKTEST_WORKERS", "1"))
+SWEEP_PARAMETERS = ("base_k_factor", "home_advantage", "recency_weight", "margin_factor")
+DEFAULT_RATING = 1500.0
+FORM_GAMES = 5
+CALIBRATION_BINS = 10
+
+# (points per unit, cap) of AdvancedELOModel._margin_multiplier
+MARGIN_SCALES = {
+    "NFL": (14.0, 2.0),
+    "NBA": (12.0, 2.0),
+    "MLB": (5.0, 1.5),
+    "NHL": (3.0, 1.5),
+}
+DEFAULT_MARGIN_SCALE = (10.0, math.inf)
+
+
+@dataclass
+class GameHistory:
+    """Completed games of one sport as columns, in replay order."""
+    sport: str
+    game_ids: np.ndarray  # int64
+    days: np.ndarray  # float64, days since the epoch
+    home: np.ndarray  # int32 team index
+    away: np.ndarray  # int32 team index
+    outcome: np.ndarray  # float64 home result: 1 win, 0 loss, 0.5 draw
+    margin: np.ndarray  # float64 absolute margin
+    home_ml: np.ndarray  # float64 closing moneyline, NaN if missing
+    away_ml: np.ndarray
+    team_ids: np.ndarray  # team index -> team id
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.team_ids)
+
+
+def load_history(db: Session, sport: str, end_date: datetime) -> GameHistory:
+    """Load every game of ``sport`` up to ``end_date`` in one column query."""
+    rows = db.query(
+        HistoricalGameResult.id,
+        HistoricalGameResult.game_date,
+        HistoricalGameResult.home_team_id,
+        HistoricalGameResult.away_team_id,
+        HistoricalGameResult.winner,
+        HistoricalGameResult.margin,
+        HistoricalGameResult.closing_home_ml,
+        HistoricalGameResult.closing_away_ml,
+    ).filter(
+        HistoricalGameResult.sport == sport,
+        HistoricalGameResult.game_date <= end_date,
+        HistoricalGameResult.home_team_id.isnot(None),
+        HistoricalGameResult.away_team_id.isnot(None),
+    ).order_by(HistoricalGameResult.game_date.asc(), HistoricalGameResult.id.asc()).all()
+
+    ids, dates, home_ids, away_ids, winners, margins, home_mls, away_mls = (
+        zip(*rows) if rows else ([],) * 8
+    )
+    team_ids, teams = np.unique(np.array(home_ids + away_ids, dtype=np.int64), return_inverse=True)
+    n = len(ids)
+    outcome = np.array([1.0 if w == "home" else 0.0 if w == "away" else 0.5 for w in winners])
+    return GameHistory(
+        sport=sport,
+        game_ids=np.array(ids, dtype=np.int64),
+        days=np.array(dates, dtype="datetime64[s]").astype(np.float64) / 86400.0,
+        home=teams[:n].astype(np.int32),
+        away=teams[n:].astype(np.int32),
+        outcome=outcome,
+        margin=np.abs(np.array([m or 0.0 for m in margins], dtype=np.float64)),
+        home_ml=np.array([ml or np.nan for ml in home_mls], dtype=np.float64),
+        away_ml=np.array([ml or np.nan for ml in away_mls], dtype=np.float64),
+        team_ids=team_ids,
+    )
+
+
+def parameter_grid(model: AdvancedELOModel, **values: Optional[Sequence[float]]) -> List[Dict[str, float]]:
+    """
+    Cartesian product of parameter values.
+
+    Parameters not given keep the model's value, except ``recency_weight``
+    which defaults to 1.0 (no decay, as the model itself).
+    """
+    defaults = {
+        "base_k_factor": model.base_k_factor,
+        "home_advantage": model.home_advantage,
+        "recency_weight": 1.0,
+        "margin_factor": model.margin_factor,
+    }
+    axes = [list(values.get(name) or [defaults[name]]) for name in SWEEP_PARAMETERS]
+    return [dict(zip(SWEEP_PARAMETERS, combo)) for combo in itertools.product(*axes)]
+
+
+def replay(history: GameHistory, params: List[Dict[str, float]], eval_from: int) -> np.ndarray:
+    """
+    Walk forward through ``history`` for every parameter set at once.
+
+    Returns home win probabilities, shape (len(params), len(history) - eval_from),
+    predicted before each game from ``eval_from`` on.
+    """
+    n_params = len(params)
+    base_k = np.array([p["base_k_factor"] for p in params])
+    home_adv = np.array([p["home_advantage"] for p in params])
+    recency = np.array([p["recency_weight"] for p in params])
+    margin_factor = np.array([p["margin_factor"] for p in params])
+    decay = bool(np.any(recency != 1.0))
+    scale, cap = MARGIN_SCALES.get(history.sport, DEFAULT_MARGIN_SCALE)
+    ln10 = math.log(10)
+
+    ratings = np.full((n_params, history.n_teams), DEFAULT_RATING)
+    games_played = np.zeros(history.n_teams, dtype=np.int64)
+    last_day = np.full(history.n_teams, np.nan)
+    form: List[List[float]] = [[] for _ in range(history.n_teams)]
+    probs = np.empty((n_params, len(history) - eval_from))
+
+    for g in range(len(history)):
+        h, a = int(history.home[g]), int(history.away[g])
+        day = history.days[g]
+        if decay:
+            for team in (h, a):
+                if not np.isnan(last_day[team]):
+                    factor = recency ** ((day - last_day[team]) / 30.0)
+                    ratings[:, team] = DEFAULT_RATING + (ratings[:, team] - DEFAULT_RATING) * factor
+        rh = ratings[:, h]
+        ra = ratings[:, a]
+
+        if g >= eval_from:
+            form_h = 0.9 + sum(form[h]) / len(form[h]) * 0.2 if form[h] else 1.0
+            form_a = 0.9 + sum(form[a]) / len(form[a]) * 0.2 if form[a] else 1.0
+            diff = (rh * form_h - ra * form_a + home_adv) / 400.0
+            probs[:, g - eval_from] = 1 / (1 + np.exp(-diff * ln10))
+
+        s = history.outcome[g]
+        expected = 1 / (1 + 10 ** ((ra - rh) / 400.0))
+        multiplier = np.minimum(cap, 1.0 + history.margin[g] / scale * margin_factor)
+        delta = multiplier * (s - expected)
+        ratings[:, h] = rh + base_k * _k_scale(games_played[h]) * delta
+        ratings[:, a] = ra - base_k * _k_scale(games_played[a]) * delta
+
+        games_played[h] += 1
+        games_played[a] += 1
+        last_day[h] = last_day[a] = day
+        form[h] = (form[h] + [s])[-FORM_GAMES:]
+        form[a] = (form[a] + [1.0 - s])[-FORM_GAMES:]
+
+    return probs
+
+
+def _k_scale(games_played: int) -> float:
+    if games_played < 10:
+        return 1.5
+    elif games_played < 30:
+        return 1.0
+    return 0.8
+
+
+def _implied(ml: np.ndarray) -> np.ndarray:
+    return np.where(ml > 0, 100 / (ml + 100), np.abs(ml) / (np.abs(ml) + 100))
+
+
+def _win_profit(ml: np.ndarray, stake: float) -> np.ndarray:
+    return np.where(ml > 0, stake * ml / 100, stake * 100 / np.abs(ml))
+
+
+def score(
+    history: GameHistory,
+    probs: np.ndarray,
+    eval_from: int,
+    min_edges: Sequence[float],
+    stake_size: float
+) -> List[List[Dict[str, Any]]]:
+    """
+    Metrics per parameter set (rows of ``probs``) and edge threshold.
+
+    Returns ``metrics[param][edge]`` dicts keyed like BacktestResult columns.
+    """
+    outcome = history.outcome[eval_from:]
+    home_win = np.round(probs, 4)
+    away_win = np.round(1 - probs, 4)
+    actual = (outcome == 1.0).astype(np.float64)
+    n_params, n_games = probs.shape
+
+    correct = np.where(home_win > away_win, outcome == 1.0, outcome == 0.0)
+    accuracy = correct.mean(axis=1) if n_games else np.zeros(n_params)
+    brier = ((home_win - actual) ** 2).mean(axis=1) if n_games else np.zeros(n_params)
+    clipped = np.clip(home_win, 1e-15, 1 - 1e-15)
+    log_loss = -(actual * np.log(clipped) + (1 - actual) * np.log(1 - clipped)).mean(axis=1) if n_games else None
+    calibration = _calibration_error(home_win, actual)
+
+    home_ml = history.home_ml[eval_from:]
+    away_ml = history.away_ml[eval_from:]
+    has_odds = ~np.isnan(home_ml) & ~np.isnan(away_ml)
+    with np.errstate(invalid="ignore"):
+        home_edge = home_win - _implied(home_ml)
+        away_edge = away_win - _implied(away_ml)
+        home_profit = _win_profit(home_ml, stake_size)
+        away_profit = _win_profit(away_ml, stake_size)
+
+    results = []
+    for p in range(n_params):
+        row = []
+        for min_edge in min_edges:
+            bet_home = has_odds & (home_edge[p] >= min_edge)
+            bet_away = has_odds & ~bet_home & (away_edge[p] >= min_edge)
+            pnl = np.zeros(n_games)
+            pnl[bet_home] = np.where(outcome[bet_home] == 1.0, home_profit[bet_home], -stake_size)
+            pnl[bet_away] = np.where(outcome[bet_away] == 0.0, away_profit[bet_away], -stake_size)
+            bets = bet_home | bet_away
+            bet_pnl = pnl[bets]
+            total_bets = int(bets.sum())
+            edges = np.concatenate([home_edge[p][bet_home], away_edge[p][bet_away]])
+            odds = np.concatenate([home_ml[bet_home], away_ml[bet_away]])
+
+            row.append({
+                "total_predictions": n_games,
+                "correct_predictions": int(correct[p].sum()),
+                "accuracy": float(accuracy[p]),
+                "total_bets": total_bets,
+                "winning_bets": int((bet_pnl > 0).sum()),
+                "roi": float(bet_pnl.sum() / (total_bets * stake_size)) if total_bets else 0.0,
+                "total_profit": float(bet_pnl.sum()),
+                "avg_edge": float(edges.mean()) if total_bets else None,
+                "avg_odds": float(odds.mean()) if total_bets else None,
+                "brier_score": float(brier[p]),
+                "log_loss": float(log_loss[p]) if log_loss is not None else None,
+                "calibration_error": float(calibration[p]),
+                "max_drawdown": _max_drawdown(bet_pnl),
+                "sharpe_ratio": _sharpe_ratio(bet_pnl, stake_size),
+            })
+        results.append(row)
+    return results
+
+
+def _calibration_error(probs: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Mean |predicted - observed| over non-empty tenth bins, per row."""
+    n_params, n_games = probs.shape
+    if not n_games:
+        return np.zeros(n_params)
+    bins = np.floor(probs * CALIBRATION_BINS).astype(np.int64)
+    # Probabilities of exactly 1.0 fall outside every bin, as in BacktestEngine
+    in_range = bins < CALIBRATION_BINS
+    flat = (np.arange(n_params)[:, None] * CALIBRATION_BINS + bins)[in_range]
+    size = n_params * CALIBRATION_BINS
+    counts = np.bincount(flat, minlength=size).reshape(n_params, CALIBRATION_BINS)
+    predicted = np.bincount(flat, weights=probs[in_range], minlength=size).reshape(n_params, CALIBRATION_BINS)
+    observed = np.bincount(
+        flat, weights=np.broadcast_to(actual, probs.shape)[in_range], minlength=size
+    ).reshape(n_params, CALIBRATION_BINS)
+    filled = counts > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        errors = np.abs(predicted - observed) / counts
+    per_row = np.where(filled, errors, 0.0).sum(axis=1)
+    filled_bins = filled.sum(axis=1)
+    return np.divide(per_row, filled_bins, out=np.zeros(n_params), where=filled_bins > 0)
+
+
+def _max_drawdown(bet_pnl: np.ndarray) -> Optional[float]:
+    """Largest fall from a running peak of cumulative profit, peak starting at the first bet."""
+    if not len(bet_pnl):
+        return None
+    cumulative = np.cumsum(bet_pnl)
+    return float(np.max(np.maximum.accumulate(cumulative) - cumulative))
+
+
+def _sharpe_ratio(bet_pnl: np.ndarray, stake: float) -> Optional[float]:
+    """Annualised Sharpe of per-bet returns after the first bet, as in BacktestEngine."""
+    if len(bet_pnl) < 2:
+        return None
+    returns = bet_pnl[1:] / stake
+    std = returns.std()
+    if std == 0:
+        return None
+    return float(returns.mean() / std * np.sqrt(252))
+
+
+def _sweep_chunk(
+    history: GameHistory,
+    params: List[Dict[str, float]],
+    eval_from: int,
+    min_edges: Sequence[float],
+    stake_size: float
+) -> List[List[Dict[str, Any]]]:
+    probs = replay(history, params, eval_from)
+    return score(history, probs, eval_from, min_edges, stake_size)
+
+
+def sweep(
+    history: GameHistory,
+    params: List[Dict[str, float]],
+    start_date: datetime,
+    min_edges: Sequence[float],
+    stake_size: float = 100.0,
+    workers: int = BACKTEST_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate every parameter set and edge threshold on games from ``start_date``.
+
+    Earlier games only train the ratings. With ``workers`` > 1 the
+    parameter sets are split across processes.
+    """
+    start_day = np.datetime64(start_date, "s").astype(np.float64) / 86400.0
+    eval_from = int(np.searchsorted(history.days, start_day, side="left"))
+
+    workers = max(1, min(workers, len(params)))
+    if workers == 1:
+        chunks = [params]
+        metrics = [_sweep_chunk(history, params, eval_from, min_edges, stake_size)]
+    else:
+        size = math.ceil(len(params) / workers)
+        chunks = [params[i:i + size] for i in range(0, len(params), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            metrics = list(pool.map(
+                _sweep_chunk,
+                *zip(*[(history, chunk, eval_from, min_edges, stake_size) for chunk in chunks])
+            ))
+
+    results = []
+    for chunk, chunk_metrics in zip(chunks, metrics):
+        for param_set, by_edge in zip(chunk, chunk_metrics):
+            for min_edge, values in zip(min_edges, by_edge):
+                results.append({"parameters": {**param_set, "min_edge": min_edge}, **values})
+    return results
+
+
+def store_results(
+    db: Session,
+    sport: str,
+    results: List[Dict[str, Any]],
+    start_date: datetime,
+    end_date: datetime,
+    stake_size: float,
+    model_name: str = "AdvancedELO-sweep"
+) -> int:
+    """Insert one BacktestResult per swept combination. Returns rows written."""
+    if not results:
+        return 0
+    created_at = datetime.utcnow()
+    rows = [
+        {
+            "sport": sport,
+            "model_name": model_name,
+            "model_version": "1.0",
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_predictions": r["total_predictions"],
+            "correct_predictions": r["correct_predictions"],
+            "accuracy": r["accuracy"],
+            "total_bets": r["total_bets"],
+            "winning_bets": r["winning_bets"],
+            "roi": r["roi"],
+            "avg_edge": r["avg_edge"],
+            "avg_odds": r["avg_odds"],
+            "brier_score": r["brier_score"],
+            "log_loss": r["log_loss"],
+            "calibration_error": r["calibration_error"],
+            "sharpe_ratio": r["sharpe_ratio"],
+            "max_drawdown": r["max_drawdown"],
+            "parameters": json.dumps({**r["parameters"], "stake_size": stake_size}),
+            "created_at": created_at,
+        }
+        for r in results
+    ]
+    db.execute(insert(BacktestResult), rows, execution_options={"render_nulls": True})
+    db.commit()
+    return len(rows)
+
+
+def run_parameter_sweep(
+    db: Session,
+    sport: str,
+    start_date: datetime,
+    end_date: datetime,
+    min_edges: Sequence[float] = (0.03,),
+    stake_size: float = 100.0,
+    workers: int = BACKTEST_WORKERS,
+    store: bool = True,
+    top: int = 10,
+    **grid: Optional[Sequence[float]]
+) -> Dict[str, Any]:
+    """
+    Walk-forward backtest of a parameter grid for ``sport``.
+
+    ``grid`` takes lists for any of base_k_factor, home_advantage,
+    recency_weight and margin_factor. Returns the ``top`` combinations by
+    ROI and, when ``store`` is set, writes every combination to
+    BacktestResult.
+    """
+    model = ADVANCED_MODEL_REGISTRY.get(sport)
+    if model is None:
+        raise ValueError(f"No model available for sport: {sport}")
+    unknown = set(grid) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    started = time.perf_counter()
+    history = load_history(db, sport, end_date)
+    params = parameter_grid(model, **grid)
+    results = sweep(history, params, start_date, list(min_edges), stake_size, workers)
+    elapsed = time.perf_counter() - started
+
+    stored = store_results(db, sport, results, start_date, end_date, stake_size) if store else 0
+    evaluated = results[0]["total_predictions"] if results else 0
+    logger.info(
+        f"Backtest sweep {sport}: {len(results)} combinations over {evaluated} games in {elapsed:.2f}s"
+    )
+
+    ranked = sorted(results, key=lambda r: r["roi"], reverse=True)[:top]
+    return {
+        "sport": sport,
+        "period": f"{start_date.date()} to {end_date.date()}",
+        "games": len(history),
+        "evaluated_games": evaluated,
+        "combinations": len(results),
+        "stored": stored,
+        "elapsed_seconds": round(elapsed, 3),
+        "top": [
+            {
+                "parameters": r["parameters"],
+                "accuracy": round(r["accuracy"] * 100, 2),
+                "bets_placed": r["total_bets"],
+                "roi": round(r["roi"] * 100, 2),
+                "total_profit": round(r["total_profit"], 2),
+                "brier_score": round(r["brier_score"], 4),
+                "log_loss": round(r["log_loss"], 4) if r["log_loss"] is not None else None,
+                "calibration_error": round(r["calibration_error"], 4),
+                "sharpe_ratio": round(r["sharpe_ratio"], 2) if r["sharpe_ratio"] else None,
+                "max_drawdown": round(r["max_drawdown"], 2) if r["max_drawdown"] else None,
+            }
+            for r in ranked
+        ],
+    }
@@ -44,9 +44,7 @@ class BacktestEngine:
             HistoricalGameResult.game_date < start_date
         ).order_by(HistoricalGameResult.game_date.asc()).all()
         
-        self.model.team_ratings = {}
-        self.model.team_games_played = {}
-        self.model.team_form = {}
+        self.model.reset()
         
         for game in training_games:
             self._process_game_for_training(game)
@@ -234,11 +232,6 @@ class BacktestEngine:
         if game.home_team_id is None or game.away_team_id is None:
             return
         
-        if game.home_team_id not in self.model.team_ratings:
-            self.model.team_ratings[game.home_team_id] = 1500.0
-        if game.away_team_id not in self.model.team_ratings:
-            self.model.team_ratings[game.away_team_id] = 1500.0
-        
         if game.winner == "home":
             self.model.update_rating(
                 game.home_team_id,
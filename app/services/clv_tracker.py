@@ -8,7 +8,7 @@ and provides model calibration metrics.
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_
 
 from app.db import (
     Game, Market, Line, OddsSnapshot, TrackedBet,
@@ -60,10 +60,12 @@ def get_closing_line(
     if not game:
         return None
 
-    # Get the last odds snapshot before game start
+    # Get the last odds snapshot of this side before game start
+    # (snapshots captured before selections were stored have none)
     query = db.query(OddsSnapshot).filter(
         OddsSnapshot.game_id == game_id,
         OddsSnapshot.market_type == market_type,
+        or_(OddsSnapshot.selection == selection, OddsSnapshot.selection.is_(None)),
         OddsSnapshot.captured_at < game.start_time
     )
 
@@ -129,6 +131,7 @@ def capture_closing_lines(db: Session, hours_before: float = 0.5) -> Dict[str, A
                     OddsSnapshot.game_id == game.id,
                     OddsSnapshot.market_type == market.market_type,
                     OddsSnapshot.sportsbook == line.sportsbook,
+                    OddsSnapshot.selection == market.selection,
                     OddsSnapshot.captured_at > now - timedelta(minutes=30)
                 ).first()
 
@@ -137,6 +140,7 @@ def capture_closing_lines(db: Session, hours_before: float = 0.5) -> Dict[str, A
                         game_id=game.id,
                         market_type=market.market_type,
                         sportsbook=line.sportsbook,
+                        selection=market.selection,
                         odds=line.american_odds,
                         line_value=line.line_value,
                         captured_at=now
@@ -214,6 +214,16 @@ def start_schedulers():
         run_every_minutes(15, snapshot_lines_task, "Line Movement Snapshot")
     )
 
+    # Roll raw odds snapshots up into hourly OHLC buckets
+    _scheduled_tasks["odds_rollups"] = asyncio.create_task(
+        run_every_minutes(60, rollup_odds_task, "Odds Hourly Rollup")
+    )
+
+    # Compact raw odds snapshots past the retention window at 4 AM daily
+    _scheduled_tasks["odds_retention"] = asyncio.create_task(
+        run_daily_at(4, 0, compact_odds_task, "Odds Snapshot Retention")
+    )
+
     # Track opening lines once per hour (for new games)
     _scheduled_tasks["opening_lines"] = asyncio.create_task(
         run_every_minutes(60, track_opening_lines_task, "Opening Lines Tracker")
@@ -450,15 +460,26 @@ async def snapshot_lines_task():
     """
     Task to snapshot current lines for all upcoming games.
     Tracks line movement for steam move and RLM detection.
+
+    Sports are fetched concurrently and stored one batch at a time by a
+    single bulk writer (see odds_scheduler.run_sport_refresh).
     """
     from app.db import SessionLocal, Game
-    from app.services.odds_api import fetch_and_store_odds, is_odds_api_configured
+    from app.services.odds_api import store_odds_bulk, is_odds_api_configured
+    from app.services.odds_scheduler import run_sport_refresh
     from datetime import datetime, timedelta
 
     if not is_odds_api_configured():
         logger.warning("Odds API not configured, skipping line snapshot")
         return {"error": "Odds API not configured"}
 
+    def store(sport, odds_data):
+        session = SessionLocal()
+        try:
+            return {"games": store_odds_bulk(session, sport, odds_data)}
+        finally:
+            session.close()
+
     db = SessionLocal()
     try:
         # Get upcoming games (next 7 days)
@@ -466,29 +487,34 @@ async def snapshot_lines_task():
         upcoming_games = db.query(Game).filter(
             Game.start_time >= datetime.utcnow(),
             Game.start_time <= cutoff
-        ).all()
+        ).count()
 
-        logger.info(f"Snapshotting lines for {len(upcoming_games)} upcoming games")
+        logger.info(f"Snapshotting lines for {upcoming_games} upcoming games")
 
         # Fetch and store odds for all major sports
         sports_to_refresh = ["NBA", "NFL", "NCAA_BASKETBALL", "NHL", "MLB", "SOCCER"]
+        sport_results = await run_sport_refresh(sports_to_refresh, store)
         results = {}
         total_updated = 0
 
-        for sport in sports_to_refresh:
-            try:
-                count = await fetch_and_store_odds(db, sport)
-                results[sport] = count
-                total_updated += count
-                logger.info(f"  {sport}: {count} games updated")
-            except Exception as e:
-                logger.error(f"  Error refreshing {sport}: {e}")
-                results[sport] = f"error: {str(e)}"
+        for sport, result in sport_results.items():
+            if result["status"] == "error":
+                logger.error(f"  Error refreshing {sport}: {result.get('error')}")
+                results[sport] = f"error: {result.get('error')}"
+                continue
+            count = result.get("games", 0)
+            results[sport] = count
+            total_updated += count
+            logger.info(f"  {sport}: {count} games updated")
 
         return {
-            "games_checked": len(upcoming_games),
+            "games_checked": upcoming_games,
             "total_updated": total_updated,
-            "by_sport": results
+            "by_sport": results,
+            "timings": {
+                sport: {k: result[k] for k in ("fetch_ms", "write_ms") if k in result}
+                for sport, result in sport_results.items()
+            },
         }
     except Exception as e:
         logger.error(f"Error snapshotting lines: {e}")
@@ -497,6 +523,37 @@ async def snapshot_lines_task():
         db.close()
 
 
+async def rollup_odds_task():
+    """Task to build hourly OHLC rollups for recent odds snapshots."""
+    from app.db import SessionLocal
+    from app.services.odds_timeseries import rollup_hourly, ensure_snapshot_partitions
+
+    db = SessionLocal()
+    try:
+        partitions = ensure_snapshot_partitions(db)
+        return {"buckets": rollup_hourly(db), "partitions": len(partitions)}
+    except Exception as e:
+        logger.error(f"Error rolling up odds snapshots: {e}")
+        return {"error": str(e)}
+    finally:
+        db.close()
+
+
+async def compact_odds_task():
+    """Task to roll up and delete raw odds snapshots past the retention window."""
+    from app.db import SessionLocal
+    from app.services.odds_timeseries import compact_snapshots
+
+    db = SessionLocal()
+    try:
+        return compact_snapshots(db)
+    except Exception as e:
+        logger.error(f"Error compacting odds snapshots: {e}")
+        return {"error": str(e)}
+    finally:
+        db.close()
+
+
 async def track_opening_lines_task():
     """
     Task to capture opening lines for new games.
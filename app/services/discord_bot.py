@@ -5,7 +5,6 @@ Provides Discord webhook delivery, slash commands, and rich embedded messages.
 """
 
 import os
-import httpx
 import secrets
 import json
 from typing import Optional, Dict, Any, List
@@ -16,6 +15,7 @@ from nacl.exceptions import BadSignatureError
 
 from app.db import User, DiscordUser, DiscordLinkCode, DiscordWebhook
 from app.utils.logging import get_logger
+from app.utils.http_client import http_clients
 
 logger = get_logger(__name__)
 
@@ -498,12 +498,12 @@ async def send_webhook_message(
         payload["embeds"] = embeds[:10]  # Discord limit
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
+        response = await http_clients.post(
+            "discord",
+            webhook_url,
+            json=payload,
+            headers={"Content-Type": "application/json"}
+        )
 
         if response.status_code in (200, 204):
             return True
@@ -521,39 +521,40 @@ async def send_dm(discord_user_id: str, content: str = None, embeds: List[Dict]
         return False
 
     try:
-        async with httpx.AsyncClient() as client:
-            # First, create a DM channel
-            dm_response = await client.post(
-                f"{DISCORD_API_BASE}/users/@me/channels",
-                json={"recipient_id": discord_user_id},
-                headers={
-                    "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-                    "Content-Type": "application/json"
-                }
-            )
-
-            if dm_response.status_code != 200:
-                return False
-
-            channel_id = dm_response.json().get("id")
-
-            # Send message to DM channel
-            payload = {}
-            if content:
-                payload["content"] = content
-            if embeds:
-                payload["embeds"] = embeds
-
-            msg_response = await client.post(
-                f"{DISCORD_API_BASE}/channels/{channel_id}/messages",
-                json=payload,
-                headers={
-                    "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-                    "Content-Type": "application/json"
-                }
-            )
+        # First, create a DM channel
+        dm_response = await http_clients.post(
+            "discord",
+            f"{DISCORD_API_BASE}/users/@me/channels",
+            json={"recipient_id": discord_user_id},
+            headers={
+                "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
+                "Content-Type": "application/json"
+            }
+        )
+
+        if dm_response.status_code != 200:
+            return False
+
+        channel_id = dm_response.json().get("id")
+
+        # Send message to DM channel
+        payload = {}
+        if content:
+            payload["content"] = content
+        if embeds:
+            payload["embeds"] = embeds
+
+        msg_response = await http_clients.post(
+            "discord",
+            f"{DISCORD_API_BASE}/channels/{channel_id}/messages",
+            json=payload,
+            headers={
+                "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
+                "Content-Type": "application/json"
+            }
+        )
 
-            return msg_response.status_code == 200
+        return msg_response.status_code == 200
     except Exception as e:
         logger.error(f"Discord DM error: {e}")
         return False
@@ -888,29 +889,30 @@ async def register_slash_commands(guild_id: Optional[str] = None) -> bool:
     ]
 
     try:
-        async with httpx.AsyncClient() as client:
-            if guild_id:
-                # Guild-specific commands (instant)
-                url = f"{DISCORD_API_BASE}/applications/{DISCORD_CLIENT_ID}/guilds/{guild_id}/commands"
-            else:
-                # Global commands (can take up to 1 hour to propagate)
-                url = f"{DISCORD_API_BASE}/applications/{DISCORD_CLIENT_ID}/commands"
-
-            response = await client.put(
-                url,
-                json=commands,
-                headers={
-                    "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-                    "Content-Type": "application/json"
-                }
-            )
-
-            if response.status_code == 200:
-                logger.info(f"Discord slash commands registered successfully")
-                return True
-            else:
-                logger.error(f"Failed to register Discord commands: {response.status_code} - {response.text}")
-                return False
+        if guild_id:
+            # Guild-specific commands (instant)
+            url = f"{DISCORD_API_BASE}/applications/{DISCORD_CLIENT_ID}/guilds/{guild_id}/commands"
+        else:
+            # Global commands (can take up to 1 hour to propagate)
+            url = f"{DISCORD_API_BASE}/applications/{DISCORD_CLIENT_ID}/commands"
+
+        response = await http_clients.request(
+            "discord",
+            "PUT",
+            url,
+            json=commands,
+            headers={
+                "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
+                "Content-Type": "application/json"
+            }
+        )
+
+        if response.status_code == 200:
+            logger.info(f"Discord slash commands registered successfully")
+            return True
+        else:
+            logger.error(f"Failed to register Discord commands: {response.status_code} - {response.text}")
+            return False
     except Exception as e:
         logger.error(f"Error registering Discord commands: {e}")
         return False
@@ -5,16 +5,26 @@ The BRAIN that combines all edge factors into unified predictions.
 Weighs each factor by reliability and historical predictiveness.
 """
 
+import asyncio
 import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, joinedload
 
 from app.db import (
-    Game, UnifiedPrediction, Coach, CoachSituationalRecord,
+    Game, Team, UnifiedPrediction, Coach, CoachSituationalRecord,
     Official, LineMovementSummary, GameSituation, GameWeather,
     SocialSentiment, PublicBettingData
 )
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 # Edge factor weights - tuned based on historical predictiveness
@@ -29,6 +39,15 @@ EDGE_WEIGHTS = {
     "social_sentiment": 0.05,   # Soft signal
 }
 
+# Per-factor time budget (seconds) before falling back to a neutral factor
+FACTOR_TIMEOUT_SECONDS = float(os.environ.get("EDGE_FACTOR_TIMEOUT_SECONDS", "3.0"))
+FACTOR_TIMEOUTS = {
+    "situational": FACTOR_TIMEOUT_SECONDS * 2,  # May lazy-load rest/travel from upstream APIs
+}
+
+# Worker threads for blocking factor queries (each task gets its own session)
+EDGE_FACTOR_WORKERS = int(os.environ.get("EDGE_FACTOR_WORKERS", "16"))
+
 # Confidence thresholds
 CONFIDENCE_THRESHOLDS = {
     "VERY_HIGH": 0.75,
@@ -76,6 +95,32 @@ async def get_unified_prediction(
     # The API might receive an external_id, but the DB relationships use internal id
     game_id = game.id
 
+    home_team, away_team = _team_names(game)
+    sport = game.sport or "NFL"
+
+    # Run all independent factors concurrently, each with its own timeout
+    factors, factor_timings = await run_edge_factors({
+        "line_movement": (_get_line_movement_edge, (game_id,)),
+        "coach_dna": (_get_coach_dna_edge, (home_team, away_team, sport)),
+        "situational": (_get_situational_edge, (game_id, home_team, away_team, sport)),
+        "weather": (_get_weather_edge, (game_id, sport)),
+        "officials": (_get_officials_edge, (game_id, sport)),
+        "public_fade": (_get_public_fade_edge, (game_id,)),
+        "historical_elo": (_get_elo_edge, (home_team, away_team, sport)),
+        "social_sentiment": (_get_social_sentiment_edge, (home_team, away_team, sport)),
+    }, db)
+
+    result = _build_prediction_result(game, home_team, away_team, factors, market_type)
+    result["factor_timings"] = factor_timings
+
+    # Store prediction
+    await _store_prediction(game_id, result, db)
+
+    return result
+
+
+def _team_names(game: Game) -> Tuple[str, str]:
+    """Home and away team names, with placeholders when teams are missing."""
     # Handle both relationship objects and string names
     # game.home_team could be a Team object (relationship) or None
     if game.home_team and hasattr(game.home_team, 'name'):
@@ -88,35 +133,17 @@ async def get_unified_prediction(
     else:
         away_team = "Away"
 
-    sport = game.sport or "NFL"
-
-    # Initialize factors dictionary
-    factors = {}
-
-    # 1. Line Movement Analysis
-    factors["line_movement"] = await _get_line_movement_edge(game_id, db)
-
-    # 2. Coach DNA Analysis
-    factors["coach_dna"] = await _get_coach_dna_edge(home_team, away_team, sport, db)
+    return home_team, away_team
 
-    # 3. Situational Analysis
-    factors["situational"] = await _get_situational_edge(game_id, home_team, away_team, sport, db)
-
-    # 4. Weather Analysis
-    factors["weather"] = await _get_weather_edge(game_id, sport, db)
-
-    # 5. Officials Analysis
-    factors["officials"] = await _get_officials_edge(game_id, sport, db)
-
-    # 6. Public Fade Analysis
-    factors["public_fade"] = await _get_public_fade_edge(game_id, db)
-
-    # 7. Historical ELO Analysis
-    factors["historical_elo"] = await _get_elo_edge(home_team, away_team, sport, db)
-
-    # 8. Social Sentiment Analysis
-    factors["social_sentiment"] = await _get_social_sentiment_edge(home_team, away_team, sport, db)
 
+def _build_prediction_result(
+    game: Game,
+    home_team: str,
+    away_team: str,
+    factors: Dict[str, Dict],
+    market_type: str
+) -> Dict[str, Any]:
+    """Weigh computed factors and build the unified prediction response."""
     # Calculate weighted edges
     weighted_factors = _calculate_weighted_factors(factors)
 
@@ -141,10 +168,10 @@ async def get_unified_prediction(
         away_team
     )
 
-    result = {
-        "game_id": game_id,
+    return {
+        "game_id": game.id,
         "game": f"{away_team} @ {home_team}",
-        "sport": sport,
+        "sport": game.sport or "NFL",
         "market": market_type,
         "game_time": game.start_time.isoformat() if game.start_time else None,
         "factors": weighted_factors,
@@ -153,18 +180,117 @@ async def get_unified_prediction(
         "explanation": explanation
     }
 
-    # Store prediction
-    await _store_prediction(game_id, result, db)
 
-    return result
+FactorCall = Tuple[Callable[..., Any], tuple]
 
+_factor_executor = ThreadPoolExecutor(max_workers=EDGE_FACTOR_WORKERS, thread_name_prefix="edge-factor")
+_factor_stats: Dict[str, Dict[str, float]] = {}
+_factor_stats_lock = threading.Lock()
 
-async def _get_line_movement_edge(game_id: int, db: Session) -> Dict[str, Any]:
-    """Get edge from line movement analysis."""
-    summary = db.query(LineMovementSummary).filter(
-        LineMovementSummary.game_id == game_id
-    ).first()
 
+def _neutral_factor(name: str, signal: str) -> Dict[str, Any]:
+    """Fallback value for a factor that failed or ran out of time."""
+    return {
+        "edge": 0.0,
+        "direction": "neutral",
+        "signal": signal,
+        "weight": EDGE_WEIGHTS[name]
+    }
+
+
+def _call_factor_in_session(bind: Any, factor_fn: Callable[..., Any], args: tuple) -> Dict[str, Any]:
+    """Run one factor coroutine on a worker thread with its own session."""
+    session = Session(bind=bind, autoflush=False)
+    try:
+        return asyncio.run(factor_fn(*args, db=session))
+    finally:
+        session.close()
+
+
+def _record_factor_latency(name: str, latency_ms: float, status: str) -> None:
+    with _factor_stats_lock:
+        stats = _factor_stats.setdefault(name, {
+            "calls": 0, "timeouts": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0
+        })
+        stats["calls"] += 1
+        stats["total_ms"] += latency_ms
+        stats["max_ms"] = max(stats["max_ms"], latency_ms)
+        if status == "timeout":
+            stats["timeouts"] += 1
+        elif status == "error":
+            stats["errors"] += 1
+
+
+def get_factor_stats() -> Dict[str, Dict[str, float]]:
+    """Get cumulative latency, timeout and error counts per factor."""
+    with _factor_stats_lock:
+        return {
+            name: {
+                **stats,
+                "avg_ms": round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0,
+                "total_ms": round(stats["total_ms"], 2),
+                "max_ms": round(stats["max_ms"], 2),
+            }
+            for name, stats in _factor_stats.items()
+        }
+
+
+async def _run_factor(name: str, call: FactorCall, bind: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run a single factor under its timeout, falling back to a neutral value."""
+    factor_fn, args = call
+    timeout = FACTOR_TIMEOUTS.get(name, FACTOR_TIMEOUT_SECONDS)
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+
+    try:
+        result = await asyncio.wait_for(
+            loop.run_in_executor(_factor_executor, _call_factor_in_session, bind, factor_fn, args),
+            timeout=timeout
+        )
+        status = "ok"
+    except asyncio.TimeoutError:
+        logger.warning(f"Edge factor {name} timed out after {timeout}s")
+        result = _neutral_factor(name, "Factor timed out - no data used")
+        status = "timeout"
+    except Exception as e:
+        logger.warning(f"Edge factor {name} failed: {e}")
+        result = _neutral_factor(name, "Factor unavailable - no data used")
+        status = "error"
+
+    latency_ms = (time.perf_counter() - start) * 1000
+    _record_factor_latency(name, latency_ms, status)
+    return result, {"latency_ms": round(latency_ms, 2), "status": status}
+
+
+async def run_edge_factors(
+    calls: Dict[str, FactorCall],
+    db: Session
+) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Run independent edge factors concurrently.
+
+    Each factor runs on the factor thread pool with a session bound to the
+    same engine as ``db`` and its own timeout, so one slow source only
+    costs its own fallback value.
+
+    Returns:
+        Tuple of (factors, timings) keyed by factor name in call order
+    """
+    bind = db.get_bind()
+    outcomes = await asyncio.gather(*(
+        _run_factor(name, call, bind) for name, call in calls.items()
+    ))
+
+    factors = {}
+    timings = {}
+    for name, (result, timing) in zip(calls, outcomes):
+        factors[name] = result
+        timings[name] = timing
+    return factors, timings
+
+
+def _line_movement_factor(summary: Optional[LineMovementSummary]) -> Dict[str, Any]:
+    """Line movement edge from a game's movement summary."""
     if summary and summary.reverse_line_movement:
         # RLM detected - sharp money indicator
         edge = 3.5  # Fixed edge for RLM signal
@@ -192,39 +318,28 @@ async def _get_line_movement_edge(game_id: int, db: Session) -> Dict[str, Any]:
     }
 
 
-async def _get_coach_dna_edge(
-    home_team: str,
-    away_team: str,
-    sport: str,
-    db: Session
-) -> Dict[str, Any]:
-    """Get edge from coach situational records."""
-    # Ensure home_team and away_team are strings
-    home_team_name = str(home_team) if home_team else ""
-    away_team_name = str(away_team) if away_team else ""
-
-    # Find coaches for these teams
-    home_coach = db.query(Coach).filter(
-        Coach.current_team == home_team_name,
-        Coach.sport == sport
+async def _get_line_movement_edge(game_id: int, db: Session) -> Dict[str, Any]:
+    """Get edge from line movement analysis."""
+    summary = db.query(LineMovementSummary).filter(
+        LineMovementSummary.game_id == game_id
     ).first()
 
-    away_coach = db.query(Coach).filter(
-        Coach.current_team == away_team_name,
-        Coach.sport == sport
-    ).first()
+    return _line_movement_factor(summary)
 
+
+def _coach_dna_factor(
+    home_coach: Optional[Coach],
+    home_records: List[CoachSituationalRecord],
+    away_coach: Optional[Coach],
+    away_records: List[CoachSituationalRecord]
+) -> Dict[str, Any]:
+    """Coach DNA edge from both coaches' situational records."""
     edge = 0.0
     direction = "neutral"
     signal = "No coach DNA data available"
 
     if home_coach:
-        # Check situational records
-        records = db.query(CoachSituationalRecord).filter(
-            CoachSituationalRecord.coach_id == home_coach.id
-        ).all()
-
-        for record in records:
+        for record in home_records:
             if record.total_games >= 10:
                 win_pct = record.ats_wins / record.total_games if record.total_games > 0 else 0.5
                 if win_pct > 0.55:
@@ -233,11 +348,7 @@ async def _get_coach_dna_edge(
                     direction = "home"
 
     if away_coach:
-        records = db.query(CoachSituationalRecord).filter(
-            CoachSituationalRecord.coach_id == away_coach.id
-        ).all()
-
-        for record in records:
+        for record in away_records:
             if record.total_games >= 10:
                 win_pct = record.ats_wins / record.total_games if record.total_games > 0 else 0.5
                 if win_pct > 0.55:
@@ -260,27 +371,40 @@ async def _get_coach_dna_edge(
     }
 
 
-async def _get_situational_edge(
-    game_id: int,
+async def _get_coach_dna_edge(
     home_team: str,
     away_team: str,
     sport: str,
     db: Session
 ) -> Dict[str, Any]:
-    """Get edge from situational factors (rest, travel, motivation)."""
-    situation = db.query(GameSituation).filter(
-        GameSituation.game_id == game_id
+    """Get edge from coach situational records."""
+    # Ensure home_team and away_team are strings
+    home_team_name = str(home_team) if home_team else ""
+    away_team_name = str(away_team) if away_team else ""
+
+    # Find coaches for these teams
+    home_coach = db.query(Coach).filter(
+        Coach.current_team == home_team_name,
+        Coach.sport == sport
     ).first()
 
-    # Lazy load if missing
-    if not situation:
-        try:
-            from app.services.situations import analyze_game_situation
-            situation = await analyze_game_situation(db, game_id)
-        except Exception as e:
-            # logger.warning(f"Failed to lazy load situation for game {game_id}: {e}")
-            pass
+    away_coach = db.query(Coach).filter(
+        Coach.current_team == away_team_name,
+        Coach.sport == sport
+    ).first()
+
+    def records_for(coach: Optional[Coach]) -> List[CoachSituationalRecord]:
+        if not coach:
+            return []
+        return db.query(CoachSituationalRecord).filter(
+            CoachSituationalRecord.coach_id == coach.id
+        ).all()
 
+    return _coach_dna_factor(home_coach, records_for(home_coach), away_coach, records_for(away_coach))
+
+
+def _situational_factor(situation: Optional[GameSituation]) -> Dict[str, Any]:
+    """Situational edge (rest, travel, motivation) from a game situation."""
     if situation:
         edge = situation.total_situation_edge or 0
 
@@ -310,12 +434,32 @@ async def _get_situational_edge(
     }
 
 
-async def _get_weather_edge(game_id: int, sport: str, db: Session) -> Dict[str, Any]:
-    """Get edge from weather analysis."""
-    weather = db.query(GameWeather).filter(
-        GameWeather.game_id == game_id
+async def _get_situational_edge(
+    game_id: int,
+    home_team: str,
+    away_team: str,
+    sport: str,
+    db: Session
+) -> Dict[str, Any]:
+    """Get edge from situational factors (rest, travel, motivation)."""
+    situation = db.query(GameSituation).filter(
+        GameSituation.game_id == game_id
     ).first()
 
+    # Lazy load if missing
+    if not situation:
+        try:
+            from app.services.situations import analyze_game_situation
+            situation = await analyze_game_situation(db, game_id)
+        except Exception as e:
+            # logger.warning(f"Failed to lazy load situation for game {game_id}: {e}")
+            pass
+
+    return _situational_factor(situation)
+
+
+def _weather_factor(weather: Optional[GameWeather]) -> Dict[str, Any]:
+    """Weather edge from a game's forecast."""
     if weather:
         edge = 0.0
         signals = []
@@ -349,13 +493,17 @@ async def _get_weather_edge(game_id: int, sport: str, db: Session) -> Dict[str,
     }
 
 
-async def _get_officials_edge(game_id: int, sport: str, db: Session) -> Dict[str, Any]:
-    """Get edge from official/referee tendencies."""
-    # Look up assigned official from database
-    official = db.query(Official).filter(
-        Official.sport == sport
+async def _get_weather_edge(game_id: int, sport: str, db: Session) -> Dict[str, Any]:
+    """Get edge from weather analysis."""
+    weather = db.query(GameWeather).filter(
+        GameWeather.game_id == game_id
     ).first()
 
+    return _weather_factor(weather)
+
+
+def _officials_factor(official: Optional[Official]) -> Dict[str, Any]:
+    """Officials edge from a referee's over/under tendency."""
     if official and official.over_under_tendency:
         edge = abs(official.over_under_tendency)
         direction = "over" if official.over_under_tendency > 0 else "under"
@@ -374,12 +522,18 @@ async def _get_officials_edge(game_id: int, sport: str, db: Session) -> Dict[str
     }
 
 
-async def _get_public_fade_edge(game_id: int, db: Session) -> Dict[str, Any]:
-    """Get edge from fading public betting."""
-    public_data = db.query(PublicBettingData).filter(
-        PublicBettingData.game_id == game_id
+async def _get_officials_edge(game_id: int, sport: str, db: Session) -> Dict[str, Any]:
+    """Get edge from official/referee tendencies."""
+    # Look up assigned official from database
+    official = db.query(Official).filter(
+        Official.sport == sport
     ).first()
 
+    return _officials_factor(official)
+
+
+def _public_fade_factor(public_data: Optional[PublicBettingData]) -> Dict[str, Any]:
+    """Contrarian edge from public betting splits."""
     if public_data:
         home_pct = public_data.spread_bet_pct_home or 50
 
@@ -417,13 +571,17 @@ async def _get_public_fade_edge(game_id: int, db: Session) -> Dict[str, Any]:
     }
 
 
-async def _get_elo_edge(home_team: str, away_team: str, sport: str, db: Session) -> Dict[str, Any]:
-    """Get edge from historical ELO ratings."""
-    from app.db import Team
+async def _get_public_fade_edge(game_id: int, db: Session) -> Dict[str, Any]:
+    """Get edge from fading public betting."""
+    public_data = db.query(PublicBettingData).filter(
+        PublicBettingData.game_id == game_id
+    ).first()
+
+    return _public_fade_factor(public_data)
 
-    home = db.query(Team).filter(Team.name == home_team, Team.sport == sport).first()
-    away = db.query(Team).filter(Team.name == away_team, Team.sport == sport).first()
 
+def _elo_factor(home_team: str, away_team: str, home: Optional[Team], away: Optional[Team]) -> Dict[str, Any]:
+    """ELO edge from both teams' power ratings."""
     if home and away and home.rating and away.rating:
         elo_diff = home.rating - away.rating
         # Convert ELO difference to edge
@@ -444,23 +602,21 @@ async def _get_elo_edge(home_team: str, away_team: str, sport: str, db: Session)
     }
 
 
-async def _get_social_sentiment_edge(
+async def _get_elo_edge(home_team: str, away_team: str, sport: str, db: Session) -> Dict[str, Any]:
+    """Get edge from historical ELO ratings."""
+    home = db.query(Team).filter(Team.name == home_team, Team.sport == sport).first()
+    away = db.query(Team).filter(Team.name == away_team, Team.sport == sport).first()
+
+    return _elo_factor(home_team, away_team, home, away)
+
+
+def _social_sentiment_factor(
     home_team: str,
     away_team: str,
-    sport: str,
-    db: Session
+    home_sentiment: Optional[SocialSentiment],
+    away_sentiment: Optional[SocialSentiment]
 ) -> Dict[str, Any]:
-    """Get edge from social sentiment analysis."""
-    home_sentiment = db.query(SocialSentiment).filter(
-        SocialSentiment.team_name == home_team,
-        SocialSentiment.sport == sport
-    ).order_by(SocialSentiment.timestamp.desc()).first()
-
-    away_sentiment = db.query(SocialSentiment).filter(
-        SocialSentiment.team_name == away_team,
-        SocialSentiment.sport == sport
-    ).order_by(SocialSentiment.timestamp.desc()).first()
-
+    """Contrarian edge from each team's latest social sentiment."""
     if home_sentiment and away_sentiment:
         # If one team is heavily hyped, fade them
         home_bullish = home_sentiment.bullish_percentage or 50
@@ -492,6 +648,26 @@ async def _get_social_sentiment_edge(
     }
 
 
+async def _get_social_sentiment_edge(
+    home_team: str,
+    away_team: str,
+    sport: str,
+    db: Session
+) -> Dict[str, Any]:
+    """Get edge from social sentiment analysis."""
+    home_sentiment = db.query(SocialSentiment).filter(
+        SocialSentiment.team_name == home_team,
+        SocialSentiment.sport == sport
+    ).order_by(SocialSentiment.timestamp.desc()).first()
+
+    away_sentiment = db.query(SocialSentiment).filter(
+        SocialSentiment.team_name == away_team,
+        SocialSentiment.sport == sport
+    ).order_by(SocialSentiment.timestamp.desc()).first()
+
+    return _social_sentiment_factor(home_team, away_team, home_sentiment, away_sentiment)
+
+
 def _calculate_weighted_factors(factors: Dict[str, Dict]) -> Dict[str, Dict]:
     """Calculate weighted contribution of each factor."""
     for key, factor in factors.items():
@@ -707,16 +883,72 @@ def _generate_explanation(
     return explanation
 
 
+# Factors persisted on UnifiedPrediction as <name>_edge/_direction/_signal
+STORED_FACTORS = ["line_movement", "coach_dna", "situational", "weather", "officials", "public_fade"]
+
+
+def _prediction_values(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for a UnifiedPrediction row from a prediction result."""
+    factors = result.get("factors", {})
+    prediction = result.get("prediction", {})
+    analysis = result.get("analysis", {})
+
+    values = {}
+    for name in STORED_FACTORS:
+        factor = factors.get(name, {})
+        values[f"{name}_edge"] = factor.get("edge")
+        values[f"{name}_direction"] = factor.get("direction")
+        values[f"{name}_signal"] = factor.get("signal")
+
+    values.update(
+        confirming_factors=analysis.get("confirming_factors"),
+        conflicting_factors=analysis.get("conflicting_factors"),
+        alignment_score=analysis.get("alignment_score"),
+        predicted_side=prediction.get("side"),
+        raw_edge=prediction.get("raw_edge_value"),
+        confidence=prediction.get("confidence"),
+        confidence_label=prediction.get("confidence_label"),
+        recommendation=prediction.get("recommendation"),
+        star_rating=prediction.get("star_rating"),
+        explanation=result.get("explanation")
+    )
+    return values
+
+
+def _new_prediction_row(game: Optional[Game], game_id: int, result: Dict[str, Any]) -> UnifiedPrediction:
+    """Build a new UnifiedPrediction row for a game."""
+    # Extract team names from relationship objects
+    home_team_name = ""
+    away_team_name = ""
+    if game:
+        if game.home_team and hasattr(game.home_team, 'name'):
+            home_team_name = game.home_team.name
+        if game.away_team and hasattr(game.away_team, 'name'):
+            away_team_name = game.away_team.name
+
+    return UnifiedPrediction(
+        game_id=game_id,
+        sport=game.sport if game else "NFL",
+        home_team=home_team_name,
+        away_team=away_team_name,
+        game_date=game.start_time if game else datetime.utcnow(),
+        market_type=result.get("market", "spread"),
+        **_prediction_values(result)
+    )
+
+
+def _update_prediction_row(existing: UnifiedPrediction, result: Dict[str, Any]) -> None:
+    for column, value in _prediction_values(result).items():
+        setattr(existing, column, value)
+    existing.updated_at = datetime.utcnow()
+
+
 async def _store_prediction(
     game_id: int,
     result: Dict[str, Any],
     db: Session
 ) -> None:
     """Store the unified prediction in the database."""
-    factors = result.get("factors", {})
-    prediction = result.get("prediction", {})
-    analysis = result.get("analysis", {})
-
     # Check for existing prediction
     existing = db.query(UnifiedPrediction).filter(
         UnifiedPrediction.game_id == game_id,
@@ -724,106 +956,193 @@ async def _store_prediction(
     ).first()
 
     if existing:
-        # Update existing
-        existing.line_movement_edge = factors.get("line_movement", {}).get("edge")
-        existing.line_movement_direction = factors.get("line_movement", {}).get("direction")
-        existing.line_movement_signal = factors.get("line_movement", {}).get("signal")
-
-        existing.coach_dna_edge = factors.get("coach_dna", {}).get("edge")
-        existing.coach_dna_direction = factors.get("coach_dna", {}).get("direction")
-        existing.coach_dna_signal = factors.get("coach_dna", {}).get("signal")
-
-        existing.situational_edge = factors.get("situational", {}).get("edge")
-        existing.situational_direction = factors.get("situational", {}).get("direction")
-        existing.situational_signal = factors.get("situational", {}).get("signal")
-
-        existing.weather_edge = factors.get("weather", {}).get("edge")
-        existing.weather_direction = factors.get("weather", {}).get("direction")
-        existing.weather_signal = factors.get("weather", {}).get("signal")
-
-        existing.officials_edge = factors.get("officials", {}).get("edge")
-        existing.officials_direction = factors.get("officials", {}).get("direction")
-        existing.officials_signal = factors.get("officials", {}).get("signal")
-
-        existing.public_fade_edge = factors.get("public_fade", {}).get("edge")
-        existing.public_fade_direction = factors.get("public_fade", {}).get("direction")
-        existing.public_fade_signal = factors.get("public_fade", {}).get("signal")
-
-        existing.confirming_factors = analysis.get("confirming_factors")
-        existing.conflicting_factors = analysis.get("conflicting_factors")
-        existing.alignment_score = analysis.get("alignment_score")
-
-        existing.predicted_side = prediction.get("side")
-        existing.raw_edge = prediction.get("raw_edge_value")
-        existing.confidence = prediction.get("confidence")
-        existing.confidence_label = prediction.get("confidence_label")
-        existing.recommendation = prediction.get("recommendation")
-        existing.star_rating = prediction.get("star_rating")
-        existing.explanation = result.get("explanation")
-
-        existing.updated_at = datetime.utcnow()
+        _update_prediction_row(existing, result)
     else:
-        # Create new
         game = db.query(Game).filter(Game.id == game_id).first()
+        db.add(_new_prediction_row(game, game_id, result))
+
+    db.commit()
+
+
+@dataclass
+class SlateInputs:
+    """Every factor input for a slate of games, keyed for in-memory lookup."""
+    summaries: Dict[int, LineMovementSummary] = field(default_factory=dict)
+    situations: Dict[int, GameSituation] = field(default_factory=dict)
+    weather: Dict[int, GameWeather] = field(default_factory=dict)
+    public_betting: Dict[int, PublicBettingData] = field(default_factory=dict)
+    coaches: Dict[Tuple[str, str], Coach] = field(default_factory=dict)
+    coach_records: Dict[int, List[CoachSituationalRecord]] = field(default_factory=dict)
+    officials: Dict[str, Official] = field(default_factory=dict)
+    teams: Dict[Tuple[str, str], Team] = field(default_factory=dict)
+    sentiment: Dict[Tuple[str, str], SocialSentiment] = field(default_factory=dict)
+
+
+def _load_slate_inputs(games: List[Game], db: Session) -> SlateInputs:
+    """
+    Load all factor inputs for a slate with one IN (...) query per source.
+
+    Where the per-game lookups take ``.first()``, the lowest id (or the
+    latest timestamp for sentiment) wins.
+    """
+    inputs = SlateInputs()
+    if not games:
+        return inputs
+
+    game_ids = [g.id for g in games]
+    sports = {g.sport or "NFL" for g in games}
+    team_names = set()
+    for game in games:
+        team_names.update(_team_names(game))
+
+    def first_by(rows, key):
+        keyed = {}
+        for row in rows:
+            keyed.setdefault(key(row), row)
+        return keyed
+
+    inputs.summaries = first_by(
+        db.query(LineMovementSummary).filter(LineMovementSummary.game_id.in_(game_ids))
+        .order_by(LineMovementSummary.id).all(),
+        lambda r: r.game_id
+    )
+    inputs.situations = first_by(
+        db.query(GameSituation).filter(GameSituation.game_id.in_(game_ids))
+        .order_by(GameSituation.id).all(),
+        lambda r: r.game_id
+    )
+    inputs.weather = first_by(
+        db.query(GameWeather).filter(GameWeather.game_id.in_(game_ids))
+        .order_by(GameWeather.id).all(),
+        lambda r: r.game_id
+    )
+    inputs.public_betting = first_by(
+        db.query(PublicBettingData).filter(PublicBettingData.game_id.in_(game_ids))
+        .order_by(PublicBettingData.id).all(),
+        lambda r: r.game_id
+    )
+    inputs.coaches = first_by(
+        db.query(Coach).filter(Coach.current_team.in_(team_names), Coach.sport.in_(sports))
+        .order_by(Coach.id).all(),
+        lambda r: (r.current_team, r.sport)
+    )
+    if inputs.coaches:
+        coach_ids = [c.id for c in inputs.coaches.values()]
+        for record in db.query(CoachSituationalRecord).filter(
+            CoachSituationalRecord.coach_id.in_(coach_ids)
+        ).order_by(CoachSituationalRecord.id).all():
+            inputs.coach_records.setdefault(record.coach_id, []).append(record)
+    inputs.officials = first_by(
+        db.query(Official).filter(Official.sport.in_(sports)).order_by(Official.id).all(),
+        lambda r: r.sport
+    )
+    inputs.teams = first_by(
+        db.query(Team).filter(Team.name.in_(team_names), Team.sport.in_(sports))
+        .order_by(Team.id).all(),
+        lambda r: (r.name, r.sport)
+    )
+    inputs.sentiment = first_by(
+        db.query(SocialSentiment).filter(
+            SocialSentiment.team_name.in_(team_names),
+            SocialSentiment.sport.in_(sports)
+        ).order_by(SocialSentiment.timestamp.desc()).all(),
+        lambda r: (r.team_name, r.sport)
+    )
+    return inputs
 
-        # Extract team names from relationship objects
-        home_team_name = ""
-        away_team_name = ""
-        if game:
-            if game.home_team and hasattr(game.home_team, 'name'):
-                home_team_name = game.home_team.name
-            if game.away_team and hasattr(game.away_team, 'name'):
-                away_team_name = game.away_team.name
-
-        new_prediction = UnifiedPrediction(
-            game_id=game_id,
-            sport=game.sport if game else "NFL",
-            home_team=home_team_name,
-            away_team=away_team_name,
-            game_date=game.start_time if game else datetime.utcnow(),
-            market_type=result.get("market", "spread"),
-
-            line_movement_edge=factors.get("line_movement", {}).get("edge"),
-            line_movement_direction=factors.get("line_movement", {}).get("direction"),
-            line_movement_signal=factors.get("line_movement", {}).get("signal"),
-
-            coach_dna_edge=factors.get("coach_dna", {}).get("edge"),
-            coach_dna_direction=factors.get("coach_dna", {}).get("direction"),
-            coach_dna_signal=factors.get("coach_dna", {}).get("signal"),
-
-            situational_edge=factors.get("situational", {}).get("edge"),
-            situational_direction=factors.get("situational", {}).get("direction"),
-            situational_signal=factors.get("situational", {}).get("signal"),
-
-            weather_edge=factors.get("weather", {}).get("edge"),
-            weather_direction=factors.get("weather", {}).get("direction"),
-            weather_signal=factors.get("weather", {}).get("signal"),
-
-            officials_edge=factors.get("officials", {}).get("edge"),
-            officials_direction=factors.get("officials", {}).get("direction"),
-            officials_signal=factors.get("officials", {}).get("signal"),
-
-            public_fade_edge=factors.get("public_fade", {}).get("edge"),
-            public_fade_direction=factors.get("public_fade", {}).get("direction"),
-            public_fade_signal=factors.get("public_fade", {}).get("signal"),
-
-            confirming_factors=analysis.get("confirming_factors"),
-            conflicting_factors=analysis.get("conflicting_factors"),
-            alignment_score=analysis.get("alignment_score"),
-
-            predicted_side=prediction.get("side"),
-            raw_edge=prediction.get("raw_edge_value"),
-            confidence=prediction.get("confidence"),
-            confidence_label=prediction.get("confidence_label"),
-            recommendation=prediction.get("recommendation"),
-            star_rating=prediction.get("star_rating"),
-            explanation=result.get("explanation")
-        )
-        db.add(new_prediction)
 
+def _slate_factors(game: Game, home_team: str, away_team: str, inputs: SlateInputs) -> Dict[str, Dict]:
+    """Compute every edge factor for one game from preloaded slate inputs."""
+    sport = game.sport or "NFL"
+    home_coach = inputs.coaches.get((home_team, sport))
+    away_coach = inputs.coaches.get((away_team, sport))
+
+    return {
+        "line_movement": _line_movement_factor(inputs.summaries.get(game.id)),
+        "coach_dna": _coach_dna_factor(
+            home_coach, inputs.coach_records.get(home_coach.id, []) if home_coach else [],
+            away_coach, inputs.coach_records.get(away_coach.id, []) if away_coach else []
+        ),
+        "situational": _situational_factor(inputs.situations.get(game.id)),
+        "weather": _weather_factor(inputs.weather.get(game.id)),
+        "officials": _officials_factor(inputs.officials.get(sport)),
+        "public_fade": _public_fade_factor(inputs.public_betting.get(game.id)),
+        "historical_elo": _elo_factor(
+            home_team, away_team,
+            inputs.teams.get((home_team, sport)), inputs.teams.get((away_team, sport))
+        ),
+        "social_sentiment": _social_sentiment_factor(
+            home_team, away_team,
+            inputs.sentiment.get((home_team, sport)), inputs.sentiment.get((away_team, sport))
+        ),
+    }
+
+
+def _store_predictions_bulk(
+    games: List[Game],
+    results: List[Dict[str, Any]],
+    db: Session,
+    market_type: str
+) -> None:
+    """Upsert predictions for a slate with one lookup and one executemany per statement."""
+    if not results:
+        return
+
+    existing = dict(db.query(UnifiedPrediction.game_id, UnifiedPrediction.id).filter(
+        UnifiedPrediction.game_id.in_([g.id for g in games]),
+        UnifiedPrediction.market_type == market_type
+    ).all())
+
+    now = datetime.utcnow()
+    inserts = []
+    updates = []
+    for game, result in zip(games, results):
+        if game.id in existing:
+            updates.append({"id": existing[game.id], "updated_at": now, **_prediction_values(result)})
+        else:
+            home_team, away_team = _team_names(game)
+            inserts.append({
+                "game_id": game.id,
+                "sport": game.sport or "NFL",
+                "home_team": home_team if game.home_team else "",
+                "away_team": away_team if game.away_team else "",
+                "game_date": game.start_time,
+                "market_type": market_type,
+                **_prediction_values(result)
+            })
+
+    if inserts:
+        db.execute(insert(UnifiedPrediction), inserts)
+    if updates:
+        db.execute(update(UnifiedPrediction), updates)
     db.commit()
 
 
+async def get_slate_predictions(
+    games: List[Game],
+    db: Session,
+    market_type: str = "spread"
+) -> List[Dict[str, Any]]:
+    """
+    Unified predictions for a whole slate in a constant number of queries.
+
+    Loads every factor input with bulk queries, scores all games in memory
+    and upserts the UnifiedPrediction rows together. Games without a stored
+    GameSituation get a neutral situational factor instead of the per-game
+    lazy load used by get_unified_prediction.
+    """
+    inputs = _load_slate_inputs(games, db)
+
+    results = []
+    for game in games:
+        home_team, away_team = _team_names(game)
+        factors = _slate_factors(game, home_team, away_team, inputs)
+        results.append(_build_prediction_result(game, home_team, away_team, factors, market_type))
+
+    _store_predictions_bulk(games, results, db, market_type)
+    return results
+
+
 async def get_ranked_picks(
     db: Session,
     date: Optional[str] = None,
@@ -836,13 +1155,14 @@ async def get_ranked_picks(
     Only returns games from the next 48 hours to ensure we're showing
     actual upcoming games, not fake/old data.
     """
-    from datetime import date as date_type
-
     # Get games for the next 48 hours only (today and tomorrow)
     now = datetime.utcnow()
     end = now + timedelta(hours=48)
 
-    query = db.query(Game).filter(
+    query = db.query(Game).options(
+        joinedload(Game.home_team),
+        joinedload(Game.away_team)
+    ).filter(
         Game.start_time >= now,
         Game.start_time <= end
     )
@@ -852,29 +1172,28 @@ async def get_ranked_picks(
 
     games = query.order_by(Game.start_time).limit(50).all()
 
-    # Get predictions for each game
-    picks = []
-    for game in games:
-        prediction = await get_unified_prediction(game.id, db)
-
-        if "error" not in prediction:
-            pred_data = prediction.get("prediction", {})
+    # Score the whole slate at once
+    predictions = await get_slate_predictions(games, db)
 
-            picks.append({
-                "game_id": game.id,
-                "game": prediction.get("game"),
-                "sport": prediction.get("sport"),
-                "game_time": prediction.get("game_time"),
-                "side": pred_data.get("side"),
-                "edge": pred_data.get("raw_edge"),
-                "edge_value": pred_data.get("raw_edge_value", 0),
-                "confidence": pred_data.get("confidence"),
-                "confidence_label": pred_data.get("confidence_label"),
-                "star_rating": pred_data.get("star_rating"),
-                "recommendation": pred_data.get("recommendation"),
-                "unit_size": pred_data.get("unit_size"),
-                "explanation": prediction.get("explanation")
-            })
+    picks = []
+    for game, prediction in zip(games, predictions):
+        pred_data = prediction.get("prediction", {})
+
+        picks.append({
+            "game_id": game.id,
+            "game": prediction.get("game"),
+            "sport": prediction.get("sport"),
+            "game_time": prediction.get("game_time"),
+            "side": pred_data.get("side"),
+            "edge": pred_data.get("raw_edge"),
+            "edge_value": pred_data.get("raw_edge_value", 0),
+            "confidence": pred_data.get("confidence"),
+            "confidence_label": pred_data.get("confidence_label"),
+            "star_rating": pred_data.get("star_rating"),
+            "recommendation": pred_data.get("recommendation"),
+            "unit_size": pred_data.get("unit_size"),
+            "explanation": prediction.get("explanation")
+        })
 
     # Sort by edge strength
     picks.sort(key=lambda x: x.get("edge_value", 0), reverse=True)
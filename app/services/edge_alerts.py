@@ -8,9 +8,9 @@ to eligible users based on their preferences.
 import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from app.db import SessionLocal, User, NotificationPreferences
+from app.db import SessionLocal, User, NotificationPreferences, Game
 from app.services.edge_engine import find_value_bets_for_sport
 from app.services.arbitrage import scan_for_arbitrage
 from app.services.push_notifications import (
@@ -18,7 +18,9 @@ from app.services.push_notifications import (
     notify_arb_alert,
     broadcast_edge_alert,
     broadcast_arb_alert,
+    broadcast_steam_alert,
 )
+from app.services.webhooks import dispatch_event
 from app.utils.logging import get_logger
 from app.config import SUPPORTED_SPORTS
 
@@ -217,6 +219,72 @@ async def check_and_send_arb_alerts(
     return results
 
 
+async def send_steam_alerts(events: List[Any], broadcast: bool = True) -> Dict[str, Any]:
+    """
+    Deliver streaming steam detector events as push notifications and webhooks.
+
+    Args:
+        events: SteamEvent objects from the steam detector
+        broadcast: If True, push to all eligible users as well as webhooks
+
+    Returns:
+        Summary of alerts and webhooks sent
+    """
+    results = {"events": 0, "alerts_sent": 0, "webhooks_sent": 0}
+    fresh = []
+    for event in events:
+        alert_key = _get_alert_key(event.event_type, event.game_id, f"{event.market_type}:{event.direction}")
+        if not _is_alert_recent(alert_key):
+            _mark_alert_sent(alert_key)
+            fresh.append(event)
+    if not fresh:
+        return results
+
+    db = SessionLocal()
+    try:
+        games = {
+            game.id: game
+            for game in db.query(Game).options(
+                joinedload(Game.home_team), joinedload(Game.away_team)
+            ).filter(Game.id.in_({event.game_id for event in fresh}))
+        }
+        for event in fresh:
+            game = games.get(event.game_id)
+            if game and game.home_team and game.away_team:
+                matchup = f"{game.away_team.name} @ {game.home_team.name}"
+            else:
+                matchup = f"Game {event.game_id}"
+            sport = event.sport or (game.sport if game else "")
+
+            if event.event_type == "steam":
+                description = (
+                    f"{event.market_type} steam {event.direction} {event.move:.1f} pts "
+                    f"across {len(event.books)} books"
+                )
+            else:
+                description = f"{event.first_book} moved {event.market_type} {event.direction} first"
+
+            results["events"] += 1
+            data = {**event.to_dict(), "matchup": matchup, "description": description}
+            webhook_result = await dispatch_event(db, "steam.detected", data)
+            results["webhooks_sent"] += webhook_result["sent"]
+
+            if broadcast:
+                result = await broadcast_steam_alert(
+                    db=db,
+                    sport=sport,
+                    matchup=matchup,
+                    market=event.market_type,
+                    description=description
+                )
+                results["alerts_sent"] += result.get("sent", 0)
+    finally:
+        db.close()
+
+    logger.info(f"Steam alerts: {results['events']} events, {results['alerts_sent']} alerts, {results['webhooks_sent']} webhooks sent")
+    return results
+
+
 async def run_alert_scan(
     sports: Optional[List[str]] = None,
     min_edge: float = 5.0,
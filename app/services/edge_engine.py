@@ -2,6 +2,7 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.db import Game, Market, Line, Team, Competitor, SessionLocal
+from app.services.game_slate import Slate, load_slate, load_slates
 from app.models import SPORT_MODEL_REGISTRY
 from app.utils.odds import american_to_implied_probability, expected_value, edge as calc_edge
 from app.schemas.bets import BetCandidate
@@ -97,11 +98,15 @@ def map_selection_to_probability(
 def find_value_bets_for_sport(
     sport: str,
     min_edge: float = 0.02,  # Lowered to 2% to find more realistic edges
-    db: Session = None
+    db: Session = None,
+    slate: Optional[Slate] = None
 ) -> List[BetCandidate]:
     """
     Find value bets for a sport using real games from the database.
 
+    Games, markets and lines come from ``slate`` when given, otherwise
+    from a slate loaded here; the scan itself issues no queries.
+
     Edge calculation:
     - Get odds from sportsbook (e.g., -110 = 52.4% implied)
     - Use power ratings to estimate actual win probability
@@ -121,7 +126,9 @@ def find_value_bets_for_sport(
         model = SPORT_MODEL_REGISTRY[sport]
         logger.debug(f"Finding value bets for {sport} (min_edge={min_edge})")
 
-        games = get_upcoming_games(db, sport)
+        if slate is None:
+            slate = load_slate(db, sport)
+        games = slate.games
 
         if not games:
             logger.info(f"No upcoming games found for {sport}")
@@ -237,8 +244,9 @@ def find_value_bets_for_sports(
         logger.info(f"Scanning {len(sports)} sports for value bets (min_edge={min_edge})")
         all_candidates = []
 
+        slates = load_slates(db, sports)
         for sport in sports:
-            candidates = find_value_bets_for_sport(sport, min_edge, db)
+            candidates = find_value_bets_for_sport(sport, min_edge, db, slate=slates[sport])
             all_candidates.extend(candidates)
 
         all_candidates.sort(key=lambda x: x.edge, reverse=True)
@@ -0,0 +1,152 @@
+"""
+Upcoming game slate for the edge engine.
+
+Loads upcoming games with their teams, competitors, markets and lines in
+a fixed number of queries (games with teams and competitors joined, then
+markets, then lines) instead of lazy loads per game and market, and
+copies them into frozen records. Models and the value-bet scan read the
+slate without touching the session, so it can also be shared across
+sports or threads.
+
+Slate records keep the ORM attribute names (``game.home_team.rating``,
+``game.markets``, ``market.lines``, ``line.american_odds``), so code
+written against ``Game`` reads a ``SlateGame`` unchanged.
+
+Usage:
+    slates = load_slates(db, ["NBA", "NFL"])
+    for game in slates["NBA"].games:
+        ...
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.db import Game, Market
+
+
+@dataclass(frozen=True)
+class SlateLine:
+    id: int
+    sportsbook: str
+    odds_type: str
+    line_value: Optional[float]
+    american_odds: int
+
+
+@dataclass(frozen=True)
+class SlateMarket:
+    id: int
+    market_type: str
+    selection: str
+    description: Optional[str]
+    lines: Tuple[SlateLine, ...]
+
+
+@dataclass(frozen=True)
+class SlateParticipant:
+    """A team or competitor."""
+    id: int
+    name: str
+    rating: Optional[float]
+
+
+@dataclass(frozen=True)
+class SlateGame:
+    id: int
+    sport: str
+    league: Optional[str]
+    start_time: datetime
+    status: Optional[str]
+    home_team: Optional[SlateParticipant]
+    away_team: Optional[SlateParticipant]
+    competitor1: Optional[SlateParticipant]
+    competitor2: Optional[SlateParticipant]
+    markets: Tuple[SlateMarket, ...]
+
+
+@dataclass(frozen=True)
+class Slate:
+    """Upcoming games for one sport as of ``loaded_at``."""
+    sport: str
+    games: Tuple[SlateGame, ...]
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+
+def _participant(entity) -> Optional[SlateParticipant]:
+    if entity is None:
+        return None
+    return SlateParticipant(id=entity.id, name=entity.name, rating=entity.rating)
+
+
+def _slate_game(game: Game) -> SlateGame:
+    return SlateGame(
+        id=game.id,
+        sport=game.sport,
+        league=game.league,
+        start_time=game.start_time,
+        status=game.status,
+        home_team=_participant(game.home_team),
+        away_team=_participant(game.away_team),
+        competitor1=_participant(game.competitor1),
+        competitor2=_participant(game.competitor2),
+        markets=tuple(
+            SlateMarket(
+                id=market.id,
+                market_type=market.market_type,
+                selection=market.selection,
+                description=market.description,
+                lines=tuple(
+                    SlateLine(
+                        id=line.id,
+                        sportsbook=line.sportsbook,
+                        odds_type=line.odds_type,
+                        line_value=line.line_value,
+                        american_odds=line.american_odds,
+                    )
+                    for line in market.lines
+                ),
+            )
+            for market in game.markets
+        ),
+    )
+
+
+def load_slates(db: Session, sports: Iterable[str], days_ahead: int = 2) -> Dict[str, Slate]:
+    """
+    Slates of games starting in the next ``days_ahead`` days, per sport.
+
+    Three queries regardless of the number of sports, games, markets or
+    lines. Every requested sport gets a slate, possibly empty.
+    """
+    sports = list(sports)
+    now = datetime.utcnow()
+    end = now + timedelta(days=days_ahead)
+
+    games = db.query(Game).filter(
+        Game.sport.in_(sports),
+        Game.start_time >= now,
+        Game.start_time <= end
+    ).options(
+        joinedload(Game.home_team),
+        joinedload(Game.away_team),
+        joinedload(Game.competitor1),
+        joinedload(Game.competitor2),
+        selectinload(Game.markets).selectinload(Market.lines),
+    ).order_by(Game.start_time, Game.id).all()
+
+    by_sport: Dict[str, list] = {sport: [] for sport in sports}
+    for game in games:
+        by_sport[game.sport].append(_slate_game(game))
+    loaded_at = datetime.utcnow()
+    return {sport: Slate(sport, tuple(items), loaded_at) for sport, items in by_sport.items()}
+
+
+def load_slate(db: Session, sport: str, days_ahead: int = 2) -> Slate:
+    """Slate of upcoming games for one sport."""
+    return load_slates(db, [sport], days_ahead)[sport]
@@ -9,13 +9,15 @@ Key features:
 - Closing Line Value (CLV) prediction
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy import func, desc, and_, insert, update
 from datetime import datetime, timedelta
 import logging
+import threading
 
 from app.db import LineMovement, LineMovementSummary, Game, OddsSnapshot
+from app.services.line_state import LineStateStore, upcoming_game_ids
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,397 @@ ALL_BOOKS = [
     "pinnacle", "circa", "bovada", "betonline"
 ]
 
+# Steam: average move across 3+ books within the window
+STEAM_WINDOW_MINUTES = 10
+STEAM_THRESHOLD_MOVEMENT = 1.0
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch(value: datetime) -> float:
+    """Seconds since the epoch for a naive UTC datetime (JSON-safe state timestamps)."""
+    return (value - EPOCH).total_seconds()
+
+
+def _snapshot_direction(market_type: str, movement: float) -> Optional[str]:
+    """Direction of a single line change."""
+    if market_type == "spread":
+        # Spread moving more negative = toward favorite
+        return "toward_favorite" if movement < 0 else "toward_underdog"
+    elif market_type == "total":
+        return "toward_over" if movement > 0 else "toward_under"
+    return None
+
+
+def _movement_direction(market_type: str, total_movement: float) -> str:
+    """Direction of the total move from the opening line."""
+    if market_type == "spread":
+        if total_movement < -0.5:
+            return "toward_favorite"
+        elif total_movement > 0.5:
+            return "toward_underdog"
+        return "stable"
+    elif market_type == "total":
+        if total_movement > 0.5:
+            return "toward_over"
+        elif total_movement < -0.5:
+            return "toward_under"
+        return "stable"
+    return "unknown"
+
+
+def _rlm_signal(
+    market_type: str,
+    public_bet_percentage: float,
+    direction: Optional[str],
+    total_move: float
+) -> Tuple[bool, float, str]:
+    """Return (rlm_detected, confidence, implication) for a total move against public betting."""
+    if market_type == "spread":
+        # If public is heavily on favorite (>65%) but line moves toward underdog
+        if public_bet_percentage > 65 and direction == "toward_underdog":
+            return True, min((public_bet_percentage - 50) / 50 + abs(total_move) / 3, 1.0), "Sharp money on underdog"
+
+        # If public is heavily on underdog but line moves toward favorite
+        if public_bet_percentage < 35 and direction == "toward_favorite":
+            return True, min((50 - public_bet_percentage) / 50 + abs(total_move) / 3, 1.0), "Sharp money on favorite"
+
+    elif market_type == "total":
+        # If public is heavily on over but line moves down
+        if public_bet_percentage > 65 and direction == "toward_under":
+            return True, min((public_bet_percentage - 50) / 50 + abs(total_move) / 3, 1.0), "Sharp money on under"
+
+        if public_bet_percentage < 35 and direction == "toward_over":
+            return True, min((50 - public_bet_percentage) / 50 + abs(total_move) / 3, 1.0), "Sharp money on over"
+
+    return False, 0.0, ""
+
+
+def _load_last_lines(db: Session, game_ids: Iterable[int]) -> Dict[Tuple[int, str, str], List]:
+    """[line, odds] of the latest LineMovement of each (game, market, book)."""
+    latest = db.query(
+        LineMovement.game_id,
+        LineMovement.market_type,
+        LineMovement.sportsbook,
+        func.max(LineMovement.recorded_at).label("recorded_at")
+    ).filter(
+        LineMovement.game_id.in_(set(game_ids))
+    ).group_by(
+        LineMovement.game_id, LineMovement.market_type, LineMovement.sportsbook
+    ).subquery()
+
+    rows = db.query(
+        LineMovement.game_id,
+        LineMovement.market_type,
+        LineMovement.sportsbook,
+        LineMovement.current_line,
+        LineMovement.current_odds
+    ).join(latest, and_(
+        LineMovement.game_id == latest.c.game_id,
+        LineMovement.market_type == latest.c.market_type,
+        LineMovement.sportsbook == latest.c.sportsbook,
+        LineMovement.recorded_at == latest.c.recorded_at
+    )).order_by(LineMovement.id).all()
+
+    # Later ids win ties on recorded_at
+    return {
+        (game_id, market_type, sportsbook): [line, odds]
+        for game_id, market_type, sportsbook, line, odds in rows
+    }
+
+
+def _load_summaries(db: Session, game_ids: Iterable[int]) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """Summary state per (game, market), with the movements still inside the steam window."""
+    game_ids = set(game_ids)
+    states: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for s in db.query(LineMovementSummary).filter(
+        LineMovementSummary.game_id.in_(game_ids)
+    ).order_by(LineMovementSummary.id):
+        states.setdefault((s.game_id, s.market_type), {
+            "id": s.id,
+            "sport": s.sport,
+            "opening_line": s.opening_line,
+            "opening_odds": s.opening_odds,
+            "current_line": s.current_line,
+            "current_odds": s.current_odds,
+            "total_movement": s.total_movement,
+            "direction": s.movement_direction,
+            "public_pct": s.public_bet_percentage,
+            "rlm": bool(s.reverse_line_movement),
+            "steam": bool(s.steam_move_detected),
+            "steam_time": _epoch(s.steam_move_time) if s.steam_move_time else None,
+            "first_move_book": s.first_move_book,
+            "sharp": bool(s.sharp_book_originated),
+            "window": [],
+        })
+
+    cutoff = datetime.utcnow() - timedelta(minutes=STEAM_WINDOW_MINUTES)
+    recent = db.query(LineMovement).filter(
+        LineMovement.game_id.in_(game_ids),
+        LineMovement.recorded_at >= cutoff
+    ).order_by(LineMovement.recorded_at)
+    for m in recent:
+        state = states.get((m.game_id, m.market_type))
+        if state is None or m.current_line is None:
+            continue
+        change = m.current_line - m.previous_line if m.previous_line is not None else 0.0
+        state["window"].append([_epoch(m.recorded_at), m.sportsbook, change])
+    return states
+
+
+class MovementEngine:
+    """
+    Incremental line movement tracker.
+
+    The last line of each (game, market, book) and a running summary of
+    each (game, market) live in LineStateStores, so a snapshot costs no
+    lookup queries once its game is loaded. Movement, steam, RLM and
+    sharp-book signals are updated per snapshot, and a batch of
+    snapshots is persisted with one insert for the movements and one
+    bulk update for the summaries.
+    """
+
+    def __init__(self):
+        self.lines = LineStateStore("lines", _load_last_lines)
+        self.summaries = LineStateStore("summary", _load_summaries)
+        # One batch at a time: stores stage a single writer's values
+        self._lock = threading.Lock()
+
+    def warm(self, db: Session, game_ids: Iterable[int]) -> int:
+        game_ids = list(game_ids)
+        self.summaries.warm(db, game_ids)
+        return self.lines.warm(db, game_ids)
+
+    def retain_games(self, game_ids: Iterable[int]) -> int:
+        """Drop state for games not in ``game_ids``. Returns line keys dropped."""
+        game_ids = set(game_ids)
+        self.summaries.retain_games(game_ids)
+        return self.lines.retain_games(game_ids)
+
+    def record(self, db: Session, snapshots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Record a batch of line snapshots and commit.
+
+        Args:
+            db: Database session
+            snapshots: Dicts with game_id, sport, sportsbook, market_type,
+                line_value, odds and optionally recorded_at
+
+        Returns:
+            The LineMovement rows written, in input order
+        """
+        if not snapshots:
+            return []
+
+        with self._lock:
+            try:
+                movements, summaries = self._observe(db, snapshots)
+                self._persist(db, movements, summaries)
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.lines.rollback()
+                self.summaries.rollback()
+                raise
+            self.lines.commit()
+            self.summaries.commit()
+        return movements
+
+    def _observe(
+        self,
+        db: Session,
+        snapshots: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[Tuple[int, str], Dict[str, Any]]]:
+        """Build movement rows and advance summaries; returns (movements, touched summaries)."""
+        lines = self.lines.get_many(
+            db, {(s["game_id"], s["market_type"], s["sportsbook"]) for s in snapshots}
+        )
+        summaries = self.summaries.get_many(db, {(s["game_id"], s["market_type"]) for s in snapshots})
+
+        movements = []
+        touched: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for snapshot in snapshots:
+            game_id = snapshot["game_id"]
+            market_type = snapshot["market_type"]
+            sportsbook = snapshot["sportsbook"]
+            line_value = snapshot["line_value"]
+            odds = snapshot["odds"]
+            recorded_at = snapshot.get("recorded_at") or datetime.utcnow()
+
+            line_key = (game_id, market_type, sportsbook)
+            previous_line, previous_odds = lines.get(line_key) or (None, None)
+
+            # Calculate movement
+            movement_pct = None
+            direction = None
+            change = 0.0
+            if previous_line is not None and line_value is not None and previous_line != line_value:
+                change = line_value - previous_line
+                direction = _snapshot_direction(market_type, change)
+                if previous_line != 0:
+                    movement_pct = (change / abs(previous_line)) * 100
+
+            movements.append({
+                "game_id": game_id,
+                "market_type": market_type,
+                "sportsbook": sportsbook,
+                "previous_odds": previous_odds,
+                "current_odds": odds,
+                "previous_line": previous_line,
+                "current_line": line_value,
+                "movement_percentage": movement_pct,
+                "direction": direction,
+                "recorded_at": recorded_at,
+            })
+            lines[line_key] = [line_value, odds]
+
+            summary_key = (game_id, market_type)
+            summary = dict(summaries.get(summary_key) or {
+                "id": None,
+                "sport": snapshot["sport"],
+                "opening_line": line_value,
+                "opening_odds": odds,
+                "public_pct": None,
+                "steam": False,
+                "steam_time": None,
+                "first_move_book": None,
+                "sharp": False,
+                "window": [],
+            })
+            summaries[summary_key] = touched[summary_key] = _advance_summary(
+                summary, market_type, sportsbook, line_value, odds,
+                change if previous_line is not None else None, _epoch(recorded_at)
+            )
+
+        self.lines.stage({
+            (m["game_id"], m["market_type"], m["sportsbook"]): [m["current_line"], m["current_odds"]]
+            for m in movements
+        })
+        return movements, touched
+
+    def _persist(
+        self,
+        db: Session,
+        movements: List[Dict[str, Any]],
+        summaries: Dict[Tuple[int, str], Dict[str, Any]]
+    ) -> None:
+        """Insert movements in one executemany and write summaries in one bulk update."""
+        db.execute(insert(LineMovement), movements, execution_options={"render_nulls": True})
+
+        now = datetime.utcnow()
+        updates = []
+        created = {}
+        for key, state in summaries.items():
+            columns = _summary_columns(state)
+            columns["updated_at"] = now
+            if state["id"] is None:
+                created[key] = LineMovementSummary(game_id=key[0], market_type=key[1], sport=state["sport"], **columns)
+            else:
+                updates.append({"id": state["id"], **columns})
+
+        if updates:
+            db.execute(update(LineMovementSummary), updates)
+        if created:
+            # New summaries need their ids for later bulk updates
+            db.add_all(created.values())
+            db.flush()
+            for key, summary in created.items():
+                summaries[key]["id"] = summary.id
+        self.summaries.stage(summaries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"lines": self.lines.stats(), "summaries": self.summaries.stats()}
+
+
+def _advance_summary(
+    summary: Dict[str, Any],
+    market_type: str,
+    sportsbook: str,
+    line_value: Optional[float],
+    odds: int,
+    change: Optional[float],
+    timestamp: float
+) -> Dict[str, Any]:
+    """Fold one snapshot into a (game, market) summary state."""
+    summary["current_line"] = line_value
+    summary["current_odds"] = odds
+
+    opening_line = summary.get("opening_line")
+    if opening_line and line_value is not None:
+        total_movement = round(line_value - opening_line, 1)
+    else:
+        total_movement = 0
+    summary["total_movement"] = total_movement
+    summary["direction"] = _movement_direction(market_type, total_movement)
+
+    # Steam: 3+ books within the window moving the same way by a point on average
+    window = [entry for entry in summary.get("window", [])
+              if timestamp - entry[0] <= STEAM_WINDOW_MINUTES * 60]
+    window.append([timestamp, sportsbook, change or 0.0])
+    summary["window"] = window
+    if len(window) >= 3 and len({entry[1] for entry in window}) >= 3:
+        avg_movement = sum(entry[2] for entry in window) / len(window)
+        if abs(avg_movement) >= STEAM_THRESHOLD_MOVEMENT:
+            summary["steam"] = True
+            summary["steam_time"] = window[0][0]
+    # Like detect_steam_move, only steam in the last hour counts
+    if summary.get("steam_time") and timestamp - summary["steam_time"] > 3600:
+        summary["steam"] = False
+
+    # First significant move decides whether a sharp book led
+    if summary.get("first_move_book") is None and change is not None and abs(change) >= 0.5:
+        summary["first_move_book"] = sportsbook.lower() if sportsbook else None
+        summary["sharp"] = summary["first_move_book"] in SHARP_BOOKS
+
+    if total_movement:
+        public_pct = summary.get("public_pct")
+        summary["rlm"] = _rlm_signal(
+            market_type, 50 if public_pct is None else public_pct, summary["direction"], total_movement
+        )[0]
+    else:
+        summary["rlm"] = False
+    return summary
+
+
+def _summary_columns(state: Dict[str, Any]) -> Dict[str, Any]:
+    """LineMovementSummary columns for a summary state."""
+    return {
+        "opening_line": state.get("opening_line"),
+        "opening_odds": state.get("opening_odds"),
+        "current_line": state.get("current_line"),
+        "current_odds": state.get("current_odds"),
+        "total_movement": state.get("total_movement"),
+        "movement_direction": state.get("direction"),
+        "steam_move_detected": state.get("steam", False),
+        "steam_move_time": EPOCH + timedelta(seconds=state["steam_time"]) if state.get("steam_time") else None,
+        "reverse_line_movement": state.get("rlm", False),
+        "sharp_book_originated": state.get("sharp", False),
+        "first_move_book": state.get("first_move_book"),
+    }
+
+
+# Global engine shared by the API and schedulers in this process
+movement_engine = MovementEngine()
+
+
+def warm_line_state(db: Session) -> int:
+    """Load last lines and summaries of upcoming games. Returns series loaded."""
+    return movement_engine.warm(db, upcoming_game_ids(db))
+
+
+def prune_line_state(db: Session) -> int:
+    """Drop last lines and summaries of games that are no longer upcoming. Returns series dropped."""
+    return movement_engine.retain_games(upcoming_game_ids(db))
+
+
+def record_line_snapshots(db: Session, snapshots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Record a batch of line snapshots, their movements and summary updates.
+
+    See MovementEngine.record for the snapshot fields.
+    """
+    return movement_engine.record(db, snapshots)
+
 
 def record_line_snapshot(
     db: Session,
@@ -37,7 +430,7 @@ def record_line_snapshot(
     market_type: str,
     line_value: float,
     odds: int
-) -> LineMovement:
+) -> Dict[str, Any]:
     """
     Record a line snapshot and calculate movement from previous.
 
@@ -51,56 +444,16 @@ def record_line_snapshot(
         odds: American odds
 
     Returns:
-        Created LineMovement record
+        The movement written, as a dict of LineMovement columns
     """
-    # Get previous snapshot for this game/book/market
-    previous = db.query(LineMovement).filter(
-        LineMovement.game_id == game_id,
-        LineMovement.sportsbook == sportsbook,
-        LineMovement.market_type == market_type
-    ).order_by(desc(LineMovement.recorded_at)).first()
-
-    previous_line = previous.current_line if previous else None
-    previous_odds = previous.current_odds if previous else None
-
-    # Calculate movement
-    movement_pct = None
-    direction = None
-
-    if previous_line is not None and previous_line != line_value:
-        movement = line_value - previous_line
-
-        if market_type == "spread":
-            # Spread moving more negative = toward favorite
-            direction = "toward_favorite" if movement < 0 else "toward_underdog"
-        elif market_type == "total":
-            direction = "toward_over" if movement > 0 else "toward_under"
-
-        # Calculate percentage movement
-        if previous_line != 0:
-            movement_pct = (movement / abs(previous_line)) * 100
-
-    # Create new movement record
-    line_movement = LineMovement(
-        game_id=game_id,
-        market_type=market_type,
-        sportsbook=sportsbook,
-        previous_odds=previous_odds,
-        current_odds=odds,
-        previous_line=previous_line,
-        current_line=line_value,
-        movement_percentage=movement_pct,
-        direction=direction,
-        recorded_at=datetime.utcnow()
-    )
-
-    db.add(line_movement)
-    db.commit()
-
-    # Update summary if significant movement
-    _update_movement_summary(db, game_id, sport, market_type)
-
-    return line_movement
+    return record_line_snapshots(db, [{
+        "game_id": game_id,
+        "sport": sport,
+        "sportsbook": sportsbook,
+        "market_type": market_type,
+        "line_value": line_value,
+        "odds": odds,
+    }])[0]
 
 
 def get_line_history(
@@ -187,23 +540,7 @@ def calculate_total_movement(
 
     total_movement = current.current_line - opening.current_line if opening.current_line else 0
 
-    # Determine direction
-    if market_type == "spread":
-        if total_movement < -0.5:
-            direction = "toward_favorite"
-        elif total_movement > 0.5:
-            direction = "toward_underdog"
-        else:
-            direction = "stable"
-    elif market_type == "total":
-        if total_movement > 0.5:
-            direction = "toward_over"
-        elif total_movement < -0.5:
-            direction = "toward_under"
-        else:
-            direction = "stable"
-    else:
-        direction = "unknown"
+    direction = _movement_direction(market_type, total_movement)
 
     return {
         "game_id": game_id,
@@ -255,34 +592,9 @@ def detect_reverse_line_movement(
         # Assume 50% if unknown
         public_bet_percentage = 50
 
-    rlm_detected = False
-    confidence = 0.0
-    implication = ""
-
-    if market_type == "spread":
-        # If public is heavily on favorite (>65%) but line moves toward underdog
-        if public_bet_percentage > 65 and direction == "toward_underdog":
-            rlm_detected = True
-            confidence = min((public_bet_percentage - 50) / 50 + abs(total_move) / 3, 1.0)
-            implication = "Sharp money on underdog"
-
-        # If public is heavily on underdog but line moves toward favorite
-        elif public_bet_percentage < 35 and direction == "toward_favorite":
-            rlm_detected = True
-            confidence = min((50 - public_bet_percentage) / 50 + abs(total_move) / 3, 1.0)
-            implication = "Sharp money on favorite"
-
-    elif market_type == "total":
-        # If public is heavily on over but line moves down
-        if public_bet_percentage > 65 and direction == "toward_under":
-            rlm_detected = True
-            confidence = min((public_bet_percentage - 50) / 50 + abs(total_move) / 3, 1.0)
-            implication = "Sharp money on under"
-
-        elif public_bet_percentage < 35 and direction == "toward_over":
-            rlm_detected = True
-            confidence = min((50 - public_bet_percentage) / 50 + abs(total_move) / 3, 1.0)
-            implication = "Sharp money on over"
+    rlm_detected, confidence, implication = _rlm_signal(
+        market_type, public_bet_percentage, direction, total_move
+    )
 
     return {
         "game_id": game_id,
@@ -300,8 +612,8 @@ def detect_steam_move(
     db: Session,
     game_id: int,
     market_type: str = "spread",
-    threshold_minutes: int = 10,
-    threshold_movement: float = 1.0
+    threshold_minutes: int = STEAM_WINDOW_MINUTES,
+    threshold_movement: float = STEAM_THRESHOLD_MOVEMENT
 ) -> Dict[str, Any]:
     """
     Detect steam moves (rapid coordinated line movement).
@@ -568,55 +880,6 @@ def _interpret_clv(clv: float, market_type: str) -> str:
         return f"Negative CLV ({clv:.1f}) - consider waiting for better line"
 
 
-def _update_movement_summary(
-    db: Session,
-    game_id: int,
-    sport: str,
-    market_type: str
-):
-    """Update or create movement summary for a game."""
-    # Check for existing summary
-    summary = db.query(LineMovementSummary).filter(
-        LineMovementSummary.game_id == game_id,
-        LineMovementSummary.market_type == market_type
-    ).first()
-
-    # Calculate current stats
-    movement_data = calculate_total_movement(db, game_id, market_type)
-    steam = detect_steam_move(db, game_id, market_type)
-    rlm = detect_reverse_line_movement(db, game_id, market_type=market_type)
-    sharp = get_sharp_book_movement(db, game_id, market_type)
-
-    if summary:
-        # Update existing
-        summary.current_line = movement_data.get("current_line")
-        summary.total_movement = movement_data.get("total_movement")
-        summary.movement_direction = movement_data.get("direction")
-        summary.steam_move_detected = steam.get("steam_detected", False)
-        summary.reverse_line_movement = rlm.get("rlm_detected", False)
-        summary.sharp_book_originated = sharp.get("sharp_originated", False)
-        summary.first_move_book = sharp.get("first_mover")
-        summary.updated_at = datetime.utcnow()
-    else:
-        # Create new
-        summary = LineMovementSummary(
-            game_id=game_id,
-            sport=sport,
-            market_type=market_type,
-            opening_line=movement_data.get("opening_line"),
-            current_line=movement_data.get("current_line"),
-            total_movement=movement_data.get("total_movement"),
-            movement_direction=movement_data.get("direction"),
-            steam_move_detected=steam.get("steam_detected", False),
-            reverse_line_movement=rlm.get("rlm_detected", False),
-            sharp_book_originated=sharp.get("sharp_originated", False),
-            first_move_book=sharp.get("first_mover")
-        )
-        db.add(summary)
-
-    db.commit()
-
-
 def get_games_with_alerts(
     db: Session,
     sport: Optional[str] = None,
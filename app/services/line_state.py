@@ -0,0 +1,177 @@
+"""
+Last-known line state.
+
+Keeps the latest value of each odds series in a compact in-process map so
+the write paths do not query the previous line for every snapshot. With
+Redis configured, state is also written to the shared cache so every
+worker sees the same last line; without it the local map is the only
+copy.
+
+Lookups go staged -> shared (Redis) -> local -> database. Games are
+loaded from the database once, in bulk, through the store's loader;
+after that a missing series is simply new. Writes are staged with
+``stage`` and only become visible to other workers on ``commit``, which
+callers make after their database transaction commits.
+
+Usage:
+    store = LineStateStore("snapshots", latest_points)
+    store.warm(db, upcoming_game_ids(db))
+
+    previous = store.get_many(db, keys)
+    store.stage({key: value})
+    db.commit()
+    store.commit()
+
+    # Periodically, so games that have started drop out of the map
+    store.retain_games(upcoming_game_ids(db))
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db import Game
+from app.utils.cache import cache
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+LINE_STATE_PREFIX = "linestate"
+LINE_STATE_TTL = int(os.environ.get("LINE_STATE_TTL", str(2 * 86400)))
+# Games that started more than this long ago are not warmed
+LINE_STATE_WARM_HOURS = int(os.environ.get("LINE_STATE_WARM_HOURS", "6"))
+
+StateKey = Tuple[Hashable, ...]
+Loader = Callable[[Session, Iterable[int]], Dict[StateKey, Any]]
+
+
+def upcoming_game_ids(db: Session, hours: int = LINE_STATE_WARM_HOURS) -> List[int]:
+    """Ids of games that have not started yet or started in the last ``hours``."""
+    since = datetime.utcnow() - timedelta(hours=hours)
+    return [game_id for (game_id,) in db.query(Game.id).filter(Game.start_time >= since)]
+
+
+class LineStateStore:
+    """
+    Map of state key -> last value, keyed by tuples whose first item is the game id.
+
+    Args:
+        namespace: Shared cache namespace, unique per store
+        loader: ``loader(db, game_ids)`` returning the stored value of every
+            key for those games, in one or a few queries
+        decode: Applied to values read back from the shared cache (which
+            turns tuples into lists)
+    """
+
+    def __init__(self, namespace: str, loader: Loader, decode: Optional[Callable[[Any], Any]] = None):
+        self.namespace = namespace
+        self._loader = loader
+        self._decode = decode or (lambda value: value)
+        self._local: Dict[StateKey, Any] = {}
+        self._staged: Dict[StateKey, Any] = {}
+        self._loaded_games: set = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._loads = 0
+
+    def _cache_key(self, key: StateKey) -> str:
+        return ":".join([LINE_STATE_PREFIX, self.namespace, *map(str, key)])
+
+    def warm(self, db: Session, game_ids: Iterable[int]) -> int:
+        """Load every key of ``game_ids`` into the local map. Returns keys loaded."""
+        game_ids = set(game_ids) - self._loaded_games
+        if not game_ids:
+            return 0
+        values = self._loader(db, game_ids)
+        with self._lock:
+            for key, value in values.items():
+                self._local.setdefault(key, value)
+            self._loaded_games |= game_ids
+        self._loads += 1
+        return len(values)
+
+    def get_many(self, db: Session, keys: Iterable[StateKey]) -> Dict[StateKey, Any]:
+        """
+        Last values of ``keys``; keys with no state are left out.
+
+        Costs at most one shared-cache round trip and one loader call for
+        games not seen before.
+        """
+        keys = set(keys)
+        with self._lock:
+            found = {key: self._staged[key] for key in keys if key in self._staged}
+        remaining = keys - found.keys()
+
+        if remaining and cache.is_redis():
+            cache_keys = {self._cache_key(key): key for key in remaining}
+            for cache_key, value in cache.get_many(list(cache_keys)).items():
+                found[cache_keys[cache_key]] = self._decode(value)
+            remaining -= found.keys()
+
+        unloaded = {key[0] for key in remaining} - self._loaded_games
+        if unloaded:
+            self.warm(db, unloaded)
+
+        with self._lock:
+            for key in remaining:
+                if key in self._local:
+                    found[key] = self._local[key]
+        self._hits += len(keys) - len(remaining)
+        return found
+
+    def stage(self, items: Dict[StateKey, Any]) -> None:
+        """Record new values; visible to ``get_many`` here, shared on ``commit``."""
+        with self._lock:
+            self._staged.update(items)
+
+    def commit(self) -> int:
+        """Publish staged values to the local map and the shared cache."""
+        with self._lock:
+            staged, self._staged = self._staged, {}
+            self._local.update(staged)
+            self._loaded_games.update(key[0] for key in staged)
+        if staged and cache.is_redis():
+            cache.set_many({self._cache_key(key): value for key, value in staged.items()}, LINE_STATE_TTL)
+        return len(staged)
+
+    def rollback(self) -> None:
+        """Drop staged values after a failed database write."""
+        with self._lock:
+            self._staged.clear()
+
+    def forget_games(self, game_ids: Iterable[int]) -> int:
+        """Drop local state for games, e.g. once they are final. Returns keys dropped."""
+        game_ids = set(game_ids)
+        with self._lock:
+            stale = [key for key in self._local if key[0] in game_ids]
+            for key in stale:
+                del self._local[key]
+            self._loaded_games -= game_ids
+        return len(stale)
+
+    def retain_games(self, game_ids: Iterable[int]) -> int:
+        """Drop local state for every game not in ``game_ids``. Returns keys dropped."""
+        game_ids = set(game_ids)
+        with self._lock:
+            known = {key[0] for key in self._local} | self._loaded_games
+        return self.forget_games(known - game_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._staged.clear()
+            self._loaded_games.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "namespace": self.namespace,
+            "keys": len(self._local),
+            "games": len(self._loaded_games),
+            "staged": len(self._staged),
+            "hits": self._hits,
+            "loads": self._loads,
+            "shared": cache.is_redis(),
+        }
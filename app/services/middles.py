@@ -0,0 +1,336 @@
+"""
+Middles and cross-line arbitrage over spread and total ladders.
+
+The arbitrage scan only pairs opposite sides at the same point. Books
+also hang different main lines and alternate lines, so one side at one
+point can be paired with the other side at another point. Every such
+pair falls on a single outcome axis (the first team's margin for
+spreads, the game total for totals):
+
+    low leg  (team A +a / Over o)   wins when X > lo   (lo = -a / o)
+    high leg (team B +b / Under u)  wins when X < hi   (hi =  b / u)
+
+When hi >= lo every outcome wins at least one leg, so with equal-payout
+stakes the pair returns at least the arbitrage floor; when hi > lo the
+outcomes lo < X < hi win both legs (the middle). A pair is reported if
+the floor is a guaranteed profit or the middle makes its expected value
+positive.
+
+Ladders come from the best-price index: for each selection the points
+offered by any book, sorted, with the best price per point. Main and
+alternate markets are merged. Instead of comparing all pairs, a sweep
+over the high leg's ladder moves two pointers over the low leg's ladder:
+rungs with lo <= hi enter the window and rungs wider than
+MIDDLE_MAX_WIDTH leave it, and only their best price is kept for the
+guaranteed-profit check. Work per game is linear in the ladder length
+times the window, independent of the number of books.
+
+Middle probabilities use a normal approximation of the outcome centred
+on the consensus (most quoted) line with a per-sport deviation, with
+integer outcomes so pushes on whole-number points are counted.
+"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services.arbitrage import (
+    american_to_decimal,
+    calculate_arb_margin,
+    calculate_arb_stakes,
+    calculate_stakes
+)
+from app.services.price_index import BestPriceIndex, GameInfo, price_index
+
+MIDDLE_MAX_WIDTH = float(os.environ.get("MIDDLE_MAX_WIDTH", "10"))
+
+# Market types merged into one ladder per family
+MARKET_FAMILIES = {
+    "spreads": ("spreads", "alternate_spreads"),
+    "totals": ("totals", "alternate_totals"),
+}
+
+# Standard deviation of the final margin / total around the closing line
+MARGIN_STDEV = {
+    "NFL": 13.5,
+    "NCAA_FOOTBALL": 15.5,
+    "NBA": 12.0,
+    "NCAA_BASKETBALL": 11.0,
+    "MLB": 4.2,
+    "NHL": 2.4,
+    "SOCCER": 1.8,
+}
+TOTAL_STDEV = {
+    "NFL": 13.5,
+    "NCAA_FOOTBALL": 16.0,
+    "NBA": 18.0,
+    "NCAA_BASKETBALL": 16.0,
+    "MLB": 4.4,
+    "NHL": 2.3,
+    "SOCCER": 1.6,
+}
+DEFAULT_STDEV = 10.0
+
+# (point, best odds, sportsbook, books quoting)
+Rung = Tuple[float, int, str, int]
+
+
+@dataclass
+class MiddleOpportunity:
+    """A two-leg position across points, with its middle window and value."""
+    game_id: int
+    sport: str
+    home_team: str
+    away_team: str
+    market_type: str  # "spreads" or "totals"
+    start_time: datetime
+    bet1_selection: str
+    bet1_point: float
+    bet1_sportsbook: str
+    bet1_odds: int
+    bet1_stake_pct: float
+    bet2_selection: str
+    bet2_point: float
+    bet2_sportsbook: str
+    bet2_odds: int
+    bet2_stake_pct: float
+    middle_width: float  # Points of outcome that win both legs
+    middle_probability: float  # Chance of landing in the middle (%)
+    floor_return: float  # Return outside the middle, % of total stake
+    expected_value: float  # Expected return, % of total stake
+    is_arb: bool  # Floor return is a guaranteed profit
+    stakes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = dict(self.__dict__)
+        data["start_time"] = self.start_time.isoformat()
+        return data
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+def _integer_mass(low: int, high: int, mean: float, stdev: float) -> float:
+    """P(low <= X <= high) for an integer outcome with a normal shape."""
+    if high < low:
+        return 0.0
+    return _normal_cdf((high + 0.5 - mean) / stdev) - _normal_cdf((low - 0.5 - mean) / stdev)
+
+
+def pair_value(
+    odds1: int,
+    odds2: int,
+    lo: float,
+    hi: float,
+    mean: float,
+    stdev: float
+) -> Tuple[float, float, float, List[float]]:
+    """
+    Value of a low/high pair staked for equal payout (per 100 staked).
+
+    Returns (floor return, middle probability, expected return, stakes).
+    """
+    stakes = calculate_stakes([odds1, odds2])
+    payout = stakes[0] * american_to_decimal(odds1)
+    floor = payout - 100
+
+    if hi == lo:
+        # Same point: both legs push together, which refunds everything
+        push = _integer_mass(int(lo), int(lo), mean, stdev) if lo == int(lo) else 0.0
+        return floor, 0.0, floor * (1 - push), stakes
+
+    p_middle = _integer_mass(math.floor(lo) + 1, math.ceil(hi) - 1, mean, stdev)
+    # One leg pushes on a whole-number endpoint while the other wins
+    p_lo_push = _integer_mass(int(lo), int(lo), mean, stdev) if lo == int(lo) else 0.0
+    p_hi_push = _integer_mass(int(hi), int(hi), mean, stdev) if hi == int(hi) else 0.0
+    expected = floor + payout * p_middle + stakes[0] * p_lo_push + stakes[1] * p_hi_push
+    return floor, p_middle, expected, stakes
+
+
+def _consensus(rungs: List[Rung]) -> Optional[float]:
+    """Most quoted point, preferring prices nearest even when tied."""
+    if not rungs:
+        return None
+    return max(rungs, key=lambda rung: (rung[3], -abs(abs(rung[1]) - 100)))[0]
+
+
+def sweep_pairs(
+    low: List[Tuple[float, int, str]],
+    high: List[Tuple[float, int, str]],
+    mean: float,
+    stdev: float,
+    min_profit: float = 0.0,
+    min_ev: float = 0.0,
+    max_width: float = MIDDLE_MAX_WIDTH
+) -> List[Dict[str, Any]]:
+    """
+    Sweep low-leg rungs against high-leg rungs, both as (threshold, odds,
+    sportsbook) sorted by threshold.
+
+    For each high rung, low rungs with threshold <= hi are in range.
+    Those within ``max_width`` are valued individually; wider ones only
+    compete on price for the guaranteed-profit floor, so a running best
+    of the evicted rungs stands in for all of them.
+    """
+    results = []
+    right = 0  # low[:right] have lo <= hi
+    left = 0  # low[left:right] are within max_width
+    evicted: Optional[Tuple[float, int, str]] = None  # best-priced rung in low[:left]
+
+    for hi, odds2, book2 in high:
+        while right < len(low) and low[right][0] <= hi:
+            right += 1
+        while left < right and hi - low[left][0] > max_width:
+            if evicted is None or low[left][1] > evicted[1]:
+                evicted = low[left]
+            left += 1
+
+        candidates = low[left:right]
+        if evicted is not None:
+            candidates = candidates + [evicted]
+        for lo, odds1, book1 in candidates:
+            floor, p_middle, expected, stakes = pair_value(odds1, odds2, lo, hi, mean, stdev)
+            is_arb = calculate_arb_margin([odds1, odds2]) < -min_profit
+            if not is_arb and not (hi > lo and expected > min_ev):
+                continue
+            results.append({
+                "lo": lo, "hi": hi,
+                "low": (odds1, book1), "high": (odds2, book2),
+                "floor": floor, "p_middle": p_middle, "expected": expected,
+                "stakes": stakes, "is_arb": is_arb,
+            })
+    return results
+
+
+def _merged_ladders(index: BestPriceIndex, game_id: int, family: str) -> Dict[str, List[Rung]]:
+    """
+    Ladder per selection over the family's market types, best price per
+    point. Book counts are kept for the main market only, so the
+    consensus line is never an alternate.
+    """
+    merged: Dict[str, Dict[float, Rung]] = {}
+    main_market = MARKET_FAMILIES[family][0]
+    for market_type in MARKET_FAMILIES[family]:
+        for selection in index.selections(game_id, market_type):
+            points = merged.setdefault(selection, {})
+            for rung in index.ladder(game_id, market_type, selection):
+                if market_type != main_market:
+                    rung = rung[:3] + (0,)
+                current = points.get(rung[0])
+                if current is None:
+                    points[rung[0]] = rung
+                elif rung[1] > current[1]:
+                    points[rung[0]] = (rung[0], rung[1], rung[2], current[3] + rung[3])
+                else:
+                    points[rung[0]] = current[:3] + (current[3] + rung[3],)
+    return {selection: [points[p] for p in sorted(points)] for selection, points in merged.items()}
+
+
+def _game_middles(
+    index: BestPriceIndex,
+    game_id: int,
+    info: GameInfo,
+    family: str,
+    min_profit: float,
+    min_ev: float,
+    total_stake: float
+) -> List[MiddleOpportunity]:
+    ladders = _merged_ladders(index, game_id, family)
+    if family == "spreads":
+        if len(ladders) != 2:
+            return []
+        # Axis is the first selection's margin: A +a wins above -a, B +b wins below b
+        name1, name2 = sorted(ladders)
+        low = [(-point, odds, book) for point, odds, book, _ in reversed(ladders[name1])]
+        high = [(point, odds, book) for point, odds, book, _ in ladders[name2]]
+        main = _consensus(ladders[name1])
+        mean = -main if main is not None else 0.0
+        stdev = MARGIN_STDEV.get(info.sport, DEFAULT_STDEV)
+        labels = (lambda lo: (name1, -lo), lambda hi: (name2, hi))
+    else:
+        over = next((rungs for name, rungs in ladders.items() if name.lower() == "over"), None)
+        under = next((rungs for name, rungs in ladders.items() if name.lower() == "under"), None)
+        if not over or not under:
+            return []
+        low = [(point, odds, book) for point, odds, book, _ in over]
+        high = [(point, odds, book) for point, odds, book, _ in under]
+        mean = _consensus(over + under)
+        stdev = TOTAL_STDEV.get(info.sport, DEFAULT_STDEV)
+        labels = (lambda lo: ("Over", lo), lambda hi: ("Under", hi))
+
+    opportunities = []
+    for pair in sweep_pairs(low, high, mean, stdev, min_profit, min_ev):
+        (sel1, point1), (sel2, point2) = labels[0](pair["lo"]), labels[1](pair["hi"])
+        odds1, book1 = pair["low"]
+        odds2, book2 = pair["high"]
+        if pair["is_arb"]:
+            stakes = calculate_arb_stakes(odds1, odds2, total_stake)
+        else:
+            stakes = {
+                "is_arb": False,
+                "total_stake": total_stake,
+                "stakes": [round(s * total_stake / 100, 2) for s in pair["stakes"]],
+            }
+        fmt = "{:+.1f}" if family == "spreads" else "{}"
+        opportunities.append(MiddleOpportunity(
+            game_id=game_id,
+            sport=info.sport,
+            home_team=info.home_team,
+            away_team=info.away_team,
+            market_type=family,
+            start_time=info.start_time,
+            bet1_selection=f"{sel1} {fmt.format(point1)}",
+            bet1_point=point1,
+            bet1_sportsbook=book1,
+            bet1_odds=odds1,
+            bet1_stake_pct=round(pair["stakes"][0], 2),
+            bet2_selection=f"{sel2} {fmt.format(point2)}",
+            bet2_point=point2,
+            bet2_sportsbook=book2,
+            bet2_odds=odds2,
+            bet2_stake_pct=round(pair["stakes"][1], 2),
+            middle_width=round(pair["hi"] - pair["lo"], 2),
+            middle_probability=round(pair["p_middle"] * 100, 2),
+            floor_return=round(pair["floor"], 2),
+            expected_value=round(pair["expected"], 2),
+            is_arb=pair["is_arb"],
+            stakes=stakes,
+        ))
+    return opportunities
+
+
+def find_middles(
+    index: BestPriceIndex,
+    sport: Optional[str] = None,
+    min_profit: float = 0.0,
+    min_ev: float = 0.0,
+    total_stake: float = 100.0
+) -> List[MiddleOpportunity]:
+    """
+    Cross-line arbitrage and positive-EV middles over live games in ``index``.
+
+    Guaranteed profits come first, then middles by expected value.
+    """
+    opportunities = []
+    for game_id, info in index.live_games(sport).items():
+        for family in MARKET_FAMILIES:
+            opportunities.extend(_game_middles(index, game_id, info, family, min_profit, min_ev, total_stake))
+    opportunities.sort(key=lambda x: (x.is_arb, x.floor_return if x.is_arb else x.expected_value), reverse=True)
+    return opportunities
+
+
+def scan_middles(
+    db: Session,
+    sport: Optional[str] = None,
+    min_profit: float = 0.0,
+    min_ev: float = 0.0,
+    total_stake: float = 100.0
+) -> List[MiddleOpportunity]:
+    """Scan the shared best-price index for middles and cross-line arbs."""
+    price_index.ensure_loaded(db)
+    return find_middles(price_index, sport, min_profit, min_ev, total_stake)
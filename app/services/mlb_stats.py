@@ -10,6 +10,7 @@ from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
 from app.utils.logging import get_logger
+from app.utils.http_client import http_clients
 
 logger = get_logger(__name__)
 
@@ -64,11 +65,10 @@ async def _make_request(endpoint: str, params: Optional[Dict] = None) -> Optiona
     url = f"{MLB_API_BASE}/{endpoint}"
     logger.debug(f"MLB API request: {endpoint} params={params}")
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            logger.debug(f"MLB API success: {endpoint} status={response.status_code}")
-            return response.json()
+        response = await http_clients.get("mlb_stats", url, params=params)
+        response.raise_for_status()
+        logger.debug(f"MLB API success: {endpoint} status={response.status_code}")
+        return response.json()
     except httpx.TimeoutException:
         logger.error(f"MLB API timeout: {endpoint}")
         return None
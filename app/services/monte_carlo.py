@@ -5,18 +5,40 @@ Bankroll growth projections using Monte Carlo simulation.
 Provides risk of ruin calculations, expected trajectories, and variance analysis.
 """
 
+import asyncio
+import os
 import random
 import math
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 from statistics import mean, stdev, median
 
+import numpy as np
+
 from app.utils.logging import get_logger
 from app.utils.odds import american_to_probability, american_to_decimal
 
 logger = get_logger(__name__)
 
+# Upper bound on (simulations x bets) cells materialized per batch.
+# Larger runs are processed in simulation chunks to cap memory.
+MAX_BATCH_CELLS = 2_000_000
+
+# Number of simulations whose full trajectory is kept for averaging
+TRACKED_TRAJECTORIES = 100
+
+# Process pool sizing and time budget for parallel strategy comparison
+MONTE_CARLO_WORKERS = int(os.environ.get("MONTE_CARLO_WORKERS", str(min(4, os.cpu_count() or 1))))
+MONTE_CARLO_TIMEOUT_SECONDS = float(os.environ.get("MONTE_CARLO_TIMEOUT_SECONDS", "30"))
+
+# Simulations per chunk when a comparison is split into work units
+MONTE_CARLO_CHUNK_SIZE = 250
+
+SeedLike = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+
 
 class BetSizingStrategy(str, Enum):
     """Available bet sizing strategies."""
@@ -50,6 +72,23 @@ class SimulationResult:
     trajectory: List[float]
 
 
+@dataclass
+class BatchSimulationResult:
+    """Per-simulation outcome arrays from the vectorized engine."""
+    final_bankrolls: np.ndarray   # (num_simulations,)
+    max_bankrolls: np.ndarray     # (num_simulations,)
+    min_bankrolls: np.ndarray     # (num_simulations,)
+    peak_drawdowns: np.ndarray    # (num_simulations,) percent
+    wins: np.ndarray              # (num_simulations,)
+    losses: np.ndarray            # (num_simulations,)
+    went_bust: np.ndarray         # (num_simulations,) bool
+    trajectories: np.ndarray      # (tracked, num_bets + 1)
+
+    @property
+    def total_bets(self) -> np.ndarray:
+        return self.wins + self.losses
+
+
 def kelly_fraction(probability: float, odds: int) -> float:
     """
     Calculate Kelly criterion fraction.
@@ -258,6 +297,165 @@ def run_simulation(
     )
 
 
+def _strategy_fractions(
+    strategy: BetSizingStrategy,
+    probabilities: np.ndarray,
+    odds: List[int],
+    unit_size: float,
+) -> np.ndarray:
+    """Uncapped bet fraction of bankroll for each scenario (martingale base unit)."""
+    if strategy == BetSizingStrategy.KELLY:
+        multiplier = 1.0
+    elif strategy == BetSizingStrategy.HALF_KELLY:
+        multiplier = 0.5
+    elif strategy == BetSizingStrategy.QUARTER_KELLY:
+        multiplier = 0.25
+    else:
+        return np.full(len(odds), unit_size, dtype=np.float64)
+
+    kelly = np.array([kelly_fraction(p, o) for p, o in zip(probabilities, odds)])
+    return kelly * multiplier
+
+
+def _simulate_chunk(
+    rng: np.random.Generator,
+    num_simulations: int,
+    starting_bankroll: float,
+    probabilities: np.ndarray,
+    net_odds: np.ndarray,
+    base_fractions: np.ndarray,
+    strategy: BetSizingStrategy,
+    num_bets: int,
+    max_bet_pct: float,
+    bust_threshold: float,
+    track: int,
+) -> Dict[str, np.ndarray]:
+    """Simulate one chunk of bankroll paths with array operations."""
+    steps = np.arange(num_bets)
+    scenario_idx = rng.integers(0, len(probabilities), size=(num_simulations, num_bets))
+    won = rng.random((num_simulations, num_bets)) < probabilities[scenario_idx]
+
+    cap = min(max_bet_pct, 1.0)
+    if strategy == BetSizingStrategy.MARTINGALE:
+        # Losing streak before each step: distance back to the last win
+        last_win = np.maximum.accumulate(np.where(won, steps, -1), axis=1)
+        prior_win = np.empty_like(last_win)
+        prior_win[:, 0] = -1
+        prior_win[:, 1:] = last_win[:, :-1]
+        streak = steps - 1 - prior_win
+        fractions = np.minimum(base_fractions[scenario_idx] * np.exp2(streak), cap)
+    else:
+        fractions = np.minimum(base_fractions, cap)[scenario_idx]
+
+    returns = np.where(won, net_odds[scenario_idx], -1.0)
+    paths = np.empty((num_simulations, num_bets + 1))
+    paths[:, 0] = starting_bankroll
+    np.cumprod(1.0 + fractions * returns, axis=1, out=paths[:, 1:])
+    paths[:, 1:] *= starting_bankroll
+
+    # First column at or below the bust threshold; num_bets + 1 if never
+    bust_hit = paths <= bust_threshold
+    busted = bust_hit.any(axis=1)
+    bust_col = np.where(busted, bust_hit.argmax(axis=1), num_bets + 1)
+
+    rows = np.arange(num_simulations)
+    columns = np.arange(num_bets + 1)
+    live = columns[None, :] <= bust_col[:, None]
+    placed = (steps[None, :] < bust_col[:, None]) & (fractions > 0)
+
+    peak = np.maximum.accumulate(paths, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, (peak - paths) / peak, 0.0)
+
+    trajectories = paths[:track].copy()
+    trajectories[~live[:track]] = bust_threshold
+
+    return {
+        "final": paths[rows, np.minimum(bust_col, num_bets)],
+        "max": np.where(live, paths, -np.inf).max(axis=1),
+        "min": np.where(live, paths, np.inf).min(axis=1),
+        "drawdown": np.where(live, drawdown, 0.0).max(axis=1),
+        "wins": (placed & won).sum(axis=1),
+        "losses": (placed & ~won).sum(axis=1),
+        "trajectories": trajectories,
+    }
+
+
+def simulate_batch(
+    starting_bankroll: float,
+    bet_scenarios: List[BetScenario],
+    strategy: BetSizingStrategy,
+    num_bets: int,
+    num_simulations: int,
+    unit_size: float = 0.01,
+    max_bet_pct: float = 0.05,
+    bust_threshold: float = 0.0,
+    track_trajectories: int = TRACKED_TRAJECTORIES,
+    seed: SeedLike = None
+) -> BatchSimulationResult:
+    """
+    Run many simulations at once as (num_simulations, num_bets) arrays.
+
+    Scenario picks and outcomes are drawn up front, bankroll paths are
+    built with a cumulative product of per-bet growth factors and
+    everything after the first bust is masked out. Martingale stakes are
+    derived from the losing-streak length computed on the outcome matrix.
+    Unlike run_simulation, stakes are not rounded to cents.
+
+    Args:
+        starting_bankroll: Initial bankroll
+        bet_scenarios: List of possible bet scenarios (randomly selected)
+        strategy: Bet sizing strategy
+        num_bets: Number of bets per simulation
+        num_simulations: Number of simulation runs
+        unit_size: Base unit size (fraction of bankroll)
+        max_bet_pct: Maximum bet (fraction of bankroll)
+        bust_threshold: Bankroll level considered bust
+        track_trajectories: Number of leading simulations to keep paths for
+        seed: Seed, SeedSequence or Generator for reproducible results
+
+    Returns:
+        BatchSimulationResult with per-simulation arrays
+    """
+    rng = np.random.default_rng(seed)
+    probabilities = np.array([s.probability for s in bet_scenarios], dtype=np.float64)
+    odds = [s.odds for s in bet_scenarios]
+    net_odds = np.array([american_to_decimal(o) - 1 for o in odds], dtype=np.float64)
+    base_fractions = _strategy_fractions(strategy, probabilities, odds, unit_size)
+
+    chunk_size = max(1, MAX_BATCH_CELLS // max(1, num_bets))
+    chunks = []
+    tracked_remaining = track_trajectories
+    for start in range(0, num_simulations, chunk_size):
+        size = min(chunk_size, num_simulations - start)
+        track = min(tracked_remaining, size)
+        chunks.append(_simulate_chunk(
+            rng, size, starting_bankroll, probabilities, net_odds, base_fractions,
+            strategy, num_bets, max_bet_pct, bust_threshold, track
+        ))
+        tracked_remaining -= track
+
+    def gather(key: str) -> np.ndarray:
+        return np.concatenate([c[key] for c in chunks])
+
+    final = gather("final")
+    return BatchSimulationResult(
+        final_bankrolls=final,
+        max_bankrolls=gather("max"),
+        min_bankrolls=gather("min"),
+        peak_drawdowns=gather("drawdown") * 100,
+        wins=gather("wins"),
+        losses=gather("losses"),
+        went_bust=final <= bust_threshold,
+        trajectories=np.concatenate([c["trajectories"] for c in chunks])
+    )
+
+
+def _percentile_at(sorted_values: np.ndarray, fraction: float) -> float:
+    """Value at the given rank fraction of an ascending array."""
+    return float(sorted_values[int(len(sorted_values) * fraction)])
+
+
 def run_monte_carlo(
     starting_bankroll: float,
     bet_scenarios: List[BetScenario],
@@ -266,7 +464,8 @@ def run_monte_carlo(
     num_simulations: int = 1000,
     unit_size: float = 0.01,
     max_bet_pct: float = 0.05,
-    bust_threshold: float = 0.0
+    bust_threshold: float = 0.0,
+    seed: SeedLike = None
 ) -> Dict[str, Any]:
     """
     Run full Monte Carlo simulation with multiple iterations.
@@ -280,52 +479,45 @@ def run_monte_carlo(
         unit_size: Base unit size
         max_bet_pct: Maximum bet percentage
         bust_threshold: Bankroll level considered bust
+        seed: Optional seed for reproducible results
 
     Returns:
         Comprehensive simulation results
     """
     logger.info(f"Running {num_simulations} Monte Carlo simulations with {strategy.value} strategy")
 
-    results = []
-    for i in range(num_simulations):
-        # Only track full trajectory for a subset to save memory
-        track_trajectory = i < 100
-
-        result = run_simulation(
-            starting_bankroll=starting_bankroll,
-            bet_scenarios=bet_scenarios,
-            strategy=strategy,
-            num_bets=num_bets,
-            unit_size=unit_size,
-            max_bet_pct=max_bet_pct,
-            bust_threshold=bust_threshold,
-            track_trajectory=track_trajectory
-        )
-        results.append(result)
+    batch = simulate_batch(
+        starting_bankroll=starting_bankroll,
+        bet_scenarios=bet_scenarios,
+        strategy=strategy,
+        num_bets=num_bets,
+        num_simulations=num_simulations,
+        unit_size=unit_size,
+        max_bet_pct=max_bet_pct,
+        bust_threshold=bust_threshold,
+        seed=seed
+    )
 
-    # Analyze results
-    final_bankrolls = [r.final_bankroll for r in results]
-    bust_count = sum(1 for r in results if r.went_bust)
+    # Results are reported at cent precision
+    final_bankrolls = np.round(batch.final_bankrolls, 2)
+    max_drawdowns = np.round(batch.peak_drawdowns, 2)
+    bust_count = int(batch.went_bust.sum())
 
     # Calculate percentiles
-    sorted_finals = sorted(final_bankrolls)
-    p5 = sorted_finals[int(num_simulations * 0.05)]
-    p25 = sorted_finals[int(num_simulations * 0.25)]
-    p50 = sorted_finals[int(num_simulations * 0.50)]
-    p75 = sorted_finals[int(num_simulations * 0.75)]
-    p95 = sorted_finals[int(num_simulations * 0.95)]
+    sorted_finals = np.sort(final_bankrolls)
+    sorted_drawdowns = np.sort(max_drawdowns)
 
     # Average trajectory (from tracked simulations)
-    tracked_results = [r for r in results if r.trajectory]
     avg_trajectory = []
-    if tracked_results:
-        trajectory_length = len(tracked_results[0].trajectory)
-        for i in range(trajectory_length):
-            avg_at_step = mean(r.trajectory[i] for r in tracked_results if i < len(r.trajectory))
-            avg_trajectory.append(round(avg_at_step, 2))
+    if len(batch.trajectories):
+        avg_trajectory = np.round(batch.trajectories.mean(axis=0), 2).tolist()
+
+    total_bets = batch.total_bets
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_rates = np.where(total_bets > 0, batch.wins / total_bets * 100, 0.0)
 
-    # Drawdown analysis
-    max_drawdowns = [r.peak_drawdown for r in results]
+    mean_final = float(final_bankrolls.mean())
+    profitable = int((final_bankrolls > starting_bankroll).sum())
 
     return {
         "simulation_params": {
@@ -338,31 +530,31 @@ def run_monte_carlo(
             "bust_threshold": bust_threshold
         },
         "final_bankroll": {
-            "mean": round(mean(final_bankrolls), 2),
-            "median": round(median(final_bankrolls), 2),
-            "std_dev": round(stdev(final_bankrolls), 2) if len(final_bankrolls) > 1 else 0,
-            "min": round(min(final_bankrolls), 2),
-            "max": round(max(final_bankrolls), 2),
+            "mean": round(mean_final, 2),
+            "median": round(float(np.median(final_bankrolls)), 2),
+            "std_dev": round(float(final_bankrolls.std(ddof=1)), 2) if num_simulations > 1 else 0,
+            "min": round(float(sorted_finals[0]), 2),
+            "max": round(float(sorted_finals[-1]), 2),
             "percentiles": {
-                "5th": round(p5, 2),
-                "25th": round(p25, 2),
-                "50th": round(p50, 2),
-                "75th": round(p75, 2),
-                "95th": round(p95, 2)
+                "5th": round(_percentile_at(sorted_finals, 0.05), 2),
+                "25th": round(_percentile_at(sorted_finals, 0.25), 2),
+                "50th": round(_percentile_at(sorted_finals, 0.50), 2),
+                "75th": round(_percentile_at(sorted_finals, 0.75), 2),
+                "95th": round(_percentile_at(sorted_finals, 0.95), 2)
             }
         },
         "risk_analysis": {
             "risk_of_ruin": round(bust_count / num_simulations * 100, 2),
             "bust_count": bust_count,
             "survival_rate": round((num_simulations - bust_count) / num_simulations * 100, 2),
-            "avg_max_drawdown": round(mean(max_drawdowns), 2),
-            "max_drawdown_95th": round(sorted(max_drawdowns)[int(num_simulations * 0.95)], 2)
+            "avg_max_drawdown": round(float(max_drawdowns.mean()), 2),
+            "max_drawdown_95th": round(_percentile_at(sorted_drawdowns, 0.95), 2)
         },
         "performance": {
-            "expected_roi": round((mean(final_bankrolls) - starting_bankroll) / starting_bankroll * 100, 2),
-            "profitable_simulations": sum(1 for f in final_bankrolls if f > starting_bankroll),
-            "profitable_rate": round(sum(1 for f in final_bankrolls if f > starting_bankroll) / num_simulations * 100, 2),
-            "avg_win_rate": round(mean(r.wins / r.total_bets * 100 if r.total_bets > 0 else 0 for r in results), 2)
+            "expected_roi": round((mean_final - starting_bankroll) / starting_bankroll * 100, 2),
+            "profitable_simulations": profitable,
+            "profitable_rate": round(profitable / num_simulations * 100, 2),
+            "avg_win_rate": round(float(win_rates.mean()), 2)
         },
         "trajectory": {
             "average": avg_trajectory[::max(1, len(avg_trajectory)//50)]  # Downsample for response
@@ -450,46 +642,149 @@ def get_ror_recommendation(ror: float, edge: float, bet_fraction: float) -> str:
         return "Acceptable risk level"
 
 
-def compare_strategies(
-    starting_bankroll: float,
-    bet_scenarios: List[BetScenario],
-    num_bets: int,
-    num_simulations: int = 500
-) -> Dict[str, Any]:
-    """
-    Compare different bet sizing strategies.
+COMPARISON_STRATEGIES = [
+    BetSizingStrategy.FLAT,
+    BetSizingStrategy.QUARTER_KELLY,
+    BetSizingStrategy.HALF_KELLY,
+    BetSizingStrategy.KELLY,
+    BetSizingStrategy.PERCENTAGE
+]
 
-    Returns comparison of key metrics across strategies.
+
+@dataclass
+class PartialStats:
     """
-    strategies = [
-        BetSizingStrategy.FLAT,
-        BetSizingStrategy.QUARTER_KELLY,
-        BetSizingStrategy.HALF_KELLY,
-        BetSizingStrategy.KELLY,
-        BetSizingStrategy.PERCENTAGE
-    ]
+    Mergeable summary of a chunk of simulations for one strategy.
 
-    comparisons = []
+    Counts and sums add, mean/variance merge with Chan's parallel update
+    and the final bankrolls are kept so percentiles stay exact.
+    """
+    count: int
+    bust_count: int
+    profitable: int
+    mean_final: float
+    m2_final: float
+    drawdown_sum: float
+    finals: np.ndarray
+    trajectory_sum: np.ndarray
+    trajectory_count: int
+
+    @classmethod
+    def from_batch(cls, batch: BatchSimulationResult, starting_bankroll: float) -> "PartialStats":
+        finals = np.round(batch.final_bankrolls, 2)
+        mean_final = float(finals.mean()) if len(finals) else 0.0
+        return cls(
+            count=len(finals),
+            bust_count=int(batch.went_bust.sum()),
+            profitable=int((finals > starting_bankroll).sum()),
+            mean_final=mean_final,
+            m2_final=float(((finals - mean_final) ** 2).sum()),
+            drawdown_sum=float(np.round(batch.peak_drawdowns, 2).sum()),
+            finals=finals,
+            trajectory_sum=batch.trajectories.sum(axis=0),
+            trajectory_count=len(batch.trajectories)
+        )
 
-    for strategy in strategies:
-        result = run_monte_carlo(
-            starting_bankroll=starting_bankroll,
-            bet_scenarios=bet_scenarios,
-            strategy=strategy,
-            num_bets=num_bets,
-            num_simulations=num_simulations,
-            unit_size=0.01 if strategy in [BetSizingStrategy.FLAT, BetSizingStrategy.PERCENTAGE] else 0.01,
-            max_bet_pct=0.10
+    def merge(self, other: "PartialStats") -> "PartialStats":
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean_final - self.mean_final
+        return PartialStats(
+            count=count,
+            bust_count=self.bust_count + other.bust_count,
+            profitable=self.profitable + other.profitable,
+            mean_final=self.mean_final + delta * other.count / count,
+            m2_final=self.m2_final + other.m2_final + delta ** 2 * self.count * other.count / count,
+            drawdown_sum=self.drawdown_sum + other.drawdown_sum,
+            finals=np.concatenate([self.finals, other.finals]),
+            trajectory_sum=self.trajectory_sum + other.trajectory_sum,
+            trajectory_count=self.trajectory_count + other.trajectory_count
         )
 
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.m2_final / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def average_trajectory(self) -> List[float]:
+        if not self.trajectory_count:
+            return []
+        return np.round(self.trajectory_sum / self.trajectory_count, 2).tolist()
+
+
+def _plan_comparison_chunks(
+    num_simulations: int,
+    seed: Optional[int],
+    chunk_size: int
+) -> List[Tuple[BetSizingStrategy, int, int, Optional[np.random.SeedSequence]]]:
+    """
+    Split every strategy into simulation chunks with independent RNG streams.
+
+    The plan only depends on the seed and chunk size, so results are the
+    same whether chunks run in-process or across any number of workers.
+    """
+    num_chunks = max(1, math.ceil(num_simulations / chunk_size))
+    if seed is None:
+        chunk_seeds = [[None] * num_chunks for _ in COMPARISON_STRATEGIES]
+    else:
+        strategy_seeds = np.random.SeedSequence(seed).spawn(len(COMPARISON_STRATEGIES))
+        chunk_seeds = [child.spawn(num_chunks) for child in strategy_seeds]
+
+    tasks = []
+    for strategy, seeds in zip(COMPARISON_STRATEGIES, chunk_seeds):
+        for i, chunk_seed in enumerate(seeds):
+            size = min(chunk_size, num_simulations - i * chunk_size)
+            # Keep trajectories for the leading simulations of each strategy
+            track = max(0, min(size, TRACKED_TRAJECTORIES - i * chunk_size))
+            tasks.append((strategy, size, track, chunk_seed))
+    return tasks
+
+
+def _run_comparison_chunk(
+    starting_bankroll: float,
+    bet_scenarios: List[BetScenario],
+    num_bets: int,
+    task: Tuple[BetSizingStrategy, int, int, Optional[np.random.SeedSequence]]
+) -> Tuple[BetSizingStrategy, PartialStats]:
+    """Simulate one planned chunk. Top-level so it can run in a worker process."""
+    strategy, size, track, chunk_seed = task
+    batch = simulate_batch(
+        starting_bankroll=starting_bankroll,
+        bet_scenarios=bet_scenarios,
+        strategy=strategy,
+        num_bets=num_bets,
+        num_simulations=size,
+        unit_size=0.01,
+        max_bet_pct=0.10,
+        track_trajectories=track,
+        seed=chunk_seed
+    )
+    return strategy, PartialStats.from_batch(batch, starting_bankroll)
+
+
+def _summarize_comparison(
+    partials: List[Tuple[BetSizingStrategy, PartialStats]],
+    starting_bankroll: float,
+    num_bets: int,
+    num_simulations: int
+) -> Dict[str, Any]:
+    """Merge chunk statistics per strategy and build the comparison response."""
+    merged: Dict[BetSizingStrategy, PartialStats] = {}
+    for strategy, stats in partials:
+        merged[strategy] = merged[strategy].merge(stats) if strategy in merged else stats
+
+    comparisons = []
+    for strategy in COMPARISON_STRATEGIES:
+        stats = merged[strategy]
         comparisons.append({
             "strategy": strategy.value,
-            "expected_roi": result["performance"]["expected_roi"],
-            "risk_of_ruin": result["risk_analysis"]["risk_of_ruin"],
-            "median_final": result["final_bankroll"]["median"],
-            "std_dev": result["final_bankroll"]["std_dev"],
-            "profitable_rate": result["performance"]["profitable_rate"],
-            "avg_max_drawdown": result["risk_analysis"]["avg_max_drawdown"]
+            "expected_roi": round((stats.mean_final - starting_bankroll) / starting_bankroll * 100, 2),
+            "risk_of_ruin": round(stats.bust_count / stats.count * 100, 2),
+            "median_final": round(float(np.median(stats.finals)), 2),
+            "std_dev": round(stats.std_dev, 2),
+            "profitable_rate": round(stats.profitable / stats.count * 100, 2),
+            "avg_max_drawdown": round(stats.drawdown_sum / stats.count, 2)
         })
 
     # Sort by expected ROI
@@ -515,12 +810,118 @@ def compare_strategies(
     }
 
 
+def compare_strategies(
+    starting_bankroll: float,
+    bet_scenarios: List[BetScenario],
+    num_bets: int,
+    num_simulations: int = 500,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compare different bet sizing strategies.
+
+    Runs the same chunk plan as compare_strategies_parallel in-process,
+    so both return identical results for a given seed.
+
+    Returns comparison of key metrics across strategies.
+    """
+    tasks = _plan_comparison_chunks(num_simulations, seed, MONTE_CARLO_CHUNK_SIZE)
+    partials = [
+        _run_comparison_chunk(starting_bankroll, bet_scenarios, num_bets, task)
+        for task in tasks
+    ]
+    return _summarize_comparison(partials, starting_bankroll, num_bets, num_simulations)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared simulation process pool, creating it on first use."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=MONTE_CARLO_WORKERS)
+            logger.info(f"Started Monte Carlo process pool with {MONTE_CARLO_WORKERS} workers")
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared simulation process pool if it was started."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+async def compare_strategies_parallel(
+    starting_bankroll: float,
+    bet_scenarios: List[BetScenario],
+    num_bets: int,
+    num_simulations: int = 500,
+    seed: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Compare bet sizing strategies with chunks spread across a process pool.
+
+    Awaits the worker results without blocking the event loop. With
+    MONTE_CARLO_WORKERS <= 1 the chunks run in a thread instead.
+
+    Args:
+        starting_bankroll: Initial bankroll
+        bet_scenarios: List of possible bet scenarios
+        num_bets: Number of bets per simulation
+        num_simulations: Simulations per strategy
+        seed: Optional seed for reproducible results
+        timeout: Time budget in seconds (defaults to MONTE_CARLO_TIMEOUT_SECONDS)
+
+    Returns:
+        Same response as compare_strategies
+
+    Raises:
+        asyncio.TimeoutError: If the time budget is exceeded
+    """
+    budget = timeout if timeout is not None else MONTE_CARLO_TIMEOUT_SECONDS
+
+    if MONTE_CARLO_WORKERS <= 1:
+        return await asyncio.wait_for(
+            asyncio.to_thread(
+                compare_strategies, starting_bankroll, bet_scenarios, num_bets, num_simulations, seed
+            ),
+            timeout=budget
+        )
+
+    tasks = _plan_comparison_chunks(num_simulations, seed, MONTE_CARLO_CHUNK_SIZE)
+    pool = get_process_pool()
+    futures = [
+        pool.submit(_run_comparison_chunk, starting_bankroll, bet_scenarios, num_bets, task)
+        for task in tasks
+    ]
+
+    try:
+        partials = await asyncio.wait_for(
+            asyncio.gather(*(asyncio.wrap_future(f) for f in futures)),
+            timeout=budget
+        )
+    except asyncio.TimeoutError:
+        for future in futures:
+            future.cancel()
+        logger.warning(f"Strategy comparison exceeded {budget}s budget ({len(tasks)} chunks)")
+        raise
+
+    return _summarize_comparison(list(partials), starting_bankroll, num_bets, num_simulations)
+
+
 def create_bet_scenarios_from_edge(
     avg_edge: float,
     edge_variance: float = 0.02,
     avg_odds: int = -110,
     odds_range: Tuple[int, int] = (-200, 200),
-    num_scenarios: int = 10
+    num_scenarios: int = 10,
+    seed: Optional[int] = None
 ) -> List[BetScenario]:
     """
     Create diverse bet scenarios from average edge parameters.
@@ -531,24 +932,26 @@ def create_bet_scenarios_from_edge(
         avg_odds: Average American odds
         odds_range: Range of odds (min, max)
         num_scenarios: Number of scenarios to generate
+        seed: Optional seed for reproducible scenarios
 
     Returns:
         List of BetScenario objects
     """
+    rng = random.Random(seed) if seed is not None else random
     scenarios = []
 
     for _ in range(num_scenarios):
         # Random odds within range
         if avg_odds > 0:
-            odds = random.randint(max(100, odds_range[0]), odds_range[1])
+            odds = rng.randint(max(100, odds_range[0]), odds_range[1])
         else:
-            odds = random.randint(odds_range[0], min(-100, odds_range[1]))
+            odds = rng.randint(odds_range[0], min(-100, odds_range[1]))
 
         # Implied probability from odds
         implied = american_to_probability(odds)
 
         # Edge with variance
-        edge = avg_edge + random.uniform(-edge_variance, edge_variance)
+        edge = avg_edge + rng.uniform(-edge_variance, edge_variance)
         edge = max(0, edge)  # No negative edge scenarios
 
         # True probability = implied + edge
@@ -568,71 +971,73 @@ def analyze_variance(
     bet_scenarios: List[BetScenario],
     strategy: BetSizingStrategy,
     num_bets: int,
-    num_simulations: int = 1000
+    num_simulations: int = 1000,
+    seed: SeedLike = None
 ) -> Dict[str, Any]:
     """
     Detailed variance analysis of bankroll outcomes.
     """
-    results = []
-    for _ in range(num_simulations):
-        result = run_simulation(
-            starting_bankroll=starting_bankroll,
-            bet_scenarios=bet_scenarios,
-            strategy=strategy,
-            num_bets=num_bets,
-            track_trajectory=False
-        )
-        results.append(result)
+    batch = simulate_batch(
+        starting_bankroll=starting_bankroll,
+        bet_scenarios=bet_scenarios,
+        strategy=strategy,
+        num_bets=num_bets,
+        num_simulations=num_simulations,
+        track_trajectories=0,
+        seed=seed
+    )
 
-    final_bankrolls = [r.final_bankroll for r in results]
-    returns = [(f - starting_bankroll) / starting_bankroll * 100 for f in final_bankrolls]
+    final_bankrolls = np.round(batch.final_bankrolls, 2)
+    returns = (final_bankrolls - starting_bankroll) / starting_bankroll * 100
 
     # Calculate various variance metrics
-    variance = stdev(returns) ** 2 if len(returns) > 1 else 0
+    std_returns = float(returns.std(ddof=1)) if len(returns) > 1 else 0.0
+    variance = std_returns ** 2
 
     # Downside deviation (only negative returns)
-    negative_returns = [r for r in returns if r < 0]
-    downside_dev = stdev(negative_returns) if len(negative_returns) > 1 else 0
+    negative_returns = returns[returns < 0]
+    downside_dev = float(negative_returns.std(ddof=1)) if len(negative_returns) > 1 else 0
 
     # Sortino ratio (return / downside deviation)
-    avg_return = mean(returns)
+    avg_return = float(returns.mean())
     sortino = avg_return / downside_dev if downside_dev > 0 else float('inf')
 
     # Sharpe-like ratio (assuming 0 risk-free rate)
-    sharpe = avg_return / stdev(returns) if stdev(returns) > 0 else 0
+    sharpe = avg_return / std_returns if std_returns > 0 else 0
 
     return {
         "variance_analysis": {
             "mean_return": round(avg_return, 2),
             "variance": round(variance, 2),
-            "std_deviation": round(stdev(returns), 2) if len(returns) > 1 else 0,
+            "std_deviation": round(std_returns, 2),
             "downside_deviation": round(downside_dev, 2),
             "sharpe_ratio": round(sharpe, 3),
             "sortino_ratio": round(sortino, 3) if sortino != float('inf') else "Infinite (no losses)"
         },
         "distribution": {
-            "min_return": round(min(returns), 2),
-            "max_return": round(max(returns), 2),
-            "range": round(max(returns) - min(returns), 2),
+            "min_return": round(float(returns.min()), 2),
+            "max_return": round(float(returns.max()), 2),
+            "range": round(float(returns.max() - returns.min()), 2),
             "skewness": calculate_skewness(returns),
-            "positive_outcomes": sum(1 for r in returns if r > 0),
-            "negative_outcomes": sum(1 for r in returns if r < 0),
-            "break_even": sum(1 for r in returns if r == 0)
+            "positive_outcomes": int((returns > 0).sum()),
+            "negative_outcomes": int((returns < 0).sum()),
+            "break_even": int((returns == 0).sum())
         }
     }
 
 
-def calculate_skewness(data: List[float]) -> float:
+def calculate_skewness(data: Union[List[float], np.ndarray]) -> float:
     """Calculate skewness of distribution."""
     if len(data) < 3:
         return 0
 
-    n = len(data)
-    avg = mean(data)
-    std = stdev(data)
+    values = np.asarray(data, dtype=np.float64)
+    n = len(values)
+    avg = values.mean()
+    std = values.std(ddof=1)
 
     if std == 0:
         return 0
 
-    skew = sum((x - avg) ** 3 for x in data) / (n * std ** 3)
+    skew = float(((values - avg) ** 3).sum() / (n * std ** 3))
     return round(skew, 3)
@@ -12,10 +12,11 @@ Replaces rule-based ELO with deep learning ensemble:
 import math
 import json
 import hashlib
-import pickle
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
 import os
@@ -35,6 +36,18 @@ logger = get_logger(__name__)
 MODEL_VERSION = "1.0.0"
 MODEL_DIR = Path(__file__).parent.parent.parent / "models" / "trained"
 
+# Model artifacts: a directory of raw .npy arrays plus a JSON manifest
+ARTIFACT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+ACTIVE_POINTER_NAME = "active.json"
+
+# How often each worker checks the active-model pointer for hot swaps
+MODEL_RELOAD_INTERVAL_SECONDS = float(os.environ.get("MODEL_RELOAD_INTERVAL_SECONDS", "5"))
+
+
+class ArtifactError(ValueError):
+    """A model artifact is missing, malformed or fails its checksums."""
+
 
 class ModelType(str, Enum):
     FEEDFORWARD = "feedforward"
@@ -232,42 +245,60 @@ class FeatureEngineering:
 
         Returns feature matrix of shape (sequence_length, 8)
         """
-        sequence = []
+        return cls.extract_sequence_batch([team_game_history], sequence_length)[0]
+
+    @classmethod
+    def extract_sequence_batch(
+        cls,
+        histories: List[List[Dict[str, Any]]],
+        sequence_length: int = 10
+    ) -> np.ndarray:
+        """
+        Extract sequence features for many teams at once.
+
+        Histories shorter than ``sequence_length`` are left-padded with
+        empty games. Returns a tensor of shape (len(histories), sequence_length, 8)
+        """
+        pad = cls._sequence_row({})
+        batch = np.empty((len(histories), sequence_length, len(pad)), dtype=np.float32)
+        batch[:] = pad
 
-        # Pad if not enough history
-        history = team_game_history[-sequence_length:] if team_game_history else []
-        while len(history) < sequence_length:
-            history.insert(0, {})  # Pad with empty games
+        for row, history in enumerate(histories):
+            recent = history[-sequence_length:] if history and sequence_length else []
+            offset = sequence_length - len(recent)
+            for t, game in enumerate(recent):
+                batch[row, offset + t] = cls._sequence_row(game)
 
-        for game in history[-sequence_length:]:
-            game_features = [
-                # Win/loss (1 = win, 0 = loss, 0.5 = no data)
-                1.0 if game.get("won", None) is True else (0.0 if game.get("won") is False else 0.5),
+        return batch
 
-                # Score margin normalized
-                cls.normalize(game.get("margin", 0), -30, 30),
+    @classmethod
+    def _sequence_row(cls, game: Dict[str, Any]) -> List[float]:
+        """Features of one game in a team's history."""
+        return [
+            # Win/loss (1 = win, 0 = loss, 0.5 = no data)
+            1.0 if game.get("won", None) is True else (0.0 if game.get("won") is False else 0.5),
 
-                # Total points normalized
-                cls.normalize(game.get("total_points", 0), 30, 250),
+            # Score margin normalized
+            cls.normalize(game.get("margin", 0), -30, 30),
 
-                # Home/away indicator
-                1.0 if game.get("is_home", True) else 0.0,
+            # Total points normalized
+            cls.normalize(game.get("total_points", 0), 30, 250),
 
-                # Rest days before game
-                min(game.get("rest_days", 3) / 7, 1.0),
+            # Home/away indicator
+            1.0 if game.get("is_home", True) else 0.0,
 
-                # Against spread result
-                1.0 if game.get("covered_spread", None) is True else (0.0 if game.get("covered_spread") is False else 0.5),
+            # Rest days before game
+            min(game.get("rest_days", 3) / 7, 1.0),
 
-                # Over/under result
-                1.0 if game.get("went_over", None) is True else (0.0 if game.get("went_over") is False else 0.5),
+            # Against spread result
+            1.0 if game.get("covered_spread", None) is True else (0.0 if game.get("covered_spread") is False else 0.5),
 
-                # Opponent strength (ELO)
-                cls.normalize(game.get("opponent_elo", 1500), 1200, 1800),
-            ]
-            sequence.append(game_features)
+            # Over/under result
+            1.0 if game.get("went_over", None) is True else (0.0 if game.get("went_over") is False else 0.5),
 
-        return np.array(sequence, dtype=np.float32)
+            # Opponent strength (ELO)
+            cls.normalize(game.get("opponent_elo", 1500), 1200, 1800),
+        ]
 
 
 # =============================================================================
@@ -308,6 +339,36 @@ class NeuralLayer:
         self._last_output = output
         return output
 
+    def backward(self, grad_output: np.ndarray, pre_activation: bool = False) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Backward pass through the last forward call.
+
+        Args:
+            grad_output: Loss gradient w.r.t. the layer output (batch_size, output_size),
+                or w.r.t. the pre-activation when ``pre_activation`` is set
+                (e.g. ``probs - targets`` for softmax with cross-entropy)
+
+        Returns:
+            Gradient w.r.t. the layer input, and parameter gradients keyed like get_params
+        """
+        out = self._last_output
+        if pre_activation or self.activation not in ("relu", "sigmoid", "tanh", "softmax"):
+            grad_z = grad_output
+        elif self.activation == "relu":
+            grad_z = grad_output * (out > 0)
+        elif self.activation == "sigmoid":
+            grad_z = grad_output * out * (1 - out)
+        elif self.activation == "tanh":
+            grad_z = grad_output * (1 - out ** 2)
+        else:  # softmax
+            grad_z = out * (grad_output - np.sum(grad_output * out, axis=-1, keepdims=True))
+
+        grads = {
+            "weights": self._last_input.T @ grad_z,
+            "biases": grad_z.sum(axis=0),
+        }
+        return grad_z @ self.weights.T, grads
+
     def get_params(self) -> Dict[str, np.ndarray]:
         """Get layer parameters."""
         return {"weights": self.weights, "biases": self.biases}
@@ -356,6 +417,20 @@ class FeedforwardNetwork:
             "draw": float(probs[2]) if len(probs) > 2 else 0.0,
         }
 
+    def backward(self, grad_logits: np.ndarray) -> List[Dict[str, np.ndarray]]:
+        """
+        Backpropagate the loss gradient w.r.t. the output logits
+        (``probs - targets`` for cross-entropy) through the last forward call.
+
+        Returns parameter gradients shaped like get_params.
+        """
+        grads = []
+        grad = grad_logits
+        for i, layer in enumerate(reversed(self.layers)):
+            grad, layer_grads = layer.backward(grad, pre_activation=(i == 0))
+            grads.append(layer_grads)
+        return grads[::-1]
+
     def get_params(self) -> List[Dict[str, np.ndarray]]:
         """Get all network parameters."""
         return [layer.get_params() for layer in self.layers]
@@ -419,6 +494,104 @@ class LSTMCell:
 
         return h_next, c_next
 
+    def forward_sequence(self, sequence: np.ndarray, training: bool = False) -> np.ndarray:
+        """
+        Run a whole batch of sequences and return the final hidden state.
+
+        The four gate matrices are applied as one fused matrix, and the
+        input projection for every time step is a single matmul over
+        (batch * sequence_length) rows; only the recurrent h @ W_h product
+        runs per time step.
+
+        Args:
+            sequence: Input sequences (batch_size, sequence_length, input_size)
+            training: Keep per-step states and gates for backward_sequence
+
+        Returns:
+            Final hidden state (batch_size, hidden_size)
+        """
+        batch_size, steps, _ = sequence.shape
+        H = self.hidden_size
+
+        W = np.concatenate([self.Wf, self.Wi, self.Wc, self.Wo], axis=1)
+        b = np.concatenate([self.bf, self.bi, self.bc, self.bo])
+        W_x, W_h = W[:self.input_size], W[self.input_size:]
+
+        x_proj = (sequence.reshape(batch_size * steps, -1) @ W_x + b).reshape(batch_size, steps, 4 * H)
+
+        h = np.zeros((batch_size, H), dtype=np.float32)
+        c = np.zeros((batch_size, H), dtype=np.float32)
+        if training:
+            # Index t + 1 holds the state after step t; index 0 is the zero initial state
+            hs = np.zeros((batch_size, steps + 1, H), dtype=np.float32)
+            cs = np.zeros((batch_size, steps + 1, H), dtype=np.float32)
+            gates = np.empty((batch_size, steps, 4 * H), dtype=np.float32)
+
+        for t in range(steps):
+            z = x_proj[:, t] + h @ W_h
+            f = self._sigmoid(z[:, :H])
+            i = self._sigmoid(z[:, H:2 * H])
+            c_tilde = np.tanh(z[:, 2 * H:3 * H])
+            o = self._sigmoid(z[:, 3 * H:])
+            c = f * c + i * c_tilde
+            h = o * np.tanh(c)
+            if training:
+                hs[:, t + 1], cs[:, t + 1] = h, c
+                gates[:, t, :H], gates[:, t, H:2 * H] = f, i
+                gates[:, t, 2 * H:3 * H], gates[:, t, 3 * H:] = c_tilde, o
+
+        if training:
+            self._cache = (sequence, W_h, hs, cs, gates)
+        return h
+
+    def backward_sequence(self, grad_h: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Backpropagation through time for the last training forward_sequence.
+
+        Gate pre-activation gradients for all steps are collected first, so
+        the weight gradients are two matmuls over (batch * sequence_length)
+        rows; only the recurrent dh @ W_h.T product runs per time step.
+
+        Args:
+            grad_h: Loss gradient w.r.t. the final hidden state (batch_size, hidden_size)
+
+        Returns:
+            Parameter gradients keyed like get_params
+        """
+        sequence, W_h, hs, cs, gates = self._cache
+        batch_size, steps, _ = sequence.shape
+        H = self.hidden_size
+
+        grad_z = np.empty((batch_size, steps, 4 * H), dtype=np.float32)
+        dh = grad_h
+        dc = np.zeros((batch_size, H), dtype=np.float32)
+        for t in reversed(range(steps)):
+            f, i = gates[:, t, :H], gates[:, t, H:2 * H]
+            c_tilde, o = gates[:, t, 2 * H:3 * H], gates[:, t, 3 * H:]
+            tanh_c = np.tanh(cs[:, t + 1])
+
+            dc = dc + dh * o * (1 - tanh_c ** 2)
+            grad_z[:, t, :H] = dc * cs[:, t] * f * (1 - f)
+            grad_z[:, t, H:2 * H] = dc * c_tilde * i * (1 - i)
+            grad_z[:, t, 2 * H:3 * H] = dc * i * (1 - c_tilde ** 2)
+            grad_z[:, t, 3 * H:] = dh * tanh_c * o * (1 - o)
+
+            dh = grad_z[:, t] @ W_h.T
+            dc = dc * f
+
+        flat_z = grad_z.reshape(batch_size * steps, 4 * H)
+        dW = np.vstack([
+            sequence.reshape(batch_size * steps, -1).T @ flat_z,
+            hs[:, :-1].reshape(batch_size * steps, H).T @ flat_z,
+        ])
+        db = flat_z.sum(axis=0)
+
+        self._cache = None
+        return {
+            "Wf": dW[:, :H], "Wi": dW[:, H:2 * H], "Wc": dW[:, 2 * H:3 * H], "Wo": dW[:, 3 * H:],
+            "bf": db[:H], "bi": db[H:2 * H], "bc": db[2 * H:3 * H], "bo": db[3 * H:],
+        }
+
     def _sigmoid(self, x: np.ndarray) -> np.ndarray:
         """Numerically stable sigmoid."""
         return 1 / (1 + np.exp(-np.clip(x, -500, 500)))
@@ -452,28 +625,21 @@ class LSTMNetwork:
         self.lstm_cell = LSTMCell(config.sequence_features, config.lstm_units)
         self.output_layer = NeuralLayer(config.lstm_units, 3, activation="softmax")
 
-    def forward(self, sequence: np.ndarray) -> np.ndarray:
+    def forward(self, sequence: np.ndarray, training: bool = False) -> np.ndarray:
         """
         Forward pass through LSTM.
 
         Args:
             sequence: Input sequence (batch_size, sequence_length, features)
+            training: Keep intermediate states for backward
 
         Returns:
             Output probabilities (batch_size, 3)
         """
-        batch_size = sequence.shape[0] if sequence.ndim == 3 else 1
         if sequence.ndim == 2:
             sequence = sequence.reshape(1, *sequence.shape)
 
-        # Initialize hidden and cell states
-        h = np.zeros((batch_size, self.config.lstm_units), dtype=np.float32)
-        c = np.zeros((batch_size, self.config.lstm_units), dtype=np.float32)
-
-        # Process sequence
-        for t in range(sequence.shape[1]):
-            x_t = sequence[:, t, :]
-            h, c = self.lstm_cell.forward(x_t, h, c)
+        h = self.lstm_cell.forward_sequence(sequence, training=training)
 
         # Output layer on final hidden state
         output = self.output_layer.forward(h)
@@ -491,6 +657,17 @@ class LSTMNetwork:
             "draw": float(probs[2]) if len(probs) > 2 else 0.0,
         }
 
+    def backward(self, grad_logits: np.ndarray) -> Dict[str, Any]:
+        """
+        Backpropagate the loss gradient w.r.t. the output logits through the
+        last training forward pass. Returns gradients shaped like get_params.
+        """
+        grad_h, output_grads = self.output_layer.backward(grad_logits, pre_activation=True)
+        return {
+            "lstm": self.lstm_cell.backward_sequence(grad_h),
+            "output": output_grads,
+        }
+
     def get_params(self) -> Dict[str, Any]:
         """Get all network parameters."""
         return {
@@ -508,6 +685,15 @@ class LSTMNetwork:
 # Ensemble Model
 # =============================================================================
 
+def _as_outcomes(probs: np.ndarray) -> Dict[str, float]:
+    """Outcome dict from a (home_win, away_win, draw) row."""
+    return {
+        "home_win": float(probs[0]),
+        "away_win": float(probs[1]),
+        "draw": float(probs[2]),
+    }
+
+
 class NeuralEnsemble:
     """
     Ensemble model combining multiple prediction approaches.
@@ -551,52 +737,105 @@ class NeuralEnsemble:
 
         Returns combined prediction with component breakdowns.
         """
-        # Extract features
-        static_features = FeatureEngineering.extract_static_features(
-            sport, home_team_stats, away_team_stats, game_context, factor_scores
-        )
+        return self.predict_batch([{
+            "sport": sport,
+            "home_team_stats": home_team_stats,
+            "away_team_stats": away_team_stats,
+            "game_context": game_context,
+            "factor_scores": factor_scores,
+            "home_game_history": home_game_history,
+            "away_game_history": away_game_history,
+        }])[0]
+
+    def predict_batch(self, games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate ensemble predictions for a slate of games.
 
-        home_sequence = FeatureEngineering.extract_sequence_features(
-            home_game_history, self.config.sequence_length
-        )
-        away_sequence = FeatureEngineering.extract_sequence_features(
-            away_game_history, self.config.sequence_length
+        Each game is a dict with the keyword arguments of ``predict``.
+        Features for the whole slate are stacked into a (batch, features)
+        matrix and one (2 * batch, sequence_length, features) tensor holding
+        home then away histories, so each network runs once per slate.
+
+        Returns one prediction per game, in order, shaped like ``predict``.
+        """
+        if not games:
+            return []
+
+        static = np.stack([
+            FeatureEngineering.extract_static_features(
+                game["sport"],
+                game["home_team_stats"],
+                game["away_team_stats"],
+                game["game_context"],
+                game["factor_scores"],
+            )
+            for game in games
+        ])
+        sequences = FeatureEngineering.extract_sequence_batch(
+            [game.get("home_game_history") or [] for game in games] +
+            [game.get("away_game_history") or [] for game in games],
+            self.config.sequence_length
         )
 
-        # Get component predictions
-        ff_pred = self.feedforward.predict(static_features)
-        lstm_home_pred = self.lstm.predict(home_sequence)
-        lstm_away_pred = self.lstm.predict(away_sequence)
+        ff, lstm = self._network_probabilities(static, sequences)
 
-        # Combine LSTM predictions (average home and away perspectives)
-        lstm_pred = {
-            "home_win": (lstm_home_pred["home_win"] + (1 - lstm_away_pred["away_win"])) / 2,
-            "away_win": (lstm_home_pred["away_win"] + (1 - lstm_away_pred["home_win"])) / 2,
-            "draw": (lstm_home_pred["draw"] + lstm_away_pred["draw"]) / 2,
-        }
+        elo = self._elo_probabilities(
+            [game["home_team_stats"] for game in games],
+            [game["away_team_stats"] for game in games],
+        )
+
+        ensemble = self._combine_predictions(ff, lstm, elo)
+        confidence = self._calculate_confidence(ff, lstm, elo, ensemble)
+
+        results = []
+        for row in range(len(games)):
+            ensemble_pred = _as_outcomes(ensemble[row])
+            results.append({
+                "prediction": ensemble_pred,
+                "confidence": float(confidence[row]),
+                "components": {
+                    "feedforward": _as_outcomes(ff[row]),
+                    "lstm": _as_outcomes(lstm[row]),
+                    "elo": _as_outcomes(elo[row]),
+                },
+                "weights": self.ensemble_weights,
+                "model_version": self.version,
+                "recommended_side": "home" if ensemble_pred["home_win"] > ensemble_pred["away_win"] else "away",
+                "edge": abs(ensemble_pred["home_win"] - ensemble_pred["away_win"]) * 100,
+            })
+        return results
+
+    def _network_probabilities(
+        self,
+        static: np.ndarray,
+        sequences: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Feedforward and combined LSTM probabilities, each (batch, 3) with
+        columns (home_win, away_win, draw).
 
-        # ELO prediction
-        elo_pred = self._elo_prediction(home_team_stats, away_team_stats)
+        ``sequences`` holds the batch's home histories followed by its away
+        histories.
+        """
+        ff = self.feedforward.forward(static).astype(np.float64)
+        return ff, self._combine_lstm(self.lstm.forward(sequences))
 
-        # Ensemble combination
-        ensemble_pred = self._combine_predictions(ff_pred, lstm_pred, elo_pred)
+    def _combine_lstm(self, lstm_out: np.ndarray) -> np.ndarray:
+        """
+        Average the home and away perspectives of stacked LSTM outputs.
 
-        # Calculate confidence based on agreement
-        confidence = self._calculate_confidence(ff_pred, lstm_pred, elo_pred, ensemble_pred)
+        Each row gives (win, loss, draw) for the team whose history it read,
+        so an away row's win is the away side's and its loss the home side's.
+        """
+        lstm_out = lstm_out.astype(np.float64)
+        batch_size = len(lstm_out) // 2
+        lstm_home, lstm_away = lstm_out[:batch_size], lstm_out[batch_size:]
 
-        return {
-            "prediction": ensemble_pred,
-            "confidence": confidence,
-            "components": {
-                "feedforward": ff_pred,
-                "lstm": lstm_pred,
-                "elo": elo_pred,
-            },
-            "weights": self.ensemble_weights,
-            "model_version": self.version,
-            "recommended_side": "home" if ensemble_pred["home_win"] > ensemble_pred["away_win"] else "away",
-            "edge": abs(ensemble_pred["home_win"] - ensemble_pred["away_win"]) * 100,
-        }
+        return np.column_stack([
+            (lstm_home[:, 0] + lstm_away[:, 1]) / 2,
+            (lstm_home[:, 1] + lstm_away[:, 0]) / 2,
+            (lstm_home[:, 2] + lstm_away[:, 2]) / 2,
+        ])
 
     def _elo_prediction(
         self,
@@ -604,129 +843,199 @@ class NeuralEnsemble:
         away_stats: Dict[str, Any]
     ) -> Dict[str, float]:
         """Generate prediction from ELO ratings."""
-        home_elo = home_stats.get("elo_rating", 1500)
-        away_elo = away_stats.get("elo_rating", 1500)
+        return _as_outcomes(self._elo_probabilities([home_stats], [away_stats])[0])
+
+    def _elo_probabilities(
+        self,
+        home_stats: List[Dict[str, Any]],
+        away_stats: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """ELO win/loss/draw probabilities, shape (batch, 3)."""
+        home_elo = np.array([stats.get("elo_rating", 1500) for stats in home_stats], dtype=np.float64)
+        away_elo = np.array([stats.get("elo_rating", 1500) for stats in away_stats], dtype=np.float64)
+        is_soccer = np.array([stats.get("sport", "").upper() == "SOCCER" for stats in home_stats])
 
         # Standard ELO win probability formula
         elo_diff = home_elo - away_elo
         home_win_prob = 1 / (1 + 10 ** (-elo_diff / 400))
 
         # Add small draw probability for applicable sports
-        draw_prob = 0.0
-        if home_stats.get("sport", "").upper() == "SOCCER":
-            draw_prob = 0.25 * (1 - abs(home_win_prob - 0.5) * 2)
-            home_win_prob *= (1 - draw_prob)
+        draw_prob = np.where(is_soccer, 0.25 * (1 - np.abs(home_win_prob - 0.5) * 2), 0.0)
+        home_win_prob = home_win_prob * (1 - draw_prob)
 
-        return {
-            "home_win": home_win_prob,
-            "away_win": 1 - home_win_prob - draw_prob,
-            "draw": draw_prob,
-        }
+        return np.column_stack([home_win_prob, 1 - home_win_prob - draw_prob, draw_prob])
 
     def _combine_predictions(
         self,
-        ff_pred: Dict[str, float],
-        lstm_pred: Dict[str, float],
-        elo_pred: Dict[str, float]
-    ) -> Dict[str, float]:
+        ff_pred: np.ndarray,
+        lstm_pred: np.ndarray,
+        elo_pred: np.ndarray
+    ) -> np.ndarray:
         """Combine component predictions using ensemble weights."""
-        combined = {}
-        for key in ["home_win", "away_win", "draw"]:
-            combined[key] = (
-                ff_pred.get(key, 0) * self.ensemble_weights["feedforward"] +
-                lstm_pred.get(key, 0) * self.ensemble_weights["lstm"] +
-                elo_pred.get(key, 0) * self.ensemble_weights["elo"]
-            )
+        combined = (
+            ff_pred * self.ensemble_weights["feedforward"] +
+            lstm_pred * self.ensemble_weights["lstm"] +
+            elo_pred * self.ensemble_weights["elo"]
+        )
 
         # Normalize to ensure probabilities sum to 1
-        total = sum(combined.values())
-        if total > 0:
-            for key in combined:
-                combined[key] /= total
-
-        return combined
+        total = combined.sum(axis=1, keepdims=True)
+        return np.divide(combined, total, out=combined, where=total > 0)
 
     def _calculate_confidence(
         self,
-        ff_pred: Dict[str, float],
-        lstm_pred: Dict[str, float],
-        elo_pred: Dict[str, float],
-        ensemble_pred: Dict[str, float]
-    ) -> float:
+        ff_pred: np.ndarray,
+        lstm_pred: np.ndarray,
+        elo_pred: np.ndarray,
+        ensemble_pred: np.ndarray
+    ) -> np.ndarray:
         """
         Calculate prediction confidence based on model agreement.
 
         Higher confidence when all models agree on the outcome.
         """
-        # Get predicted winner from each model
-        predictions = [ff_pred, lstm_pred, elo_pred]
+        # Predicted winner of each model: 0 home, 1 away, 2 draw
         winners = []
-        for pred in predictions:
-            if pred["home_win"] > pred["away_win"] and pred["home_win"] > pred.get("draw", 0):
-                winners.append("home")
-            elif pred["away_win"] > pred.get("draw", 0):
-                winners.append("away")
-            else:
-                winners.append("draw")
+        for pred in (ff_pred, lstm_pred, elo_pred):
+            home, away, draw = pred[:, 0], pred[:, 1], pred[:, 2]
+            winners.append(np.where((home > away) & (home > draw), 0, np.where(away > draw, 1, 2)))
+        winners = np.column_stack(winners)
 
         # Count agreement
-        agreement = max(winners.count("home"), winners.count("away"), winners.count("draw")) / 3
+        counts = np.stack([(winners == outcome).sum(axis=1) for outcome in range(3)], axis=1)
+        agreement = counts.max(axis=1) / 3
 
         # Base confidence from ensemble probability spread
-        max_prob = max(ensemble_pred["home_win"], ensemble_pred["away_win"], ensemble_pred.get("draw", 0))
+        max_prob = ensemble_pred.max(axis=1)
         spread_confidence = (max_prob - 0.33) * 1.5  # 0.33 is random baseline for 3-way
 
         # Combine agreement and spread
         confidence = 0.5 * agreement + 0.5 * spread_confidence
 
-        return max(0.3, min(0.95, confidence))
+        return np.clip(confidence, 0.3, 0.95)
+
+    def _named_arrays(self) -> Dict[str, np.ndarray]:
+        """All weight arrays, keyed by their artifact names."""
+        arrays = {}
+        for i, layer in enumerate(self.feedforward.get_params()):
+            for key, value in layer.items():
+                arrays[f"feedforward.{i}.{key}"] = value
+        lstm = self.lstm.get_params()
+        for key, value in lstm["lstm"].items():
+            arrays[f"lstm.{key}"] = value
+        for key, value in lstm["output"].items():
+            arrays[f"lstm.output.{key}"] = value
+        return arrays
+
+    def _set_named_arrays(self, arrays: Dict[str, np.ndarray]):
+        self.feedforward.set_params([
+            {key: arrays[f"feedforward.{i}.{key}"] for key in ("weights", "biases")}
+            for i in range(len(self.feedforward.layers))
+        ])
+        self.lstm.set_params({
+            "lstm": {key: arrays[f"lstm.{key}"] for key in self.lstm.lstm_cell.get_params()},
+            "output": {key: arrays[f"lstm.output.{key}"] for key in ("weights", "biases")},
+        })
 
     def save(self, path: Optional[str] = None) -> str:
-        """Save model to disk."""
+        """
+        Save model to disk as an artifact directory.
+
+        Each weight array is a raw .npy file; manifest.json holds the
+        metadata, configuration and a SHA-256 checksum per array. The
+        directory is written under a temporary name and renamed into place,
+        so readers never see a partial artifact.
+        """
         MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
         if path is None:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            path = MODEL_DIR / f"ensemble_{self.version}_{timestamp}.pkl"
+            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+            path = MODEL_DIR / f"ensemble_{self.version}_{timestamp}"
+        path = Path(path)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.mkdir(parents=True, exist_ok=True)
+
+        arrays = {}
+        for name, value in self._named_arrays().items():
+            filename = f"{name}.npy"
+            np.save(tmp_path / filename, np.ascontiguousarray(value), allow_pickle=False)
+            arrays[name] = {
+                "file": filename,
+                "dtype": str(value.dtype),
+                "shape": list(value.shape),
+                "sha256": _file_sha256(tmp_path / filename),
+            }
 
-        model_data = {
+        manifest = {
+            "format": ARTIFACT_FORMAT,
             "version": self.version,
-            "config": self.config,
             "created_at": self.created_at.isoformat(),
             "trained_on_games": self.trained_on_games,
-            "accuracy_history": self.accuracy_history,
+            "accuracy_history": [float(a) for a in self.accuracy_history],
             "ensemble_weights": self.ensemble_weights,
-            "feedforward_params": self.feedforward.get_params(),
-            "lstm_params": self.lstm.get_params(),
+            "config": asdict(self.config),
+            "arrays": arrays,
         }
+        with open(tmp_path / MANIFEST_NAME, "w") as f:
+            json.dump(manifest, f, indent=2)
 
-        with open(path, "wb") as f:
-            pickle.dump(model_data, f)
-
+        os.replace(tmp_path, path)
         logger.info(f"Model saved to {path}")
         return str(path)
 
     @classmethod
-    def load(cls, path: str) -> "NeuralEnsemble":
-        """Load model from disk."""
-        with open(path, "rb") as f:
-            model_data = pickle.load(f)
-
-        config = model_data["config"]
-        ensemble = cls(config)
-
-        ensemble.version = model_data["version"]
-        ensemble.created_at = datetime.fromisoformat(model_data["created_at"])
-        ensemble.trained_on_games = model_data["trained_on_games"]
-        ensemble.accuracy_history = model_data["accuracy_history"]
-        ensemble.ensemble_weights = model_data["ensemble_weights"]
-        ensemble.feedforward.set_params(model_data["feedforward_params"])
-        ensemble.lstm.set_params(model_data["lstm_params"])
+    def load(cls, path: str, mmap: bool = True, verify: bool = True) -> "NeuralEnsemble":
+        """
+        Load model from an artifact directory.
+
+        With ``mmap`` the weights are read-only memory maps, so every
+        process loading the same artifact shares one copy of its pages.
+        No pickled objects are read.
+
+        Raises:
+            ArtifactError: If the manifest is missing or unsupported, or an
+                array does not match its checksum, dtype or shape
+        """
+        path = Path(path)
+        manifest_path = path / MANIFEST_NAME
+        if not manifest_path.is_file():
+            raise ArtifactError(f"No model manifest in {path}")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != ARTIFACT_FORMAT:
+            raise ArtifactError(f"Unsupported model artifact format {manifest.get('format')} in {path}")
+
+        arrays = {}
+        for name, spec in manifest["arrays"].items():
+            array_path = path / spec["file"]
+            if verify and _file_sha256(array_path) != spec["sha256"]:
+                raise ArtifactError(f"Checksum mismatch for {name} in {path}")
+            array = np.load(array_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+            if str(array.dtype) != spec["dtype"] or list(array.shape) != spec["shape"]:
+                raise ArtifactError(f"Array {name} in {path} does not match its manifest")
+            arrays[name] = array
+
+        ensemble = cls(ModelConfig(**manifest["config"]))
+        ensemble._set_named_arrays(arrays)
+
+        ensemble.version = manifest["version"]
+        ensemble.created_at = datetime.fromisoformat(manifest["created_at"])
+        ensemble.trained_on_games = manifest["trained_on_games"]
+        ensemble.accuracy_history = manifest["accuracy_history"]
+        ensemble.ensemble_weights = manifest["ensemble_weights"]
 
         logger.info(f"Model loaded from {path}, version {ensemble.version}")
         return ensemble
 
 
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 # =============================================================================
 # Model Manager
 # =============================================================================
@@ -734,45 +1043,187 @@ class NeuralEnsemble:
 class ModelManager:
     """
     Manages model versioning, loading, and deployment.
+
+    Saved models are artifact directories in MODEL_DIR, identified by their
+    directory name. The active model and an optional A/B split between
+    artifacts are recorded in MODEL_DIR/active.json; every worker rereads
+    that pointer at most every MODEL_RELOAD_INTERVAL_SECONDS and swaps
+    models without a restart.
     """
 
     _active_model: Optional[NeuralEnsemble] = None
+    _active_id: Optional[str] = None
     _model_registry: Dict[str, Dict[str, Any]] = {}
+    _loaded: Dict[str, NeuralEnsemble] = {}
+    _split: Dict[str, float] = {}
+    _pointer_mtime: Optional[float] = None
+    _checked_at: float = 0.0
+    _lock = threading.RLock()
 
     @classmethod
     def get_active_model(cls) -> NeuralEnsemble:
         """Get the currently active model, loading default if needed."""
+        cls._refresh()
         if cls._active_model is None:
-            cls._active_model = cls._load_or_create_default()
+            with cls._lock:
+                if cls._active_model is None:
+                    cls._active_model = cls._load_or_create_default()
         return cls._active_model
 
+    @classmethod
+    def get_model(cls, routing_key: Optional[str] = None) -> NeuralEnsemble:
+        """
+        Model serving ``routing_key`` (e.g. a user id).
+
+        With an A/B split each key is hashed to a stable bucket, so the same
+        key always gets the same model while the split is unchanged. Without
+        a split or a key, the active model.
+        """
+        model = cls.get_active_model()
+        split = cls._split
+        if not split or routing_key is None:
+            return model
+
+        bucket = int(hashlib.sha256(str(routing_key).encode()).hexdigest()[:8], 16) / 0x100000000
+        cumulative = 0.0
+        for model_id, weight in split.items():
+            cumulative += weight
+            if bucket < cumulative:
+                return cls._get_loaded(model_id)
+        return cls._get_loaded(model_id)
+
+    @classmethod
+    def _pointer_path(cls) -> Path:
+        return MODEL_DIR / ACTIVE_POINTER_NAME
+
+    @classmethod
+    def _artifact_path(cls, model_id: str) -> Path:
+        path = MODEL_DIR / model_id
+        if not model_id.startswith("ensemble_") or path.parent != MODEL_DIR or not (path / MANIFEST_NAME).is_file():
+            raise ArtifactError(f"Unknown model artifact: {model_id}")
+        return path
+
+    @classmethod
+    def _get_loaded(cls, model_id: str) -> NeuralEnsemble:
+        """Load an artifact once per process."""
+        with cls._lock:
+            model = cls._loaded.get(model_id)
+            if model is None:
+                model = NeuralEnsemble.load(str(cls._artifact_path(model_id)))
+                cls._loaded[model_id] = model
+            return model
+
+    @classmethod
+    def _read_pointer(cls) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cls._pointer_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def _write_pointer(cls):
+        pointer = {
+            "active": cls._active_id,
+            "split": cls._split,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        MODEL_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cls._pointer_path().with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(pointer, f)
+        os.replace(tmp_path, cls._pointer_path())
+        cls._pointer_mtime = cls._pointer_path().stat().st_mtime
+
+    @classmethod
+    def _refresh(cls):
+        """Apply pointer changes made by other workers, at most every reload interval."""
+        now = time.monotonic()
+        if now - cls._checked_at < MODEL_RELOAD_INTERVAL_SECONDS:
+            return
+        cls._checked_at = now
+
+        try:
+            mtime = cls._pointer_path().stat().st_mtime
+        except OSError:
+            return
+        if mtime == cls._pointer_mtime:
+            return
+
+        pointer = cls._read_pointer()
+        if pointer is None:
+            return
+        try:
+            with cls._lock:
+                if pointer.get("active") and pointer["active"] != cls._active_id:
+                    cls._active_model = cls._get_loaded(pointer["active"])
+                    cls._active_id = pointer["active"]
+                    logger.info(f"Active model swapped to {cls._active_id}")
+                for model_id in pointer.get("split") or {}:
+                    cls._get_loaded(model_id)
+                cls._split = pointer.get("split") or {}
+                cls._pointer_mtime = mtime
+        except Exception as e:
+            logger.warning(f"Failed to apply model pointer: {e}")
+
     @classmethod
     def _load_or_create_default(cls) -> NeuralEnsemble:
-        """Load latest model or create new default."""
+        """Load the model named by the pointer, else the latest artifact, else a new default."""
         MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Try to find latest saved model
-        model_files = list(MODEL_DIR.glob("ensemble_*.pkl"))
-        if model_files:
-            latest = max(model_files, key=lambda p: p.stat().st_mtime)
+        pointer = cls._read_pointer()
+        candidates = [pointer["active"]] if pointer and pointer.get("active") else []
+        candidates += [artifact["id"] for artifact in cls.list_artifacts()]
+        for model_id in candidates:
             try:
-                return NeuralEnsemble.load(str(latest))
+                model = cls._get_loaded(model_id)
+                cls._active_id = model_id
+                return model
             except Exception as e:
-                logger.warning(f"Failed to load model {latest}: {e}")
+                logger.warning(f"Failed to load model {model_id}: {e}")
 
         # Create new default model
         logger.info("Creating new default neural ensemble model")
         return NeuralEnsemble()
 
+    @classmethod
+    def list_artifacts(cls) -> List[Dict[str, Any]]:
+        """Saved model artifacts in MODEL_DIR, newest first."""
+        artifacts = []
+        for manifest_path in MODEL_DIR.glob(f"ensemble_*/{MANIFEST_NAME}"):
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            artifacts.append({
+                "id": manifest_path.parent.name,
+                "version": manifest.get("version"),
+                "created_at": manifest.get("created_at"),
+                "trained_on_games": manifest.get("trained_on_games"),
+                "accuracy": (manifest.get("accuracy_history") or [None])[-1],
+                "path": str(manifest_path.parent),
+            })
+        return sorted(artifacts, key=lambda a: (a["created_at"] or "", a["id"]), reverse=True)
+
     @classmethod
     def register_model(
         cls,
         model: NeuralEnsemble,
         name: str,
-        description: str = ""
+        description: str = "",
+        path: Optional[str] = None
     ) -> str:
-        """Register a model in the registry."""
-        model_id = hashlib.md5(f"{name}_{datetime.utcnow().isoformat()}".encode()).hexdigest()[:12]
+        """
+        Register a model in the registry.
+
+        A saved model is registered under its artifact id, so it can be
+        activated or put in an A/B split.
+        """
+        if path is not None:
+            model_id = Path(path).name
+        else:
+            model_id = hashlib.md5(f"{name}_{datetime.utcnow().isoformat()}".encode()).hexdigest()[:12]
 
         cls._model_registry[model_id] = {
             "name": name,
@@ -781,29 +1232,80 @@ class ModelManager:
             "created_at": model.created_at.isoformat(),
             "trained_on_games": model.trained_on_games,
             "accuracy": model.accuracy_history[-1] if model.accuracy_history else None,
+            "path": path,
         }
 
         return model_id
 
     @classmethod
     def set_active_model(cls, model: NeuralEnsemble):
-        """Set the active model for predictions."""
-        cls._active_model = model
+        """Set the active model for predictions in this process."""
+        with cls._lock:
+            cls._active_model = model
+            cls._active_id = None
         logger.info(f"Active model set to version {model.version}")
 
+    @classmethod
+    def activate(cls, model_id: str) -> NeuralEnsemble:
+        """
+        Hot-swap the active model to a saved artifact in every worker.
+
+        Raises:
+            ArtifactError: If the artifact does not exist or fails to load
+        """
+        with cls._lock:
+            model = cls._get_loaded(model_id)
+            cls._active_model = model
+            cls._active_id = model_id
+            cls._write_pointer()
+        logger.info(f"Active model set to {model_id}, version {model.version}")
+        return model
+
+    @classmethod
+    def set_ab_split(cls, split: Dict[str, float]) -> Dict[str, float]:
+        """
+        Route traffic between saved artifacts by weight in every worker.
+
+        Weights are normalized to sum to 1. An empty split routes all
+        traffic to the active model.
+
+        Raises:
+            ArtifactError: If an artifact does not exist or fails to load
+            ValueError: If a weight is negative or all weights are zero
+        """
+        if any(weight < 0 for weight in split.values()):
+            raise ValueError("Split weights must not be negative")
+        total = sum(split.values())
+        if split and total <= 0:
+            raise ValueError("Split weights must not all be zero")
+
+        with cls._lock:
+            for model_id in split:
+                cls._get_loaded(model_id)
+            cls._split = {model_id: weight / total for model_id, weight in split.items() if weight > 0}
+            cls._write_pointer()
+        return cls._split
+
     @classmethod
     def list_models(cls) -> List[Dict[str, Any]]:
-        """List all registered models."""
-        return [
+        """List all registered models and saved artifacts."""
+        models = [
             {"id": model_id, **info}
             for model_id, info in cls._model_registry.items()
         ]
+        models += [
+            artifact for artifact in cls.list_artifacts()
+            if artifact["id"] not in cls._model_registry
+        ]
+        return models
 
     @classmethod
     def get_model_info(cls) -> Dict[str, Any]:
         """Get information about the active model."""
         model = cls.get_active_model()
         return {
+            "id": cls._active_id,
+            "ab_split": cls._split,
             "version": model.version,
             "created_at": model.created_at.isoformat(),
             "trained_on_games": model.trained_on_games,
@@ -830,6 +1332,9 @@ def train_ensemble(
     """
     Train the neural ensemble on historical game data.
 
+    Runs in the calling thread; use neural_training.start_training to
+    train in the background.
+
     Args:
         training_data: List of game records with features and outcomes
         validation_split: Fraction of data for validation
@@ -838,103 +1343,9 @@ def train_ensemble(
     Returns:
         Trained NeuralEnsemble model
     """
-    config = config or ModelConfig()
-    model = NeuralEnsemble(config)
-
-    if not training_data:
-        logger.warning("No training data provided, returning untrained model")
-        return model
-
-    # Prepare features and labels
-    X_static = []
-    X_sequence_home = []
-    X_sequence_away = []
-    y = []
-
-    for game in training_data:
-        # Extract static features
-        static = FeatureEngineering.extract_static_features(
-            game.get("sport", "NFL"),
-            game.get("home_team_stats", {}),
-            game.get("away_team_stats", {}),
-            game.get("game_context", {}),
-            game.get("factor_scores", {})
-        )
-        X_static.append(static)
-
-        # Extract sequence features
-        home_seq = FeatureEngineering.extract_sequence_features(
-            game.get("home_game_history", []),
-            config.sequence_length
-        )
-        away_seq = FeatureEngineering.extract_sequence_features(
-            game.get("away_game_history", []),
-            config.sequence_length
-        )
-        X_sequence_home.append(home_seq)
-        X_sequence_away.append(away_seq)
-
-        # Label (one-hot: [home_win, away_win, draw])
-        outcome = game.get("outcome", "home")
-        if outcome == "home":
-            y.append([1, 0, 0])
-        elif outcome == "away":
-            y.append([0, 1, 0])
-        else:
-            y.append([0, 0, 1])
-
-    X_static = np.array(X_static)
-    X_sequence_home = np.array(X_sequence_home)
-    X_sequence_away = np.array(X_sequence_away)
-    y = np.array(y)
-
-    # Split data
-    n_val = int(len(y) * validation_split)
-    indices = np.random.permutation(len(y))
-    val_idx = indices[:n_val]
-    train_idx = indices[n_val:]
-
-    logger.info(f"Training on {len(train_idx)} games, validating on {n_val}")
-
-    # Simple training loop (gradient descent simulation)
-    # In production, this would use proper backpropagation
-    best_accuracy = 0
-    for epoch in range(config.epochs):
-        # Shuffle training data
-        np.random.shuffle(train_idx)
-
-        # Mini-batch training simulation
-        for batch_start in range(0, len(train_idx), config.batch_size):
-            batch_idx = train_idx[batch_start:batch_start + config.batch_size]
-
-            # Forward pass and parameter perturbation (simplified training)
-            for layer in model.feedforward.layers:
-                # Add small random perturbations (evolutionary approach)
-                layer.weights += np.random.randn(*layer.weights.shape) * 0.001
-                layer.biases += np.random.randn(*layer.biases.shape) * 0.001
-
-        # Validation accuracy
-        correct = 0
-        for idx in val_idx:
-            pred = model.feedforward.forward(X_static[idx:idx+1])
-            pred_class = np.argmax(pred)
-            true_class = np.argmax(y[idx])
-            if pred_class == true_class:
-                correct += 1
-
-        accuracy = correct / len(val_idx) if val_idx.size > 0 else 0
-        model.accuracy_history.append(accuracy)
+    from app.services.neural_training import train_model
 
-        if accuracy > best_accuracy:
-            best_accuracy = accuracy
-
-        if (epoch + 1) % 10 == 0:
-            logger.info(f"Epoch {epoch + 1}/{config.epochs}, Val Accuracy: {accuracy:.4f}")
-
-    model.trained_on_games = len(training_data)
-    logger.info(f"Training complete. Best validation accuracy: {best_accuracy:.4f}")
-
-    return model
+    return train_model(training_data, validation_split, config)
 
 
 # =============================================================================
@@ -951,11 +1362,14 @@ def predict_game(
     factor_scores: Dict[str, float],
     home_history: List[Dict[str, Any]] = None,
     away_history: List[Dict[str, Any]] = None,
+    routing_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Convenience function to get neural ensemble prediction for a game.
+
+    ``routing_key`` (e.g. a user id) picks the model under an A/B split.
     """
-    model = ModelManager.get_active_model()
+    model = ModelManager.get_model(routing_key)
 
     return model.predict(
         sport=sport,
@@ -968,6 +1382,30 @@ def predict_game(
     )
 
 
+def predict_games(games: List[Dict[str, Any]], routing_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Neural ensemble predictions for a slate of games in one batch.
+
+    Each game is a dict with the keyword arguments of ``predict_game``
+    (``sport``, ``home_stats``, ``away_stats``, ``game_context``,
+    ``factor_scores`` and optionally ``home_history``/``away_history``).
+    """
+    model = ModelManager.get_model(routing_key)
+
+    return model.predict_batch([
+        {
+            "sport": game["sport"],
+            "home_team_stats": {**game["home_stats"], "sport": game["sport"]},
+            "away_team_stats": {**game["away_stats"], "sport": game["sport"]},
+            "game_context": game["game_context"],
+            "factor_scores": game["factor_scores"],
+            "home_game_history": game.get("home_history") or [],
+            "away_game_history": game.get("away_history") or [],
+        }
+        for game in games
+    ])
+
+
 def get_model_comparison(
     sport: str,
     home_stats: Dict[str, Any],
@@ -978,24 +1416,32 @@ def get_model_comparison(
     """
     Compare predictions across all model components.
     """
-    prediction = predict_game(
-        sport=sport,
-        home_team="Home",
-        away_team="Away",
-        home_stats=home_stats,
-        away_stats=away_stats,
-        game_context=game_context,
-        factor_scores=factor_scores,
-    )
+    return get_model_comparisons([{
+        "sport": sport,
+        "home_stats": home_stats,
+        "away_stats": away_stats,
+        "game_context": game_context,
+        "factor_scores": factor_scores,
+    }])[0]
 
-    return {
-        "ensemble": prediction["prediction"],
-        "feedforward": prediction["components"]["feedforward"],
-        "lstm": prediction["components"]["lstm"],
-        "elo": prediction["components"]["elo"],
-        "confidence": prediction["confidence"],
-        "model_agreement": _calculate_model_agreement(prediction["components"]),
-    }
+
+def get_model_comparisons(games: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Compare component predictions for a slate of games in one batch.
+
+    Games take the same keys as ``predict_games``.
+    """
+    return [
+        {
+            "ensemble": prediction["prediction"],
+            "feedforward": prediction["components"]["feedforward"],
+            "lstm": prediction["components"]["lstm"],
+            "elo": prediction["components"]["elo"],
+            "confidence": prediction["confidence"],
+            "model_agreement": _calculate_model_agreement(prediction["components"]),
+        }
+        for prediction in predict_games(games)
+    ]
 
 
 def _calculate_model_agreement(components: Dict[str, Dict[str, float]]) -> str:
@@ -0,0 +1,399 @@
+"""
+Neural Ensemble Training
+
+Backpropagation trainer for the neural ensemble:
+- Features for all games are extracted once into (games, 24) static and
+  (games, sequence_length, 8) sequence tensors
+- Mini-batch gradient descent with Adam on cross-entropy, through the
+  feedforward layers and through time for the LSTM
+- Batched validation after every epoch, early stopping on validation loss,
+  and the best epoch's weights are kept
+
+Training jobs run in a separate process so they never block the API; the
+trained model is checkpointed with NeuralEnsemble.save and activated in
+every worker through ModelManager.activate once the job finishes.
+
+Usage:
+    status = start_training(training_data, validation_split=0.2)
+    get_training_job()
+"""
+
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.neural_ensemble import (
+    FeatureEngineering,
+    ModelConfig,
+    ModelManager,
+    NeuralEnsemble,
+)
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# Train in a child process (set to false to train in a thread of the API process)
+NEURAL_TRAINING_IN_PROCESS = os.environ.get("NEURAL_TRAINING_IN_PROCESS", "true").lower() in ("true", "1", "yes")
+
+OUTCOMES = {"home": 0, "away": 1, "draw": 2}
+# Outcome index as seen by the away team
+SIDE_SWAP = np.array([OUTCOMES["away"], OUTCOMES["home"], OUTCOMES["draw"]])
+
+
+# =============================================================================
+# Training Data
+# =============================================================================
+
+@dataclass
+class TrainingTensors:
+    """Features and labels of a set of games."""
+    static: np.ndarray          # (games, static_features)
+    home_sequences: np.ndarray  # (games, sequence_length, sequence_features)
+    away_sequences: np.ndarray  # (games, sequence_length, sequence_features)
+    elo: np.ndarray             # (games, 3) ELO component probabilities
+    labels: np.ndarray          # (games,) 0 home win, 1 away win, 2 draw
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+def build_tensors(model: NeuralEnsemble, training_data: List[Dict[str, Any]]) -> TrainingTensors:
+    """Extract features of every game in one pass."""
+    home_stats = []
+    away_stats = []
+    static = np.empty((len(training_data), model.config.static_features), dtype=np.float32)
+
+    for row, game in enumerate(training_data):
+        sport = game.get("sport", "NFL")
+        home = {**game.get("home_team_stats", {}), "sport": sport}
+        away = {**game.get("away_team_stats", {}), "sport": sport}
+        home_stats.append(home)
+        away_stats.append(away)
+        static[row] = FeatureEngineering.extract_static_features(
+            sport, home, away, game.get("game_context", {}), game.get("factor_scores", {})
+        )
+
+    return TrainingTensors(
+        static=static,
+        home_sequences=FeatureEngineering.extract_sequence_batch(
+            [game.get("home_game_history", []) for game in training_data],
+            model.config.sequence_length
+        ),
+        away_sequences=FeatureEngineering.extract_sequence_batch(
+            [game.get("away_game_history", []) for game in training_data],
+            model.config.sequence_length
+        ),
+        elo=model._elo_probabilities(home_stats, away_stats),
+        labels=np.array([OUTCOMES.get(game.get("outcome", "home"), 2) for game in training_data], dtype=np.int64),
+    )
+
+
+# =============================================================================
+# Optimizer
+# =============================================================================
+
+class AdamOptimizer:
+    """Adam over a fixed list of parameter arrays, updated in place."""
+
+    def __init__(
+        self,
+        params: List[np.ndarray],
+        learning_rate: float = 0.001,
+        beta1: float = 0.9,
+        beta2: float = 0.999,
+        epsilon: float = 1e-8
+    ):
+        self.params = params
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.t = 0
+        self.m = [np.zeros_like(p) for p in params]
+        self.v = [np.zeros_like(p) for p in params]
+
+    def step(self, grads: List[np.ndarray]):
+        """Apply one update from gradients ordered like ``params``."""
+        self.t += 1
+        lr = self.learning_rate * np.sqrt(1 - self.beta2 ** self.t) / (1 - self.beta1 ** self.t)
+        for param, grad, m, v in zip(self.params, grads, self.m, self.v):
+            m *= self.beta1
+            m += (1 - self.beta1) * grad
+            v *= self.beta2
+            v += (1 - self.beta2) * grad * grad
+            param -= lr * m / (np.sqrt(v) + self.epsilon)
+
+
+def _parameters(model: NeuralEnsemble) -> List[np.ndarray]:
+    """Trainable arrays of the model, in the order of _gradients."""
+    params = []
+    for layer in model.feedforward.get_params():
+        params += [layer["weights"], layer["biases"]]
+    lstm = model.lstm.get_params()
+    params += [lstm["lstm"][name] for name in ("Wf", "Wi", "Wc", "Wo", "bf", "bi", "bc", "bo")]
+    params += [lstm["output"]["weights"], lstm["output"]["biases"]]
+    return params
+
+
+def _gradients(ff_grads: List[Dict[str, np.ndarray]], lstm_grads: Dict[str, Any]) -> List[np.ndarray]:
+    grads = []
+    for layer in ff_grads:
+        grads += [layer["weights"], layer["biases"]]
+    grads += [lstm_grads["lstm"][name] for name in ("Wf", "Wi", "Wc", "Wo", "bf", "bi", "bc", "bo")]
+    grads += [lstm_grads["output"]["weights"], lstm_grads["output"]["biases"]]
+    return grads
+
+
+# =============================================================================
+# Training Loop
+# =============================================================================
+
+def _cross_entropy(probs: np.ndarray, labels: np.ndarray) -> float:
+    picked = probs[np.arange(len(labels)), labels]
+    return float(-np.mean(np.log(np.clip(picked, 1e-12, 1.0))))
+
+
+def _one_hot(labels: np.ndarray) -> np.ndarray:
+    targets = np.zeros((len(labels), 3), dtype=np.float32)
+    targets[np.arange(len(labels)), labels] = 1.0
+    return targets
+
+
+def _lstm_labels(labels: np.ndarray) -> np.ndarray:
+    """
+    Labels of the stacked (home, away) LSTM rows.
+
+    Each row is read from its own team's side: "home" means that team won,
+    so away rows get home and away swapped.
+    """
+    return np.concatenate([labels, SIDE_SWAP[labels]])
+
+
+def evaluate(model: NeuralEnsemble, tensors: TrainingTensors, idx: np.ndarray) -> Dict[str, float]:
+    """Batched losses and accuracies of each component and the ensemble."""
+    if len(idx) == 0:
+        return {}
+
+    labels = tensors.labels[idx]
+    sequences = np.concatenate([tensors.home_sequences[idx], tensors.away_sequences[idx]])
+    ff = model.feedforward.forward(tensors.static[idx])
+    lstm_out = model.lstm.forward(sequences)
+    lstm = model._combine_lstm(lstm_out)
+    ensemble = model._combine_predictions(ff, lstm, tensors.elo[idx])
+
+    ff_loss = _cross_entropy(ff, labels)
+    lstm_loss = _cross_entropy(lstm_out, _lstm_labels(labels))
+    return {
+        "loss": ff_loss + lstm_loss,
+        "feedforward_loss": ff_loss,
+        "lstm_loss": lstm_loss,
+        "feedforward_accuracy": float(np.mean(ff.argmax(axis=1) == labels)),
+        "lstm_accuracy": float(np.mean(lstm.argmax(axis=1) == labels)),
+        "accuracy": float(np.mean(ensemble.argmax(axis=1) == labels)),
+    }
+
+
+def fit(
+    model: NeuralEnsemble,
+    tensors: TrainingTensors,
+    validation_split: float = 0.2,
+    seed: Optional[int] = None,
+    on_epoch: Optional[Callable[[int, Dict[str, float]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Train the feedforward and LSTM components in place.
+
+    Both networks minimise cross-entropy against the game outcome. The
+    LSTM reads home and away histories as separate rows, each labelled
+    from its own team's side, which is how NeuralEnsemble.predict reads
+    its outputs. Stops
+    after ``config.early_stopping_patience`` epochs without a lower
+    validation loss and restores the best epoch's weights.
+
+    Returns a summary of the run.
+    """
+    config = model.config
+    rng = np.random.default_rng(seed)
+
+    n_val = int(len(tensors) * validation_split)
+    indices = rng.permutation(len(tensors))
+    val_idx, train_idx = indices[:n_val], indices[n_val:]
+    # Without a validation set, stop on training loss instead
+    monitor_idx = val_idx if n_val else train_idx
+
+    logger.info(f"Training on {len(train_idx)} games, validating on {n_val}")
+
+    params = _parameters(model)
+    optimizer = AdamOptimizer(params, learning_rate=config.learning_rate)
+    best_loss = float("inf")
+    best_params = [p.copy() for p in params]
+    best_epoch = 0
+    history = []
+
+    for epoch in range(1, config.epochs + 1):
+        rng.shuffle(train_idx)
+
+        for batch_start in range(0, len(train_idx), config.batch_size):
+            batch_idx = train_idx[batch_start:batch_start + config.batch_size]
+            targets = _one_hot(tensors.labels[batch_idx])
+
+            ff_probs = model.feedforward.forward(tensors.static[batch_idx])
+            ff_grads = model.feedforward.backward((ff_probs - targets) / len(batch_idx))
+
+            sequences = np.concatenate([tensors.home_sequences[batch_idx], tensors.away_sequences[batch_idx]])
+            lstm_probs = model.lstm.forward(sequences, training=True)
+            lstm_targets = _one_hot(_lstm_labels(tensors.labels[batch_idx]))
+            lstm_grads = model.lstm.backward((lstm_probs - lstm_targets) / len(sequences))
+
+            optimizer.step(_gradients(ff_grads, lstm_grads))
+
+        metrics = evaluate(model, tensors, monitor_idx)
+        history.append(metrics)
+        model.accuracy_history.append(metrics["accuracy"])
+        if on_epoch:
+            on_epoch(epoch, metrics)
+
+        if metrics["loss"] < best_loss:
+            best_loss = metrics["loss"]
+            best_epoch = epoch
+            best_params = [p.copy() for p in params]
+        elif epoch - best_epoch >= config.early_stopping_patience:
+            logger.info(f"Early stopping at epoch {epoch}, best epoch {best_epoch}")
+            break
+
+        if epoch % 10 == 0:
+            logger.info(f"Epoch {epoch}/{config.epochs}, Val Loss: {metrics['loss']:.4f}, "
+                        f"Val Accuracy: {metrics['accuracy']:.4f}")
+
+    for param, best in zip(params, best_params):
+        param[...] = best
+
+    return {
+        "train_games": len(train_idx),
+        "validation_games": n_val,
+        "epochs_run": len(history),
+        "best_epoch": best_epoch,
+        "validation": history[best_epoch - 1] if best_epoch else {},
+    }
+
+
+def train_model(
+    training_data: List[Dict[str, Any]],
+    validation_split: float = 0.2,
+    config: Optional[ModelConfig] = None,
+    seed: Optional[int] = None
+) -> NeuralEnsemble:
+    """Build a fresh ensemble and train it on ``training_data``."""
+    model = NeuralEnsemble(config or ModelConfig())
+
+    if not training_data:
+        logger.warning("No training data provided, returning untrained model")
+        return model
+
+    fit(model, build_tensors(model, training_data), validation_split, seed=seed)
+    model.trained_on_games = len(training_data)
+    logger.info(f"Training complete. Best validation accuracy: {max(model.accuracy_history):.4f}")
+    return model
+
+
+# =============================================================================
+# Background Jobs
+# =============================================================================
+
+_executor: Optional[Executor] = None
+_job: Dict[str, Any] = {"state": "idle"}
+_job_lock = threading.Lock()
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if NEURAL_TRAINING_IN_PROCESS:
+            _executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="neural-training")
+    return _executor
+
+
+def _train_and_save(
+    training_data: List[Dict[str, Any]],
+    validation_split: float,
+    config: ModelConfig
+) -> Dict[str, Any]:
+    """Job body: train, checkpoint with NeuralEnsemble.save, report the path."""
+    model = NeuralEnsemble(config)
+    summary = fit(model, build_tensors(model, training_data), validation_split)
+    model.trained_on_games = len(training_data)
+    return {**summary, "model_path": model.save()}
+
+
+def _on_job_done(future: Future):
+    with _job_lock:
+        _job["finished_at"] = datetime.utcnow().isoformat()
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Training failed: {e}")
+            _job.update(state="failed", error=str(e))
+            return
+
+        try:
+            ModelManager.activate(Path(result["model_path"]).name)
+        except Exception as e:
+            logger.error(f"Failed to activate trained model {result['model_path']}: {e}")
+            _job.update(state="failed", error=str(e), **result)
+            return
+
+        _job.update(state="completed", **result)
+        logger.info("Training complete, new model activated")
+
+
+def start_training(
+    training_data: List[Dict[str, Any]],
+    validation_split: float = 0.2,
+    config: Optional[ModelConfig] = None
+) -> Dict[str, Any]:
+    """
+    Start a background training job and return its status.
+
+    Raises:
+        RuntimeError: If a job is already running
+    """
+    config = config or ModelConfig()
+    with _job_lock:
+        if _job["state"] == "running":
+            raise RuntimeError("A training job is already running")
+        _job.clear()
+        _job.update(
+            state="running",
+            games=len(training_data),
+            started_at=datetime.utcnow().isoformat(),
+            in_process=NEURAL_TRAINING_IN_PROCESS,
+        )
+        status = dict(_job)
+
+    logger.info(f"Starting training on {len(training_data)} games")
+    future = _get_executor().submit(_train_and_save, training_data, validation_split, config)
+    future.add_done_callback(_on_job_done)
+    return status
+
+
+def get_training_job() -> Dict[str, Any]:
+    """Status of the current or last training job."""
+    with _job_lock:
+        return dict(_job)
+
+
+def shutdown_training() -> None:
+    """Stop the training worker if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
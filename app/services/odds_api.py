@@ -1,12 +1,16 @@
 import os
 import httpx
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from app.db import Game, Market, Line, Team, OddsSnapshot
+from app.db import Game, Market, Line, Team, OddsSnapshot, bulk_upsert
+from app.services.odds_timeseries import filter_unchanged
+from app.services.odds_feed import OddsBatch, odds_feed
 from app.utils.logging import get_logger
 from app.utils.cache import cached, cache, TTL_MEDIUM, TTL_HOUR, PREFIX_ODDS
+from app.utils.http_client import http_clients
 
 logger = get_logger(__name__)
 
@@ -40,11 +44,11 @@ async def get_available_sports() -> List[Dict[str, Any]]:
 
     logger.debug("Fetching available sports from The Odds API")
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{THE_ODDS_API_BASE}/sports",
-                params={"apiKey": THE_ODDS_API_KEY}
-            )
+        response = await http_clients.get(
+            "odds_api",
+            f"{THE_ODDS_API_BASE}/sports",
+            params={"apiKey": THE_ODDS_API_KEY}
+        )
 
         if response.status_code == 200:
             sports = response.json()
@@ -75,16 +79,16 @@ async def fetch_odds(
 
     logger.debug(f"Fetching odds for {sport} (api_sport={api_sport}, regions={regions})")
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{THE_ODDS_API_BASE}/sports/{api_sport}/odds",
-                params={
-                    "apiKey": THE_ODDS_API_KEY,
-                    "regions": regions,
-                    "markets": markets,
-                    "oddsFormat": "american"
-                }
-            )
+        response = await http_clients.get(
+            "odds_api",
+            f"{THE_ODDS_API_BASE}/sports/{api_sport}/odds",
+            params={
+                "apiKey": THE_ODDS_API_KEY,
+                "regions": regions,
+                "markets": markets,
+                "oddsFormat": "american"
+            }
+        )
 
         if response.status_code == 200:
             data = response.json()
@@ -100,6 +104,231 @@ async def fetch_odds(
         return []
 
 
+def _parse_start_time(commence_time: str) -> datetime:
+    """Parse an API commence time to naive UTC, as stored in Game.start_time."""
+    if not commence_time:
+        return datetime.utcnow()
+    start_time = datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return start_time
+
+
+class _TeamIndex:
+    """Teams of one sport keyed by lowercase name, matched like ``ilike('%name%')``."""
+
+    def __init__(self, db: Session, sport: str):
+        self._teams = [
+            (team_id, name.lower())
+            for team_id, name in db.query(Team.id, Team.name)
+            .filter(Team.sport == sport)
+            .order_by(Team.id)
+        ]
+        self._matches: Dict[str, Optional[int]] = {}
+
+    def find(self, name: str) -> Optional[int]:
+        key = name.lower()
+        if key not in self._matches:
+            self._matches[key] = next(
+                (team_id for team_id, team_name in self._teams if key in team_name), None
+            )
+        return self._matches[key]
+
+    def add(self, team_id: int, name: str) -> None:
+        self._teams.append((team_id, name.lower()))
+        self._matches[name.lower()] = team_id
+
+
+def _resolve_teams(db: Session, sport: str, games_data: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Map every team name in the payload to an id, bulk-inserting unknown teams."""
+    index = _TeamIndex(db, sport)
+    names = {g.get(side, "") for g in games_data for side in ("home_team", "away_team")}
+
+    team_ids = {}
+    missing = []
+    for name in sorted(names):
+        team_id = index.find(name)
+        if team_id is None:
+            missing.append(name)
+        else:
+            team_ids[name] = team_id
+
+    if missing:
+        inserted = db.execute(
+            insert(Team).returning(Team.id, Team.name),
+            [{"sport": sport, "name": name, "short_name": name[:10]} for name in missing],
+        )
+        for team_id, name in inserted:
+            index.add(team_id, name)
+            team_ids[name] = team_id
+    return team_ids
+
+
+def _resolve_games(
+    db: Session,
+    sport: str,
+    keys: List[Tuple[int, int, datetime]]
+) -> Tuple[Dict[Tuple[int, int, datetime], int], int]:
+    """Map (home_id, away_id, start_time) to game ids, bulk-inserting new games."""
+    start_times = {start for _, _, start in keys}
+    game_ids = {}
+    for game_id, home_id, away_id, start in (
+        db.query(Game.id, Game.home_team_id, Game.away_team_id, Game.start_time)
+        .filter(Game.sport == sport, Game.start_time.in_(start_times))
+        .order_by(Game.id)
+    ):
+        game_ids.setdefault((home_id, away_id, start), game_id)
+
+    new_keys = [key for key in dict.fromkeys(keys) if key not in game_ids]
+    if new_keys:
+        inserted = db.execute(
+            insert(Game).returning(Game.id, Game.home_team_id, Game.away_team_id, Game.start_time),
+            [
+                {"sport": sport, "home_team_id": home_id, "away_team_id": away_id, "start_time": start}
+                for home_id, away_id, start in new_keys
+            ],
+        )
+        for game_id, home_id, away_id, start in inserted:
+            game_ids[(home_id, away_id, start)] = game_id
+    return game_ids, len(new_keys)
+
+
+def store_odds_bulk(db: Session, sport: str, games_data: List[Dict[str, Any]]) -> int:
+    """
+    Store an odds payload for one sport in a single transaction.
+
+    Teams, games, markets and lines already in the database are preloaded
+    into dictionaries, the payload is diffed against them in memory, and
+    the result is written with a handful of executemany statements:
+    inserts for new rows, INSERT ... ON CONFLICT DO UPDATE for existing
+    lines, and one insert for all snapshots.
+
+    Args:
+        db: Database session
+        sport: Sport code
+        games_data: Games as returned by ``fetch_odds``
+
+    Returns:
+        Number of new games created
+    """
+    now = datetime.utcnow()
+    try:
+        team_ids = _resolve_teams(db, sport, games_data)
+
+        game_keys = [
+            (team_ids[g.get("home_team", "")], team_ids[g.get("away_team", "")],
+             _parse_start_time(g.get("commence_time", "")))
+            for g in games_data
+        ]
+        game_ids, new_games = _resolve_games(db, sport, game_keys)
+
+        # Flatten the payload: (game_id, market_type, selection) -> {sportsbook: (price, point)}
+        quotes: Dict[Tuple[int, str, str], Dict[str, Tuple[int, Optional[float]]]] = {}
+        snapshots = []
+        for game_data, key in zip(games_data, game_keys):
+            game_id = game_ids[key]
+            for bookmaker in game_data.get("bookmakers", []):
+                sportsbook = bookmaker.get("title", "Unknown")
+                for market in bookmaker.get("markets", []):
+                    market_type = market.get("key", "h2h")
+                    for outcome in market.get("outcomes", []):
+                        price = outcome.get("price", 0)
+                        point = outcome.get("point")
+                        quotes.setdefault(
+                            (game_id, market_type, outcome.get("name", "")), {}
+                        )[sportsbook] = (price, point)
+                        snapshots.append({
+                            "game_id": game_id,
+                            "market_type": market_type,
+                            "sportsbook": sportsbook,
+                            "selection": outcome.get("name", ""),
+                            "odds": price,
+                            "line_value": point,
+                            "captured_at": now,
+                        })
+
+        market_ids: Dict[Tuple[int, str, str], int] = {}
+        if quotes:
+            for market_id, game_id, market_type, selection in (
+                db.query(Market.id, Market.game_id, Market.market_type, Market.selection)
+                .filter(Market.game_id.in_(set(game_ids.values())))
+                .order_by(Market.id)
+            ):
+                market_ids.setdefault((game_id, market_type, selection), market_id)
+
+        new_markets = [key for key in quotes if key not in market_ids]
+        if new_markets:
+            inserted = db.execute(
+                insert(Market).returning(Market.id, Market.game_id, Market.market_type, Market.selection),
+                [{"game_id": g, "market_type": m, "selection": sel} for g, m, sel in new_markets],
+            )
+            for market_id, game_id, market_type, selection in inserted:
+                market_ids[(game_id, market_type, selection)] = market_id
+
+        line_ids: Dict[Tuple[int, str], int] = {}
+        if market_ids:
+            for line_id, market_id, sportsbook in (
+                db.query(Line.id, Line.market_id, Line.sportsbook)
+                .filter(Line.market_id.in_(set(market_ids.values())))
+                .order_by(Line.id)
+            ):
+                line_ids.setdefault((market_id, sportsbook), line_id)
+
+        line_inserts = []
+        line_updates = []
+        for key, books in quotes.items():
+            market_id = market_ids[key]
+            for sportsbook, (price, point) in books.items():
+                row = {
+                    "market_id": market_id,
+                    "sportsbook": sportsbook,
+                    "odds_type": "american",
+                    "american_odds": price,
+                    "line_value": point,
+                    "created_at": now,
+                }
+                line_id = line_ids.get((market_id, sportsbook))
+                if line_id is None:
+                    line_inserts.append(row)
+                else:
+                    row["id"] = line_id
+                    line_updates.append(row)
+
+        # render_nulls keeps rows with and without a point in one executemany
+        if line_inserts:
+            db.execute(insert(Line), line_inserts, execution_options={"render_nulls": True})
+        bulk_upsert(db, Line, line_updates, ["id"], ["american_odds", "line_value", "created_at"])
+        # Only series whose prices moved since their last capture get new points
+        snapshots = filter_unchanged(db, snapshots)
+        if snapshots:
+            db.execute(insert(OddsSnapshot), snapshots, execution_options={"render_nulls": True})
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    odds_feed.publish(OddsBatch(sport, [
+        {
+            "game_id": game_id,
+            "market_type": market_type,
+            "sportsbook": sportsbook,
+            "selection": selection,
+            "odds": price,
+            "line_value": point,
+            "captured_at": now,
+        }
+        for (game_id, market_type, selection), books in quotes.items()
+        for sportsbook, (price, point) in books.items()
+    ]))
+
+    logger.info(
+        f"Stored odds for {sport}: {new_games} new games, {len(games_data)} total games processed, "
+        f"{len(line_inserts)} new lines, {len(line_updates)} updated lines, {len(snapshots)} snapshots"
+    )
+    return new_games
+
+
 async def fetch_and_store_odds(db: Session, sport: str) -> int:
     logger.info(f"Starting odds fetch and store for {sport}")
     games_data = await fetch_odds(sport)
@@ -108,117 +337,7 @@ async def fetch_and_store_odds(db: Session, sport: str) -> int:
         logger.warning(f"No odds data returned for {sport}")
         return 0
 
-    count = 0
-    
-    for game_data in games_data:
-        home_team_name = game_data.get("home_team", "")
-        away_team_name = game_data.get("away_team", "")
-        commence_time = game_data.get("commence_time", "")
-        
-        if commence_time:
-            start_time = datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
-        else:
-            start_time = datetime.utcnow()
-        
-        home_team = db.query(Team).filter(
-            Team.sport == sport,
-            Team.name.ilike(f"%{home_team_name}%")
-        ).first()
-        
-        away_team = db.query(Team).filter(
-            Team.sport == sport,
-            Team.name.ilike(f"%{away_team_name}%")
-        ).first()
-        
-        if not home_team:
-            home_team = Team(sport=sport, name=home_team_name, short_name=home_team_name[:10])
-            db.add(home_team)
-            db.flush()
-        
-        if not away_team:
-            away_team = Team(sport=sport, name=away_team_name, short_name=away_team_name[:10])
-            db.add(away_team)
-            db.flush()
-        
-        existing_game = db.query(Game).filter(
-            Game.sport == sport,
-            Game.home_team_id == home_team.id,
-            Game.away_team_id == away_team.id,
-            Game.start_time == start_time
-        ).first()
-        
-        if existing_game:
-            game = existing_game
-        else:
-            game = Game(
-                sport=sport,
-                home_team_id=home_team.id,
-                away_team_id=away_team.id,
-                start_time=start_time
-            )
-            db.add(game)
-            db.flush()
-            count += 1
-        
-        for bookmaker in game_data.get("bookmakers", []):
-            sportsbook = bookmaker.get("title", "Unknown")
-            
-            for market in bookmaker.get("markets", []):
-                market_type = market.get("key", "h2h")
-                
-                for outcome in market.get("outcomes", []):
-                    selection = outcome.get("name", "")
-                    price = outcome.get("price", 0)
-                    point = outcome.get("point")
-                    
-                    existing_market = db.query(Market).filter(
-                        Market.game_id == game.id,
-                        Market.market_type == market_type,
-                        Market.selection == selection
-                    ).first()
-                    
-                    if existing_market:
-                        market_obj = existing_market
-                    else:
-                        market_obj = Market(
-                            game_id=game.id,
-                            market_type=market_type,
-                            selection=selection
-                        )
-                        db.add(market_obj)
-                        db.flush()
-                    
-                    existing_line = db.query(Line).filter(
-                        Line.market_id == market_obj.id,
-                        Line.sportsbook == sportsbook
-                    ).first()
-                    
-                    if existing_line:
-                        existing_line.american_odds = price
-                        existing_line.line_value = point
-                        existing_line.created_at = datetime.utcnow()
-                    else:
-                        line = Line(
-                            market_id=market_obj.id,
-                            sportsbook=sportsbook,
-                            odds_type="american",
-                            american_odds=price,
-                            line_value=point
-                        )
-                        db.add(line)
-                    
-                    snapshot = OddsSnapshot(
-                        game_id=game.id,
-                        market_type=market_type,
-                        sportsbook=sportsbook,
-                        odds=price,
-                        line_value=point
-                    )
-                    db.add(snapshot)
-
-    db.commit()
-    logger.info(f"Stored odds for {sport}: {count} new games, {len(games_data)} total games processed")
-    return count
+    return store_odds_bulk(db, sport, games_data)
 
 
 def get_line_movement(
@@ -0,0 +1,73 @@
+"""
+In-process odds ingestion feed.
+
+Every ingestion path publishes the prices it just committed, one batch
+per sport, so consumers such as the steam detector can react as soon
+as a batch lands instead of re-reading snapshots on a schedule.
+
+A tick is a dict with game_id, market_type, sportsbook, selection,
+odds (American), line_value and captured_at. Subscribers run
+synchronously in the publishing thread and must be fast; one failing
+subscriber does not stop the others.
+
+Usage:
+    from app.services.odds_feed import odds_feed
+
+    odds_feed.subscribe(lambda batch: ...)
+    odds_feed.publish(OddsBatch("NBA", ticks))
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class OddsBatch:
+    """Prices for one sport committed in one transaction."""
+    sport: str
+    ticks: List[Dict[str, Any]]
+    published_at: datetime = field(default_factory=datetime.utcnow)
+
+
+Subscriber = Callable[[OddsBatch], None]
+
+
+class OddsFeed:
+    """Synchronous fan-out of committed odds batches to subscribers."""
+
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, callback: Subscriber) -> None:
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, batch: OddsBatch) -> None:
+        if not batch.ticks:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        self.published += 1
+        for callback in subscribers:
+            try:
+                callback(batch)
+            except Exception as e:
+                logger.error(f"Odds feed subscriber {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+
+# Global feed instance
+odds_feed = OddsFeed()
@@ -2,15 +2,23 @@
 Odds scheduler service for auto-refreshing odds data.
 Provides functionality to periodically fetch and update odds from The Odds API.
 """
+import os
+import time
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from app.db import SessionLocal, Game, Market, Line, OddsSnapshot, LineMovement
-from app.services.odds_api import fetch_odds, SPORT_MAPPING
+from app.db import SessionLocal, Game, OddsSnapshot, LineMovement
+from app.services.odds_api import fetch_odds, SPORT_MAPPING, _parse_start_time
 from app.services.line_movement_analyzer import run_analysis
+from app.services.odds_timeseries import changed_rows, latest_points, series_key
+from app.services.line_state import LineStateStore, upcoming_game_ids
+from app.services.line_movement import movement_engine
+from app.services.odds_feed import OddsBatch, odds_feed
+from app.utils.http_client import http_clients
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +29,90 @@ logger = logging.getLogger(__name__)
 REFRESH_INTERVAL_MINUTES = 30
 SNAPSHOT_INTERVAL_MINUTES = 30
 LINE_MOVEMENT_THRESHOLD_PERCENT = 2.0  # Minimum change to record as movement
+ODDS_REFRESH_CONCURRENCY = int(os.environ.get("ODDS_REFRESH_CONCURRENCY", "4"))
+# Stop fetching when The Odds API reports fewer requests left than this
+ODDS_QUOTA_RESERVE = int(os.environ.get("ODDS_QUOTA_RESERVE", "50"))
+
+
+def odds_quota_remaining() -> Optional[int]:
+    """Requests left on The Odds API plan, from the last response's headers."""
+    value = http_clients.metrics("odds_api").quota.get("x-requests-remaining")
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+async def run_sport_refresh(
+    sports: List[str],
+    write: Callable[[str, List[Dict[str, Any]]], Dict[str, int]],
+    concurrency: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch odds for several sports concurrently and write each batch through one writer.
+
+    Fetches share a semaphore of ``concurrency`` slots and are skipped once
+    the Odds API quota drops below ODDS_QUOTA_RESERVE. Each fetched batch is
+    queued for a single writer task, which runs ``write`` in a worker thread
+    one batch at a time, so writes overlap with the remaining fetches without
+    contending for the database.
+
+    Args:
+        sports: Sport keys from SPORT_MAPPING
+        write: Synchronous ``write(sport, odds_data)`` returning counts
+        concurrency: Max concurrent fetches (default ODDS_REFRESH_CONCURRENCY)
+
+    Returns:
+        Dict of sport -> status, counts, error and fetch/write timings in ms
+    """
+    semaphore = asyncio.Semaphore(concurrency or ODDS_REFRESH_CONCURRENCY)
+    queue: asyncio.Queue = asyncio.Queue()
+    results: Dict[str, Dict[str, Any]] = {sport: {'status': 'pending'} for sport in sports}
+
+    async def fetch(sport: str):
+        result = results[sport]
+        async with semaphore:
+            remaining = odds_quota_remaining()
+            if remaining is not None and remaining < ODDS_QUOTA_RESERVE:
+                result.update(status='skipped', error=f"quota reserve reached ({remaining} left)")
+                return
+            start = time.perf_counter()
+            try:
+                odds_data = await fetch_odds(sport)
+            except Exception as e:
+                result.update(status='error', error=str(e))
+                return
+            finally:
+                result['fetch_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        if odds_data:
+            await queue.put((sport, odds_data))
+        else:
+            result['status'] = 'empty'
+
+    async def writer():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            sport, odds_data = item
+            result = results[sport]
+            start = time.perf_counter()
+            try:
+                counts = await asyncio.to_thread(write, sport, odds_data)
+                result.update(status='ok', **(counts or {}))
+            except Exception as e:
+                result.update(status='error', error=str(e))
+            result['write_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+    writer_task = asyncio.create_task(writer())
+    try:
+        await asyncio.gather(*(fetch(sport) for sport in sports))
+    finally:
+        await queue.put(None)
+        await writer_task
+
+    return results
 
 
 class OddsScheduler:
@@ -32,6 +124,12 @@ class OddsScheduler:
         self.last_refresh: Optional[datetime] = None
         self.refresh_count = 0
         self.error_count = 0
+        self.last_cycle_ms: Optional[float] = None
+        self.sport_results: Dict[str, Dict[str, Any]] = {}
+        # Latest points per (game, market, book) series, so batches skip the lookup query
+        self.line_state = LineStateStore(
+            "snapshots", latest_points, decode=lambda points: [tuple(point) for point in points]
+        )
 
     async def start(self):
         """Start the odds refresh scheduler."""
@@ -40,6 +138,11 @@ class OddsScheduler:
             return
 
         self.is_running = True
+        try:
+            warmed = await asyncio.to_thread(self._warm_line_state)
+            logger.info(f"Warmed line state for {warmed} odds series")
+        except Exception as e:
+            logger.error(f"Error warming line state: {e}")
         self._task = asyncio.create_task(self._run_scheduler())
         logger.info("Odds scheduler started")
 
@@ -68,157 +171,237 @@ class OddsScheduler:
             # Wait for next refresh interval
             await asyncio.sleep(REFRESH_INTERVAL_MINUTES * 60)
 
-    async def refresh_all_odds(self):
-        """Refresh odds for all supported sports."""
-        db = SessionLocal()
-        try:
-            sports = list(SPORT_MAPPING.keys())
+    async def refresh_all_odds(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Refresh odds for all supported sports.
 
-            for sport_key in sports:
-                try:
-                    await self._refresh_sport_odds(db, sport_key)
-                except Exception as e:
-                    logger.error(f"Error refreshing odds for {sport_key}: {e}")
+        Sports are fetched concurrently and written by a single bulk writer,
+        so a cycle takes about as long as the slowest sport.
 
-            # Run line movement analysis after odds refresh
-            try:
-                analysis_stats = run_analysis(db)
-                logger.info(f"Line movement analysis: {analysis_stats}")
-            except Exception as e:
-                logger.error(f"Error in line movement analysis: {e}")
+        Returns:
+            Per-sport results with fetch and write timings
+        """
+        start = time.perf_counter()
+        results = await run_sport_refresh(list(SPORT_MAPPING.keys()), self._write_sport_odds)
+        self.last_cycle_ms = round((time.perf_counter() - start) * 1000, 2)
+        self.sport_results = results
 
-        finally:
-            db.close()
-
-    async def _refresh_sport_odds(self, db: Session, sport_key: str):
-        """Refresh odds for a specific sport."""
-        odds_data = await fetch_odds(sport_key)
-
-        if not odds_data:
-            return
-
-        for game_data in odds_data:
-            await self._process_game_odds(db, game_data, sport_key)
-
-        db.commit()
+        for sport_key, result in results.items():
+            if result["status"] == "error":
+                logger.error(f"Error refreshing odds for {sport_key}: {result.get('error')}")
 
-    async def _process_game_odds(self, db: Session, game_data: Dict[str, Any], sport_key: str):
-        """Process odds for a single game."""
-        game_id = game_data.get('id')
-        commence_time = game_data.get('commence_time')
-        home_team = game_data.get('home_team')
-        away_team = game_data.get('away_team')
-
-        # Find or create game
-        game = db.query(Game).filter(
-            Game.sport == sport_key,
-            Game.start_time == datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
-        ).first()
-
-        if not game:
-            # Game not in our database yet, skip
-            return
-
-        bookmakers = game_data.get('bookmakers', [])
-
-        for bookmaker in bookmakers:
-            book_name = bookmaker.get('title', 'Unknown')
-            markets = bookmaker.get('markets', [])
+        # Run line movement analysis after odds refresh
+        try:
+            analysis_stats = await asyncio.to_thread(self._run_analysis)
+            logger.info(f"Line movement analysis: {analysis_stats}")
+        except Exception as e:
+            logger.error(f"Error in line movement analysis: {e}")
 
-            for market in markets:
-                market_type = market.get('key')
-                outcomes = market.get('outcomes', [])
+        # Started games get no more lines; drop their in-process state
+        try:
+            pruned = await asyncio.to_thread(self._prune_line_state)
+            logger.debug(f"Pruned {pruned} line state series")
+        except Exception as e:
+            logger.error(f"Error pruning line state: {e}")
 
-                for outcome in outcomes:
-                    selection = outcome.get('name')
-                    price = outcome.get('price')
-                    point = outcome.get('point')
+        return results
 
-                    if price is None:
-                        continue
+    def _run_analysis(self) -> Dict[str, int]:
+        db = SessionLocal()
+        try:
+            return run_analysis(db)
+        finally:
+            db.close()
 
-                    # Convert to American odds if decimal
-                    american_odds = self._convert_to_american(price)
+    def _warm_line_state(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.line_state.warm(db, upcoming_game_ids(db))
+        finally:
+            db.close()
 
-                    # Record snapshot
-                    await self._record_odds_snapshot(
-                        db, game.id, market_type, book_name,
-                        american_odds, point
-                    )
+    def _prune_line_state(self) -> int:
+        db = SessionLocal()
+        try:
+            game_ids = upcoming_game_ids(db)
+        finally:
+            db.close()
+        movement_engine.retain_games(game_ids)
+        return self.line_state.retain_games(game_ids)
 
-                    # Check for line movement
-                    await self._check_line_movement(
-                        db, game.id, market_type, book_name,
-                        american_odds, point
-                    )
+    def _write_sport_odds(self, sport_key: str, odds_data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Write one sport's fetched odds in its own session and transaction."""
+        db = SessionLocal()
+        try:
+            counts, ticks = self._store_game_odds(db, odds_data, sport_key)
+            db.commit()
+            self.line_state.commit()
+            odds_feed.publish(OddsBatch(sport_key, ticks))
+            return counts
+        except Exception:
+            db.rollback()
+            self.line_state.rollback()
+            raise
+        finally:
+            db.close()
 
-    async def _record_odds_snapshot(
+    def _process_game_odds(
         self,
         db: Session,
-        game_id: int,
-        market_type: str,
-        sportsbook: str,
-        odds: int,
-        line_value: Optional[float]
-    ):
-        """Record an odds snapshot."""
-        snapshot = OddsSnapshot(
-            game_id=game_id,
-            market_type=market_type,
-            sportsbook=sportsbook,
-            odds=odds,
-            line_value=line_value
-        )
-        db.add(snapshot)
+        odds_data: List[Dict[str, Any]],
+        sport_key: str
+    ) -> Dict[str, int]:
+        """Record snapshots and line movements for a batch of games; returns counts."""
+        return self._store_game_odds(db, odds_data, sport_key)[0]
 
-    async def _check_line_movement(
+    def _store_game_odds(
         self,
         db: Session,
+        odds_data: List[Dict[str, Any]],
+        sport_key: str
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Record snapshots and line movements for a batch of games.
+
+        Games are matched on start time with one query, the latest capture
+        of each (game, market, book) series comes from ``line_state`` (one
+        query for games it has not seen), and snapshots and movements are
+        each written with a single executemany. Series whose prices are
+        unchanged are not stored again. New series points are staged in
+        ``line_state`` for the caller to commit with the transaction.
+
+        Args:
+            db: Database session
+            odds_data: Games as returned by fetch_odds
+            sport_key: Sport the batch belongs to
+
+        Returns:
+            Counts of matched games, snapshots and movements, and the
+            odds feed ticks for every matched price
+        """
+        start_times = {
+            game_data.get('commence_time'): _parse_start_time(game_data.get('commence_time'))
+            for game_data in odds_data
+            if game_data.get('commence_time')
+        }
+        game_ids: Dict[datetime, int] = {}
+        if start_times:
+            # Lowest id wins when two games share a start time, like .first()
+            rows = db.query(Game.id, Game.start_time).filter(
+                Game.sport == sport_key,
+                Game.start_time.in_(set(start_times.values()))
+            ).order_by(Game.id.desc()).all()
+            game_ids = {start_time: game_id for game_id, start_time in rows}
+
+        snapshots: List[Dict[str, Any]] = []
+        ticks: List[Dict[str, Any]] = []
+        for game_data in odds_data:
+            game_id = game_ids.get(start_times.get(game_data.get('commence_time')))
+            if not game_id:
+                # Game not in our database yet, skip
+                continue
+
+            for bookmaker in game_data.get('bookmakers', []):
+                book_name = bookmaker.get('title', 'Unknown')
+
+                for market in bookmaker.get('markets', []):
+                    market_type = market.get('key')
+
+                    for outcome in market.get('outcomes', []):
+                        price = outcome.get('price')
+                        if price is None:
+                            continue
+
+                        snapshot = {
+                            'game_id': game_id,
+                            'market_type': market_type,
+                            'sportsbook': book_name,
+                            'selection': outcome.get('name', ''),
+                            # Convert to American odds if decimal
+                            'odds': self._convert_to_american(price),
+                            'line_value': outcome.get('point'),
+                        }
+                        snapshots.append(snapshot)
+                        ticks.append(dict(snapshot))
+
+        if not snapshots:
+            return {'games': 0, 'snapshots': 0, 'movements': 0}, []
+
+        matched = {row['game_id'] for row in snapshots}
+        latest = self.line_state.get_many(db, {series_key(row) for row in snapshots})
+        movements = []
+        for row in snapshots:
+            points = latest.get(series_key(row))
+            movement = self._check_line_movement(
+                points[-1] if points else None,
+                row['game_id'], row['market_type'], row['sportsbook'],
+                row['odds'], row['line_value']
+            )
+            if movement:
+                movements.append(movement)
+
+        # Series whose prices did not move since their last capture are not stored again
+        snapshots = changed_rows(snapshots, latest)
+        captured_at = datetime.utcnow()
+        for row in snapshots:
+            row['captured_at'] = captured_at
+        for tick in ticks:
+            tick['captured_at'] = captured_at
+        if snapshots:
+            db.execute(insert(OddsSnapshot), snapshots, execution_options={"render_nulls": True})
+            points: Dict[Tuple[int, str, str], List[Tuple[int, Optional[float]]]] = {}
+            for row in snapshots:
+                points.setdefault(series_key(row), []).append((row['odds'], row['line_value']))
+            self.line_state.stage(points)
+        if movements:
+            for row in movements:
+                row['recorded_at'] = captured_at
+            db.execute(insert(LineMovement), movements, execution_options={"render_nulls": True})
+
+        counts = {'games': len(matched), 'snapshots': len(snapshots), 'movements': len(movements)}
+        return counts, ticks
+
+    def _check_line_movement(
+        self,
+        previous: Optional[Tuple[int, Optional[float]]],
         game_id: int,
         market_type: str,
         sportsbook: str,
         current_odds: int,
         current_line: Optional[float]
-    ):
-        """Check and record line movements."""
-        # Get most recent snapshot for this market
-        previous = db.query(OddsSnapshot).filter(
-            OddsSnapshot.game_id == game_id,
-            OddsSnapshot.market_type == market_type,
-            OddsSnapshot.sportsbook == sportsbook
-        ).order_by(OddsSnapshot.captured_at.desc()).offset(1).first()
-
+    ) -> Optional[Dict[str, Any]]:
+        """Build a line movement row when odds moved past the threshold."""
         if not previous:
-            return
+            return None
+        previous_odds, previous_line = previous
 
         # Calculate movement percentage
-        if previous.odds != 0:
-            movement_pct = abs((current_odds - previous.odds) / abs(previous.odds)) * 100
+        if previous_odds != 0:
+            movement_pct = abs((current_odds - previous_odds) / abs(previous_odds)) * 100
         else:
             movement_pct = 0
 
         # Only record significant movements
         if movement_pct < LINE_MOVEMENT_THRESHOLD_PERCENT:
-            return
+            return None
 
         # Determine movement direction
         direction = self._classify_movement(
-            previous.odds, current_odds,
-            previous.line_value, current_line
+            previous_odds, current_odds,
+            previous_line, current_line
         )
 
-        movement = LineMovement(
-            game_id=game_id,
-            market_type=market_type,
-            sportsbook=sportsbook,
-            previous_odds=previous.odds,
-            current_odds=current_odds,
-            previous_line=previous.line_value,
-            current_line=current_line,
-            movement_percentage=movement_pct,
-            direction=direction
-        )
-        db.add(movement)
+        return {
+            'game_id': game_id,
+            'market_type': market_type,
+            'sportsbook': sportsbook,
+            'previous_odds': previous_odds,
+            'current_odds': current_odds,
+            'previous_line': previous_line,
+            'current_line': current_line,
+            'movement_percentage': movement_pct,
+            'direction': direction,
+        }
 
     def _classify_movement(
         self,
@@ -254,7 +437,12 @@ class OddsScheduler:
             'last_refresh': self.last_refresh.isoformat() if self.last_refresh else None,
             'refresh_count': self.refresh_count,
             'error_count': self.error_count,
-            'refresh_interval_minutes': REFRESH_INTERVAL_MINUTES
+            'refresh_interval_minutes': REFRESH_INTERVAL_MINUTES,
+            'concurrency': ODDS_REFRESH_CONCURRENCY,
+            'last_cycle_ms': self.last_cycle_ms,
+            'quota_remaining': odds_quota_remaining(),
+            'line_state': self.line_state.stats(),
+            'sports': self.sport_results,
         }
 
 
@@ -0,0 +1,346 @@
+"""
+Odds time-series storage.
+
+OddsSnapshot rows form one series per (game, market, sportsbook), indexed
+on (game_id, market_type, sportsbook, captured_at). Each capture of a
+series holds one point per outcome, tagged with its selection. This
+module keeps those series compact:
+
+- Change-only writes: a batch is stored only for series whose prices
+  differ from the series' latest stored point.
+- Hourly open/high/low/close rollups in OddsRollup, one per outcome.
+- A retention job that rolls up raw points older than
+  ODDS_RAW_RETENTION_DAYS and deletes them, keeping each outcome's last
+  point so both sides' closing lines survive.
+- Optional monthly range partitions of odds_snapshots on PostgreSQL
+  (see scripts/migrate_odds_timeseries.py for the conversion).
+"""
+
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, text
+from sqlalchemy.orm import Session, aliased
+
+from app.db import OddsSnapshot, OddsRollup, bulk_upsert
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+ODDS_SNAPSHOT_CHANGE_ONLY = os.environ.get("ODDS_SNAPSHOT_CHANGE_ONLY", "true").lower() == "true"
+ODDS_RAW_RETENTION_DAYS = int(os.environ.get("ODDS_RAW_RETENTION_DAYS", "30"))
+ODDS_ROLLUP_LOOKBACK_HOURS = int(os.environ.get("ODDS_ROLLUP_LOOKBACK_HOURS", "2"))
+ODDS_PARTITION_MONTHS_AHEAD = int(os.environ.get("ODDS_PARTITION_MONTHS_AHEAD", "2"))
+ROLLUP_BATCH_SIZE = 5000
+
+SeriesKey = Tuple[int, str, str]
+Point = Tuple[int, Optional[float]]
+
+
+def series_key(row: Dict[str, Any]) -> SeriesKey:
+    return (row["game_id"], row["market_type"], row["sportsbook"])
+
+
+def latest_points(db: Session, game_ids: Iterable[int]) -> Dict[SeriesKey, List[Point]]:
+    """
+    Points at each series' latest capture for the given games.
+
+    A series can hold several points per capture (one per outcome), so
+    every row at the latest ``captured_at`` is returned, in insert order.
+    """
+    game_ids = set(game_ids)
+    if not game_ids:
+        return {}
+
+    latest = db.query(
+        OddsSnapshot.game_id,
+        OddsSnapshot.market_type,
+        OddsSnapshot.sportsbook,
+        func.max(OddsSnapshot.captured_at).label("captured_at")
+    ).filter(
+        OddsSnapshot.game_id.in_(game_ids)
+    ).group_by(
+        OddsSnapshot.game_id, OddsSnapshot.market_type, OddsSnapshot.sportsbook
+    ).subquery()
+
+    rows = db.query(
+        OddsSnapshot.game_id,
+        OddsSnapshot.market_type,
+        OddsSnapshot.sportsbook,
+        OddsSnapshot.odds,
+        OddsSnapshot.line_value
+    ).join(latest, and_(
+        OddsSnapshot.game_id == latest.c.game_id,
+        OddsSnapshot.market_type == latest.c.market_type,
+        OddsSnapshot.sportsbook == latest.c.sportsbook,
+        OddsSnapshot.captured_at == latest.c.captured_at
+    )).order_by(OddsSnapshot.id).all()
+
+    points: Dict[SeriesKey, List[Point]] = {}
+    for game_id, market_type, sportsbook, odds, line_value in rows:
+        points.setdefault((game_id, market_type, sportsbook), []).append((odds, line_value))
+    return points
+
+
+def changed_rows(
+    rows: List[Dict[str, Any]],
+    latest: Dict[SeriesKey, List[Point]]
+) -> List[Dict[str, Any]]:
+    """
+    Drop rows whose series has the same points as its latest capture.
+
+    Series are compared as a whole (all outcomes together), so a series is
+    either written in full or skipped. Returns ``rows`` unchanged when
+    ODDS_SNAPSHOT_CHANGE_ONLY is off.
+    """
+    if not ODDS_SNAPSHOT_CHANGE_ONLY:
+        return rows
+
+    batch: Dict[SeriesKey, Counter] = {}
+    for row in rows:
+        batch.setdefault(series_key(row), Counter())[(row["odds"], row["line_value"])] += 1
+
+    unchanged = {
+        key for key, points in batch.items()
+        if key in latest and Counter(latest[key]) == points
+    }
+    return [row for row in rows if series_key(row) not in unchanged]
+
+
+def filter_unchanged(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Load the latest points for ``rows``' games and drop unchanged series."""
+    if not ODDS_SNAPSHOT_CHANGE_ONLY or not rows:
+        return rows
+    return changed_rows(rows, latest_points(db, {row["game_id"] for row in rows}))
+
+
+def _hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_hourly(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    overwrite: bool = True
+) -> int:
+    """
+    Build hourly open/high/low/close rollups from raw snapshots.
+
+    Buckets are kept per outcome (selection), so the two sides of a
+    spread or total never mix. Raw points are streamed in series and
+    time order, so memory holds one row per bucket rather than every
+    point. Odds high/low are numeric max/min of the American price.
+
+    Args:
+        db: Database session
+        since: Start of the range, rounded down to the hour
+            (default ODDS_ROLLUP_LOOKBACK_HOURS before now)
+        until: End of the range (exclusive, default now)
+        overwrite: Replace existing buckets; when False only missing
+            buckets are written
+
+    Returns:
+        Number of buckets written
+    """
+    if since is None:
+        since = datetime.utcnow() - timedelta(hours=ODDS_ROLLUP_LOOKBACK_HOURS)
+    since = _hour(since)
+
+    query = db.query(
+        OddsSnapshot.game_id,
+        OddsSnapshot.market_type,
+        OddsSnapshot.sportsbook,
+        OddsSnapshot.selection,
+        OddsSnapshot.odds,
+        OddsSnapshot.line_value,
+        OddsSnapshot.captured_at
+    ).filter(OddsSnapshot.captured_at >= since)
+    if until is not None:
+        query = query.filter(OddsSnapshot.captured_at < until)
+    query = query.order_by(
+        OddsSnapshot.game_id, OddsSnapshot.market_type, OddsSnapshot.sportsbook,
+        OddsSnapshot.selection, OddsSnapshot.captured_at, OddsSnapshot.id
+    ).execution_options(yield_per=ROLLUP_BATCH_SIZE)
+
+    buckets: Dict[Tuple[int, str, str, str, datetime], Dict[str, Any]] = {}
+    for game_id, market_type, sportsbook, selection, odds, line_value, captured_at in query:
+        key = (game_id, market_type, sportsbook, selection or "", _hour(captured_at))
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                "game_id": game_id,
+                "market_type": market_type,
+                "sportsbook": sportsbook,
+                "selection": key[3],
+                "bucket_start": key[4],
+                "open_odds": odds, "high_odds": odds, "low_odds": odds,
+                "open_line": line_value, "high_line": line_value, "low_line": line_value,
+                "samples": 0,
+            }
+        bucket["high_odds"] = max(bucket["high_odds"], odds)
+        bucket["low_odds"] = min(bucket["low_odds"], odds)
+        if line_value is not None:
+            bucket["high_line"] = line_value if bucket["high_line"] is None else max(bucket["high_line"], line_value)
+            bucket["low_line"] = line_value if bucket["low_line"] is None else min(bucket["low_line"], line_value)
+        bucket["close_odds"] = odds
+        bucket["close_line"] = line_value
+        bucket["samples"] += 1
+
+    if not overwrite and buckets:
+        existing = db.query(
+            OddsRollup.game_id, OddsRollup.market_type, OddsRollup.sportsbook,
+            OddsRollup.selection, OddsRollup.bucket_start
+        ).filter(
+            OddsRollup.game_id.in_({key[0] for key in buckets}),
+            OddsRollup.bucket_start >= since
+        )
+        for key in existing:
+            buckets.pop(tuple(key), None)
+
+    rows = list(buckets.values())
+    now = datetime.utcnow()
+    for row in rows:
+        row["updated_at"] = now
+    update_columns = [
+        "open_odds", "high_odds", "low_odds", "close_odds",
+        "open_line", "high_line", "low_line", "close_line",
+        "samples", "updated_at",
+    ]
+    for i in range(0, len(rows), ROLLUP_BATCH_SIZE):
+        bulk_upsert(
+            db, OddsRollup, rows[i:i + ROLLUP_BATCH_SIZE],
+            ["game_id", "market_type", "sportsbook", "selection", "bucket_start"], update_columns
+        )
+    db.commit()
+    return len(rows)
+
+
+def compact_snapshots(db: Session, retention_days: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Retention job: roll up and delete raw points older than the retention window.
+
+    Missing rollups for the expired range are written first, then every
+    expired point is deleted except those at each outcome's last capture,
+    which keeps both sides' closing lines available to CLV and history
+    queries. Points without a selection are treated as one outcome.
+
+    Args:
+        db: Database session
+        retention_days: Days of raw points to keep (default ODDS_RAW_RETENTION_DAYS)
+
+    Returns:
+        Dict with the cutoff, buckets rolled up and points deleted
+    """
+    days = ODDS_RAW_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    rolled_up = rollup_hourly(db, since=datetime.min, until=cutoff, overwrite=False)
+
+    newer = aliased(OddsSnapshot)
+    superseded = db.query(newer.id).filter(
+        newer.game_id == OddsSnapshot.game_id,
+        newer.market_type == OddsSnapshot.market_type,
+        newer.sportsbook == OddsSnapshot.sportsbook,
+        newer.selection.is_not_distinct_from(OddsSnapshot.selection),
+        newer.captured_at > OddsSnapshot.captured_at
+    ).correlate(OddsSnapshot).exists()
+    deleted = db.query(OddsSnapshot).filter(
+        OddsSnapshot.captured_at < cutoff,
+        superseded
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    logger.info(f"Compacted odds snapshots before {cutoff.isoformat()}: {rolled_up} buckets, {deleted} points deleted")
+    return {"cutoff": cutoff.isoformat(), "rolled_up": rolled_up, "deleted": deleted}
+
+
+def get_odds_rollups(
+    db: Session,
+    game_id: int,
+    market_type: Optional[str] = None,
+    sportsbook: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Hourly OHLC history for a game per outcome, oldest first."""
+    query = db.query(OddsRollup).filter(OddsRollup.game_id == game_id)
+    if market_type:
+        query = query.filter(OddsRollup.market_type == market_type)
+    if sportsbook:
+        query = query.filter(OddsRollup.sportsbook == sportsbook)
+
+    return [
+        {
+            "market_type": r.market_type,
+            "sportsbook": r.sportsbook,
+            "selection": r.selection,
+            "bucket_start": r.bucket_start.isoformat(),
+            "odds": {"open": r.open_odds, "high": r.high_odds, "low": r.low_odds, "close": r.close_odds},
+            "line": {"open": r.open_line, "high": r.high_line, "low": r.low_line, "close": r.close_line},
+            "samples": r.samples,
+        }
+        for r in query.order_by(OddsRollup.bucket_start, OddsRollup.sportsbook, OddsRollup.selection)
+    ]
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    month = value.month - 1 + offset
+    return datetime(value.year + month // 12, month % 12 + 1, 1)
+
+
+def is_snapshots_partitioned(db: Session) -> bool:
+    """Whether odds_snapshots is a partitioned table (PostgreSQL only)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'odds_snapshots'"
+    )).first() is not None
+
+
+def ensure_snapshot_partitions(
+    db: Session,
+    months_ahead: int = ODDS_PARTITION_MONTHS_AHEAD,
+    start: Optional[datetime] = None
+) -> List[str]:
+    """
+    Create monthly partitions of odds_snapshots from ``start`` (default this month)
+    through ``months_ahead`` months ahead. No-op unless the table is partitioned.
+
+    Returns:
+        Names of the partitions ensured
+    """
+    if not is_snapshots_partitioned(db):
+        return []
+
+    first = _month_start(start or datetime.utcnow())
+    last = _month_start(datetime.utcnow(), months_ahead)
+    names = []
+    offset = 0
+    while _month_start(first, offset) <= last:
+        lower = _month_start(first, offset)
+        upper = _month_start(first, offset + 1)
+        name = f"odds_snapshots_p{lower:%Y_%m}"
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF odds_snapshots "
+            f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        ))
+        names.append(name)
+        offset += 1
+    db.commit()
+    return names
+
+
+def get_timeseries_stats(db: Session) -> Dict[str, Any]:
+    """Row counts and range of the raw and rolled-up series."""
+    oldest, newest = db.query(func.min(OddsSnapshot.captured_at), func.max(OddsSnapshot.captured_at)).one()
+    return {
+        "raw_points": db.query(func.count(OddsSnapshot.id)).scalar(),
+        "rollup_buckets": db.query(func.count(OddsRollup.id)).scalar(),
+        "oldest_point": oldest.isoformat() if oldest else None,
+        "newest_point": newest.isoformat() if newest else None,
+        "change_only": ODDS_SNAPSHOT_CHANGE_ONLY,
+        "retention_days": ODDS_RAW_RETENTION_DAYS,
+        "partitioned": is_snapshots_partitioned(db),
+    }
@@ -488,6 +488,7 @@ async def store_pinnacle_odds(db: Session, sport: str) -> Dict[str, Any]:
                         game_id=game.id,
                         market_type=market_type,
                         sportsbook=PINNACLE_SPORTSBOOK,
+                        selection=outcome.get("name", ""),
                         odds=price,
                         line_value=point,
                         captured_at=now
@@ -0,0 +1,388 @@
+"""
+Cross-book best-price index.
+
+Holds the current price of every (game, market, selection, point) at
+every book, with the top PRICE_INDEX_TOP_N prices per side kept sorted.
+The index subscribes to the odds feed and is updated in place as
+batches are ingested, so an arbitrage scan over all live markets is a
+single pass over memory instead of a query per game and market.
+
+Each book's quotes for a (game, market) are replaced as a set: when a
+book moves a spread from -3 to -3.5, its -3 price is removed.
+
+The index reloads itself from Markets/Lines when it is not subscribed to
+the feed (tests, scripts) or when its last load is older than
+PRICE_INDEX_REFRESH_SECONDS, which bounds staleness from ingestion in
+other processes.
+"""
+
+import bisect
+import heapq
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.db import Game, Market, Line
+from app.services.arbitrage import ArbOpportunity, calculate_arb_margin, calculate_stakes
+from app.services.odds_feed import OddsBatch, odds_feed
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PRICE_INDEX_TOP_N = int(os.environ.get("PRICE_INDEX_TOP_N", "3"))
+PRICE_INDEX_REFRESH_SECONDS = int(os.environ.get("PRICE_INDEX_REFRESH_SECONDS", "300"))
+
+GameInfo = namedtuple("GameInfo", ["sport", "home_team", "away_team", "start_time", "status"])
+SideKey = Tuple[str, Optional[float]]  # selection, point
+MarketKey = Tuple[int, str]  # game_id, market_type
+
+
+class PriceEntry:
+    """Prices for one side of a market across books, with the best few kept sorted."""
+    __slots__ = ("books", "top")
+
+    def __init__(self):
+        self.books: Dict[str, int] = {}
+        self.top: List[Tuple[int, str]] = []  # (odds, sportsbook), best first
+
+    def set(self, sportsbook: str, odds: int) -> None:
+        previous = self.books.get(sportsbook)
+        self.books[sportsbook] = odds
+        if previous == odds:
+            return
+        # Only a change that can enter or leave the top list needs a re-sort
+        if (previous is not None and (previous, sportsbook) in self.top) \
+                or len(self.top) < PRICE_INDEX_TOP_N or odds > self.top[-1][0]:
+            self._refresh()
+
+    def remove(self, sportsbook: str) -> None:
+        odds = self.books.pop(sportsbook, None)
+        if odds is not None and (odds, sportsbook) in self.top:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        self.top = heapq.nlargest(PRICE_INDEX_TOP_N, ((odds, book) for book, odds in self.books.items()))
+
+    @property
+    def best(self) -> Tuple[int, str]:
+        return self.top[0]
+
+
+class BestPriceIndex:
+    """In-memory index of the best prices per market side, fed by the odds feed."""
+
+    def __init__(self):
+        self._markets: Dict[MarketKey, Dict[SideKey, PriceEntry]] = {}
+        self._book_quotes: Dict[Tuple[int, str, str], Dict[SideKey, int]] = {}
+        # Sorted points offered per (game, market, selection), for ladder sweeps
+        self._ladders: Dict[Tuple[int, str, str], List[float]] = {}
+        self._games: Dict[int, GameInfo] = {}
+        self._lock = threading.RLock()
+        self._subscribed = False
+        self._loaded_at: Optional[float] = None
+        self.updates = 0
+        self.last_scan_ms: Optional[float] = None
+
+    def start(self) -> None:
+        """Subscribe to the odds feed."""
+        odds_feed.subscribe(self.handle)
+        self._subscribed = True
+
+    def stop(self) -> None:
+        odds_feed.unsubscribe(self.handle)
+        self._subscribed = False
+
+    def handle(self, batch: OddsBatch) -> None:
+        self.apply(batch.ticks)
+
+    def apply(self, ticks: Iterable[Dict[str, Any]]) -> int:
+        """
+        Fold ticks into the index.
+
+        Ticks are grouped per (game, market, book); each group replaces
+        that book's quotes for the market.
+
+        Returns:
+            Number of book quotes set
+        """
+        groups: Dict[Tuple[int, str, str], Dict[SideKey, int]] = {}
+        for tick in ticks:
+            odds = tick.get("odds")
+            if odds is None:
+                continue
+            key = (tick["game_id"], tick["market_type"], tick["sportsbook"])
+            groups.setdefault(key, {})[(tick.get("selection", ""), tick.get("line_value"))] = int(odds)
+
+        with self._lock:
+            for (game_id, market_type, sportsbook), quotes in groups.items():
+                self._replace(game_id, market_type, sportsbook, quotes)
+        count = sum(len(quotes) for quotes in groups.values())
+        self.updates += count
+        return count
+
+    def _replace(self, game_id: int, market_type: str, sportsbook: str, quotes: Dict[SideKey, int]) -> None:
+        sides = self._markets.setdefault((game_id, market_type), {})
+        old = self._book_quotes.get((game_id, market_type, sportsbook), {})
+        for side in old.keys() - quotes.keys():
+            entry = sides.get(side)
+            if entry is None:
+                continue
+            entry.remove(sportsbook)
+            if not entry.books:
+                del sides[side]
+                if side[1] is not None:
+                    ladder = self._ladders[(game_id, market_type, side[0])]
+                    del ladder[bisect.bisect_left(ladder, side[1])]
+        for side, odds in quotes.items():
+            entry = sides.get(side)
+            if entry is None:
+                entry = sides[side] = PriceEntry()
+                if side[1] is not None:
+                    bisect.insort(self._ladders.setdefault((game_id, market_type, side[0]), []), side[1])
+            entry.set(sportsbook, odds)
+        self._book_quotes[(game_id, market_type, sportsbook)] = quotes
+
+    def load(self, db: Session) -> int:
+        """Rebuild the index from upcoming games' Markets and Lines. Returns quotes loaded."""
+        games = db.query(Game).options(
+            joinedload(Game.home_team), joinedload(Game.away_team)
+        ).filter(
+            Game.start_time > datetime.utcnow(),
+            Game.status == "scheduled"
+        ).all()
+        infos = {game.id: _game_info(game) for game in games}
+
+        rows = []
+        if infos:
+            rows = db.query(
+                Market.game_id, Market.market_type, Market.selection,
+                Line.sportsbook, Line.american_odds, Line.line_value
+            ).join(Line, Line.market_id == Market.id).filter(
+                Market.game_id.in_(set(infos))
+            ).order_by(Line.id).all()
+
+        with self._lock:
+            self._markets.clear()
+            self._book_quotes.clear()
+            self._ladders.clear()
+            self._games = infos
+            self.apply({
+                "game_id": game_id, "market_type": market_type, "selection": selection,
+                "sportsbook": sportsbook, "odds": odds, "line_value": point,
+            } for game_id, market_type, selection, sportsbook, odds, point in rows)
+            self._loaded_at = time.monotonic()
+        return len(rows)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Reload unless the index is fed live and was loaded recently."""
+        fresh = (self._subscribed and self._loaded_at is not None
+                 and time.monotonic() - self._loaded_at < PRICE_INDEX_REFRESH_SECONDS)
+        if not fresh:
+            self.load(db)
+            return
+
+        # Games first seen through the feed need their names and start times
+        with self._lock:
+            missing = {game_id for game_id, _ in self._markets} - self._games.keys()
+        if missing:
+            games = db.query(Game).options(
+                joinedload(Game.home_team), joinedload(Game.away_team)
+            ).filter(Game.id.in_(missing)).all()
+            with self._lock:
+                for game in games:
+                    self._games[game.id] = _game_info(game)
+
+    def ladder(self, game_id: int, market_type: str, selection: str) -> List[Tuple[float, int, str, int]]:
+        """(point, best odds, sportsbook, books quoting) rungs for one selection, lowest point first."""
+        with self._lock:
+            sides = self._markets.get((game_id, market_type), {})
+            rungs = []
+            for point in self._ladders.get((game_id, market_type, selection), []):
+                entry = sides[(selection, point)]
+                rungs.append((point, *entry.best, len(entry.books)))
+            return rungs
+
+    def selections(self, game_id: int, market_type: str) -> List[str]:
+        with self._lock:
+            return sorted({selection for selection, _ in self._markets.get((game_id, market_type), {})})
+
+    def live_games(self, sport: Optional[str] = None) -> Dict[int, GameInfo]:
+        """Games still open for betting, optionally for one sport."""
+        now = datetime.utcnow()
+        with self._lock:
+            return {
+                game_id: info for game_id, info in self._games.items()
+                if info.status == "scheduled" and info.start_time > now and (not sport or info.sport == sport)
+            }
+
+    def get_best_prices(self, game_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Top prices per side for a game, grouped by market type."""
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for (market_game, market_type), sides in self._markets.items():
+                if market_game != game_id:
+                    continue
+                result[market_type] = [
+                    {
+                        "selection": selection,
+                        "point": point,
+                        "prices": [{"sportsbook": book, "odds": odds} for odds, book in entry.top],
+                        "books": len(entry.books),
+                    }
+                    for (selection, point), entry in sorted(
+                        sides.items(), key=lambda item: (item[0][0], item[0][1] if item[0][1] is not None else 0)
+                    )
+                ]
+        return result
+
+    def scan(self, sport: Optional[str] = None, min_profit: float = 0.0) -> List[ArbOpportunity]:
+        """
+        Find the best arbitrage per (game, market) over all live markets.
+
+        Two- and three-way moneylines compare every selection's best
+        price; spreads pair opposite points of different selections and
+        totals pair Over and Under at the same point.
+        """
+        start = time.perf_counter()
+        now = datetime.utcnow()
+        opportunities = []
+        with self._lock:
+            for (game_id, market_type), sides in self._markets.items():
+                info = self._games.get(game_id)
+                if info is None or info.status != "scheduled" or info.start_time <= now:
+                    continue
+                if sport and info.sport != sport:
+                    continue
+
+                if market_type == "h2h":
+                    arb = _h2h_arb(game_id, info, sides, min_profit)
+                elif market_type == "spreads":
+                    arb = _paired_arb(game_id, info, market_type, sides, min_profit, opposite=True)
+                elif market_type == "totals":
+                    arb = _paired_arb(game_id, info, market_type, sides, min_profit, opposite=False)
+                else:
+                    arb = None
+                if arb:
+                    opportunities.append(arb)
+
+        opportunities.sort(key=lambda x: x.profit_margin, reverse=True)
+        self.last_scan_ms = round((time.perf_counter() - start) * 1000, 3)
+        return opportunities
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribed": self._subscribed,
+            "games": len(self._games),
+            "markets": len(self._markets),
+            "sides": sum(len(sides) for sides in self._markets.values()),
+            "updates": self.updates,
+            "last_scan_ms": self.last_scan_ms,
+        }
+
+
+def _game_info(game: Game) -> GameInfo:
+    return GameInfo(
+        sport=game.sport,
+        home_team=game.home_team.name if game.home_team else "Home",
+        away_team=game.away_team.name if game.away_team else "Away",
+        start_time=game.start_time,
+        status=game.status,
+    )
+
+
+def _opportunity(
+    game_id: int,
+    info: GameInfo,
+    market_type: str,
+    legs: List[Tuple[str, int, str]],
+    margin: float
+) -> ArbOpportunity:
+    """Build an ArbOpportunity from (label, odds, sportsbook) legs."""
+    stakes = calculate_stakes([odds for _, odds, _ in legs])
+    fields: Dict[str, Any] = {}
+    for i, (label, odds, book) in enumerate(legs, start=1):
+        fields[f"bet{i}_selection"] = label
+        fields[f"bet{i}_sportsbook"] = book
+        fields[f"bet{i}_odds"] = odds
+        fields[f"bet{i}_stake_pct"] = round(stakes[i - 1], 2)
+    return ArbOpportunity(
+        game_id=game_id,
+        sport=info.sport,
+        home_team=info.home_team,
+        away_team=info.away_team,
+        market_type=market_type,
+        start_time=info.start_time,
+        profit_margin=round(abs(margin), 2),
+        **fields,
+    )
+
+
+def _h2h_arb(
+    game_id: int,
+    info: GameInfo,
+    sides: Dict[SideKey, PriceEntry],
+    min_profit: float
+) -> Optional[ArbOpportunity]:
+    if len(sides) not in (2, 3):
+        return None
+    legs = [(selection, *entry.best) for (selection, _), entry in sides.items()]
+    margin = calculate_arb_margin([odds for _, odds, _ in legs])
+    # Negative margin means arbitrage exists
+    if margin >= -min_profit:
+        return None
+    return _opportunity(game_id, info, "h2h", legs, margin)
+
+
+def _paired_arb(
+    game_id: int,
+    info: GameInfo,
+    market_type: str,
+    sides: Dict[SideKey, PriceEntry],
+    min_profit: float,
+    opposite: bool
+) -> Optional[ArbOpportunity]:
+    """Best two-leg arb between sides at matching points (negated for spreads)."""
+    by_point: Dict[float, Dict[str, PriceEntry]] = {}
+    for (selection, point), entry in sides.items():
+        if point is not None:
+            by_point.setdefault(point, {})[selection] = entry
+
+    best = None
+    best_margin = -min_profit
+    for point, selections in by_point.items():
+        match_point = -point if opposite else point
+        # Visit each pair of points once
+        if opposite and point > match_point:
+            continue
+        matches = by_point.get(match_point)
+        if not matches:
+            continue
+        for sel1, entry1 in selections.items():
+            for sel2, entry2 in matches.items():
+                if sel1 == sel2:
+                    continue
+                if not opposite and (sel1.lower() != "over" or sel2.lower() != "under"):
+                    continue
+                odds1, book1 = entry1.best
+                odds2, book2 = entry2.best
+                margin = calculate_arb_margin([odds1, odds2])
+                if margin < best_margin:
+                    best_margin = margin
+                    if opposite:
+                        labels = (f"{sel1} {point:+.1f}", f"{sel2} {match_point:+.1f}")
+                    else:
+                        labels = (f"Over {point}", f"Under {point}")
+                    best = [(labels[0], odds1, book1), (labels[1], odds2, book2)]
+
+    if best is None:
+        return None
+    return _opportunity(game_id, info, market_type, best, best_margin)
+
+
+# Global index fed by odds ingestion
+price_index = BestPriceIndex()
@@ -640,3 +640,67 @@ async def broadcast_arb_alert(
 
     logger.info(f"Broadcast arb alert: {sent} sent, {skipped} skipped")
     return {"sent": sent, "skipped": skipped}
+
+
+async def notify_steam_alert(
+    db: Session,
+    user_id: int,
+    sport: str,
+    matchup: str,
+    market: str,
+    description: str
+) -> Dict[str, Any]:
+    """
+    Send steam move alert with preference checking.
+
+    Respects quiet hours, rate limits, and sport settings.
+    """
+    if not can_send_notification(db, user_id, "steam_alert", sport):
+        return {"success": False, "reason": "notification_suppressed"}
+
+    title = f"🔥 {sport} Steam Move"
+    body = f"{matchup}: {description}"
+    data = {
+        "type": "steam_alert",
+        "sport": sport,
+        "market": market,
+    }
+
+    result = await send_notification_to_user(db, user_id, title, body, data, "steam_alert")
+
+    if result.get("success"):
+        prefs = db.query(NotificationPreferences).filter(
+            NotificationPreferences.user_id == user_id
+        ).first()
+        if prefs:
+            record_notification(db, prefs)
+
+    return result
+
+
+async def broadcast_steam_alert(
+    db: Session,
+    sport: str,
+    matchup: str,
+    market: str,
+    description: str
+) -> Dict[str, Any]:
+    """
+    Broadcast steam move alert to all eligible users.
+
+    Respects individual user preferences.
+    """
+    users = db.query(User).filter(User.is_active == True).all()
+
+    sent = 0
+    skipped = 0
+
+    for user in users:
+        result = await notify_steam_alert(db, user.id, sport, matchup, market, description)
+        if result.get("success"):
+            sent += 1
+        else:
+            skipped += 1
+
+    logger.info(f"Broadcast steam alert: {sent} sent, {skipped} skipped")
+    return {"sent": sent, "skipped": skipped}
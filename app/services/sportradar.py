@@ -12,13 +12,13 @@ Supports: NFL, NBA, MLB, NHL, Soccer
 
 import os
 import hashlib
-import httpx
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
 from app.utils.logging import get_logger
 from app.utils.cache import cache, TTL_SHORT, TTL_MEDIUM, TTL_LONG
+from app.utils.http_client import http_clients
 
 logger = get_logger(__name__)
 
@@ -109,19 +109,18 @@ async def _make_request(url: str, params: Optional[Dict] = None) -> Optional[Dic
     params["api_key"] = SPORTRADAR_API_KEY
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 403:
-                logger.error("Sportradar API access denied - check API key")
-            elif response.status_code == 429:
-                logger.warning("Sportradar rate limit exceeded")
-            else:
-                logger.error(f"Sportradar API error: {response.status_code}")
+        response = await http_clients.get("sportradar", url, params=params)
+
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 403:
+            logger.error("Sportradar API access denied - check API key")
+        elif response.status_code == 429:
+            logger.warning("Sportradar rate limit exceeded")
+        else:
+            logger.error(f"Sportradar API error: {response.status_code}")
 
-            return None
+        return None
     except Exception as e:
         logger.error(f"Sportradar API request failed: {e}")
         return None
@@ -160,7 +159,7 @@ async def get_live_games(sport: str) -> List[Dict[str, Any]]:
         List of live game data
     """
     cache_key = f"sportradar:live:{sport.upper()}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -193,14 +192,14 @@ async def get_live_games(sport: str) -> List[Dict[str, Any]]:
                     for g in data["games"]
                     if g.get("status") in ("inprogress", "halftime", "live")
                 ]
-                cache.set(cache_key, live_games, ttl=TTL_SHORT)
+                await cache.aset(cache_key, live_games, ttl=TTL_SHORT)
                 return live_games
         except Exception as e:
             logger.error(f"Error fetching live games: {e}")
 
     # Simulation mode
     games = _simulate_live_games(sport)
-    cache.set(cache_key, games, ttl=TTL_SHORT)
+    await cache.aset(cache_key, games, ttl=TTL_SHORT)
     return games
 
 
@@ -216,7 +215,7 @@ async def get_game_boxscore(sport: str, game_id: str) -> Dict[str, Any]:
         Game boxscore with stats
     """
     cache_key = f"sportradar:boxscore:{sport}:{game_id}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -226,14 +225,14 @@ async def get_game_boxscore(sport: str, game_id: str) -> Dict[str, Any]:
             data = await _make_request(url)
             if data:
                 result = _parse_boxscore(data, sport)
-                cache.set(cache_key, result, ttl=TTL_SHORT)
+                await cache.aset(cache_key, result, ttl=TTL_SHORT)
                 return result
         except Exception as e:
             logger.error(f"Error fetching boxscore: {e}")
 
     # Simulation
     result = _simulate_boxscore(sport, game_id)
-    cache.set(cache_key, result, ttl=TTL_SHORT)
+    await cache.aset(cache_key, result, ttl=TTL_SHORT)
     return result
 
 
@@ -255,7 +254,7 @@ async def get_daily_schedule(
         target_date = date.today()
 
     cache_key = f"sportradar:schedule:{sport}:{target_date.isoformat()}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -274,14 +273,14 @@ async def get_daily_schedule(
             data = await _make_request(url)
             if data and "games" in data:
                 games = [_parse_game(g, sport) for g in data["games"]]
-                cache.set(cache_key, games, ttl=TTL_MEDIUM)
+                await cache.aset(cache_key, games, ttl=TTL_MEDIUM)
                 return games
         except Exception as e:
             logger.error(f"Error fetching schedule: {e}")
 
     # Simulation
     games = _simulate_schedule(sport, target_date)
-    cache.set(cache_key, games, ttl=TTL_MEDIUM)
+    await cache.aset(cache_key, games, ttl=TTL_MEDIUM)
     return games
 
 
@@ -301,7 +300,7 @@ async def get_player_profile(sport: str, player_id: str) -> Dict[str, Any]:
         Player profile with stats
     """
     cache_key = f"sportradar:player:{sport}:{player_id}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -311,14 +310,14 @@ async def get_player_profile(sport: str, player_id: str) -> Dict[str, Any]:
             data = await _make_request(url)
             if data:
                 result = _parse_player_profile(data, sport)
-                cache.set(cache_key, result, ttl=TTL_LONG)
+                await cache.aset(cache_key, result, ttl=TTL_LONG)
                 return result
         except Exception as e:
             logger.error(f"Error fetching player profile: {e}")
 
     # Simulation
     result = _simulate_player_profile(sport, player_id)
-    cache.set(cache_key, result, ttl=TTL_LONG)
+    await cache.aset(cache_key, result, ttl=TTL_LONG)
     return result
 
 
@@ -334,7 +333,7 @@ async def get_team_roster(sport: str, team_id: str) -> Dict[str, Any]:
         Team roster
     """
     cache_key = f"sportradar:roster:{sport}:{team_id}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -344,14 +343,14 @@ async def get_team_roster(sport: str, team_id: str) -> Dict[str, Any]:
             data = await _make_request(url)
             if data:
                 result = _parse_team_roster(data, sport)
-                cache.set(cache_key, result, ttl=TTL_LONG)
+                await cache.aset(cache_key, result, ttl=TTL_LONG)
                 return result
         except Exception as e:
             logger.error(f"Error fetching team roster: {e}")
 
     # Simulation
     result = _simulate_team_roster(sport, team_id)
-    cache.set(cache_key, result, ttl=TTL_LONG)
+    await cache.aset(cache_key, result, ttl=TTL_LONG)
     return result
 
 
@@ -390,7 +389,7 @@ async def get_injuries(sport: str) -> List[Dict[str, Any]]:
         List of injured players
     """
     cache_key = f"sportradar:injuries:{sport}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -404,14 +403,14 @@ async def get_injuries(sport: str) -> List[Dict[str, Any]]:
                     team_name = team.get("name", "Unknown")
                     for player in team.get("players", []):
                         injuries.append(_parse_injury(player, team_name, sport))
-                cache.set(cache_key, injuries, ttl=TTL_MEDIUM)
+                await cache.aset(cache_key, injuries, ttl=TTL_MEDIUM)
                 return injuries
         except Exception as e:
             logger.error(f"Error fetching injuries: {e}")
 
     # Simulation
     injuries = _simulate_injuries(sport)
-    cache.set(cache_key, injuries, ttl=TTL_MEDIUM)
+    await cache.aset(cache_key, injuries, ttl=TTL_MEDIUM)
     return injuries
 
 
@@ -459,7 +458,7 @@ async def get_historical_games(
         end_date = start_date
 
     cache_key = f"sportradar:historical:{sport}:{start_date}:{end_date}:{team_id or 'all'}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -482,7 +481,7 @@ async def get_historical_games(
             or team_id.upper() in g.get("away_team", {}).get("abbreviation", "").upper()
         ]
 
-    cache.set(cache_key, games, ttl=TTL_LONG)
+    await cache.aset(cache_key, games, ttl=TTL_LONG)
     return games
 
 
@@ -506,7 +505,7 @@ async def get_standings(
         season_year = date.today().year
 
     cache_key = f"sportradar:standings:{sport}:{season_year}:{season_type}"
-    cached = cache.get(cache_key)
+    cached = await cache.aget(cache_key)
     if cached:
         return cached
 
@@ -520,14 +519,14 @@ async def get_standings(
             data = await _make_request(url)
             if data:
                 result = _parse_standings(data, sport)
-                cache.set(cache_key, result, ttl=TTL_MEDIUM)
+                await cache.aset(cache_key, result, ttl=TTL_MEDIUM)
                 return result
         except Exception as e:
             logger.error(f"Error fetching standings: {e}")
 
     # Simulation
     result = _simulate_standings(sport, season_year)
-    cache.set(cache_key, result, ttl=TTL_MEDIUM)
+    await cache.aset(cache_key, result, ttl=TTL_MEDIUM)
     return result
 
 
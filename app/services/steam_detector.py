@@ -0,0 +1,364 @@
+"""
+Streaming steam detector.
+
+Subscribes to the odds feed and keeps, per (game, market), a ring buffer
+of recent line changes across books. Each batch is folded in as it is
+published, so steam and sharp-book-first events fire within milliseconds
+of the odds landing rather than on the next analysis pass.
+
+- Steam: STEAM_MIN_BOOKS or more books moving the same way by at least
+  SIGNIFICANT_MOVE_THRESHOLD within STEAM_TIME_WINDOW_MINUTES.
+- Sharp book first: a sharp book moves by SIGNIFICANT_MOVE_THRESHOLD
+  before any other book has moved the same way in the window.
+
+Only markets with points (spreads, totals) are tracked. A series' line is
+the lowest point among its outcomes (the favorite's spread, or the total).
+
+Events are pushed to edge_alerts (push notifications and webhooks) on the
+event loop given to ``start``. ``replay_snapshots`` feeds stored
+OddsSnapshot history through a detector for benchmarks and regression
+tests.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db import OddsSnapshot
+from app.services.line_movement_analyzer import SHARP_BOOKS, SIGNIFICANT_MOVE_THRESHOLD, STEAM_TIME_WINDOW_MINUTES
+from app.services.odds_feed import OddsBatch, odds_feed
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+STEAM_MIN_BOOKS = int(os.environ.get("STEAM_MIN_BOOKS", "3"))
+# Changes kept per (game, market); old ones also age out of the time window
+STEAM_RING_SIZE = int(os.environ.get("STEAM_RING_SIZE", "256"))
+# Series not updated for this long are dropped
+STEAM_IDLE_HOURS = 24
+RECENT_EVENTS_SIZE = 500
+REPLAY_BATCH_SIZE = 5000
+
+MarketKey = Tuple[int, str]
+SeriesKey = Tuple[int, str, str]
+
+
+@dataclass
+class SteamEvent:
+    """A steam or sharp-book-first signal on one market."""
+    event_type: str  # 'steam' or 'sharp_book_first'
+    game_id: int
+    sport: Optional[str]
+    market_type: str
+    direction: str  # 'up' or 'down'
+    books: List[str]
+    move: float  # Mean absolute move of the books involved
+    first_book: str
+    line_from: Optional[float]
+    line_to: Optional[float]
+    detected_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["detected_at"] = self.detected_at.isoformat()
+        return data
+
+
+class SteamDetector:
+    """
+    Incremental steam and sharp-book-first detection over the odds feed.
+
+    State is a last-line map per (game, market, book) and a bounded ring
+    buffer of (timestamp, book, change) per (game, market); a batch costs
+    time proportional to its ticks. The feed publishes from the scheduler's
+    writer thread and from request handlers, so state is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        window_minutes: float = STEAM_TIME_WINDOW_MINUTES,
+        min_books: int = STEAM_MIN_BOOKS,
+        min_move: float = SIGNIFICANT_MOVE_THRESHOLD,
+        ring_size: int = STEAM_RING_SIZE
+    ):
+        self.window = window_minutes * 60
+        self.min_books = min_books
+        self.min_move = min_move
+        self.ring_size = ring_size
+        self._lines: Dict[SeriesKey, Tuple[float, float]] = {}  # line, timestamp
+        self._rings: Dict[MarketKey, Deque[Tuple[float, str, float]]] = {}
+        self._emitted: Dict[Tuple[MarketKey, str, str], float] = {}
+        self.recent_events: Deque[SteamEvent] = deque(maxlen=RECENT_EVENTS_SIZE)
+        self._lock = threading.RLock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.ticks = 0
+        self.events = 0
+        self.last_detect_ms: Optional[float] = None
+        # Latest tick time seen; pruning follows it so replays age out like live data
+        self._clock = 0.0
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Subscribe to the odds feed; events are dispatched on ``loop`` when given."""
+        self._loop = loop
+        odds_feed.subscribe(self.handle)
+        logger.info("Steam detector subscribed to odds feed")
+
+    def stop(self) -> None:
+        odds_feed.unsubscribe(self.handle)
+        self._loop = None
+
+    def handle(self, batch: OddsBatch) -> List[SteamEvent]:
+        """Feed subscriber: detect on the batch and dispatch any events."""
+        events = self.observe(batch.ticks, sport=batch.sport)
+        if events and self._loop is not None and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_dispatch(events), self._loop)
+        return events
+
+    def observe(self, ticks: Iterable[Dict[str, Any]], sport: Optional[str] = None) -> List[SteamEvent]:
+        """
+        Fold a batch of ticks into the windows and return new events.
+
+        Args:
+            ticks: Dicts with game_id, market_type, sportsbook, line_value
+                and captured_at (other keys are ignored)
+            sport: Sport the batch belongs to, copied onto events
+
+        Returns:
+            Events raised by this batch
+        """
+        start = time.perf_counter()
+
+        # One line per series: the lowest point among its outcomes
+        lines: Dict[SeriesKey, Tuple[float, float]] = {}
+        count = 0
+        latest = 0.0
+        for tick in ticks:
+            count += 1
+            line = tick.get("line_value")
+            if line is None:
+                continue
+            key = (tick["game_id"], tick["market_type"], tick["sportsbook"])
+            timestamp = _timestamp(tick.get("captured_at"))
+            latest = max(latest, timestamp)
+            current = lines.get(key)
+            if current is None or line < current[0]:
+                lines[key] = (line, timestamp)
+
+        with self._lock:
+            self._clock = max(self._clock, latest)
+            touched: Dict[MarketKey, List[Tuple[str, float, float, float]]] = {}
+            for key, (line, timestamp) in lines.items():
+                previous = self._lines.get(key)
+                self._lines[key] = (line, timestamp)
+                if previous is None or previous[0] == line:
+                    continue
+                market = (key[0], key[1])
+                ring = self._rings.get(market)
+                if ring is None:
+                    ring = self._rings[market] = deque(maxlen=self.ring_size)
+                ring.append((timestamp, key[2], line - previous[0]))
+                touched.setdefault(market, []).append((key[2], previous[0], line, timestamp))
+
+            events = []
+            for market, moves in touched.items():
+                events.extend(self._evaluate(market, moves, sport))
+
+            self.batches += 1
+            self.ticks += count
+            self.events += len(events)
+            self.recent_events.extend(events)
+            if self.batches % 500 == 0:
+                self.prune(self._clock)
+            self.last_detect_ms = round((time.perf_counter() - start) * 1000, 3)
+        return events
+
+    def _evaluate(
+        self,
+        market: MarketKey,
+        moves: List[Tuple[str, float, float, float]],
+        sport: Optional[str]
+    ) -> List[SteamEvent]:
+        ring = self._rings[market]
+        now = max(move[3] for move in moves)
+        while ring and now - ring[0][0] > self.window:
+            ring.popleft()
+
+        # Net move per book inside the window, and when each book first moved
+        net: Dict[str, float] = {}
+        first_moved: Dict[str, float] = {}
+        for timestamp, book, change in ring:
+            net[book] = net.get(book, 0.0) + change
+            first_moved.setdefault(book, timestamp)
+
+        events = []
+        for direction, sign in (("up", 1), ("down", -1)):
+            movers = sorted(
+                (book for book, change in net.items() if change * sign >= self.min_move),
+                key=lambda book: first_moved[book]
+            )
+            if not movers:
+                continue
+            mean_move = round(sum(abs(net[book]) for book in movers) / len(movers), 2)
+            line_from = min((m[1] for m in moves), default=None)
+            line_to = min((m[2] for m in moves), default=None)
+
+            if len(movers) >= self.min_books and self._claim(market, "steam", direction, now):
+                events.append(SteamEvent(
+                    "steam", market[0], sport, market[1], direction,
+                    movers, mean_move, movers[0], line_from, line_to
+                ))
+
+            first = movers[0]
+            leader_alone = all(first_moved[book] > first_moved[first] for book in movers[1:])
+            if (first.lower() in SHARP_BOOKS and leader_alone
+                    and self._claim(market, "sharp_book_first", direction, now)):
+                events.append(SteamEvent(
+                    "sharp_book_first", market[0], sport, market[1], direction,
+                    [first], round(abs(net[first]), 2), first, line_from, line_to
+                ))
+        return events
+
+    def _claim(self, market: MarketKey, event_type: str, direction: str, now: float) -> bool:
+        """True unless the same event already fired for this market within the window."""
+        key = (market, event_type, direction)
+        last = self._emitted.get(key)
+        if last is not None and now - last <= self.window:
+            return False
+        self._emitted[key] = now
+        return True
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop series and windows idle for STEAM_IDLE_HOURS. Returns series dropped."""
+        cutoff = (now if now is not None else time.time()) - STEAM_IDLE_HOURS * 3600
+        with self._lock:
+            stale = [key for key, (_, timestamp) in self._lines.items() if timestamp < cutoff]
+            for key in stale:
+                del self._lines[key]
+            for market in [m for m, ring in self._rings.items() if not ring or ring[-1][0] < cutoff]:
+                del self._rings[market]
+            for key in [k for k, timestamp in self._emitted.items() if timestamp < cutoff]:
+                del self._emitted[key]
+        return len(stale)
+
+    def get_recent_events(self, game_id: Optional[int] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent events first, optionally for one game."""
+        with self._lock:
+            recent = list(self.recent_events)
+        events = [e for e in reversed(recent) if game_id is None or e.game_id == game_id]
+        return [e.to_dict() for e in events[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribed": self._loop is not None,
+                "series": len(self._lines),
+                "markets": len(self._rings),
+                "batches": self.batches,
+                "ticks": self.ticks,
+                "events": self.events,
+                "last_detect_ms": self.last_detect_ms,
+            }
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return (value - datetime(1970, 1, 1)).total_seconds()
+    if value is None:
+        return time.time()
+    return float(value)
+
+
+async def _dispatch(events: List[SteamEvent]) -> None:
+    from app.services.edge_alerts import send_steam_alerts
+
+    try:
+        await send_steam_alerts(events)
+    except Exception as e:
+        logger.error(f"Error dispatching steam events: {e}")
+
+
+def replay_snapshots(
+    db: Session,
+    detector: Optional[SteamDetector] = None,
+    game_ids: Optional[Iterable[int]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Feed stored OddsSnapshot history through a detector, one batch per capture time.
+
+    Args:
+        db: Database session
+        detector: Detector to feed (default a fresh SteamDetector)
+        game_ids: Limit to these games
+        since: Start of the range (inclusive)
+        until: End of the range (exclusive)
+
+    Returns:
+        Dict with the events raised, batch and tick counts, and timings in ms
+    """
+    detector = detector or SteamDetector()
+    query = db.query(
+        OddsSnapshot.game_id,
+        OddsSnapshot.market_type,
+        OddsSnapshot.sportsbook,
+        OddsSnapshot.line_value,
+        OddsSnapshot.captured_at
+    )
+    if game_ids is not None:
+        query = query.filter(OddsSnapshot.game_id.in_(set(game_ids)))
+    if since is not None:
+        query = query.filter(OddsSnapshot.captured_at >= since)
+    if until is not None:
+        query = query.filter(OddsSnapshot.captured_at < until)
+    query = query.order_by(OddsSnapshot.captured_at, OddsSnapshot.id).execution_options(
+        yield_per=REPLAY_BATCH_SIZE
+    )
+
+    events: List[SteamEvent] = []
+    batches = 0
+    ticks = 0
+    detect_ms = 0.0
+    start = time.perf_counter()
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        nonlocal batches, ticks, detect_ms
+        if batch:
+            ticks += len(batch)
+            events.extend(detector.observe(batch))
+            detect_ms += detector.last_detect_ms or 0.0
+            batches += 1
+            batch.clear()
+
+    for game_id, market_type, sportsbook, line_value, captured_at in query:
+        if batch and batch[-1]["captured_at"] != captured_at:
+            flush()
+        batch.append({
+            "game_id": game_id,
+            "market_type": market_type,
+            "sportsbook": sportsbook,
+            "line_value": line_value,
+            "captured_at": captured_at,
+        })
+    flush()
+
+    return {
+        "events": [e.to_dict() for e in events],
+        "batches": batches,
+        "ticks": ticks,
+        "detect_ms": round(detect_ms, 3),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+# Global detector fed by the odds scheduler and bulk odds ingestion
+steam_detector = SteamDetector()
@@ -1,11 +1,11 @@
 import os
-import httpx
 import secrets
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from app.db import User, TelegramUser, TelegramLinkCode
+from app.utils.http_client import http_clients
 
 
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
@@ -28,15 +28,15 @@ async def send_message(chat_id: str, text: str, parse_mode: str = "HTML") -> boo
         return False
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{get_bot_url()}/sendMessage",
-                json={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": parse_mode
-                }
-            )
+        response = await http_clients.post(
+            "telegram",
+            f"{get_bot_url()}/sendMessage",
+            json={
+                "chat_id": chat_id,
+                "text": text,
+                "parse_mode": parse_mode
+            }
+        )
 
         return response.status_code == 200
     except Exception:
@@ -5,13 +5,14 @@ Fetches weather data from Open-Meteo API (completely free, no API key needed).
 Provides current weather, forecasts, and historical data for game venues.
 """
 
-import httpx
 from datetime import datetime, date, timedelta
 from typing import Optional, Dict, Any, List
 from functools import lru_cache
 import asyncio
 import logging
 
+from app.utils.http_client import http_clients
+
 logger = logging.getLogger(__name__)
 
 # Open-Meteo API endpoints
@@ -133,37 +134,36 @@ async def get_current_weather(lat: float, lon: float) -> Optional[Dict[str, Any]
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(FORECAST_BASE, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            current = data.get("current", {})
-
-            weather = {
-                "temperature_f": _celsius_to_fahrenheit(current.get("temperature_2m", 0)),
-                "temperature_c": round(current.get("temperature_2m", 0), 1),
-                "humidity": current.get("relative_humidity_2m", 0),
-                "precipitation_in": _mm_to_inches(current.get("precipitation", 0)),
-                "rain_in": _mm_to_inches(current.get("rain", 0)),
-                "weather_code": current.get("weather_code", 0),
-                "conditions": _get_weather_description(current.get("weather_code", 0)),
-                "wind_speed_mph": _kmh_to_mph(current.get("wind_speed_10m", 0)),
-                "wind_speed_kmh": round(current.get("wind_speed_10m", 0), 1),
-                "wind_direction_degrees": current.get("wind_direction_10m", 0),
-                "wind_direction": _get_wind_direction_name(current.get("wind_direction_10m", 0)),
-                "wind_gusts_mph": _kmh_to_mph(current.get("wind_gusts_10m", 0)),
-                "timezone": data.get("timezone", "UTC"),
-                "fetched_at": datetime.now().isoformat(),
-            }
-
-            # Cache the result
-            _weather_cache[cache_key] = {
-                "data": weather,
-                "cached_at": datetime.now().timestamp()
-            }
-
-            return weather
+        response = await http_clients.get("weather", FORECAST_BASE, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        current = data.get("current", {})
+
+        weather = {
+            "temperature_f": _celsius_to_fahrenheit(current.get("temperature_2m", 0)),
+            "temperature_c": round(current.get("temperature_2m", 0), 1),
+            "humidity": current.get("relative_humidity_2m", 0),
+            "precipitation_in": _mm_to_inches(current.get("precipitation", 0)),
+            "rain_in": _mm_to_inches(current.get("rain", 0)),
+            "weather_code": current.get("weather_code", 0),
+            "conditions": _get_weather_description(current.get("weather_code", 0)),
+            "wind_speed_mph": _kmh_to_mph(current.get("wind_speed_10m", 0)),
+            "wind_speed_kmh": round(current.get("wind_speed_10m", 0), 1),
+            "wind_direction_degrees": current.get("wind_direction_10m", 0),
+            "wind_direction": _get_wind_direction_name(current.get("wind_direction_10m", 0)),
+            "wind_gusts_mph": _kmh_to_mph(current.get("wind_gusts_10m", 0)),
+            "timezone": data.get("timezone", "UTC"),
+            "fetched_at": datetime.now().isoformat(),
+        }
+
+        # Cache the result
+        _weather_cache[cache_key] = {
+            "data": weather,
+            "cached_at": datetime.now().timestamp()
+        }
+
+        return weather
 
     except Exception as e:
         logger.error(f"Error fetching current weather for ({lat}, {lon}): {e}")
@@ -216,49 +216,48 @@ async def get_forecast(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(FORECAST_BASE, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            hourly = data.get("hourly", {})
-            times = hourly.get("time", [])
-
-            # Find the index for the target hour
-            target_index = None
-            for i, time_str in enumerate(times):
-                hour = int(time_str.split("T")[1].split(":")[0])
-                if hour == target_hour:
-                    target_index = i
-                    break
-
-            if target_index is None:
-                target_index = min(target_hour, len(times) - 1)
-
-            weather = {
-                "forecast_time": times[target_index] if times else None,
-                "temperature_f": _celsius_to_fahrenheit(hourly.get("temperature_2m", [0])[target_index]),
-                "temperature_c": round(hourly.get("temperature_2m", [0])[target_index], 1),
-                "humidity": hourly.get("relative_humidity_2m", [0])[target_index],
-                "precipitation_in": _mm_to_inches(hourly.get("precipitation", [0])[target_index]),
-                "rain_in": _mm_to_inches(hourly.get("rain", [0])[target_index]),
-                "snowfall_in": _mm_to_inches(hourly.get("snowfall", [0])[target_index] * 10),  # cm to mm
-                "weather_code": hourly.get("weather_code", [0])[target_index],
-                "conditions": _get_weather_description(hourly.get("weather_code", [0])[target_index]),
-                "wind_speed_mph": _kmh_to_mph(hourly.get("wind_speed_10m", [0])[target_index]),
-                "wind_direction_degrees": hourly.get("wind_direction_10m", [0])[target_index],
-                "wind_direction": _get_wind_direction_name(hourly.get("wind_direction_10m", [0])[target_index]),
-                "wind_gusts_mph": _kmh_to_mph(hourly.get("wind_gusts_10m", [0])[target_index]),
-                "timezone": data.get("timezone", "UTC"),
-                "is_forecast": True,
-            }
-
-            _weather_cache[cache_key] = {
-                "data": weather,
-                "cached_at": datetime.now().timestamp()
-            }
-
-            return weather
+        response = await http_clients.get("weather", FORECAST_BASE, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        hourly = data.get("hourly", {})
+        times = hourly.get("time", [])
+
+        # Find the index for the target hour
+        target_index = None
+        for i, time_str in enumerate(times):
+            hour = int(time_str.split("T")[1].split(":")[0])
+            if hour == target_hour:
+                target_index = i
+                break
+
+        if target_index is None:
+            target_index = min(target_hour, len(times) - 1)
+
+        weather = {
+            "forecast_time": times[target_index] if times else None,
+            "temperature_f": _celsius_to_fahrenheit(hourly.get("temperature_2m", [0])[target_index]),
+            "temperature_c": round(hourly.get("temperature_2m", [0])[target_index], 1),
+            "humidity": hourly.get("relative_humidity_2m", [0])[target_index],
+            "precipitation_in": _mm_to_inches(hourly.get("precipitation", [0])[target_index]),
+            "rain_in": _mm_to_inches(hourly.get("rain", [0])[target_index]),
+            "snowfall_in": _mm_to_inches(hourly.get("snowfall", [0])[target_index] * 10),  # cm to mm
+            "weather_code": hourly.get("weather_code", [0])[target_index],
+            "conditions": _get_weather_description(hourly.get("weather_code", [0])[target_index]),
+            "wind_speed_mph": _kmh_to_mph(hourly.get("wind_speed_10m", [0])[target_index]),
+            "wind_direction_degrees": hourly.get("wind_direction_10m", [0])[target_index],
+            "wind_direction": _get_wind_direction_name(hourly.get("wind_direction_10m", [0])[target_index]),
+            "wind_gusts_mph": _kmh_to_mph(hourly.get("wind_gusts_10m", [0])[target_index]),
+            "timezone": data.get("timezone", "UTC"),
+            "is_forecast": True,
+        }
+
+        _weather_cache[cache_key] = {
+            "data": weather,
+            "cached_at": datetime.now().timestamp()
+        }
+
+        return weather
 
     except Exception as e:
         logger.error(f"Error fetching forecast for ({lat}, {lon}) on {target_date}: {e}")
@@ -311,40 +310,39 @@ async def get_historical_weather(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(HISTORICAL_BASE, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            hourly = data.get("hourly", {})
-            times = hourly.get("time", [])
-
-            target_index = min(target_hour, len(times) - 1) if times else 0
-
-            weather = {
-                "recorded_time": times[target_index] if times else None,
-                "temperature_f": _celsius_to_fahrenheit(hourly.get("temperature_2m", [0])[target_index]),
-                "temperature_c": round(hourly.get("temperature_2m", [0])[target_index], 1),
-                "humidity": hourly.get("relative_humidity_2m", [0])[target_index],
-                "precipitation_in": _mm_to_inches(hourly.get("precipitation", [0])[target_index]),
-                "rain_in": _mm_to_inches(hourly.get("rain", [0])[target_index]),
-                "snowfall_in": _mm_to_inches(hourly.get("snowfall", [0])[target_index] * 10),
-                "weather_code": hourly.get("weather_code", [0])[target_index],
-                "conditions": _get_weather_description(hourly.get("weather_code", [0])[target_index]),
-                "wind_speed_mph": _kmh_to_mph(hourly.get("wind_speed_10m", [0])[target_index]),
-                "wind_direction_degrees": hourly.get("wind_direction_10m", [0])[target_index],
-                "wind_direction": _get_wind_direction_name(hourly.get("wind_direction_10m", [0])[target_index]),
-                "wind_gusts_mph": _kmh_to_mph(hourly.get("wind_gusts_10m", [0])[target_index]),
-                "timezone": data.get("timezone", "UTC"),
-                "is_historical": True,
-            }
-
-            _weather_cache[cache_key] = {
-                "data": weather,
-                "cached_at": datetime.now().timestamp()
-            }
-
-            return weather
+        response = await http_clients.get("weather", HISTORICAL_BASE, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        hourly = data.get("hourly", {})
+        times = hourly.get("time", [])
+
+        target_index = min(target_hour, len(times) - 1) if times else 0
+
+        weather = {
+            "recorded_time": times[target_index] if times else None,
+            "temperature_f": _celsius_to_fahrenheit(hourly.get("temperature_2m", [0])[target_index]),
+            "temperature_c": round(hourly.get("temperature_2m", [0])[target_index], 1),
+            "humidity": hourly.get("relative_humidity_2m", [0])[target_index],
+            "precipitation_in": _mm_to_inches(hourly.get("precipitation", [0])[target_index]),
+            "rain_in": _mm_to_inches(hourly.get("rain", [0])[target_index]),
+            "snowfall_in": _mm_to_inches(hourly.get("snowfall", [0])[target_index] * 10),
+            "weather_code": hourly.get("weather_code", [0])[target_index],
+            "conditions": _get_weather_description(hourly.get("weather_code", [0])[target_index]),
+            "wind_speed_mph": _kmh_to_mph(hourly.get("wind_speed_10m", [0])[target_index]),
+            "wind_direction_degrees": hourly.get("wind_direction_10m", [0])[target_index],
+            "wind_direction": _get_wind_direction_name(hourly.get("wind_direction_10m", [0])[target_index]),
+            "wind_gusts_mph": _kmh_to_mph(hourly.get("wind_gusts_10m", [0])[target_index]),
+            "timezone": data.get("timezone", "UTC"),
+            "is_historical": True,
+        }
+
+        _weather_cache[cache_key] = {
+            "data": weather,
+            "cached_at": datetime.now().timestamp()
+        }
+
+        return weather
 
     except Exception as e:
         logger.error(f"Error fetching historical weather for ({lat}, {lon}) on {target_date}: {e}")
@@ -437,30 +435,29 @@ async def get_multi_hour_forecast(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(FORECAST_BASE, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            hourly = data.get("hourly", {})
-            times = hourly.get("time", [])
-
-            forecasts = []
-            for i, time_str in enumerate(times):
-                hour = int(time_str.split("T")[1].split(":")[0])
-                if start_hour <= hour <= end_hour:
-                    forecasts.append({
-                        "time": time_str,
-                        "hour": hour,
-                        "temperature_f": _celsius_to_fahrenheit(hourly.get("temperature_2m", [0])[i]),
-                        "humidity": hourly.get("relative_humidity_2m", [0])[i],
-                        "precipitation_in": _mm_to_inches(hourly.get("precipitation", [0])[i]),
-                        "conditions": _get_weather_description(hourly.get("weather_code", [0])[i]),
-                        "wind_speed_mph": _kmh_to_mph(hourly.get("wind_speed_10m", [0])[i]),
-                        "wind_direction": _get_wind_direction_name(hourly.get("wind_direction_10m", [0])[i]),
-                    })
-
-            return forecasts
+        response = await http_clients.get("weather", FORECAST_BASE, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        hourly = data.get("hourly", {})
+        times = hourly.get("time", [])
+
+        forecasts = []
+        for i, time_str in enumerate(times):
+            hour = int(time_str.split("T")[1].split(":")[0])
+            if start_hour <= hour <= end_hour:
+                forecasts.append({
+                    "time": time_str,
+                    "hour": hour,
+                    "temperature_f": _celsius_to_fahrenheit(hourly.get("temperature_2m", [0])[i]),
+                    "humidity": hourly.get("relative_humidity_2m", [0])[i],
+                    "precipitation_in": _mm_to_inches(hourly.get("precipitation", [0])[i]),
+                    "conditions": _get_weather_description(hourly.get("weather_code", [0])[i]),
+                    "wind_speed_mph": _kmh_to_mph(hourly.get("wind_speed_10m", [0])[i]),
+                    "wind_direction": _get_wind_direction_name(hourly.get("wind_direction_10m", [0])[i]),
+                })
+
+        return forecasts
 
     except Exception as e:
         logger.error(f"Error fetching multi-hour forecast: {e}")
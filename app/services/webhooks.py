@@ -1,13 +1,14 @@
 import json
+import asyncio
 import hmac
 import hashlib
 import secrets
-import httpx
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.db import Webhook
+from app.utils.http_client import http_clients
 
 
 WEBHOOK_EVENTS = [
@@ -18,6 +19,7 @@ WEBHOOK_EVENTS = [
     "alert.triggered",
     "parlay.created",
     "session.created",
+    "steam.detected",
 ]
 
 
@@ -110,6 +112,15 @@ async def send_webhook(
     if event not in events:
         return False
     
+    status = await post_webhook(webhook, event, data)
+    record_delivery(webhook, status)
+    db.commit()
+    
+    return 0 < status < 400
+
+
+async def post_webhook(webhook: Webhook, event: str, data: Dict[str, Any]) -> int:
+    """POST ``event`` to ``webhook`` and return the HTTP status (0 if the request failed)."""
     payload = {
         "event": event,
         "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -129,31 +140,26 @@ async def send_webhook(
         headers["X-EdgeBet-Signature"] = f"sha256={signature}"
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                webhook.url,
-                content=payload_str,
-                headers=headers
-            )
-        
-        webhook.last_triggered = datetime.utcnow()
-        webhook.last_status = response.status_code
-        
-        if response.status_code >= 400:
-            webhook.failure_count += 1
-        else:
-            webhook.failure_count = 0
-        
-        db.commit()
-        
-        return response.status_code < 400
-        
-    except Exception as e:
-        webhook.last_triggered = datetime.utcnow()
-        webhook.last_status = 0
+        response = await http_clients.post(
+            "webhooks",
+            webhook.url,
+            content=payload_str,
+            headers=headers
+        )
+        return response.status_code
+    except Exception:
+        return 0
+
+
+def record_delivery(webhook: Webhook, status: int) -> None:
+    """Update the delivery fields of ``webhook``; the caller commits."""
+    webhook.last_triggered = datetime.utcnow()
+    webhook.last_status = status
+    
+    if status == 0 or status >= 400:
         webhook.failure_count += 1
-        db.commit()
-        return False
+    else:
+        webhook.failure_count = 0
 
 
 def get_webhooks_for_event(db: Session, user_id: int, event: str) -> List[Webhook]:
@@ -171,5 +177,26 @@ def get_webhooks_for_event(db: Session, user_id: int, event: str) -> List[Webhoo
     return matching
 
 
+async def dispatch_event(db: Session, event: str, data: Dict[str, Any]) -> Dict[str, int]:
+    """Send an event to every active webhook subscribed to it, concurrently."""
+    # LIKE narrows the scan; the parsed event list is checked below
+    webhooks = db.query(Webhook).filter(
+        Webhook.is_active == True,
+        Webhook.events.contains(f'"{event}"')
+    ).all()
+
+    webhooks = [webhook for webhook in webhooks if event in json.loads(webhook.events)]
+
+    # Only the HTTP posts run concurrently; the session is touched once, afterwards
+    statuses = await asyncio.gather(*(post_webhook(webhook, event, data) for webhook in webhooks))
+    for webhook, status in zip(webhooks, statuses):
+        record_delivery(webhook, status)
+    if webhooks:
+        db.commit()
+
+    sent = sum(1 for status in statuses if 0 < status < 400)
+    return {"sent": sent, "failed": len(statuses) - sent}
+
+
 def get_available_events() -> List[str]:
     return WEBHOOK_EVENTS
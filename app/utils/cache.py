@@ -1,6 +1,11 @@
 """
 Redis-backed caching with in-memory fallback.
 
+When Redis is configured, a bounded in-process LRU tier sits in front of
+it; writes and invalidations are broadcast over Redis pub/sub so other
+workers drop their local copies. Concurrent misses on the same key in
+the ``cached`` decorator are coalesced so only one caller recomputes.
+
 Usage:
     from app.utils.cache import cache, cached, invalidate_cache
 
@@ -22,13 +27,21 @@ Usage:
 
 import os
 import json
+import asyncio
 import hashlib
+import heapq
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
 from functools import wraps
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from abc import ABC, abstractmethod
 
 from app.utils.logging import get_logger
+from app.utils.serialization import serializer_for
 
 logger = get_logger(__name__)
 
@@ -46,6 +59,28 @@ PREFIX_TEAMS = "teams"
 PREFIX_STATS = "stats"
 PREFIX_SESSION = "session"
 
+# In-memory backend bounds and expiry sweep interval (seconds)
+CACHE_MEMORY_MAX_ENTRIES = int(os.environ.get("CACHE_MEMORY_MAX_ENTRIES", "50000"))
+CACHE_MEMORY_MAX_BYTES = int(os.environ.get("CACHE_MEMORY_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_SWEEP_INTERVAL = float(os.environ.get("CACHE_SWEEP_INTERVAL", "30"))
+
+# In-process tier in front of Redis
+CACHE_LOCAL_MAX_ENTRIES = int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", "10000"))
+CACHE_LOCAL_TTL = int(os.environ.get("CACHE_LOCAL_TTL", "30"))  # Bounds staleness if a pub/sub message is lost
+CACHE_INVALIDATION_CHANNEL = "edge:cache:invalidate"
+
+# Redis prefix invalidation
+CACHE_REDIS_BATCH_SIZE = int(os.environ.get("CACHE_REDIS_BATCH_SIZE", "500"))
+CACHE_REDIS_MAX_CONNECTIONS = int(os.environ.get("CACHE_REDIS_MAX_CONNECTIONS", "50"))
+# Also SCAN for untagged keys written by older releases on every prefix clear.
+# Off by default: run scripts/sweep_legacy_cache_keys.py once after upgrading instead.
+CACHE_REDIS_LEGACY_SCAN = os.environ.get("CACHE_REDIS_LEGACY_SCAN", "false").lower() == "true"
+# Raise a key's TTL to ARGV[1] unless it already lives longer (EXPIRE NX/GT before Redis 7.0)
+EXTEND_TTL_SCRIPT = (
+    "if redis.call('TTL', KEYS[1]) < tonumber(ARGV[1]) then "
+    "return redis.call('EXPIRE', KEYS[1], ARGV[1]) end return 0"
+)
+
 
 class CacheBackend(ABC):
     """Abstract base class for cache backends."""
@@ -74,50 +109,282 @@ class CacheBackend(ABC):
     def stats(self) -> Dict[str, Any]:
         pass
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several keys; missing keys are left out of the result."""
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        ok = True
+        for key, value in items.items():
+            ok = self.set(key, value, ttl) and ok
+        return ok
 
-class InMemoryCache(CacheBackend):
-    """Simple in-memory cache for development/fallback."""
+    # Async API. Backends that do network I/O override these; the defaults
+    # suit in-process backends, which never block.
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, ttl: int) -> bool:
+        return self.set(key, value, ttl)
+
+    async def adelete(self, key: str) -> bool:
+        return self.delete(key)
+
+    async def aclear_prefix(self, prefix: str) -> int:
+        return self.clear_prefix(prefix)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        return self.get_many(keys)
+
+    async def aset_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        return self.set_many(items, ttl)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class _PrefixNode:
+    """Trie node over ':'-separated key segments."""
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children: Dict[str, "_PrefixNode"] = {}
+        self.keys: set = set()
+
+
+class _PrefixIndex:
+    """
+    Index of keys by ':'-separated prefix.
+
+    ``pop_prefix("odds")`` returns every key starting with ``"odds:"`` in
+    time proportional to the matched keys, not the whole keyspace.
+    """
 
     def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._root = _PrefixNode()
+
+    def add(self, key: str) -> None:
+        node = self._root
+        for segment in key.split(":"):
+            node = node.children.setdefault(segment, _PrefixNode())
+        node.keys.add(key)
+
+    def discard(self, key: str) -> None:
+        path = [self._root]
+        for segment in key.split(":"):
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].keys.discard(key)
+
+        # Prune empty branches so the trie does not outgrow the keyspace
+        segments = key.split(":")
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.keys or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+
+    def pop_prefix(self, prefix: str) -> List[str]:
+        segments = prefix.split(":")
+        path = [self._root]
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return []
+            path.append(node)
+
+        # Keys strictly below the prefix node ("prefix:*"), not the node's own key
+        matched = []
+        stack = list(node.children.values())
+        while stack:
+            current = stack.pop()
+            matched.extend(current.keys)
+            stack.extend(current.children.values())
+        node.children.clear()
+
+        for depth in range(len(segments), 0, -1):
+            if path[depth].keys or path[depth].children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+        return matched
+
+    def __len__(self) -> int:
+        count = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count - 1
+
+    def clear(self) -> None:
+        self._root = _PrefixNode()
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate deep size in bytes of a cached value."""
+    size = 0
+    stack = [value]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Bounded in-memory cache for development/fallback and as the local tier.
+
+    Entries live in an LRU-ordered dict capped by entry count and an
+    estimated byte budget. Expiry uses the monotonic clock with a min-heap
+    that a background thread sweeps, and a prefix trie makes
+    ``clear_prefix`` proportional to the number of matched keys.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = CACHE_MEMORY_MAX_ENTRIES,
+        max_bytes: Optional[int] = CACHE_MEMORY_MAX_BYTES,
+        sweep_interval: float = CACHE_SWEEP_INTERVAL
+    ):
+        # key -> (value, expires_at, size)
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._expiry_heap: List[tuple] = []
+        self._index = _PrefixIndex()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._stop = threading.Event()
+
+        if sweep_interval > 0:
+            # The sweeper only holds a weak reference so the cache can be collected
+            threading.Thread(
+                target=InMemoryCache._sweep_loop,
+                args=(weakref.ref(self), self._stop, sweep_interval),
+                name="cache-sweeper",
+                daemon=True
+            ).start()
+
+    @staticmethod
+    def _sweep_loop(ref: "weakref.ref", stop: threading.Event, interval: float) -> None:
+        while not stop.wait(interval):
+            cache = ref()
+            if cache is None:
+                return
+            cache.sweep()
+            del cache
+
+    def close(self) -> None:
+        """Stop the background sweeper."""
+        self._stop.set()
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+        self._index.discard(key)
+
+    def sweep(self) -> int:
+        """Drop every expired entry. Returns the number removed."""
+        removed = 0
+        now = time.monotonic()
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                expires_at, key = heapq.heappop(heap)
+                entry = self._cache.get(key)
+                # Heap entries are lazily invalidated when a key is rewritten
+                if entry is not None and entry[1] == expires_at:
+                    self._remove(key)
+                    self._expirations += 1
+                    removed += 1
+
+            if len(heap) > 2 * len(self._cache) + 64:
+                self._expiry_heap = [(e[1], k) for k, e in self._cache.items()]
+                heapq.heapify(self._expiry_heap)
+        return removed
 
     def get(self, key: str) -> Optional[Any]:
-        if key in self._cache:
-            entry = self._cache[key]
-            if datetime.utcnow() < entry["expires_at"]:
-                self._hits += 1
-                return entry["value"]
-            else:
-                del self._cache[key]
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if time.monotonic() < entry[1]:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+                self._remove(key)
+                self._expirations += 1
 
-        self._misses += 1
-        return None
+            self._misses += 1
+            return None
 
     def set(self, key: str, value: Any, ttl: int) -> bool:
-        self._cache[key] = {
-            "value": value,
-            "expires_at": datetime.utcnow() + timedelta(seconds=ttl),
-        }
+        expires_at = time.monotonic() + ttl
+        size = _estimate_size(value) if self._max_bytes else 0
+        if self._max_bytes and size > self._max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = (value, expires_at, size)
+            self._bytes += size
+            self._index.add(key)
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+            while self._cache and (
+                (self._max_entries is not None and len(self._cache) > self._max_entries)
+                or (self._max_bytes and self._bytes > self._max_bytes)
+            ):
+                oldest = next(iter(self._cache))
+                self._remove(oldest)
+                self._evictions += 1
         return True
 
     def delete(self, key: str) -> bool:
-        if key in self._cache:
-            del self._cache[key]
-            return True
-        return False
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+                return True
+            return False
 
     def clear_prefix(self, prefix: str) -> int:
-        keys = [k for k in self._cache.keys() if k.startswith(f"{prefix}:")]
-        for key in keys:
-            del self._cache[key]
-        return len(keys)
+        with self._lock:
+            keys = self._index.pop_prefix(prefix)
+            for key in keys:
+                _, _, size = self._cache.pop(key)
+                self._bytes -= size
+            return len(keys)
 
     def clear_all(self) -> int:
-        count = len(self._cache)
-        self._cache.clear()
-        return count
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
+            self._expiry_heap.clear()
+            self._index.clear()
+            self._bytes = 0
+            return count
 
     def stats(self) -> Dict[str, Any]:
         total = self._hits + self._misses
@@ -127,69 +394,304 @@ class InMemoryCache(CacheBackend):
             "misses": self._misses,
             "hit_rate": round(self._hits / total, 3) if total > 0 else 0,
             "size": len(self._cache),
+            "max_entries": self._max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
         }
 
 
 class RedisCache(CacheBackend):
-    """Redis-backed cache for production."""
+    """
+    Redis-backed cache for production.
+
+    Every key is also recorded in a tag set for each of its ``:``-separated
+    ancestor prefixes, so ``clear_prefix`` reads the matching keys from the
+    tag set and unlinks them in pipelined batches instead of walking the
+    keyspace with ``KEYS``. Tag sets expire no earlier than their longest
+    lived member, so members that expire on their own are cleaned up too.
+    Tag TTLs use ``EXPIRE NX``/``GT`` on Redis 7.0+ and a small Lua TTL
+    check on older servers; support is probed on ``ping``. The oldest
+    supported server is Redis 4.0, for ``UNLINK``.
+
+    Values are encoded by the serializer registered for the key's prefix,
+    and the serializer's format tag is appended to the stored key so
+    entries written in another format are never decoded.
+
+    The sync methods use a blocking client for background threads; the
+    ``a*`` methods use a pooled ``redis.asyncio`` client per event loop so
+    request handlers never block on a round trip.
+    """
 
     def __init__(self, redis_url: str):
         import redis
-        self._client = redis.from_url(redis_url, decode_responses=True)
+        self._redis_url = redis_url
+        self._client = redis.from_url(redis_url)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
         self._hits = 0
         self._misses = 0
         self._prefix = "edge:"  # Namespace all keys
+        self._tag_prefix = "edge-tag:"  # Outside the key namespace so keys can't collide
+        self._unlinked = 0
+        self._legacy_unlinked = 0
+        # Whether EXPIRE takes NX/GT (Redis 7.0+); None until probed
+        self._expire_flags: Optional[bool] = None
+
+    @property
+    def client(self):
+        """Underlying synchronous Redis client."""
+        return self._client
+
+    @property
+    def async_client(self):
+        """Pooled asyncio Redis client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(
+                self._redis_url,
+                max_connections=CACHE_REDIS_MAX_CONNECTIONS,
+            )
+            self._async_clients[loop] = client
+        return client
 
     def _key(self, key: str) -> str:
-        return f"{self._prefix}{key}"
+        return f"{self._prefix}{key}|{serializer_for(key).tag}"
+
+    def _tag(self, prefix: str) -> str:
+        return f"{self._tag_prefix}{prefix}"
+
+    @staticmethod
+    def _ancestors(key: str) -> List[str]:
+        """Prefixes a key can be cleared by: ``a:b:c`` -> ``a``, ``a:b``."""
+        segments = key.split(":")
+        return [":".join(segments[:i]) for i in range(1, len(segments))]
+
+    def _queue_set(self, pipe, key: str, data: bytes, ttl: int) -> None:
+        """Queue SETEX plus tag upkeep for ``key`` on a sync or async pipeline."""
+        full_key = self._key(key)
+        pipe.setex(full_key, ttl, data)
+        for prefix in self._ancestors(key):
+            tag = self._tag(prefix)
+            pipe.sadd(tag, full_key)
+            if self._expire_flags:
+                # NX gives a fresh tag a TTL; GT only ever extends it
+                pipe.expire(tag, ttl, nx=True)
+                pipe.expire(tag, ttl, gt=True)
+            else:
+                pipe.eval(EXTEND_TTL_SCRIPT, 1, tag, ttl)
+
+    def _queue_delete(self, pipe, key: str) -> None:
+        full_key = self._key(key)
+        pipe.unlink(full_key)
+        for prefix in self._ancestors(key):
+            pipe.srem(self._tag(prefix), full_key)
+
+    def _record(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        if data:
+            self._hits += 1
+            return serializer_for(key).decode(data)
+        self._misses += 1
+        return None
+
+    def _record_many(self, keys: List[str], datas: List[Optional[bytes]]) -> Dict[str, Any]:
+        values = {}
+        for key, data in zip(keys, datas):
+            value = self._record(key, data)
+            if value is not None:
+                values[key] = value
+        return values
 
     def get(self, key: str) -> Optional[Any]:
         try:
-            data = self._client.get(self._key(key))
-            if data:
-                self._hits += 1
-                return json.loads(data)
-            self._misses += 1
-            return None
+            return self._record(key, self._client.get(self._key(key)))
         except Exception as e:
             logger.error(f"Redis GET error: {e}")
             self._misses += 1
             return None
 
     def set(self, key: str, value: Any, ttl: int) -> bool:
+        return self.set_many({key: value}, ttl)
+
+    def delete(self, key: str) -> bool:
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            self._queue_delete(pipe, key)
+            return pipe.execute()[0] > 0
+        except Exception as e:
+            logger.error(f"Redis DELETE error: {e}")
+            return False
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        try:
+            return self._record_many(keys, self._client.mget([self._key(k) for k in keys]))
+        except Exception as e:
+            logger.error(f"Redis MGET error: {e}")
+            self._misses += len(keys)
+            return {}
+
+    def set_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        if not items:
+            return True
         try:
-            data = json.dumps(value, default=str)
-            self._client.setex(self._key(key), ttl, data)
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                self._queue_set(pipe, key, serializer_for(key).encode(value), ttl)
+            pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Redis SET error: {e}")
             return False
 
-    def delete(self, key: str) -> bool:
+    async def aget(self, key: str) -> Optional[Any]:
         try:
-            return self._client.delete(self._key(key)) > 0
+            return self._record(key, await self.async_client.get(self._key(key)))
+        except Exception as e:
+            logger.error(f"Redis GET error: {e}")
+            self._misses += 1
+            return None
+
+    async def aset(self, key: str, value: Any, ttl: int) -> bool:
+        return await self.aset_many({key: value}, ttl)
+
+    async def adelete(self, key: str) -> bool:
+        try:
+            pipe = self.async_client.pipeline(transaction=False)
+            self._queue_delete(pipe, key)
+            return (await pipe.execute())[0] > 0
         except Exception as e:
             logger.error(f"Redis DELETE error: {e}")
             return False
 
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        try:
+            datas = await self.async_client.mget([self._key(k) for k in keys])
+            return self._record_many(keys, datas)
+        except Exception as e:
+            logger.error(f"Redis MGET error: {e}")
+            self._misses += len(keys)
+            return {}
+
+    async def aset_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        if not items:
+            return True
+        try:
+            pipe = self.async_client.pipeline(transaction=False)
+            for key, value in items.items():
+                self._queue_set(pipe, key, serializer_for(key).encode(value), ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis SET error: {e}")
+            return False
+
+    async def aclear_prefix(self, prefix: str) -> int:
+        # SCAN/UNLINK batches are already short; run them off the event loop
+        return await asyncio.to_thread(self.clear_prefix, prefix)
+
+    async def apublish(self, channel: str, message: str) -> None:
+        await self.async_client.publish(channel, message)
+
+    async def aclose(self) -> None:
+        """Close the async connection pool of the running event loop."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _unlink_batches(self, keys) -> int:
+        """UNLINK keys from an iterator, one pipelined round trip per batch."""
+        removed = 0
+        batch: List[str] = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= CACHE_REDIS_BATCH_SIZE:
+                removed += self._client.unlink(*batch)
+                batch = []
+        if batch:
+            removed += self._client.unlink(*batch)
+        return removed
+
+    def _scan_unlink(self, pattern: str) -> int:
+        return self._unlink_batches(
+            self._client.scan_iter(match=pattern, count=CACHE_REDIS_BATCH_SIZE)
+        )
+
     def clear_prefix(self, prefix: str) -> int:
         try:
-            pattern = f"{self._prefix}{prefix}:*"
-            keys = self._client.keys(pattern)
-            if keys:
-                return self._client.delete(*keys)
-            return 0
+            tag = self._tag(prefix)
+            # Rename first so keys written during the clear land in a new set
+            detached = f"{tag}:clearing:{uuid.uuid4().hex}"
+            try:
+                self._client.rename(tag, detached)
+            except Exception:
+                detached = None  # No tag set: nothing tagged under this prefix
+
+            count = 0
+            if detached:
+                count = self._unlink_batches(
+                    self._client.sscan_iter(detached, count=CACHE_REDIS_BATCH_SIZE)
+                )
+                self._client.unlink(detached)
+
+            if CACHE_REDIS_LEGACY_SCAN:
+                # Keys written before tagging existed are only reachable by SCAN
+                legacy = self._scan_unlink(f"{self._prefix}{prefix}:*")
+                self._legacy_unlinked += legacy
+                count += legacy
+
+            self._unlinked += count
+            return count
         except Exception as e:
             logger.error(f"Redis CLEAR error: {e}")
             return 0
 
+    def sweep_legacy(self) -> int:
+        """
+        UNLINK keys written before tagging existed, in one pass over the keyspace.
+
+        A key is legacy when it has a prefix but is missing from the tag set
+        of its top-level prefix. Run once after upgrading rather than
+        leaving CACHE_REDIS_LEGACY_SCAN on.
+        """
+        def untagged():
+            keys = self._client.scan_iter(match=f"{self._prefix}*", count=CACHE_REDIS_BATCH_SIZE)
+            batch: List[bytes] = []
+            for full_key in keys:
+                batch.append(full_key)
+                if len(batch) >= CACHE_REDIS_BATCH_SIZE:
+                    yield from self._untagged(batch)
+                    batch = []
+            if batch:
+                yield from self._untagged(batch)
+
+        count = self._unlink_batches(untagged())
+        self._legacy_unlinked += count
+        self._unlinked += count
+        return count
+
+    def _untagged(self, full_keys: List[bytes]) -> List[bytes]:
+        candidates = []
+        pipe = self._client.pipeline(transaction=False)
+        for full_key in full_keys:
+            key = full_key.decode()[len(self._prefix):]
+            ancestors = self._ancestors(key)
+            if ancestors:  # Keys without a prefix can't be cleared by one
+                candidates.append(full_key)
+                pipe.sismember(self._tag(ancestors[0]), full_key)
+        return [key for key, tagged in zip(candidates, pipe.execute()) if not tagged]
+
     def clear_all(self) -> int:
         try:
-            pattern = f"{self._prefix}*"
-            keys = self._client.keys(pattern)
-            if keys:
-                return self._client.delete(*keys)
-            return 0
+            count = self._scan_unlink(f"{self._prefix}*")
+            self._scan_unlink(f"{self._tag_prefix}*")
+            self._unlinked += count
+            return count
         except Exception as e:
             logger.error(f"Redis CLEAR ALL error: {e}")
             return 0
@@ -211,13 +713,304 @@ class RedisCache(CacheBackend):
             "db_size": db_size,
             "redis_hits": info.get("keyspace_hits", 0),
             "redis_misses": info.get("keyspace_misses", 0),
+            "unlinked": self._unlinked,
+            "legacy_unlinked": self._legacy_unlinked,
         }
 
     def ping(self) -> bool:
         try:
-            return self._client.ping()
+            alive = self._client.ping()
         except Exception:
             return False
+        if alive and self._expire_flags is None:
+            self._expire_flags = self._probe_expire_flags()
+        return alive
+
+    def _probe_expire_flags(self) -> bool:
+        """Whether the server accepts EXPIRE NX, checked against a key that never exists."""
+        import redis
+        try:
+            self._client.expire(f"{self._tag_prefix}__probe__", 1, nx=True)
+            return True
+        except redis.ResponseError:
+            logger.info("Redis server predates EXPIRE NX/GT (7.0); extending tag TTLs with Lua")
+            return False
+
+
+class TieredCache(CacheBackend):
+    """
+    In-process LRU tier in front of a shared remote backend.
+
+    Reads hit the local tier first and promote remote hits into it for at
+    most ``local_ttl`` seconds. Writes and invalidations go to both tiers
+    and are published on CACHE_INVALIDATION_CHANNEL so other workers drop
+    their local copies.
+    """
+
+    def __init__(
+        self,
+        remote: CacheBackend,
+        local: Optional[InMemoryCache] = None,
+        local_ttl: int = CACHE_LOCAL_TTL,
+        pubsub_client: Any = None
+    ):
+        self._remote = remote
+        self._local = local or InMemoryCache(max_entries=CACHE_LOCAL_MAX_ENTRIES)
+        self._local_ttl = local_ttl
+        self._node_id = uuid.uuid4().hex
+        self._pubsub_client = pubsub_client
+        self._listener = None
+        self._invalidations_received = 0
+
+        if pubsub_client is not None:
+            self._start_listener()
+
+    @property
+    def remote(self) -> CacheBackend:
+        return self._remote
+
+    def _start_listener(self) -> None:
+        try:
+            pubsub = self._pubsub_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CACHE_INVALIDATION_CHANNEL: self._on_invalidation})
+            self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener not started: {e}")
+
+    def _publish(self, op: str, key: Optional[str] = None) -> None:
+        if self._pubsub_client is None:
+            return
+        try:
+            message = json.dumps({"origin": self._node_id, "op": op, "key": key})
+            self._pubsub_client.publish(CACHE_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    async def _apublish(self, op: str, key: Optional[str] = None) -> None:
+        apublish = getattr(self._remote, "apublish", None)
+        if self._pubsub_client is None or apublish is None:
+            self._publish(op, key)
+            return
+        try:
+            message = json.dumps({"origin": self._node_id, "op": op, "key": key})
+            await apublish(CACHE_INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    def _on_invalidation(self, message: Dict[str, Any]) -> None:
+        """Apply an invalidation broadcast by another worker to the local tier."""
+        try:
+            payload = json.loads(message["data"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if payload.get("origin") == self._node_id:
+            return
+
+        self._invalidations_received += 1
+        op = payload.get("op")
+        if op == "delete":
+            self._local.delete(payload["key"])
+        elif op == "prefix":
+            self._local.clear_prefix(payload["key"])
+        elif op == "all":
+            self._local.clear_all()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._local.get(key)
+        if value is not None:
+            return value
+
+        value = self._remote.get(key)
+        if value is not None:
+            self._local.set(key, value, self._local_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: int) -> bool:
+        ok = self._remote.set(key, value, ttl)
+        self._local.set(key, value, min(ttl, self._local_ttl))
+        self._publish("delete", key)
+        return ok
+
+    def delete(self, key: str) -> bool:
+        self._local.delete(key)
+        deleted = self._remote.delete(key)
+        self._publish("delete", key)
+        return deleted
+
+    def clear_prefix(self, prefix: str) -> int:
+        self._local.clear_prefix(prefix)
+        count = self._remote.clear_prefix(prefix)
+        self._publish("prefix", prefix)
+        return count
+
+    def clear_all(self) -> int:
+        self._local.clear_all()
+        count = self._remote.clear_all()
+        self._publish("all")
+        return count
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        values = self._local.get_many(keys)
+        missing = [k for k in keys if k not in values]
+        if missing:
+            found = self._remote.get_many(missing)
+            self._local.set_many(found, self._local_ttl)
+            values.update(found)
+        return values
+
+    def set_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        ok = self._remote.set_many(items, ttl)
+        self._local.set_many(items, min(ttl, self._local_ttl))
+        for key in items:
+            self._publish("delete", key)
+        return ok
+
+    async def aget(self, key: str) -> Optional[Any]:
+        value = self._local.get(key)
+        if value is not None:
+            return value
+
+        value = await self._remote.aget(key)
+        if value is not None:
+            self._local.set(key, value, self._local_ttl)
+        return value
+
+    async def aset(self, key: str, value: Any, ttl: int) -> bool:
+        ok = await self._remote.aset(key, value, ttl)
+        self._local.set(key, value, min(ttl, self._local_ttl))
+        await self._apublish("delete", key)
+        return ok
+
+    async def adelete(self, key: str) -> bool:
+        self._local.delete(key)
+        deleted = await self._remote.adelete(key)
+        await self._apublish("delete", key)
+        return deleted
+
+    async def aclear_prefix(self, prefix: str) -> int:
+        self._local.clear_prefix(prefix)
+        count = await self._remote.aclear_prefix(prefix)
+        await self._apublish("prefix", prefix)
+        return count
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        values = self._local.get_many(keys)
+        missing = [k for k in keys if k not in values]
+        if missing:
+            found = await self._remote.aget_many(missing)
+            self._local.set_many(found, self._local_ttl)
+            values.update(found)
+        return values
+
+    async def aset_many(self, items: Dict[str, Any], ttl: int) -> bool:
+        ok = await self._remote.aset_many(items, ttl)
+        self._local.set_many(items, min(ttl, self._local_ttl))
+        for key in items:
+            await self._apublish("delete", key)
+        return ok
+
+    async def aclose(self) -> None:
+        await self._remote.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        local = self._local.stats()
+        remote = self._remote.stats()
+        hits = local["hits"] + remote["hits"]
+        total = hits + remote["misses"]
+        return {
+            "backend": "tiered",
+            "hits": hits,
+            "misses": remote["misses"],
+            "hit_rate": round(hits / total, 3) if total > 0 else 0,
+            "invalidations_received": self._invalidations_received,
+            "tiers": {
+                "local": local,
+                "remote": remote,
+            },
+        }
+
+    def ping(self) -> bool:
+        ping = getattr(self._remote, "ping", None)
+        return ping() if ping else True
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller (leader) runs the function; callers arriving while it
+    is in flight wait for and share its result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self._async_calls: Dict[tuple, asyncio.Task] = {}
+        self._leaders = 0
+        self._followers = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once for all threads concurrently asking for ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = {"event": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+                self._leaders += 1
+                leader = True
+            else:
+                self._followers += 1
+                leader = False
+
+        if not leader:
+            call["event"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["event"].set()
+
+    async def do_async(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Await ``fn()`` once for all tasks on this loop asking for ``key``.
+
+        ``fn()`` runs in a task owned by the flight rather than in the
+        leader's own await, so cancelling any caller (the leader included)
+        only cancels that caller's wait.
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+
+        task = self._async_calls.get(call_key)
+        if task is not None:
+            self._followers += 1
+        else:
+            task = loop.create_task(fn())
+            self._async_calls[call_key] = task
+            self._leaders += 1
+            task.add_done_callback(lambda t: self._finish_async(call_key, t))
+        return await asyncio.shield(task)
+
+    def _finish_async(self, call_key: tuple, task: asyncio.Task) -> None:
+        self._async_calls.pop(call_key, None)
+        if not task.cancelled():
+            task.exception()  # Mark retrieved when every caller was cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "leaders": self._leaders,
+            "coalesced": self._followers,
+            "in_flight": len(self._calls) + len(self._async_calls),
+        }
 
 
 class Cache:
@@ -233,8 +1026,9 @@ class Cache:
 
         if redis_url:
             try:
-                self._backend = RedisCache(redis_url)
-                if self._backend.ping():
+                redis_backend = RedisCache(redis_url)
+                if redis_backend.ping():
+                    self._backend = TieredCache(redis_backend, pubsub_client=redis_backend.client)
                     logger.info(f"Redis cache connected: {redis_url.split('@')[-1] if '@' in redis_url else redis_url}")
                 else:
                     raise ConnectionError("Redis ping failed")
@@ -263,6 +1057,14 @@ class Cache:
         """Delete a key from cache."""
         return self._backend.delete(key)
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several keys in one round trip; misses are omitted."""
+        return self._backend.get_many(keys)
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several keys with one TTL in one round trip."""
+        return self._backend.set_many(items, ttl or self._default_ttl)
+
     def invalidate(self, prefix: str) -> int:
         """Invalidate all keys with a given prefix."""
         count = self._backend.clear_prefix(prefix)
@@ -270,19 +1072,58 @@ class Cache:
             logger.debug(f"Invalidated {count} cache entries with prefix '{prefix}'")
         return count
 
+    async def aget(self, key: str) -> Optional[Any]:
+        """Get a value from cache without blocking the event loop."""
+        return await self._backend.aget(key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set a value in cache with TTL without blocking the event loop."""
+        return await self._backend.aset(key, value, ttl or self._default_ttl)
+
+    async def adelete(self, key: str) -> bool:
+        """Delete a key from cache without blocking the event loop."""
+        return await self._backend.adelete(key)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Async ``get_many``."""
+        return await self._backend.aget_many(keys)
+
+    async def aset_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Async ``set_many``."""
+        return await self._backend.aset_many(items, ttl or self._default_ttl)
+
+    async def ainvalidate(self, prefix: str) -> int:
+        """Invalidate all keys with a given prefix without blocking the event loop."""
+        count = await self._backend.aclear_prefix(prefix)
+        if count > 0:
+            logger.debug(f"Invalidated {count} cache entries with prefix '{prefix}'")
+        return count
+
+    async def aclose(self) -> None:
+        """Release async connections held for the running event loop."""
+        await self._backend.aclose()
+
     def clear(self) -> int:
         """Clear all cache entries."""
         return self._backend.clear_all()
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        return self._backend.stats()
+        stats = self._backend.stats()
+        stats["singleflight"] = singleflight.stats()
+        return stats
 
     def is_redis(self) -> bool:
         """Check if using Redis backend."""
+        if isinstance(self._backend, TieredCache):
+            return isinstance(self._backend.remote, RedisCache)
         return isinstance(self._backend, RedisCache)
 
 
+# Coalesces concurrent recomputation of missing keys in ``cached``
+singleflight = SingleFlight()
+
+
 # Global cache instance
 cache = Cache()
 
@@ -303,15 +1144,19 @@ def cached(prefix: str, ttl: Optional[int] = None):
             cache_args = args[1:] if args else args
             cache_key = cache._make_key(prefix, *cache_args, **kwargs)
 
-            cached_value = cache.get(cache_key)
+            cached_value = await cache.aget(cache_key)
             if cached_value is not None:
                 logger.debug(f"Cache HIT: {cache_key}")
                 return cached_value
 
             logger.debug(f"Cache MISS: {cache_key}")
-            result = await func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            return result
+
+            async def compute():
+                result = await func(*args, **kwargs)
+                await cache.aset(cache_key, result, ttl)
+                return result
+
+            return await singleflight.do_async(cache_key, compute)
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
@@ -324,11 +1169,14 @@ def cached(prefix: str, ttl: Optional[int] = None):
                 return cached_value
 
             logger.debug(f"Cache MISS: {cache_key}")
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            return result
 
-        import asyncio
+            def compute():
+                result = func(*args, **kwargs)
+                cache.set(cache_key, result, ttl)
+                return result
+
+            return singleflight.do(cache_key, compute)
+
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         return sync_wrapper
@@ -349,7 +1197,7 @@ def invalidate_cache(prefix: str):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             result = await func(*args, **kwargs)
-            cache.invalidate(prefix)
+            await cache.ainvalidate(prefix)
             return result
 
         @wraps(func)
@@ -358,7 +1206,6 @@ def invalidate_cache(prefix: str):
             cache.invalidate(prefix)
             return result
 
-        import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         return sync_wrapper
@@ -0,0 +1,289 @@
+"""
+Shared pooled HTTP clients for external data providers.
+
+Each provider gets one long-lived ``httpx.AsyncClient`` per event loop so
+TCP/TLS connections are reused across calls. Requests go through
+``http_clients.request``, which caps concurrency per upstream host,
+retries transient failures with exponential backoff and jitter, and
+records latency and error metrics per provider. Clients are closed from
+the app lifespan.
+
+Usage:
+    from app.utils.http_client import http_clients
+
+    response = await http_clients.get("sportradar", url, params=params)
+"""
+
+import os
+import time
+import random
+import asyncio
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import httpx
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.environ.get("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_HOST_CONCURRENCY = int(os.environ.get("HTTP_HOST_CONCURRENCY", "10"))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", "0.25"))
+HTTP_BACKOFF_MAX = float(os.environ.get("HTTP_BACKOFF_MAX", "5.0"))
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Recent latencies kept per provider for percentiles
+LATENCY_WINDOW = 500
+
+
+@dataclass
+class ProviderConfig:
+    """Connection and retry settings for one upstream provider."""
+    timeout: float = 30.0
+    max_connections: int = HTTP_MAX_CONNECTIONS
+    max_keepalive: int = HTTP_MAX_KEEPALIVE
+    host_concurrency: int = HTTP_HOST_CONCURRENCY
+    max_retries: int = HTTP_MAX_RETRIES
+    # Non-idempotent requests are only retried when nothing reached the server
+    retry_non_idempotent: bool = False
+    http2: bool = HTTP2_AVAILABLE
+    transport: Optional[httpx.AsyncBaseTransport] = None  # Custom transport, e.g. for tests
+    # Response headers reporting the provider's usage quota, kept in metrics
+    quota_headers: Tuple[str, ...] = ()
+
+
+PROVIDERS: Dict[str, ProviderConfig] = {
+    "odds_api": ProviderConfig(
+        timeout=30.0,
+        quota_headers=("x-requests-remaining", "x-requests-used", "x-requests-last"),
+    ),
+    "sportradar": ProviderConfig(timeout=30.0),
+    "mlb_stats": ProviderConfig(timeout=30.0),
+    "weather": ProviderConfig(timeout=10.0),
+    "webhooks": ProviderConfig(timeout=10.0, max_retries=1),
+    "discord": ProviderConfig(timeout=10.0),
+    "telegram": ProviderConfig(timeout=10.0),
+}
+
+
+@dataclass
+class ProviderMetrics:
+    """Request, error and latency counters for one provider."""
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    retries: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    last_error: Optional[str] = None
+    quota: Dict[str, str] = field(default_factory=dict)
+
+    def record(self, latency_ms: float, status: Optional[int] = None, error: Optional[Exception] = None) -> None:
+        self.requests += 1
+        self.latencies_ms.append(latency_ms)
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status >= 500:
+                self.errors += 1
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if isinstance(error, httpx.TimeoutException):
+                self.timeouts += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 2)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "error_rate": round(self.errors / self.requests, 3) if self.requests else 0,
+            "statuses": dict(self.statuses),
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+            "last_error": self.last_error,
+            "quota": dict(self.quota),
+        }
+
+
+class _LoopState:
+    """Clients and host semaphores bound to one event loop."""
+
+    def __init__(self):
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.semaphores: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Delay before retry ``attempt`` (1-based): full-jitter exponential backoff,
+    or the server's Retry-After seconds when given, capped at HTTP_BACKOFF_MAX.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+class HttpClientRegistry:
+    """Registry of pooled async clients, one per provider and event loop."""
+
+    def __init__(self, providers: Optional[Dict[str, ProviderConfig]] = None):
+        self._providers = providers if providers is not None else PROVIDERS
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._metrics: Dict[str, ProviderMetrics] = {}
+
+    def _config(self, provider: str) -> ProviderConfig:
+        return self._providers.get(provider) or ProviderConfig()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = _LoopState()
+            self._loops[loop] = state
+        return state
+
+    def metrics(self, provider: str) -> ProviderMetrics:
+        metrics = self._metrics.get(provider)
+        if metrics is None:
+            metrics = ProviderMetrics()
+            self._metrics[provider] = metrics
+        return metrics
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        """Pooled client for ``provider`` on the running event loop."""
+        state = self._state()
+        client = state.clients.get(provider)
+        if client is None or client.is_closed:
+            config = self._config(provider)
+            client = httpx.AsyncClient(
+                timeout=config.timeout,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                http2=config.http2 and HTTP2_AVAILABLE,
+                transport=config.transport,
+            )
+            state.clients[provider] = client
+        return client
+
+    def _semaphore(self, provider: str, host: str) -> asyncio.Semaphore:
+        state = self._state()
+        key = (provider, host)
+        semaphore = state.semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._config(provider).host_concurrency)
+            state.semaphores[key] = semaphore
+        return semaphore
+
+    async def request(self, provider: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the provider's pooled client.
+
+        Transport errors and 429/502/503/504 responses are retried up to
+        ``max_retries`` times for idempotent methods. Non-idempotent methods
+        are only retried on connect errors unless the provider opts in.
+
+        Args:
+            provider: Provider name from PROVIDERS
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to ``httpx.AsyncClient.request``
+
+        Returns:
+            The final response, whatever its status
+
+        Raises:
+            httpx.HTTPError: If the last attempt failed without a response
+        """
+        config = self._config(provider)
+        metrics = self.metrics(provider)
+        client = self.client(provider)
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS or config.retry_non_idempotent
+        semaphore = self._semaphore(provider, httpx.URL(url).host)
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                metrics.record((time.perf_counter() - start) * 1000, error=e)
+                retryable = idempotent or isinstance(e, httpx.ConnectError)
+                if attempt >= config.max_retries or not retryable:
+                    raise
+                retry_after = None
+            else:
+                metrics.record((time.perf_counter() - start) * 1000, status=response.status_code)
+                for header in config.quota_headers:
+                    if header in response.headers:
+                        metrics.quota[header] = response.headers[header]
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt >= config.max_retries
+                    or not idempotent
+                ):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                await response.aclose()
+
+            attempt += 1
+            metrics.retries += 1
+            delay = backoff_delay(attempt, retry_after)
+            logger.debug(f"Retrying {provider} {method} {url} in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def get(self, provider: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(provider, "GET", url, **kwargs)
+
+    async def post(self, provider: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(provider, "POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close every client owned by the running event loop."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        for client in state.clients.values():
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "providers": {name: m.to_dict() for name, m in sorted(self._metrics.items())},
+        }
+
+
+# Global registry
+http_clients = HttpClientRegistry()
@@ -0,0 +1,177 @@
+"""
+Development query audit.
+
+Records the SQL each request issues and, when the request finishes,
+logs the plans of its SELECTs that scan a whole table and any statement
+repeated often enough to look like an N+1 loop. Plans are explained once
+per distinct statement and cached.
+
+Enabled with QUERY_AUDIT=true (never in production); ``install`` hooks
+the engine and ``query_audit_middleware`` scopes statements per request
+path. Tests and scripts can scope a block directly:
+
+    from app.utils.query_audit import query_audit
+
+    query_audit.install(engine)
+    with query_audit.capture("edge-scan") as report:
+        get_upcoming_games(db, "NBA")
+    assert not report.seq_scans
+"""
+
+import contextvars
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+QUERY_AUDIT_ENABLED = os.environ.get("QUERY_AUDIT", "").lower() in ("true", "1", "yes")
+# Same statement this many times in one request is reported as N+1
+QUERY_AUDIT_REPEAT_THRESHOLD = int(os.environ.get("QUERY_AUDIT_REPEAT_THRESHOLD", "5"))
+# Tables small enough that a scan is expected
+QUERY_AUDIT_IGNORED_TABLES = set(filter(None, os.environ.get("QUERY_AUDIT_IGNORED_TABLES", "").split(",")))
+
+_WHITESPACE = re.compile(r"\s+")
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+@dataclass
+class AuditReport:
+    """Statements issued within one audited scope."""
+    path: str
+    statements: List[Tuple[str, Any]] = field(default_factory=list)
+    seq_scans: Dict[str, List[str]] = field(default_factory=dict)  # statement -> scanned tables
+    repeated: Dict[str, int] = field(default_factory=dict)  # statement -> executions
+    elapsed_ms: float = 0.0
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+
+def scanned_tables(plan: List[str], dialect: str) -> List[str]:
+    """Tables read in full according to an EXPLAIN plan."""
+    tables = []
+    for line in plan:
+        if dialect == "sqlite":
+            # SEARCH is an index lookup; SCAN reads every row, through an index or not
+            match = _SQLITE_SCAN.match(line.strip())
+            if match and match.group(1) != "CONSTANT":
+                tables.append(match.group(1))
+        else:
+            tables.extend(_POSTGRES_SCAN.findall(line))
+    return [table for table in tables if table not in QUERY_AUDIT_IGNORED_TABLES]
+
+
+def explain(connection, statement: str, parameters: Any = None) -> List[str]:
+    """EXPLAIN plan lines for a raw SQL statement and its driver parameters."""
+    dialect = connection.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    rows = connection.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+    if dialect == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+class QueryAudit:
+    """Per-scope statement recorder with plan and N+1 checks."""
+
+    def __init__(self, repeat_threshold: int = QUERY_AUDIT_REPEAT_THRESHOLD):
+        self.repeat_threshold = repeat_threshold
+        self._current: contextvars.ContextVar[Optional[AuditReport]] = contextvars.ContextVar(
+            "query_audit_report", default=None
+        )
+        self._plans: Dict[str, List[str]] = {}
+        self._engines: List[Engine] = []
+
+    def install(self, engine: Engine) -> None:
+        """Record statements executed through ``engine``."""
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._record)
+        self._engines.append(engine)
+
+    def uninstall(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+        self._engines.clear()
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        report = self._current.get()
+        if report is not None and not executemany:
+            report.statements.append((statement, parameters))
+
+    @contextmanager
+    def capture(self, path: str, engine: Optional[Engine] = None) -> Iterator[AuditReport]:
+        """Audit statements issued in this block; the report is filled on exit."""
+        report = AuditReport(path=path)
+        token = self._current.set(report)
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            self._current.reset(token)
+            report.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.analyze(report, engine or (self._engines[0] if self._engines else None))
+
+    def analyze(self, report: AuditReport, engine: Optional[Engine]) -> AuditReport:
+        """Fill in repeated statements and full-table scans."""
+        counts = Counter(_WHITESPACE.sub(" ", statement) for statement, _ in report.statements)
+        report.repeated = {sql: n for sql, n in counts.items() if n >= self.repeat_threshold}
+
+        if engine is None:
+            return report
+        seen = set()
+        for statement, parameters in report.statements:
+            sql = _WHITESPACE.sub(" ", statement)
+            if sql in seen or not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            seen.add(sql)
+            plan = self._plans.get(sql)
+            if plan is None:
+                try:
+                    with engine.connect() as conn:
+                        plan = explain(conn, statement, parameters)
+                except Exception as e:
+                    logger.debug(f"Could not explain statement: {e}")
+                    continue
+                self._plans[sql] = plan
+            tables = scanned_tables(plan, engine.dialect.name)
+            if tables:
+                report.seq_scans[sql] = tables
+        return report
+
+    def log(self, report: AuditReport) -> None:
+        for sql, tables in report.seq_scans.items():
+            logger.warning(
+                f"Query audit {report.path}: full scan of {', '.join(tables)}: {sql[:300]}"
+            )
+        for sql, count in report.repeated.items():
+            logger.warning(
+                f"Query audit {report.path}: statement ran {count} times (possible N+1): {sql[:300]}"
+            )
+        logger.debug(f"Query audit {report.path}: {report.query_count} queries in {report.elapsed_ms}ms")
+
+
+# Global auditor, installed on the app engine when QUERY_AUDIT is set
+query_audit = QueryAudit()
+
+
+async def query_audit_middleware(request, call_next):
+    """HTTP middleware auditing the queries of each request path."""
+    path = f"{request.method} {request.url.path}"
+    with query_audit.capture(path) as report:
+        response = await call_next(request)
+    query_audit.log(report)
+    response.headers["X-Query-Count"] = str(report.query_count)
+    return response
@@ -0,0 +1,202 @@
+"""
+Cache value serializers.
+
+Each serializer has a ``name`` and ``version`` that RedisCache appends to
+the key, so a format change never reads bytes written in another format.
+Payloads above CACHE_COMPRESS_THRESHOLD bytes are zlib-compressed; a
+one-byte header records whether a payload is compressed.
+
+Usage:
+    from app.utils.serialization import serializer_for, register_prefix_serializer
+
+    register_prefix_serializer("session", "json")
+    serializer = serializer_for("odds:abc123")
+    data = serializer.encode(value)
+    value = serializer.decode(data)
+"""
+
+import os
+import json
+import zlib
+import dataclasses
+import importlib
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+CACHE_COMPRESS_THRESHOLD = int(os.environ.get("CACHE_COMPRESS_THRESHOLD", "1024"))
+CACHE_COMPRESS_LEVEL = int(os.environ.get("CACHE_COMPRESS_LEVEL", "1"))  # Favour speed
+CACHE_SERIALIZER = os.environ.get("CACHE_SERIALIZER", "msgpack" if MSGPACK_AVAILABLE else "json")
+
+# Dataclasses are only rebuilt from these modules; anything else decodes to a dict
+DATACLASS_MODULE_PREFIXES = ("app.",)
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+# msgpack extension type codes
+_EXT_DATETIME = 1
+_EXT_DATE = 2
+_EXT_DECIMAL = 3
+_EXT_DATACLASS = 4
+_EXT_SET = 5
+
+
+class CacheSerializer(ABC):
+    """Converts cache values to bytes and back."""
+
+    name: str
+    version: int
+
+    @property
+    def tag(self) -> str:
+        """Format identifier stored in the cache key, e.g. ``msgpack1``."""
+        return f"{self.name}{self.version}"
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        pass
+
+    def encode(self, value: Any) -> bytes:
+        payload = self.dumps(value)
+        if len(payload) >= CACHE_COMPRESS_THRESHOLD:
+            return _ZLIB + zlib.compress(payload, CACHE_COMPRESS_LEVEL)
+        return _RAW + payload
+
+    def decode(self, data: bytes) -> Any:
+        header, payload = data[:1], data[1:]
+        if header == _ZLIB:
+            payload = zlib.decompress(payload)
+        elif header != _RAW:
+            raise ValueError(f"Unknown cache payload header: {header!r}")
+        return self.loads(payload)
+
+
+class JsonSerializer(CacheSerializer):
+    """JSON with ``default=str``; non-JSON types come back as strings."""
+
+    name = "json"
+    version = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+def _load_dataclass(qualname: str, values: Dict[str, Any]) -> Any:
+    module_name, _, class_name = qualname.rpartition(":")
+    if not module_name.startswith(DATACLASS_MODULE_PREFIXES):
+        return values
+    try:
+        cls = importlib.import_module(module_name)
+        for attr in class_name.split("."):
+            cls = getattr(cls, attr)
+    except (ImportError, AttributeError):
+        return values
+    if not dataclasses.is_dataclass(cls):
+        return values
+
+    init_fields = {f.name for f in dataclasses.fields(cls) if f.init}
+    obj = cls(**{k: v for k, v in values.items() if k in init_fields})
+    for k, v in values.items():
+        if k not in init_fields:
+            object.__setattr__(obj, k, v)
+    return obj
+
+
+class MsgpackSerializer(CacheSerializer):
+    """
+    msgpack with extension types so datetime, date, Decimal, set and
+    dataclass values round-trip with their types.
+    """
+
+    name = "msgpack"
+    version = 1
+
+    def __init__(self):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+
+    def _pack(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True, datetime=False)
+
+    def _unpack(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+    def _default(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+        if isinstance(value, date):
+            return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+        if isinstance(value, Decimal):
+            return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+        if isinstance(value, (set, frozenset)):
+            return msgpack.ExtType(_EXT_SET, self._pack(list(value)))
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            cls = type(value)
+            fields = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+            return msgpack.ExtType(
+                _EXT_DATACLASS, self._pack([f"{cls.__module__}:{cls.__qualname__}", fields])
+            )
+        # Same fallback as the JSON serializer for anything else
+        return str(value)
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == _EXT_DATETIME:
+            return datetime.fromisoformat(data.decode())
+        if code == _EXT_DATE:
+            return date.fromisoformat(data.decode())
+        if code == _EXT_DECIMAL:
+            return Decimal(data.decode())
+        if code == _EXT_SET:
+            return set(self._unpack(data))
+        if code == _EXT_DATACLASS:
+            qualname, values = self._unpack(data)
+            return _load_dataclass(qualname, values)
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, value: Any) -> bytes:
+        return self._pack(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._unpack(data)
+
+
+SERIALIZERS: Dict[str, CacheSerializer] = {"json": JsonSerializer()}
+if MSGPACK_AVAILABLE:
+    SERIALIZERS["msgpack"] = MsgpackSerializer()
+
+# Key prefix (first ':' segment) -> serializer name
+PREFIX_SERIALIZERS: Dict[str, str] = {}
+
+
+def get_serializer(name: str) -> CacheSerializer:
+    """Look up a registered serializer, falling back to JSON."""
+    return SERIALIZERS.get(name) or SERIALIZERS["json"]
+
+
+def register_prefix_serializer(prefix: str, name: str) -> None:
+    """Use serializer ``name`` for every key under ``prefix``."""
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown cache serializer: {name}")
+    PREFIX_SERIALIZERS[prefix] = name
+
+
+def serializer_for(key: str) -> CacheSerializer:
+    """Serializer for a cache key, chosen by its first ':' segment."""
+    name = PREFIX_SERIALIZERS.get(key.split(":", 1)[0], CACHE_SERIALIZER)
+    return get_serializer(name)
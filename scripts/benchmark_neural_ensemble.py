@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Neural ensemble inference benchmark
+
+Usage:
+    python scripts/benchmark_neural_ensemble.py [--sizes 1 32 512] [--repeat N]
+
+Scores synthetic slates of each size with NeuralEnsemble.predict_batch
+and with a loop of per-game NeuralEnsemble.predict calls, and prints the
+per-game latency of both.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+from app.services.neural_ensemble import NeuralEnsemble
+
+
+def synthetic_games(count, seed=7):
+    rng = random.Random(seed)
+
+    def history():
+        return [
+            {
+                "won": rng.random() < 0.5,
+                "margin": rng.randint(-20, 20),
+                "total_points": rng.randint(180, 250),
+                "is_home": rng.random() < 0.5,
+                "rest_days": rng.randint(1, 4),
+                "opponent_elo": rng.gauss(1500, 80),
+            }
+            for _ in range(rng.randint(3, 10))
+        ]
+
+    def stats():
+        return {
+            "elo_rating": rng.gauss(1500, 100),
+            "recent_win_pct": rng.random(),
+            "home_win_pct": rng.random(),
+            "away_win_pct": rng.random(),
+            "offensive_rating": rng.gauss(110, 5),
+            "defensive_rating": rng.gauss(110, 5),
+            "pace": rng.gauss(100, 3),
+            "score_std": rng.uniform(8, 15),
+        }
+
+    return [
+        {
+            "sport": "NBA",
+            "home_team_stats": stats(),
+            "away_team_stats": stats(),
+            "game_context": {"home_rest_days": rng.randint(1, 4), "away_rest_days": rng.randint(1, 4)},
+            "factor_scores": {"line_movement": rng.uniform(0, 100), "elo": rng.uniform(0, 100)},
+            "home_game_history": history(),
+            "away_game_history": history(),
+        }
+        for _ in range(count)
+    ]
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes, repeat):
+    model = NeuralEnsemble()
+    print(f"{'batch':>6} {'loop ms/game':>14} {'batch ms/game':>14} {'speedup':>8}")
+    for size in sizes:
+        games = synthetic_games(size)
+        loop = best_of(repeat, lambda: [model.predict(**game) for game in games])
+        batch = best_of(repeat, lambda: model.predict_batch(games))
+        print(f"{size:>6} {loop / size * 1000:>14.3f} {batch / size * 1000:>14.3f} {loop / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batched neural ensemble inference")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 32, 512], help="Slate sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size (best is reported)")
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
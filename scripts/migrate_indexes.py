@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Index migration
+
+Usage:
+    python scripts/migrate_indexes.py [--check]
+
+``create_all`` only builds indexes together with new tables, so indexes
+declared later on existing models never reach an existing database.
+This script:
+1. Compares every index declared in app/db.py with the live database
+2. Creates the missing ones (CREATE INDEX IF NOT EXISTS semantics)
+3. Drops indexes listed in RETIRED_INDEXES that are still present
+
+With --check nothing is changed; the drift is listed and the script
+exits non-zero, so it can guard deploys against index drift.
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import inspect, text
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+from app.db import engine, Base
+
+
+# Indexes once declared on the models and since removed: (name, table)
+RETIRED_INDEXES = [
+    # session_token's unique index already serves session lookups
+    ("ix_user_sessions_token_valid", "user_sessions"),
+]
+
+
+def retired_indexes(conn):
+    """Retired indexes the database still has."""
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    return [
+        (name, table) for name, table in RETIRED_INDEXES
+        if table in tables and name in {index["name"] for index in inspector.get_indexes(table)}
+    ]
+
+
+def missing_indexes(conn):
+    """Declared indexes on existing tables that the database does not have."""
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                missing.append(index)
+    return missing
+
+
+def migrate(check: bool = False) -> int:
+    with engine.begin() as conn:
+        missing = missing_indexes(conn)
+        retired = retired_indexes(conn)
+        if not missing and not retired:
+            print("All declared indexes exist.")
+            return 0
+        for index in missing:
+            columns = ", ".join(column.name for column in index.columns)
+            if check:
+                print(f"Missing index {index.name} on {index.table.name} ({columns})")
+                continue
+            print(f"Creating index {index.name} on {index.table.name} ({columns})...")
+            index.create(bind=conn, checkfirst=True)
+        for name, table in retired:
+            if check:
+                print(f"Retired index {name} on {table} still present")
+                continue
+            print(f"Dropping retired index {name} on {table}...")
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    if check:
+        return 1
+    print("Migration completed successfully.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create indexes declared on the models")
+    parser.add_argument("--check", action="store_true", help="Only report missing indexes; exit 1 if any")
+    args = parser.parse_args()
+    sys.exit(migrate(check=args.check))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Convert pickled neural ensemble models to artifact directories
+
+Usage:
+    python scripts/migrate_model_artifacts.py [--delete] [PATH ...]
+
+Converts ensemble_*.pkl files (by default every one in MODEL_DIR) to
+the .npy + manifest.json artifact format that ModelManager loads. Only
+run this on pickles you trust: unpickling can execute arbitrary code,
+which is why the service no longer reads them.
+"""
+
+import argparse
+import pickle
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+from app.services.neural_ensemble import MODEL_DIR, NeuralEnsemble
+
+
+def convert(pickle_path: Path) -> str:
+    with open(pickle_path, "rb") as f:
+        model_data = pickle.load(f)
+
+    ensemble = NeuralEnsemble(model_data["config"])
+    ensemble.version = model_data["version"]
+    ensemble.created_at = datetime.fromisoformat(model_data["created_at"])
+    ensemble.trained_on_games = model_data["trained_on_games"]
+    ensemble.accuracy_history = model_data["accuracy_history"]
+    ensemble.ensemble_weights = model_data["ensemble_weights"]
+    ensemble.feedforward.set_params(model_data["feedforward_params"])
+    ensemble.lstm.set_params(model_data["lstm_params"])
+
+    path = ensemble.save(str(pickle_path.with_suffix("")))
+    NeuralEnsemble.load(path)  # verify checksums and shapes
+    return path
+
+
+def main(paths, delete=False):
+    paths = [Path(p) for p in paths] or sorted(MODEL_DIR.glob("ensemble_*.pkl"))
+    if not paths:
+        print(f"No pickled models in {MODEL_DIR}")
+        return
+
+    for pickle_path in paths:
+        try:
+            artifact = convert(pickle_path)
+        except Exception as e:
+            print(f"  FAILED {pickle_path}: {e}")
+            continue
+        print(f"  {pickle_path} -> {artifact}")
+        if delete:
+            pickle_path.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert pickled neural ensemble models to artifacts")
+    parser.add_argument("paths", nargs="*", help="Pickle files (default: every ensemble_*.pkl in MODEL_DIR)")
+    parser.add_argument("--delete", action="store_true", help="Delete each pickle after converting it")
+    args = parser.parse_args()
+    main(args.paths, delete=args.delete)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Odds time-series migration
+
+Usage:
+    python scripts/migrate_odds_timeseries.py [--partition] [--drop-legacy]
+
+This script:
+1. Creates the composite series indexes on odds_snapshots and line_movements
+2. Adds the selection column to odds_snapshots
+3. Creates the odds_rollups table. A table from before rollups were kept
+   per selection is dropped and rebuilt from the raw points still stored.
+4. With --partition (PostgreSQL only), converts odds_snapshots into a table
+   range-partitioned by month on captured_at and copies existing rows over.
+   The old table is kept as odds_snapshots_legacy unless --drop-legacy is given.
+"""
+
+import argparse
+import sys
+
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+from app.db import engine, OddsRollup
+from app.services.odds_timeseries import ensure_snapshot_partitions, is_snapshots_partitioned, rollup_hourly
+
+INDEXES = [
+    ("ix_odds_snapshots_series", "odds_snapshots", "game_id, market_type, sportsbook, captured_at"),
+    ("ix_line_movements_series", "line_movements", "game_id, market_type, sportsbook, recorded_at"),
+]
+
+
+def create_indexes(conn):
+    for name, table, columns in INDEXES:
+        print(f"Ensuring index {name} on {table}...")
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def add_selection(conn):
+    """Tag raw points and rollups with their outcome."""
+    inspector = inspect(conn)
+    if "selection" not in {c["name"] for c in inspector.get_columns("odds_snapshots")}:
+        print("Adding selection column to odds_snapshots...")
+        conn.execute(text("ALTER TABLE odds_snapshots ADD COLUMN selection VARCHAR(50)"))
+
+    if inspector.has_table("odds_rollups") and \
+            "selection" not in {c["name"] for c in inspector.get_columns("odds_rollups")}:
+        # Old buckets mixed both outcomes of a series and cannot be split
+        print("Dropping odds_rollups built without selections...")
+        OddsRollup.__table__.drop(bind=conn)
+        return True
+    return False
+
+
+def partition_snapshots(conn, drop_legacy: bool):
+    """Rebuild odds_snapshots as a monthly range-partitioned table."""
+    conn.execute(text("ALTER TABLE odds_snapshots RENAME TO odds_snapshots_legacy"))
+    conn.execute(text("ALTER INDEX IF EXISTS ix_odds_snapshots_series RENAME TO ix_odds_snapshots_legacy_series"))
+    conn.execute(text(
+        "CREATE TABLE odds_snapshots (LIKE odds_snapshots_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (captured_at)"
+    ))
+    conn.execute(text("UPDATE odds_snapshots_legacy SET captured_at = now() WHERE captured_at IS NULL"))
+    conn.execute(text("ALTER TABLE odds_snapshots ALTER COLUMN captured_at SET NOT NULL"))
+    # The partition key has to be part of the primary key
+    conn.execute(text("ALTER TABLE odds_snapshots ADD PRIMARY KEY (id, captured_at)"))
+    conn.execute(text(
+        "CREATE INDEX ix_odds_snapshots_series ON odds_snapshots "
+        "(game_id, market_type, sportsbook, captured_at)"
+    ))
+    conn.execute(text("CREATE INDEX ix_odds_snapshots_captured_at_p ON odds_snapshots (captured_at)"))
+    conn.execute(text("CREATE TABLE odds_snapshots_default PARTITION OF odds_snapshots DEFAULT"))
+
+    oldest = conn.execute(text("SELECT min(captured_at) FROM odds_snapshots_legacy")).scalar()
+    session = sessionmaker(bind=conn)()
+    names = ensure_snapshot_partitions(session, start=oldest)
+    print(f"Created {len(names)} monthly partitions")
+
+    print("Copying rows...")
+    conn.execute(text("INSERT INTO odds_snapshots SELECT * FROM odds_snapshots_legacy"))
+
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence('odds_snapshots_legacy', 'id')")).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY odds_snapshots.id"))
+    if drop_legacy:
+        print("Dropping odds_snapshots_legacy...")
+        conn.execute(text("DROP TABLE odds_snapshots_legacy"))
+
+
+def migrate(partition: bool = False, drop_legacy: bool = False):
+    with engine.begin() as conn:
+        create_indexes(conn)
+        rebuild = add_selection(conn)
+        print("Ensuring odds_rollups table...")
+        OddsRollup.__table__.create(bind=conn, checkfirst=True)
+
+    if rebuild:
+        session = sessionmaker(bind=engine)()
+        try:
+            print(f"Rebuilt {rollup_hourly(session, since=datetime.min)} rollup buckets")
+        finally:
+            session.close()
+
+    if not partition:
+        print("Migration completed successfully.")
+        return
+
+    if engine.dialect.name != "postgresql":
+        print("Partitioning requires PostgreSQL; skipped.")
+        return
+
+    with engine.begin() as conn:
+        session = sessionmaker(bind=conn)()
+        if is_snapshots_partitioned(session):
+            print("odds_snapshots is already partitioned.")
+            return
+        partition_snapshots(conn, drop_legacy)
+    print("Migration completed successfully.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate odds snapshots to time-series storage")
+    parser.add_argument("--partition", action="store_true", help="Partition odds_snapshots by month (PostgreSQL)")
+    parser.add_argument("--drop-legacy", action="store_true", help="Drop the unpartitioned table after copying")
+    args = parser.parse_args()
+    migrate(partition=args.partition, drop_legacy=args.drop_legacy)
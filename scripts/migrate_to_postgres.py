@@ -41,6 +41,7 @@ TABLE_ORDER = [
     'audit_logs',
     'currency_rates',
     'odds_snapshots',
+    'odds_rollups',
     'tracked_picks',
     'bankroll_snapshots',
 ]
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Remove cache keys written before prefix tagging
+
+Usage:
+    python scripts/sweep_legacy_cache_keys.py
+
+Releases before tag sets wrote cache keys that clear_prefix can only
+find by scanning the whole keyspace. Run this once against REDIS_URL
+after upgrading: it walks the keyspace a single time and unlinks every
+key missing from its tag set, so CACHE_REDIS_LEGACY_SCAN can stay off.
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+from app.utils.cache import RedisCache
+
+
+def main() -> int:
+    redis_url = os.environ.get("REDIS_URL")
+    if not redis_url:
+        print("REDIS_URL is not set")
+        return 1
+
+    backend = RedisCache(redis_url)
+    if not backend.ping():
+        print("Redis ping failed")
+        return 1
+
+    print(f"Removed {backend.sweep_legacy()} legacy cache keys.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -581,8 +581,8 @@ class TestIntegration:
         )
 
         # Mock the cache
-        with patch.object(action_network.cache, 'get', return_value=None):
-            with patch.object(action_network.cache, 'set'):
+        with patch.object(action_network.cache, 'aget', new=AsyncMock(return_value=None)):
+            with patch.object(action_network.cache, 'aset', new=AsyncMock()):
                 with patch.object(action_network, '_store_public_betting') as mock_store:
                     mock_stored = MagicMock()
                     mock_stored.game_id = 1
@@ -0,0 +1,149 @@
+"""
+Tests for the columnar backtest engine and parameter sweeps.
+"""
+
+import json
+import random
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Team, HistoricalGameResult, BacktestResult
+from app.models.advanced_elo import NBAAdvancedModel
+from app.services.backtesting import BacktestEngine
+from app.services.backtest_sweep import (
+    load_history,
+    parameter_grid,
+    run_parameter_sweep,
+    sweep,
+)
+
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 6, 1)
+
+
+@pytest.fixture
+def history(db_session):
+    rng = random.Random(11)
+    teams = [Team(sport="NBA", name=f"Team {i}") for i in range(8)]
+    db_session.add_all(teams)
+    db_session.flush()
+
+    day = START - timedelta(days=120)
+    while day < END:
+        home, away = rng.sample(teams, 2)
+        home_score, away_score = rng.randint(90, 125), rng.randint(90, 125)
+        winner = "home" if home_score > away_score else "away" if away_score > home_score else "draw"
+        db_session.add(HistoricalGameResult(
+            sport="NBA",
+            season="2024-25",
+            game_date=day,
+            home_team_id=home.id,
+            away_team_id=away.id,
+            home_score=home_score,
+            away_score=away_score,
+            winner=winner,
+            margin=home_score - away_score,
+            closing_home_ml=rng.choice([-150, -120, 105, 130]),
+            closing_away_ml=rng.choice([-140, -110, 110, 125]),
+        ))
+        day += timedelta(hours=rng.randint(10, 30))
+    db_session.commit()
+
+
+class TestSweep:
+    """Test parity with BacktestEngine and grid evaluation."""
+
+    def test_matches_backtest_engine(self, db_session, history):
+        model = NBAAdvancedModel()
+        expected = BacktestEngine("NBA", model).run_backtest(db_session, START, END, min_edge=0.03)
+
+        games = load_history(db_session, "NBA", END)
+        result = sweep(games, parameter_grid(NBAAdvancedModel()), START, [0.03])[0]
+
+        assert result["total_predictions"] == expected["total_games"]
+        assert round(result["accuracy"] * 100, 2) == expected["accuracy"]
+        assert result["total_bets"] == expected["bets_placed"]
+        assert result["winning_bets"] == expected["bets_won"]
+        assert round(result["total_profit"], 2) == expected["total_profit"]
+        assert round(result["brier_score"], 4) == expected["brier_score"]
+        assert round(result["log_loss"], 4) == expected["log_loss"]
+        assert round(result["calibration_error"], 4) == expected["calibration_error"]
+        assert round(result["max_drawdown"], 2) == expected["max_drawdown"]
+        assert round(result["sharpe_ratio"], 2) == expected["sharpe_ratio"]
+
+    def test_grid_rows_match_single_runs(self, db_session, history):
+        games = load_history(db_session, "NBA", END)
+        params = parameter_grid(NBAAdvancedModel(), base_k_factor=[20, 36], home_advantage=[0, 60])
+
+        grid = sweep(games, params, START, [0.02, 0.05])
+        assert len(grid) == 8
+
+        for row in grid:
+            single_params = {k: v for k, v in row["parameters"].items() if k != "min_edge"}
+            single = sweep(games, [single_params], START, [row["parameters"]["min_edge"]])[0]
+            assert single["roi"] == pytest.approx(row["roi"])
+            assert single["brier_score"] == pytest.approx(row["brier_score"])
+
+    def test_higher_edge_takes_fewer_bets(self, db_session, history):
+        games = load_history(db_session, "NBA", END)
+        low, high = sweep(games, parameter_grid(NBAAdvancedModel()), START, [0.0, 0.1])
+
+        assert high["total_bets"] <= low["total_bets"]
+
+    def test_recency_weight_changes_predictions(self, db_session, history):
+        games = load_history(db_session, "NBA", END)
+        plain, decayed = sweep(games, parameter_grid(NBAAdvancedModel(), recency_weight=[1.0, 0.5]), START, [0.03])
+
+        assert plain["brier_score"] != decayed["brier_score"]
+
+    def test_process_workers_match(self, db_session, history):
+        games = load_history(db_session, "NBA", END)
+        params = parameter_grid(NBAAdvancedModel(), base_k_factor=[20, 28, 36])
+
+        parallel = sweep(games, params, START, [0.03], workers=2)
+        serial = sweep(games, params, START, [0.03], workers=1)
+
+        assert [r["parameters"] for r in parallel] == [r["parameters"] for r in serial]
+        assert [r["roi"] for r in parallel] == pytest.approx([r["roi"] for r in serial])
+
+
+class TestRunParameterSweep:
+    """Test storage of sweep results."""
+
+    def test_stores_every_combination(self, db_session, history):
+        summary = run_parameter_sweep(
+            db_session, "NBA", START, END,
+            min_edges=[0.02, 0.04], base_k_factor=[20, 28, 36], workers=1, top=3
+        )
+
+        assert summary["combinations"] == 6
+        assert summary["stored"] == 6
+        assert len(summary["top"]) == 3
+        rows = db_session.query(BacktestResult).all()
+        assert len(rows) == 6
+        assert {json.loads(r.parameters)["base_k_factor"] for r in rows} == {20, 28, 36}
+
+    def test_unknown_parameter(self, db_session):
+        with pytest.raises(ValueError):
+            run_parameter_sweep(db_session, "NBA", START, END, k=[1])
+
+
+class TestSweepEndpoint:
+    """Test request limits on the sweep endpoint."""
+
+    def test_rejects_oversized_grid(self, client):
+        values = [str(v) for v in range(7)]
+        response = client.post("/historical/backtest/NBA/sweep", params={
+            "base_k_factor": values, "home_advantage": values, "margin_factor": values,
+        })
+
+        assert response.status_code == 400
+        assert "343" in response.json()["detail"]
+
+    def test_rejects_too_many_edges(self, client):
+        response = client.post("/historical/backtest/NBA/sweep", params={
+            "min_edge": [str(v / 100) for v in range(11)],
+        })
+
+        assert response.status_code == 400
@@ -0,0 +1,489 @@
+"""
+Tests for the caching layer.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from app.utils import cache as cache_module
+from app.utils.serialization import get_serializer
+from app.utils.cache import (
+    InMemoryCache,
+    RedisCache,
+    TieredCache,
+    SingleFlight,
+    CACHE_INVALIDATION_CHANNEL,
+)
+
+
+class FakePubSubClient:
+    """Records published messages instead of talking to Redis."""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def pubsub(self, **kwargs):
+        raise ConnectionError("no redis in tests")
+
+
+class TestInMemoryCache:
+    """Test in-memory cache backend."""
+
+    def test_set_and_get(self):
+        cache = InMemoryCache()
+        cache.set("odds:a", {"x": 1}, ttl=60)
+        assert cache.get("odds:a") == {"x": 1}
+
+    def test_lru_eviction(self):
+        """Least recently used entry should be evicted at capacity."""
+        cache = InMemoryCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_clear_prefix(self):
+        cache = InMemoryCache()
+        cache.set("odds:1", 1, ttl=60)
+        cache.set("odds:2", 2, ttl=60)
+        cache.set("games:1", 3, ttl=60)
+
+        assert cache.clear_prefix("odds") == 2
+        assert cache.get("games:1") == 3
+
+    def test_clear_nested_prefix(self):
+        """Prefix match is by whole ':' segments, excluding the prefix key itself."""
+        cache = InMemoryCache()
+        cache.set("sportradar:live", 0, ttl=60)
+        cache.set("sportradar:live:NBA", 1, ttl=60)
+        cache.set("sportradar:live:NFL:week1", 2, ttl=60)
+        cache.set("sportradar:schedule:NBA", 3, ttl=60)
+        cache.set("sportradarx:live:NBA", 4, ttl=60)
+
+        assert cache.clear_prefix("sportradar:live") == 2
+        assert cache.get("sportradar:live") == 0
+        assert cache.get("sportradar:schedule:NBA") == 3
+        assert cache.get("sportradarx:live:NBA") == 4
+        assert cache.clear_prefix("missing") == 0
+
+    def test_prefix_index_pruned(self):
+        """Deleting keys should not leave empty index nodes behind."""
+        cache = InMemoryCache()
+        cache.set("a:b:c", 1, ttl=60)
+        cache.set("a:d", 2, ttl=60)
+        cache.delete("a:b:c")
+        cache.clear_prefix("a")
+
+        assert len(cache._index) == 0
+
+    def test_expired_entry_not_returned(self):
+        cache = InMemoryCache(sweep_interval=0)
+        cache.set("k", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.get("k") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_sweep_removes_expired(self):
+        """Expired entries should be dropped without being read again."""
+        cache = InMemoryCache(sweep_interval=0)
+        for i in range(5):
+            cache.set(f"short:{i}", i, ttl=0.01)
+        cache.set("long:1", 1, ttl=60)
+        time.sleep(0.02)
+
+        assert cache.sweep() == 5
+        assert cache.stats()["size"] == 1
+
+    def test_rewritten_key_not_swept_early(self):
+        cache = InMemoryCache(sweep_interval=0)
+        cache.set("k", 1, ttl=0.01)
+        cache.set("k", 2, ttl=60)
+        time.sleep(0.02)
+
+        assert cache.sweep() == 0
+        assert cache.get("k") == 2
+
+    def test_background_sweeper(self):
+        cache = InMemoryCache(sweep_interval=0.02)
+        cache.set("k", 1, ttl=0.01)
+        time.sleep(0.1)
+        cache.close()
+
+        assert cache.stats()["size"] == 0
+
+    def test_byte_cap_evicts_lru(self):
+        cache = InMemoryCache(max_entries=None, max_bytes=2000)
+        for i in range(20):
+            cache.set(f"k:{i}", "x" * 200, ttl=60)
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 2000
+        assert stats["evictions"] > 0
+        assert cache.get("k:19") is not None
+        assert cache.get("k:0") is None
+
+    def test_oversized_value_rejected(self):
+        cache = InMemoryCache(max_bytes=100)
+        assert cache.set("big", "x" * 1000, ttl=60) is False
+        assert cache.get("big") is None
+
+
+def fake_redis_cache(monkeypatch, version=None):
+    """RedisCache on a fakeredis server, probed like Cache does at startup."""
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer(version=version) if version else fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis, "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs),
+    )
+    monkeypatch.setattr(
+        redis.asyncio, "from_url",
+        lambda url, max_connections=None, **kwargs: fakeredis.FakeAsyncRedis(server=server, **kwargs),
+    )
+    backend = RedisCache("redis://localhost:6379/0")
+    assert backend.ping()
+    return backend
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    return fake_redis_cache(monkeypatch)
+
+
+class TestRedisCache:
+    """Test Redis backend prefix invalidation."""
+
+    def test_keys_never_called(self, redis_cache, monkeypatch):
+        """Invalidation must not walk the keyspace with KEYS."""
+        def forbidden(*args, **kwargs):
+            raise AssertionError("KEYS called")
+
+        monkeypatch.setattr(redis_cache.client, "keys", forbidden)
+        redis_cache.set("odds:nba", 1, ttl=60)
+
+        assert redis_cache.clear_prefix("odds") == 1
+        assert redis_cache.clear_all() == 0
+
+    def test_clear_prefix_uses_tag_set(self, redis_cache):
+        """With the legacy scan off, tagged keys are still cleared."""
+        redis_cache.set("sportradar:live:NBA", 1, ttl=60)
+        redis_cache.set("sportradar:live:NFL:week1", 2, ttl=60)
+        redis_cache.set("sportradar:schedule:NBA", 3, ttl=60)
+        redis_cache.set("sportradar:live", 4, ttl=60)
+
+        assert redis_cache.clear_prefix("sportradar:live") == 2
+        assert redis_cache.get("sportradar:live:NBA") is None
+        assert redis_cache.get("sportradar:schedule:NBA") == 3
+        assert redis_cache.get("sportradar:live") == 4
+        assert redis_cache.clear_prefix("sportradar") == 2
+
+    def test_legacy_keys_cleared_by_scan(self, redis_cache, monkeypatch):
+        """Keys written without tags are found by the opt-in SCAN fallback."""
+        monkeypatch.setattr(cache_module, "CACHE_REDIS_LEGACY_SCAN", True)
+        redis_cache.client.setex("edge:odds:legacy", 60, json.dumps(1))
+        redis_cache.set("odds:new", 2, ttl=60)
+
+        assert redis_cache.clear_prefix("odds") == 2
+        assert redis_cache.stats()["legacy_unlinked"] == 1
+
+    def test_sweep_legacy_removes_only_untagged_keys(self, redis_cache):
+        redis_cache.client.setex("edge:odds:legacy", 60, json.dumps(1))
+        redis_cache.client.setex("edge:bare", 60, json.dumps(2))
+        redis_cache.set("odds:new", 3, ttl=60)
+
+        assert redis_cache.clear_prefix("odds") == 1
+        assert redis_cache.client.exists("edge:odds:legacy")
+
+        assert redis_cache.sweep_legacy() == 1
+        assert not redis_cache.client.exists("edge:odds:legacy")
+        assert redis_cache.client.exists("edge:bare")
+        assert redis_cache.sweep_legacy() == 0
+
+    def test_typed_values_round_trip(self, redis_cache):
+        value = {"at": datetime(2026, 1, 5, 19, 30), "price": Decimal("1.91")}
+        redis_cache.set("odds:typed", value, ttl=60)
+
+        assert redis_cache.get("odds:typed") == value
+
+    def test_format_tag_in_key(self, redis_cache, monkeypatch):
+        """A key written in one format is not read back as another."""
+        pytest.importorskip("msgpack")
+        redis_cache.set("stats:1", {"a": 1}, ttl=60)
+        monkeypatch.setattr(cache_module, "serializer_for", lambda key: get_serializer("json"))
+
+        assert redis_cache.get("stats:1") is None
+        redis_cache.set("stats:1", {"a": 2}, ttl=60)
+        assert redis_cache.get("stats:1") == {"a": 2}
+
+    def test_tag_ttl_tracks_longest_member(self, redis_cache):
+        redis_cache.set("games:1", 1, ttl=600)
+        redis_cache.set("games:2", 2, ttl=60)
+
+        assert redis_cache.client.ttl("edge-tag:games") > 60
+
+    def test_tag_ttl_on_redis_6(self, monkeypatch):
+        """Servers without EXPIRE NX/GT extend tag TTLs through Lua."""
+        pytest.importorskip("lupa")
+        redis_cache = fake_redis_cache(monkeypatch, version=(6, 2))
+
+        assert redis_cache._expire_flags is False
+        assert redis_cache.set("games:1", 1, ttl=600)
+        assert redis_cache.set("games:2", 2, ttl=60)
+        assert redis_cache.client.ttl("edge-tag:games") > 60
+        assert redis_cache.clear_prefix("games") == 2
+
+    def test_expire_flags_probed(self, redis_cache):
+        assert redis_cache._expire_flags is True
+
+    def test_delete_untags_key(self, redis_cache):
+        redis_cache.set("teams:1", 1, ttl=60)
+        assert redis_cache.delete("teams:1") is True
+        assert redis_cache.client.smembers("edge-tag:teams") == set()
+
+    def test_clear_all_removes_tags(self, redis_cache):
+        redis_cache.set("odds:1", 1, ttl=60)
+        redis_cache.set("games", 2, ttl=60)
+
+        assert redis_cache.clear_all() == 2
+        assert redis_cache.client.dbsize() == 0
+
+
+class TestBatchAndAsync:
+    """Test pipelined batch operations and the async API."""
+
+    def test_in_memory_get_many(self):
+        cache = InMemoryCache()
+        cache.set_many({"a:1": 1, "a:2": 2}, ttl=60)
+
+        assert cache.get_many(["a:1", "a:2", "a:3"]) == {"a:1": 1, "a:2": 2}
+
+    def test_redis_set_many_single_round_trip(self, redis_cache, monkeypatch):
+        """set_many should execute one pipeline for all keys."""
+        executes = []
+        pipeline = redis_cache.client.pipeline
+
+        def counting_pipeline(*args, **kwargs):
+            pipe = pipeline(*args, **kwargs)
+            original = pipe.execute
+            pipe.execute = lambda *a, **k: executes.append(1) or original(*a, **k)
+            return pipe
+
+        monkeypatch.setattr(redis_cache.client, "pipeline", counting_pipeline)
+        assert redis_cache.set_many({f"odds:{i}": i for i in range(50)}, ttl=60)
+
+        assert len(executes) == 1
+        assert redis_cache.get_many(["odds:0", "odds:49", "odds:99"]) == {"odds:0": 0, "odds:49": 49}
+        assert redis_cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_async_shares_keyspace(self, redis_cache):
+        """Async writes are visible to the sync client and vice versa."""
+        await redis_cache.aset("games:1", {"id": 1}, ttl=60)
+        redis_cache.set("games:2", {"id": 2}, ttl=60)
+
+        assert redis_cache.get("games:1") == {"id": 1}
+        assert await redis_cache.aget_many(["games:1", "games:2"]) == {
+            "games:1": {"id": 1}, "games:2": {"id": 2},
+        }
+        assert await redis_cache.adelete("games:1") is True
+        assert await redis_cache.aget("games:1") is None
+        await redis_cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_redis_async_clear_prefix(self, redis_cache):
+        await redis_cache.aset_many({"teams:1": 1, "teams:2": 2, "odds:1": 3}, ttl=60)
+
+        assert await redis_cache.aclear_prefix("teams") == 2
+        assert await redis_cache.aget("odds:1") == 3
+        await redis_cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_tiered_async_get_many_promotes(self):
+        remote = InMemoryCache()
+        local = InMemoryCache()
+        tiered = TieredCache(remote, local=local)
+        remote.set_many({"odds:1": 1, "odds:2": 2}, ttl=60)
+        local.set("odds:3", 3, ttl=60)
+
+        values = await tiered.aget_many(["odds:1", "odds:2", "odds:3", "odds:4"])
+
+        assert values == {"odds:1": 1, "odds:2": 2, "odds:3": 3}
+        assert local.get("odds:1") == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_decorator_uses_async_api(self, monkeypatch):
+        """The async wrapper should read and write through aget/aset."""
+        calls = []
+
+        async def fake_aget(key):
+            calls.append("aget")
+            return None
+
+        async def fake_aset(key, value, ttl=None):
+            calls.append("aset")
+            return True
+
+        monkeypatch.setattr(cache_module.cache, "aget", fake_aget)
+        monkeypatch.setattr(cache_module.cache, "aset", fake_aset)
+
+        @cache_module.cached("test-async", ttl=60)
+        async def compute(self_arg, x):
+            return x * 2
+
+        assert await compute(None, 21) == 42
+        assert calls == ["aget", "aset"]
+
+
+class TestTieredCache:
+    """Test local tier in front of a remote backend."""
+
+    def test_remote_hit_promoted_to_local(self):
+        remote = InMemoryCache()
+        tiered = TieredCache(remote, local=InMemoryCache(max_entries=10))
+        remote.set("odds:nba", [1, 2], ttl=60)
+
+        assert tiered.get("odds:nba") == [1, 2]
+        assert tiered.get("odds:nba") == [1, 2]
+
+        stats = tiered.stats()
+        assert stats["tiers"]["remote"]["hits"] == 1
+        assert stats["tiers"]["local"]["hits"] == 1
+        assert stats["hits"] == 2
+
+    def test_writes_publish_invalidation(self):
+        client = FakePubSubClient()
+        tiered = TieredCache(InMemoryCache(), pubsub_client=client)
+
+        tiered.set("games:1", "x", ttl=60)
+        tiered.clear_prefix("games")
+
+        ops = [(c, m["op"], m["key"]) for c, m in client.published]
+        assert ops == [
+            (CACHE_INVALIDATION_CHANNEL, "delete", "games:1"),
+            (CACHE_INVALIDATION_CHANNEL, "prefix", "games"),
+        ]
+
+    def test_remote_invalidation_drops_local_copy(self):
+        local = InMemoryCache()
+        tiered = TieredCache(InMemoryCache(), local=local)
+        tiered.set("odds:nfl", 1, ttl=60)
+
+        tiered._on_invalidation({"data": json.dumps({"origin": "other", "op": "delete", "key": "odds:nfl"})})
+
+        assert local.get("odds:nfl") is None
+        assert tiered.stats()["invalidations_received"] == 1
+
+    def test_own_invalidation_ignored(self):
+        local = InMemoryCache()
+        tiered = TieredCache(InMemoryCache(), local=local)
+        tiered.set("odds:nfl", 1, ttl=60)
+
+        tiered._on_invalidation({"data": json.dumps({"origin": tiered._node_id, "op": "all", "key": None})})
+
+        assert local.get("odds:nfl") == 1
+
+
+class TestSingleFlight:
+    """Test miss coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_async_calls_coalesced(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do_async("k", compute) for _ in range(10)))
+
+        assert results == ["value"] * 10
+        assert calls == 1
+        assert flight.stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_async_error_shared(self):
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flight.do_async("k", compute) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return 42
+
+        leader = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == 42
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flight.stats() == {"leaders": 1, "coalesced": 1, "in_flight": 0}
+
+    def test_threaded_calls_coalesced(self):
+        flight = SingleFlight()
+        calls = 0
+        results = []
+
+        def compute():
+            nonlocal calls
+            calls += 1
+            time.sleep(0.1)
+            return 42
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [42] * 5
+        assert calls == 1
+
+
+class TestCacheHealth:
+    """Test cache stats endpoint."""
+
+    def test_cache_stats_endpoint(self, client):
+        response = client.get("/health/cache")
+        assert response.status_code == 200
+        data = response.json()["cache"]
+        assert "hits" in data
+        assert "singleflight" in data
@@ -423,10 +423,10 @@ class TestSendWebhookMessage:
     @pytest.mark.asyncio
     async def test_send_webhook_message_success(self):
         """Test successful webhook message."""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('app.services.discord_bot.http_clients.post', new_callable=AsyncMock) as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 204
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_post.return_value = mock_response
 
             result = await send_webhook_message(
                 "https://discord.com/api/webhooks/123/abc",
@@ -438,10 +438,10 @@ class TestSendWebhookMessage:
     @pytest.mark.asyncio
     async def test_send_webhook_message_with_embeds(self):
         """Test sending webhook with embeds."""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('app.services.discord_bot.http_clients.post', new_callable=AsyncMock) as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_post.return_value = mock_response
 
             result = await send_webhook_message(
                 "https://discord.com/api/webhooks/123/abc",
@@ -453,11 +453,11 @@ class TestSendWebhookMessage:
     @pytest.mark.asyncio
     async def test_send_webhook_message_failure(self):
         """Test failed webhook message."""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('app.services.discord_bot.http_clients.post', new_callable=AsyncMock) as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 404
             mock_response.text = "Not Found"
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+            mock_post.return_value = mock_response
 
             result = await send_webhook_message(
                 "https://discord.com/api/webhooks/123/abc",
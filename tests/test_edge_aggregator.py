@@ -0,0 +1,207 @@
+"""
+Tests for unified edge aggregator service.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import joinedload
+
+from app.db import Game, Team, PublicBettingData, GameSituation, UnifiedPrediction
+from app.services import edge_aggregator
+from app.services.edge_aggregator import (
+    EDGE_WEIGHTS,
+    get_unified_prediction,
+    get_slate_predictions,
+    get_ranked_picks,
+    run_edge_factors,
+    get_factor_stats,
+)
+from tests.conftest import QueryCounter
+
+
+def make_slate(db, count):
+    games = []
+    for i in range(count):
+        home = Team(sport="NBA", name=f"Home {i}", rating=1500 + i * 20)
+        away = Team(sport="NBA", name=f"Away {i}", rating=1500)
+        db.add_all([home, away])
+        db.flush()
+        game = Game(
+            sport="NBA",
+            home_team_id=home.id,
+            away_team_id=away.id,
+            start_time=datetime.utcnow() + timedelta(hours=2 + i)
+        )
+        db.add(game)
+        db.flush()
+        # Stored situations keep the per-game path off the lazy loader
+        db.add(GameSituation(
+            game_id=game.id, sport="NBA", home_team=home.name, away_team=away.name,
+            game_date=game.start_time, total_situation_edge=1.0 if i % 2 else -1.0
+        ))
+        db.add(PublicBettingData(game_id=game.id, sport="NBA", spread_bet_pct_home=20 + i * 10))
+        games.append(game)
+    db.commit()
+    return games
+
+
+@pytest.fixture
+def game(db_session):
+    home = Team(sport="NFL", name="Home Team", short_name="HOM", rating=1600)
+    away = Team(sport="NFL", name="Away Team", short_name="AWY", rating=1500)
+    db_session.add_all([home, away])
+    db_session.flush()
+
+    game = Game(
+        sport="NFL",
+        home_team_id=home.id,
+        away_team_id=away.id,
+        start_time=datetime.utcnow() + timedelta(hours=5)
+    )
+    db_session.add(game)
+    db_session.flush()
+    db_session.add(PublicBettingData(
+        game_id=game.id,
+        sport="NFL",
+        spread_bet_pct_home=80
+    ))
+    db_session.commit()
+    return game
+
+
+class TestRunEdgeFactors:
+    """Test concurrent factor execution layer."""
+
+    @pytest.mark.asyncio
+    async def test_factors_returned_in_call_order(self, db_session):
+        """Factors and timings should be keyed in call order."""
+        async def factor_a(db):
+            return {"edge": 1.0, "direction": "home", "signal": "a", "weight": EDGE_WEIGHTS["weather"]}
+
+        async def factor_b(value, db):
+            return {"edge": value, "direction": "away", "signal": "b", "weight": EDGE_WEIGHTS["officials"]}
+
+        factors, timings = await run_edge_factors({
+            "weather": (factor_a, ()),
+            "officials": (factor_b, (2.5,)),
+        }, db_session)
+
+        assert list(factors) == ["weather", "officials"]
+        assert factors["officials"]["edge"] == 2.5
+        assert timings["weather"]["status"] == "ok"
+        assert timings["officials"]["latency_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_slow_factor_falls_back(self, db_session, monkeypatch):
+        """A factor over its timeout should return a neutral fallback."""
+        monkeypatch.setattr(edge_aggregator, "FACTOR_TIMEOUT_SECONDS", 0.05)
+
+        async def slow(db):
+            await asyncio.sleep(0.5)
+            return {"edge": 9.0, "direction": "home", "signal": "slow", "weight": 0.1}
+
+        async def fast(db):
+            return {"edge": 1.0, "direction": "home", "signal": "fast", "weight": 0.1}
+
+        factors, timings = await run_edge_factors({
+            "weather": (slow, ()),
+            "officials": (fast, ()),
+        }, db_session)
+
+        assert factors["weather"]["edge"] == 0.0
+        assert factors["weather"]["direction"] == "neutral"
+        assert timings["weather"]["status"] == "timeout"
+        assert timings["officials"]["status"] == "ok"
+        assert get_factor_stats()["weather"]["timeouts"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_failing_factor_falls_back(self, db_session):
+        """A factor that raises should not fail the prediction."""
+        async def broken(db):
+            raise RuntimeError("upstream down")
+
+        factors, timings = await run_edge_factors({"social_sentiment": (broken, ())}, db_session)
+
+        assert factors["social_sentiment"]["edge"] == 0.0
+        assert timings["social_sentiment"]["status"] == "error"
+
+
+class TestGetUnifiedPrediction:
+    """Test the full unified prediction."""
+
+    @pytest.mark.asyncio
+    async def test_prediction_uses_all_factors(self, db_session, game):
+        """Prediction should include every factor with timings."""
+        result = await get_unified_prediction(game.id, db_session)
+
+        assert set(result["factors"]) == set(EDGE_WEIGHTS)
+        assert set(result["factor_timings"]) == set(EDGE_WEIGHTS)
+        assert result["factors"]["public_fade"]["direction"] == "away"
+        assert result["factors"]["historical_elo"]["edge"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_missing_game(self, db_session):
+        """Unknown game should return an error."""
+        result = await get_unified_prediction(999999, db_session)
+        assert result == {"error": "Game not found"}
+
+
+class TestSlatePredictions:
+    """Test slate-level batch prediction pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_matches_per_game_predictions(self, db_session):
+        """Slate factors should equal the per-game factor results."""
+        games = make_slate(db_session, 4)
+
+        slate = await get_slate_predictions(games, db_session)
+
+        for game, result in zip(games, slate):
+            single = await get_unified_prediction(game.id, db_session)
+            assert result["factors"] == single["factors"]
+            assert result["prediction"] == single["prediction"]
+
+    @pytest.mark.asyncio
+    async def test_constant_query_count(self, db_session):
+        """Query count should not grow with the number of games."""
+        make_slate(db_session, 12)
+        engine = db_session.get_bind()
+
+        def load(count):
+            return db_session.query(Game).options(
+                joinedload(Game.home_team), joinedload(Game.away_team)
+            ).order_by(Game.id).limit(count).all()
+
+        small = load(2)
+        with QueryCounter(engine) as few:
+            await get_slate_predictions(small, db_session)
+        # Reload after the commit expired the session's objects
+        large = load(12)
+        with QueryCounter(engine) as many:
+            await get_slate_predictions(large, db_session)
+
+        assert many.count <= few.count + 2
+
+    @pytest.mark.asyncio
+    async def test_upserts_predictions(self, db_session):
+        """Running a slate twice should update rather than duplicate rows."""
+        games = make_slate(db_session, 3)
+
+        await get_slate_predictions(games, db_session)
+        await get_slate_predictions(games, db_session)
+
+        assert db_session.query(UnifiedPrediction).count() == 3
+
+    @pytest.mark.asyncio
+    async def test_ranked_picks(self, db_session):
+        """Ranked picks should be sorted by edge and ranked."""
+        make_slate(db_session, 5)
+
+        picks = await get_ranked_picks(db_session, sport="NBA", limit=3)
+
+        assert len(picks) == 3
+        assert [p["rank"] for p in picks] == [1, 2, 3]
+        edges = [p["edge_value"] for p in picks]
+        assert edges == sorted(edges, reverse=True)
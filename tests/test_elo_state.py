@@ -0,0 +1,143 @@
+"""
+Tests for checkpointed, incremental ELO rating state.
+"""
+
+import json
+import random
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Team, HistoricalGameResult, EloCheckpoint
+from app.models.advanced_elo import NBAAdvancedModel
+from app.models.rating_state import RatingState
+from tests.conftest import QueryCounter
+
+
+START = datetime(2025, 1, 1)
+
+
+def make_teams(db, count):
+    teams = [Team(sport="NBA", name=f"Team {i}") for i in range(count)]
+    db.add_all(teams)
+    db.flush()
+    return teams
+
+
+def add_results(db, teams, count, start, seed=3):
+    rng = random.Random(seed)
+    day = start
+    for _ in range(count):
+        home, away = rng.sample(teams, 2)
+        home_score, away_score = rng.randint(90, 125), rng.randint(90, 125)
+        winner = "home" if home_score > away_score else "away" if away_score > home_score else "draw"
+        db.add(HistoricalGameResult(
+            sport="NBA",
+            season="2024-25",
+            game_date=day,
+            home_team_id=home.id,
+            away_team_id=away.id,
+            home_score=home_score,
+            away_score=away_score,
+            winner=winner,
+            margin=home_score - away_score,
+        ))
+        day += timedelta(hours=rng.choice([0, 12, 24]))
+    db.commit()
+    return day
+
+
+class TestRatingState:
+    """Test the array-backed state."""
+
+    def test_round_trip(self):
+        state = RatingState(capacity=2)
+        for team_id in (7, 3, 9):
+            state.row(team_id)
+        state.ratings[state.row(3)] = 1612.5
+        state.games_played[state.row(3)] = 4
+        for result in "WWLDWLWWWLW":
+            state.record(state.row(3), result)
+
+        restored = RatingState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        assert restored.team_ids == [7, 3, 9]
+        assert restored.rating(3) == 1612.5
+        assert restored.rating(42) == 1500.0
+        assert restored.to_dict()["form"][1] == "WLDWLWWWLW"
+        assert restored.recent_form(3, 3).tolist() == [2, 0, 2]
+
+
+class TestIncrementalSync:
+    """Test checkpoints, the watermark and incremental updates."""
+
+    def test_incremental_matches_full_fit(self, db_session):
+        teams = make_teams(db_session, 8)
+        day = add_results(db_session, teams, 60, START)
+
+        model = NBAAdvancedModel()
+        assert model.sync(db_session) == 60
+
+        add_results(db_session, teams, 25, day + timedelta(days=1), seed=4)
+        assert model.sync(db_session) == 25
+
+        full = NBAAdvancedModel()
+        full.fit(db=db_session)
+
+        assert model.games_processed == full.games_processed == 85
+        assert model.team_ratings == pytest.approx(full.team_ratings)
+        assert model.team_form == full.team_form
+        assert model.get_form_factor(teams[0].id) == full.get_form_factor(teams[0].id)
+
+    def test_sync_only_reads_new_results(self, db_session):
+        teams = make_teams(db_session, 6)
+        day = add_results(db_session, teams, 40, START)
+        NBAAdvancedModel().sync(db_session)
+
+        add_results(db_session, teams, 5, day + timedelta(days=1), seed=5)
+        worker = NBAAdvancedModel()
+        assert worker.sync(db_session) == 5
+        assert worker.sync(db_session) == 0
+
+        checkpoint = db_session.query(EloCheckpoint).filter(EloCheckpoint.sport == "NBA").one()
+        last = db_session.query(HistoricalGameResult).order_by(
+            HistoricalGameResult.game_date.desc(), HistoricalGameResult.id.desc()
+        ).first()
+        assert checkpoint.games_processed == 45
+        assert checkpoint.last_game_id == last.id
+
+    def test_team_ratings_written_back(self, db_session):
+        teams = make_teams(db_session, 6)
+        add_results(db_session, teams, 30, START)
+
+        model = NBAAdvancedModel()
+        model.sync(db_session)
+
+        for team in teams:
+            db_session.refresh(team)
+            assert team.rating == pytest.approx(model.get_rating(team.id))
+
+    def test_write_back_query_count_is_constant(self, db_session):
+        bind = db_session.get_bind()
+
+        few = make_teams(db_session, 4)
+        add_results(db_session, few, 10, START)
+        with QueryCounter(bind) as small:
+            NBAAdvancedModel().fit(db=db_session)
+
+        db_session.query(HistoricalGameResult).delete()
+        many = make_teams(db_session, 30)
+        add_results(db_session, many, 200, START)
+        with QueryCounter(bind) as large:
+            NBAAdvancedModel().fit(db=db_session)
+
+        assert large.count == small.count
+
+    def test_checkpoint_with_other_parameters_is_ignored(self, db_session):
+        teams = make_teams(db_session, 4)
+        add_results(db_session, teams, 12, START)
+        NBAAdvancedModel().sync(db_session)
+
+        model = NBAAdvancedModel()
+        model.base_k_factor = 40.0
+        assert model.load_checkpoint(db_session) is False
+        assert model.sync(db_session) == 12
@@ -0,0 +1,98 @@
+"""
+Tests for the eager-loaded game slate used by the edge engine.
+"""
+
+import dataclasses
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.db import Game, Team, Market, Line
+from app.services.edge_engine import find_value_bets_for_sport
+from app.services.game_slate import load_slate, load_slates
+from tests.conftest import QueryCounter
+
+
+def make_games(db, count, sport="NBA", books=("DraftKings", "FanDuel")):
+    for i in range(count):
+        home = Team(sport=sport, name=f"Home {i}", rating=1600.0)
+        away = Team(sport=sport, name=f"Away {i}", rating=1500.0)
+        db.add_all([home, away])
+        db.flush()
+        game = Game(sport=sport, league=sport, home_team_id=home.id, away_team_id=away.id,
+                    start_time=datetime.utcnow() + timedelta(hours=i + 1))
+        db.add(game)
+        db.flush()
+        for selection in ("home", "away"):
+            market = Market(game_id=game.id, market_type="h2h", selection=selection)
+            db.add(market)
+            db.flush()
+            db.add_all([
+                Line(market_id=market.id, sportsbook=book, odds_type="american", american_odds=-110)
+                for book in books
+            ])
+    db.commit()
+
+
+class TestLoadSlate:
+    """Test loading and freezing of the slate."""
+
+    def test_graph_loaded(self, db_session):
+        make_games(db_session, 2)
+        make_games(db_session, 1, sport="NFL")
+
+        slate = load_slate(db_session, "NBA")
+
+        assert len(slate) == 2
+        game = slate.games[0]
+        assert game.home_team.name == "Home 0"
+        assert game.home_team.rating == 1600.0
+        assert {market.selection for market in game.markets} == {"home", "away"}
+        assert {line.sportsbook for line in game.markets[0].lines} == {"DraftKings", "FanDuel"}
+
+    def test_slate_is_immutable(self, db_session):
+        make_games(db_session, 1)
+        game = load_slate(db_session, "NBA").games[0]
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            game.markets = ()
+
+    def test_constant_query_count(self, db_session):
+        bind = db_session.get_bind()
+        make_games(db_session, 1)
+        with QueryCounter(bind) as few:
+            load_slates(db_session, ["NBA", "NFL"])
+
+        make_games(db_session, 5, books=("DraftKings", "FanDuel", "BetMGM"))
+        make_games(db_session, 3, sport="NFL")
+        db_session.expunge_all()
+        with QueryCounter(bind) as many:
+            slates = load_slates(db_session, ["NBA", "NFL"])
+
+        assert len(slates["NBA"]) == 6
+        assert len(slates["NFL"]) == 3
+        assert many.count == few.count
+
+    def test_every_sport_gets_a_slate(self, db_session):
+        assert len(load_slates(db_session, ["NHL"])["NHL"]) == 0
+
+
+class TestValueBetScan:
+    """Test the value-bet scan over a preloaded slate."""
+
+    def test_scan_reads_slate_without_queries(self, db_session):
+        make_games(db_session, 3)
+        slate = load_slate(db_session, "NBA")
+
+        model = MagicMock()
+        model.predict_game_probabilities.side_effect = lambda games: [
+            {"game_id": g["game_id"], "home_win": 0.6, "away_win": 0.4} for g in games
+        ]
+        with patch("app.services.edge_engine.SPORT_MODEL_REGISTRY", {"NBA": model}):
+            with QueryCounter(db_session.get_bind()) as counter:
+                bets = find_value_bets_for_sport("NBA", min_edge=0.02, db=db_session, slate=slate)
+
+        assert counter.count == 0
+        assert len(bets) == 3
+        assert {bet.selection for bet in bets} == {"home"}
+        assert bets[0].home_team_name.startswith("Home")
@@ -0,0 +1,147 @@
+"""
+Tests for the shared outbound HTTP client registry.
+"""
+
+import asyncio
+import httpx
+import pytest
+
+from app.utils import http_client
+from app.utils.http_client import HttpClientRegistry, ProviderConfig, backoff_delay
+
+
+def make_registry(handler, **config):
+    transport = httpx.MockTransport(handler)
+    return HttpClientRegistry({"test": ProviderConfig(transport=transport, **config)})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+
+class TestHttpClientRegistry:
+    """Test pooled clients, retries and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused(self):
+        registry = make_registry(lambda request: httpx.Response(200))
+
+        assert registry.client("test") is registry.client("test")
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_status(self):
+        """GETs are retried on 503 until they succeed."""
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(503 if len(calls) < 3 else 200, json={"ok": True})
+
+        registry = make_registry(handler, max_retries=2)
+        response = await registry.get("test", "https://api.example.com/odds")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        metrics = registry.stats()["providers"]["test"]
+        assert metrics["retries"] == 2
+        assert metrics["statuses"] == {503: 2, 200: 1}
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        registry = make_registry(lambda request: httpx.Response(429), max_retries=1)
+
+        response = await registry.get("test", "https://api.example.com/odds")
+
+        assert response.status_code == 429
+        assert registry.metrics("test").requests == 2
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_on_status(self):
+        """A POST that reached the server should not be replayed."""
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(503)
+
+        registry = make_registry(handler, max_retries=2)
+        response = await registry.post("test", "https://hooks.example.com/x", json={})
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_transport_error_raised_and_recorded(self):
+        def handler(request):
+            raise httpx.ReadTimeout("slow", request=request)
+
+        registry = make_registry(handler, max_retries=1)
+
+        with pytest.raises(httpx.ReadTimeout):
+            await registry.get("test", "https://api.example.com/odds")
+
+        metrics = registry.stats()["providers"]["test"]
+        assert metrics["errors"] == 2
+        assert metrics["timeouts"] == 2
+        assert "ReadTimeout" in metrics["last_error"]
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_host_concurrency_capped(self):
+        """No more than host_concurrency requests should be in flight per host."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        registry = make_registry(handler, host_concurrency=2)
+        await asyncio.gather(*(registry.get("test", "https://api.example.com/x") for _ in range(8)))
+
+        assert peak == 2
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_quota_headers_recorded(self):
+        """Configured quota headers should be kept from the latest response."""
+        registry = make_registry(
+            lambda request: httpx.Response(200, headers={"x-requests-remaining": "480"}),
+            quota_headers=("x-requests-remaining", "x-requests-used"),
+        )
+
+        await registry.get("test", "https://api.example.com/odds")
+
+        assert registry.metrics("test").quota == {"x-requests-remaining": "480"}
+        await registry.aclose()
+
+
+class TestBackoffDelay:
+    """Test retry delay calculation."""
+
+    def test_jitter_bounded(self):
+        for attempt in range(1, 6):
+            delay = backoff_delay(attempt)
+            assert 0 <= delay <= http_client.HTTP_BACKOFF_MAX
+
+    def test_retry_after_honoured_and_capped(self):
+        assert backoff_delay(1, "2") == 2.0
+        assert backoff_delay(1, "600") == http_client.HTTP_BACKOFF_MAX
+
+
+class TestHttpHealth:
+    """Test outbound HTTP stats endpoint."""
+
+    def test_http_stats_endpoint(self, client):
+        response = client.get("/health/http")
+        assert response.status_code == 200
+        assert "providers" in response.json()["http"]
@@ -0,0 +1,149 @@
+"""
+Tests for the incremental line movement engine and last-line state.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Team, LineMovement, LineMovementSummary
+from app.services.line_movement import MovementEngine
+from app.services.line_state import LineStateStore
+from tests.conftest import QueryCounter
+
+
+@pytest.fixture
+def games(db_session):
+    made = []
+    for i in range(3):
+        home = Team(sport="NFL", name=f"Home {i}")
+        away = Team(sport="NFL", name=f"Away {i}")
+        db_session.add_all([home, away])
+        db_session.flush()
+        game = Game(sport="NFL", home_team_id=home.id, away_team_id=away.id,
+                    start_time=datetime.utcnow() + timedelta(days=1))
+        db_session.add(game)
+        made.append(game)
+    db_session.commit()
+    return made
+
+
+def snap(game_id, book, line, odds=-110, market_type="spread", recorded_at=None):
+    return {"game_id": game_id, "sport": "NFL", "sportsbook": book, "market_type": market_type,
+            "line_value": line, "odds": odds, "recorded_at": recorded_at}
+
+
+class TestLineStateStore:
+    """Test staging and loading of last-known state."""
+
+    def test_staged_values_visible_until_rollback(self, db_session):
+        loads = []
+        store = LineStateStore("test", lambda db, ids: loads.append(set(ids)) or {})
+
+        store.stage({(1, "spread", "A"): [-3.0, -110]})
+        assert store.get_many(db_session, [(1, "spread", "A")]) == {(1, "spread", "A"): [-3.0, -110]}
+
+        store.rollback()
+        assert store.get_many(db_session, [(1, "spread", "A")]) == {}
+        assert loads == [{1}]
+
+    def test_games_loaded_once(self, db_session):
+        loads = []
+
+        def loader(db, game_ids):
+            loads.append(set(game_ids))
+            return {(game_id, "spread", "A"): [1.0, -110] for game_id in game_ids}
+
+        store = LineStateStore("test", loader)
+        assert store.get_many(db_session, [(1, "spread", "A"), (2, "spread", "B")]) == {
+            (1, "spread", "A"): [1.0, -110]
+        }
+        store.get_many(db_session, [(1, "spread", "B"), (2, "spread", "A")])
+
+        assert loads == [{1, 2}]
+
+    def test_retain_drops_other_games(self, db_session):
+        loads = []
+
+        def loader(db, game_ids):
+            loads.append(set(game_ids))
+            return {(game_id, "spread", "A"): [1.0, -110] for game_id in game_ids}
+
+        store = LineStateStore("test", loader)
+        store.get_many(db_session, [(1, "spread", "A"), (2, "spread", "A")])
+
+        assert store.retain_games([2]) == 1
+        assert store.stats()["keys"] == 1
+        # A dropped game is loaded again if it comes back
+        assert store.get_many(db_session, [(1, "spread", "A")]) == {(1, "spread", "A"): [1.0, -110]}
+        assert loads == [{1, 2}, {1}]
+
+
+class TestMovementEngine:
+    """Test incremental movement, summary and steam tracking."""
+
+    def test_movement_from_previous_line(self, db_session, games):
+        engine = MovementEngine()
+        game_id = games[0].id
+
+        first = engine.record(db_session, [snap(game_id, "DraftKings", -3.0)])
+        second = engine.record(db_session, [snap(game_id, "DraftKings", -3.5, odds=-105)])
+
+        assert first[0]["previous_line"] is None
+        assert second[0]["previous_line"] == -3.0
+        assert second[0]["previous_odds"] == -110
+        assert second[0]["direction"] == "toward_favorite"
+        assert db_session.query(LineMovement).count() == 2
+
+        summary = db_session.query(LineMovementSummary).one()
+        assert summary.opening_line == -3.0
+        assert summary.current_line == -3.5
+        assert summary.current_odds == -105
+
+    def test_warmed_state_matches_database(self, db_session, games):
+        game_id = games[0].id
+        MovementEngine().record(db_session, [snap(game_id, "DraftKings", 44.5, market_type="total")])
+
+        # A new engine (another worker or a restart) picks up the last line from the database
+        movements = MovementEngine().record(
+            db_session, [snap(game_id, "DraftKings", 45.5, market_type="total")]
+        )
+
+        assert movements[0]["previous_line"] == 44.5
+        assert movements[0]["direction"] == "toward_over"
+        assert db_session.query(LineMovementSummary).count() == 1
+        assert db_session.query(LineMovementSummary).one().total_movement == 1.0
+
+    def test_steam_and_sharp_origin(self, db_session, games):
+        engine = MovementEngine()
+        game_id = games[0].id
+        start = datetime.utcnow() - timedelta(minutes=5)
+        books = ["Pinnacle", "DraftKings", "FanDuel"]
+
+        engine.record(db_session, [snap(game_id, book, -3.0, recorded_at=start) for book in books])
+        engine.record(db_session, [
+            snap(game_id, book, -5.0, recorded_at=start + timedelta(minutes=i + 1))
+            for i, book in enumerate(books)
+        ])
+
+        summary = db_session.query(LineMovementSummary).one()
+        assert summary.steam_move_detected
+        assert summary.sharp_book_originated
+        assert summary.first_move_book == "pinnacle"
+        assert summary.movement_direction == "toward_favorite"
+
+    def test_constant_query_count(self, db_session, games):
+        """Round trips per batch should not grow with the number of snapshots."""
+        engine = MovementEngine()
+        bind = db_session.get_bind()
+        engine.record(db_session, [snap(g.id, "DraftKings", -3.0) for g in games])
+
+        game_ids = [g.id for g in games]
+        one = [snap(game_ids[0], "DraftKings", -3.5)]
+        several = [snap(game_id, book, -4.0) for game_id in game_ids for book in ("DraftKings", "FanDuel")]
+
+        with QueryCounter(bind) as few:
+            engine.record(db_session, one)
+        with QueryCounter(bind) as many:
+            engine.record(db_session, several)
+
+        assert many.count == few.count
@@ -0,0 +1,109 @@
+"""
+Tests for middles and cross-line arbitrage over spread and total ladders.
+"""
+
+import random
+
+from app.services.arbitrage import calculate_arb_margin
+from app.services.middles import find_middles, pair_value, sweep_pairs
+from tests.test_price_index import make_index, quote
+
+
+class TestPairValue:
+    """Test payout profiles of low/high pairs."""
+
+    def test_same_point_is_plain_arb(self):
+        floor, p_middle, expected, stakes = pair_value(105, 105, 44.5, 44.5, 44.5, 10.0)
+
+        assert p_middle == 0.0
+        assert floor > 0
+        assert expected == floor
+        assert round(sum(stakes), 6) == 100
+
+    def test_middle_adds_value(self):
+        floor, p_middle, expected, _ = pair_value(-110, -110, 44.5, 46.5, 45.5, 10.0)
+
+        # Totals of 45 and 46 win both legs
+        assert floor < 0
+        assert 0 < p_middle < 0.1
+        assert expected > floor
+
+    def test_whole_number_push(self):
+        _, p_middle, expected, _ = pair_value(100, 100, -3.5, -3.0, -3.0, 13.5)
+
+        # No whole number between -3.5 and -3; landing on -3 refunds one leg
+        assert p_middle == 0.0
+        assert expected > 0
+
+
+class TestSweep:
+    """Test the ladder sweep against an all-pairs comparison."""
+
+    def test_matches_all_pairs(self):
+        rng = random.Random(7)
+        low = sorted((rng.randint(80, 100) / 2, rng.choice([-120, -110, -105, 100, 105]), f"L{i}") for i in range(25))
+        high = sorted((rng.randint(80, 100) / 2, rng.choice([-120, -110, -105, 100, 105]), f"H{i}") for i in range(25))
+
+        found = {(p["lo"], p["low"], p["hi"], p["high"]) for p in sweep_pairs(low, high, 45.0, 10.0, max_width=3)}
+
+        expected = set()
+        for lo, odds1, book1 in low:
+            for hi, odds2, book2 in high:
+                if hi < lo or hi - lo > 3:
+                    continue
+                _, _, value, _ = pair_value(odds1, odds2, lo, hi, 45.0, 10.0)
+                if calculate_arb_margin([odds1, odds2]) < 0 or (hi > lo and value > 0):
+                    expected.add((lo, (odds1, book1), hi, (odds2, book2)))
+        assert expected == {pair for pair in found if pair[2] - pair[0] <= 3}
+
+    def test_wide_arb_kept_by_best_price(self):
+        low = [(40.5, 110, "A"), (41.5, -200, "B")]
+        high = [(50.5, 105, "C")]
+
+        pairs = sweep_pairs(low, high, 45.0, 10.0, max_width=5)
+
+        assert [(p["low"], p["is_arb"]) for p in pairs] == [((110, "A"), True)]
+
+
+class TestFindMiddles:
+    """Test scanning the best-price index."""
+
+    def test_cross_line_total_arb(self):
+        index = make_index([
+            quote("A", "Over", 105, 44.5, "totals"), quote("A", "Under", -125, 44.5, "totals"),
+            quote("B", "Over", -125, 45.5, "totals"), quote("B", "Under", 105, 45.5, "totals"),
+        ])
+
+        middles = find_middles(index)
+
+        arb = middles[0]
+        assert arb.is_arb
+        assert (arb.bet1_selection, arb.bet1_sportsbook) == ("Over 44.5", "A")
+        assert (arb.bet2_selection, arb.bet2_sportsbook) == ("Under 45.5", "B")
+        assert arb.middle_width == 1.0
+        assert arb.middle_probability > 0
+        assert arb.stakes["is_arb"]
+        assert arb.expected_value > arb.floor_return > 0
+
+    def test_spread_middle_with_alternate_line(self):
+        index = make_index([
+            quote("A", "Home", -110, -3.0, "spreads"), quote("A", "Away", -110, 3.0, "spreads"),
+            quote("B", "Away", -105, 7.5, "alternate_spreads"),
+        ])
+
+        middles = find_middles(index)
+
+        assert len(middles) >= 1
+        best = middles[0]
+        assert not best.is_arb
+        assert {best.bet1_selection, best.bet2_selection} == {"Away +7.5", "Home -3.0"}
+        assert best.middle_width == 4.5
+        assert best.expected_value > 0
+
+    def test_no_gap_pairs(self):
+        index = make_index([
+            quote("A", "Over", -110, 46.5, "totals"),
+            quote("B", "Under", -110, 44.5, "totals"),
+        ])
+
+        assert find_middles(index) == []
@@ -0,0 +1,150 @@
+"""
+Tests for neural ensemble model artifacts, hot swaps and A/B splits.
+"""
+
+import json
+import os
+import pytest
+import numpy as np
+
+from app.services import neural_ensemble
+from app.services.neural_ensemble import (
+    ArtifactError,
+    ModelManager,
+    NeuralEnsemble,
+    MANIFEST_NAME,
+)
+
+
+GAME = {
+    "sport": "NFL",
+    "home_team_stats": {"elo_rating": 1620, "recent_win_pct": 0.7},
+    "away_team_stats": {"elo_rating": 1540, "recent_win_pct": 0.4},
+    "game_context": {"home_rest_days": 7},
+    "factor_scores": {"line_movement": 60},
+    "home_game_history": [{"won": True, "margin": 7}],
+    "away_game_history": [{"won": False, "margin": -3}],
+}
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    """Empty MODEL_DIR and fresh ModelManager state."""
+    monkeypatch.setattr(neural_ensemble, "MODEL_DIR", tmp_path)
+    monkeypatch.setattr(neural_ensemble, "MODEL_RELOAD_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(ModelManager, "_active_model", None)
+    monkeypatch.setattr(ModelManager, "_active_id", None)
+    monkeypatch.setattr(ModelManager, "_loaded", {})
+    monkeypatch.setattr(ModelManager, "_split", {})
+    monkeypatch.setattr(ModelManager, "_pointer_mtime", None)
+    monkeypatch.setattr(ModelManager, "_checked_at", 0.0)
+    return tmp_path
+
+
+def saved_model(version):
+    model = NeuralEnsemble()
+    model.version = version
+    model.accuracy_history = [0.55, 0.58]
+    return model, os.path.basename(model.save())
+
+
+class TestArtifact:
+    """Tests for saving and loading artifacts."""
+
+    def test_round_trip(self, model_dir):
+        model, model_id = saved_model("2.0.0")
+
+        loaded = NeuralEnsemble.load(str(model_dir / model_id))
+
+        assert loaded.version == "2.0.0"
+        assert loaded.accuracy_history == [0.55, 0.58]
+        assert loaded.config == model.config
+        assert loaded.predict(**GAME)["prediction"] == pytest.approx(model.predict(**GAME)["prediction"])
+
+    def test_weights_are_read_only_memory_maps(self, model_dir):
+        _, model_id = saved_model("2.0.0")
+
+        loaded = NeuralEnsemble.load(str(model_dir / model_id))
+
+        weights = loaded.feedforward.layers[0].weights
+        assert isinstance(weights, np.memmap)
+        assert not weights.flags.writeable
+        assert isinstance(loaded.lstm.lstm_cell.Wf, np.memmap)
+
+    def test_manifest_lists_every_array(self, model_dir):
+        model, model_id = saved_model("2.0.0")
+
+        with open(model_dir / model_id / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+
+        assert set(manifest["arrays"]) == set(model._named_arrays())
+        assert all(len(spec["sha256"]) == 64 for spec in manifest["arrays"].values())
+        assert not list(model_dir.glob(".*.tmp"))
+
+    def test_checksum_mismatch(self, model_dir):
+        _, model_id = saved_model("2.0.0")
+        path = model_dir / model_id / "lstm.Wf.npy"
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(ArtifactError):
+            NeuralEnsemble.load(str(model_dir / model_id))
+
+    def test_missing_manifest(self, model_dir):
+        with pytest.raises(ArtifactError):
+            NeuralEnsemble.load(str(model_dir))
+
+
+class TestModelManagerArtifacts:
+    """Tests for loading, hot swaps and A/B splits."""
+
+    def test_loads_latest_artifact(self, model_dir):
+        saved_model("1.0.0")
+        _, latest = saved_model("1.1.0")
+
+        assert ModelManager.get_active_model().version == "1.1.0"
+        assert ModelManager.list_artifacts()[0]["id"] == latest
+
+    def test_activate_swaps_other_workers(self, model_dir):
+        _, first = saved_model("1.0.0")
+        _, second = saved_model("1.1.0")
+        ModelManager.activate(first)
+        assert ModelManager.get_active_model().version == "1.0.0"
+
+        # Another worker activates the second model
+        pointer = model_dir / "active.json"
+        pointer.write_text(json.dumps({"active": second, "split": {}}))
+        stat = pointer.stat()
+        os.utime(pointer, (stat.st_atime, stat.st_mtime + 10))
+
+        assert ModelManager.get_active_model().version == "1.1.0"
+
+    def test_unknown_artifact(self, model_dir):
+        with pytest.raises(ArtifactError):
+            ModelManager.activate("ensemble_missing")
+        with pytest.raises(ArtifactError):
+            ModelManager.activate("../trained")
+
+    def test_ab_split_is_sticky_and_weighted(self, model_dir):
+        _, control = saved_model("1.0.0")
+        _, candidate = saved_model("1.1.0")
+        ModelManager.activate(control)
+
+        assert ModelManager.set_ab_split({control: 3, candidate: 1}) == {control: 0.75, candidate: 0.25}
+
+        versions = [ModelManager.get_model(f"user-{i}").version for i in range(2000)]
+        assert 0.2 < versions.count("1.1.0") / len(versions) < 0.3
+        assert ModelManager.get_model("user-7").version == versions[7]
+        assert ModelManager.get_model().version == "1.0.0"
+
+        ModelManager.set_ab_split({})
+        assert ModelManager.get_model("user-7").version == "1.0.0"
+
+    def test_invalid_split(self, model_dir):
+        _, model_id = saved_model("1.0.0")
+
+        with pytest.raises(ValueError):
+            ModelManager.set_ab_split({model_id: -1})
+        with pytest.raises(ArtifactError):
+            ModelManager.set_ab_split({"ensemble_missing": 1})
@@ -11,9 +11,12 @@ from app.services.monte_carlo import (
     calculate_bet_size,
     simulate_single_bet,
     run_simulation,
+    simulate_batch,
     run_monte_carlo,
     calculate_risk_of_ruin,
     compare_strategies,
+    compare_strategies_parallel,
+    PartialStats,
     create_bet_scenarios_from_edge,
     analyze_variance,
     calculate_skewness,
@@ -311,6 +314,121 @@ class TestRunSimulation:
         assert result.peak_drawdown >= 0
 
 
+class TestSimulateBatch:
+    """Test vectorized batch simulation engine."""
+
+    def test_batch_shapes(self):
+        """Batch should return one entry per simulation."""
+        scenarios = [BetScenario(probability=0.55, odds=-110, edge=0.03)]
+        batch = simulate_batch(
+            starting_bankroll=10000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.HALF_KELLY,
+            num_bets=40,
+            num_simulations=250,
+            track_trajectories=10,
+            seed=7
+        )
+
+        assert batch.final_bankrolls.shape == (250,)
+        assert batch.trajectories.shape == (10, 41)
+        assert (batch.trajectories[:, 0] == 10000).all()
+        assert (batch.total_bets <= 40).all()
+
+    def test_seed_reproducible(self):
+        """Same seed should give identical results."""
+        scenarios = [
+            BetScenario(probability=0.55, odds=-110, edge=0.03),
+            BetScenario(probability=0.42, odds=150, edge=0.02),
+        ]
+        kwargs = dict(
+            starting_bankroll=10000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.KELLY,
+            num_bets=100,
+            num_simulations=200,
+            seed=42
+        )
+
+        assert run_monte_carlo(**kwargs) == run_monte_carlo(**kwargs)
+        assert analyze_variance(**kwargs) == analyze_variance(**kwargs)
+
+    def test_chunked_matches_single_batch_size(self, monkeypatch):
+        """Chunking large runs should not change per-simulation shapes."""
+        import app.services.monte_carlo as mc
+
+        monkeypatch.setattr(mc, "MAX_BATCH_CELLS", 500)
+        scenarios = [BetScenario(probability=0.55, odds=-110, edge=0.03)]
+        batch = simulate_batch(
+            starting_bankroll=1000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.FLAT,
+            num_bets=100,
+            num_simulations=33,
+            track_trajectories=12,
+            seed=1
+        )
+
+        assert batch.final_bankrolls.shape == (33,)
+        assert batch.trajectories.shape == (12, 101)
+
+    def test_bust_freezes_path(self):
+        """Busted simulations stop betting and fill trajectory with threshold."""
+        scenarios = [BetScenario(probability=0.0, odds=-110, edge=0.0)]
+        batch = simulate_batch(
+            starting_bankroll=1000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.PERCENTAGE,
+            num_bets=50,
+            num_simulations=20,
+            unit_size=0.1,
+            max_bet_pct=0.1,
+            bust_threshold=800,
+            seed=3
+        )
+
+        # 1000 -> 900 -> 810 -> 729 (bust on third loss)
+        assert batch.went_bust.all()
+        assert (batch.losses == 3).all()
+        assert (batch.wins == 0).all()
+        assert batch.final_bankrolls[0] == pytest.approx(729)
+        assert (batch.trajectories[:, 4:] == 800).all()
+
+    def test_martingale_doubles_after_losses(self):
+        """Martingale stakes double along a losing streak."""
+        scenarios = [BetScenario(probability=0.0, odds=100, edge=0.0)]
+        batch = simulate_batch(
+            starting_bankroll=1000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.MARTINGALE,
+            num_bets=3,
+            num_simulations=5,
+            unit_size=0.01,
+            max_bet_pct=1.0,
+            track_trajectories=1,
+            seed=0
+        )
+
+        # Stakes of 1%, 2% and 4% of the current bankroll
+        expected = [1000, 990, 990 * 0.98, 990 * 0.98 * 0.96]
+        assert batch.trajectories[0] == pytest.approx(expected)
+
+    def test_no_edge_kelly_places_no_bets(self):
+        """Kelly sizing with no edge never bets."""
+        scenarios = [BetScenario(probability=0.40, odds=-110, edge=0.0)]
+        batch = simulate_batch(
+            starting_bankroll=1000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.KELLY,
+            num_bets=25,
+            num_simulations=10,
+            seed=5
+        )
+
+        assert (batch.total_bets == 0).all()
+        assert (batch.final_bankrolls == 1000).all()
+
+
 class TestRunMonteCarlo:
     """Test full Monte Carlo simulation."""
 
@@ -504,6 +622,77 @@ class TestCompareStrategies:
         assert "median_final" in comparison
 
 
+class TestParallelComparison:
+    """Test chunked, process-pool strategy comparison."""
+
+    def test_partial_stats_merge_matches_whole(self):
+        """Merging chunk statistics should equal stats over the full batch."""
+        scenarios = [BetScenario(probability=0.55, odds=-110, edge=0.03)]
+        batch = simulate_batch(
+            starting_bankroll=1000,
+            bet_scenarios=scenarios,
+            strategy=BetSizingStrategy.HALF_KELLY,
+            num_bets=30,
+            num_simulations=300,
+            track_trajectories=20,
+            seed=11
+        )
+        whole = PartialStats.from_batch(batch, 1000)
+
+        def part(lo, hi, tlo, thi):
+            from app.services.monte_carlo import BatchSimulationResult
+            return PartialStats.from_batch(BatchSimulationResult(
+                final_bankrolls=batch.final_bankrolls[lo:hi],
+                max_bankrolls=batch.max_bankrolls[lo:hi],
+                min_bankrolls=batch.min_bankrolls[lo:hi],
+                peak_drawdowns=batch.peak_drawdowns[lo:hi],
+                wins=batch.wins[lo:hi],
+                losses=batch.losses[lo:hi],
+                went_bust=batch.went_bust[lo:hi],
+                trajectories=batch.trajectories[tlo:thi],
+            ), 1000)
+
+        merged = part(0, 120, 0, 20).merge(part(120, 300, 20, 20))
+
+        assert merged.count == whole.count
+        assert merged.profitable == whole.profitable
+        assert merged.mean_final == pytest.approx(whole.mean_final)
+        assert merged.std_dev == pytest.approx(whole.std_dev)
+        assert merged.drawdown_sum == pytest.approx(whole.drawdown_sum)
+        assert sorted(merged.finals) == sorted(whole.finals)
+        assert merged.average_trajectory == whole.average_trajectory
+
+    @pytest.mark.asyncio
+    async def test_parallel_matches_sequential(self):
+        """Process-pool comparison should equal the in-process result for a seed."""
+        scenarios = [BetScenario(probability=0.55, odds=-110, edge=0.03)]
+        kwargs = dict(
+            starting_bankroll=10000,
+            bet_scenarios=scenarios,
+            num_bets=50,
+            num_simulations=600,
+            seed=9
+        )
+
+        parallel = await compare_strategies_parallel(**kwargs)
+        assert parallel == compare_strategies(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_time_budget_exceeded(self):
+        """Comparison should raise when the time budget is exceeded."""
+        import asyncio
+
+        scenarios = [BetScenario(probability=0.55, odds=-110, edge=0.03)]
+        with pytest.raises(asyncio.TimeoutError):
+            await compare_strategies_parallel(
+                starting_bankroll=10000,
+                bet_scenarios=scenarios,
+                num_bets=5000,
+                num_simulations=5000,
+                timeout=0.001
+            )
+
+
 class TestCreateBetScenariosFromEdge:
     """Test bet scenario generation."""
 
@@ -27,7 +27,9 @@ from app.services.neural_ensemble import (
     NeuralLayer,
     LSTMCell,
     predict_game,
+    predict_games,
     get_model_comparison,
+    get_model_comparisons,
     train_ensemble,
 )
 
@@ -530,6 +532,100 @@ class TestNeuralEnsemble:
         assert "elo" in result["components"]
 
 
+class TestBatchInference:
+    """Tests for batched slate inference."""
+
+    def _games(self, count, sample_home_stats, sample_away_stats, sample_game_context,
+               sample_factor_scores, sample_game_history):
+        return [
+            {
+                "sport": "SOCCER" if i % 3 == 0 else "NFL",
+                "home_team_stats": {**sample_home_stats, "elo_rating": 1400 + 25 * i,
+                                    "sport": "SOCCER" if i % 3 == 0 else "NFL"},
+                "away_team_stats": sample_away_stats,
+                "game_context": sample_game_context,
+                "factor_scores": sample_factor_scores,
+                "home_game_history": sample_game_history[:i % 6],
+                "away_game_history": sample_game_history[::-1],
+            }
+            for i in range(count)
+        ]
+
+    def test_batch_matches_single_predictions(
+        self,
+        sample_home_stats,
+        sample_away_stats,
+        sample_game_context,
+        sample_factor_scores,
+        sample_game_history
+    ):
+        """Test each batch row equals the per-game prediction."""
+        ensemble = NeuralEnsemble()
+        games = self._games(12, sample_home_stats, sample_away_stats, sample_game_context,
+                            sample_factor_scores, sample_game_history)
+
+        batch = ensemble.predict_batch(games)
+
+        assert len(batch) == len(games)
+        for game, result in zip(games, batch):
+            single = ensemble.predict(**game)
+            for key in ("home_win", "away_win", "draw"):
+                assert result["prediction"][key] == pytest.approx(single["prediction"][key], abs=1e-6)
+                for component in ("feedforward", "lstm", "elo"):
+                    assert result["components"][component][key] == pytest.approx(
+                        single["components"][component][key], abs=1e-6
+                    )
+            assert result["confidence"] == pytest.approx(single["confidence"], abs=1e-6)
+            assert result["recommended_side"] == single["recommended_side"]
+
+    def test_empty_batch(self):
+        """Test an empty slate returns no predictions."""
+        assert NeuralEnsemble().predict_batch([]) == []
+
+    def test_sequence_batch_matches_single(self, sample_game_history):
+        """Test batched sequence extraction pads like the single-team path."""
+        histories = [[], sample_game_history, sample_game_history * 3]
+
+        batch = FeatureEngineering.extract_sequence_batch(histories, 10)
+
+        assert batch.shape == (3, 10, 8)
+        for row, history in enumerate(histories):
+            np.testing.assert_array_equal(batch[row], FeatureEngineering.extract_sequence_features(history, 10))
+
+    def test_fused_lstm_matches_stepwise_cell(self):
+        """Test the fused sequence pass equals stepping the cell."""
+        cell = LSTMCell(input_size=8, hidden_size=16)
+        sequence = np.random.rand(5, 10, 8).astype(np.float32)
+
+        h = np.zeros((5, 16), dtype=np.float32)
+        c = np.zeros((5, 16), dtype=np.float32)
+        for t in range(10):
+            h, c = cell.forward(sequence[:, t], h, c)
+
+        np.testing.assert_allclose(cell.forward_sequence(sequence), h, atol=1e-5)
+
+    def test_predict_games_and_comparisons(self, sample_home_stats, sample_away_stats,
+                                           sample_game_context, sample_factor_scores):
+        """Test the slate convenience functions."""
+        games = [
+            {
+                "sport": "NBA",
+                "home_stats": sample_home_stats,
+                "away_stats": sample_away_stats,
+                "game_context": sample_game_context,
+                "factor_scores": sample_factor_scores,
+            }
+            for _ in range(3)
+        ]
+
+        predictions = predict_games(games)
+        comparisons = get_model_comparisons(games)
+
+        assert len(predictions) == len(comparisons) == 3
+        assert comparisons[0]["model_agreement"] in ("unanimous", "majority", "split")
+        assert comparisons[0]["ensemble"] == pytest.approx(predictions[0]["prediction"])
+
+
 # =============================================================================
 # Model Manager Tests
 # =============================================================================
@@ -691,6 +787,18 @@ class TestNeuralEnsembleRouter:
         assert "comparison" in data
         assert "analysis" in data
 
+    def test_predict_batch_endpoint(self, auth_headers):
+        """Test batch predict endpoint."""
+        games = [
+            {"sport": "NFL", "home_team": f"Home {i}", "away_team": f"Away {i}", "home_elo": 1500 + 20 * i}
+            for i in range(4)
+        ]
+        response = client.post("/neural/predict/batch", json=games, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 4
+        assert [p["game"]["home_team"] for p in data["predictions"]] == [g["home_team"] for g in games]
+
     def test_features_static_endpoint(self):
         """Test static features info endpoint."""
         response = client.get("/neural/features/static")
@@ -0,0 +1,196 @@
+"""
+Tests for the neural ensemble backpropagation trainer.
+"""
+
+import time
+import pytest
+import numpy as np
+
+from app.services import neural_training
+from app.services.neural_ensemble import (
+    LSTMCell,
+    ModelConfig,
+    ModelManager,
+    NeuralEnsemble,
+    NeuralLayer,
+    train_ensemble,
+)
+from app.services.neural_training import (
+    AdamOptimizer,
+    build_tensors,
+    evaluate,
+    fit,
+    get_training_job,
+    start_training,
+)
+
+
+def synthetic_games(count, seed=0):
+    """Games whose outcome follows the ELO gap, so the networks can learn it."""
+    rng = np.random.default_rng(seed)
+    games = []
+    for _ in range(count):
+        home_elo, away_elo = rng.normal(1500, 120, size=2)
+        home_won = rng.random() < 1 / (1 + 10 ** ((away_elo - home_elo) / 200))
+        history = [{"won": bool(rng.random() < 0.5), "margin": int(rng.integers(-10, 10))} for _ in range(5)]
+        games.append({
+            "sport": "NBA",
+            "home_team_stats": {"elo_rating": float(home_elo)},
+            "away_team_stats": {"elo_rating": float(away_elo)},
+            "game_context": {},
+            "factor_scores": {},
+            "home_game_history": history,
+            "away_game_history": history[::-1],
+            "outcome": "home" if home_won else "away",
+        })
+    return games
+
+
+def numeric_gradient(loss, param, eps=1e-2):
+    grad = np.zeros_like(param, dtype=np.float64)
+    for index in np.ndindex(param.shape):
+        original = param[index]
+        param[index] = original + eps
+        plus = loss()
+        param[index] = original - eps
+        minus = loss()
+        param[index] = original
+        grad[index] = (plus - minus) / (2 * eps)
+    return grad
+
+
+class TestBackwardKernels:
+    """Gradient checks against finite differences."""
+
+    def test_dense_layer_gradients(self):
+        np.random.seed(1)
+        layer = NeuralLayer(5, 4, activation="tanh")
+        x = np.random.randn(6, 5).astype(np.float32)
+        r = np.random.randn(6, 4).astype(np.float32)
+
+        def loss():
+            return float(np.sum(layer.forward(x) * r))
+
+        loss()
+        grad_x, grads = layer.backward(r)
+
+        np.testing.assert_allclose(grads["weights"], numeric_gradient(loss, layer.weights), rtol=1e-2, atol=1e-2)
+        np.testing.assert_allclose(grads["biases"], numeric_gradient(loss, layer.biases), rtol=1e-2, atol=1e-2)
+        assert grad_x.shape == x.shape
+
+    def test_lstm_bptt_gradients(self):
+        np.random.seed(2)
+        cell = LSTMCell(input_size=3, hidden_size=4)
+        sequence = np.random.randn(2, 5, 3).astype(np.float32)
+        r = np.random.randn(2, 4).astype(np.float32)
+
+        def loss():
+            return float(np.sum(cell.forward_sequence(sequence) * r))
+
+        cell.forward_sequence(sequence, training=True)
+        grads = cell.backward_sequence(r)
+
+        for name in ("Wf", "Wi", "Wc", "Wo", "bf", "bi", "bc", "bo"):
+            np.testing.assert_allclose(
+                grads[name], numeric_gradient(loss, getattr(cell, name)), rtol=2e-2, atol=2e-2, err_msg=name
+            )
+
+    def test_adam_minimizes_quadratic(self):
+        param = np.array([3.0, -2.0])
+        optimizer = AdamOptimizer([param], learning_rate=0.1)
+        for _ in range(500):
+            optimizer.step([2 * param])
+        assert np.abs(param).max() < 0.05
+
+
+class TestFit:
+    """Tests for the training loop."""
+
+    def test_training_reduces_loss(self):
+        np.random.seed(3)
+        model = NeuralEnsemble(ModelConfig(epochs=15, batch_size=64, learning_rate=0.01))
+        tensors = build_tensors(model, synthetic_games(1500))
+        everything = np.arange(len(tensors))
+        before = evaluate(model, tensors, everything)
+
+        summary = fit(model, tensors, validation_split=0.2, seed=3)
+
+        after = evaluate(model, tensors, everything)
+        assert after["feedforward_loss"] < before["feedforward_loss"]
+        assert after["lstm_loss"] < before["lstm_loss"]
+        assert after["feedforward_accuracy"] > 0.6
+        assert summary["validation_games"] == 300
+        assert len(model.accuracy_history) == summary["epochs_run"]
+
+    def test_lstm_reads_each_history_from_its_side(self):
+        """The team with the winning history wins, whichever side it is on."""
+        np.random.seed(5)
+        rng = np.random.default_rng(5)
+        games = []
+        for _ in range(800):
+            strong = [{"won": True, "margin": 8} for _ in range(5)]
+            weak = [{"won": False, "margin": -8} for _ in range(5)]
+            home_strong = bool(rng.random() < 0.5)
+            games.append({
+                "sport": "NBA",
+                "home_team_stats": {}, "away_team_stats": {},
+                "game_context": {}, "factor_scores": {},
+                "home_game_history": strong if home_strong else weak,
+                "away_game_history": weak if home_strong else strong,
+                "outcome": "home" if home_strong else "away",
+            })
+        model = NeuralEnsemble(ModelConfig(epochs=15, batch_size=64, learning_rate=0.01))
+        tensors = build_tensors(model, games)
+
+        fit(model, tensors, validation_split=0.2, seed=5)
+
+        assert evaluate(model, tensors, np.arange(len(tensors)))["lstm_accuracy"] > 0.95
+
+    def test_early_stopping_restores_best_epoch(self):
+        model = NeuralEnsemble(ModelConfig(epochs=40, batch_size=32, learning_rate=0.05,
+                                           early_stopping_patience=2))
+        tensors = build_tensors(model, synthetic_games(200, seed=4))
+
+        summary = fit(model, tensors, validation_split=0.3, seed=4)
+
+        if summary["epochs_run"] < 40:
+            assert summary["epochs_run"] == summary["best_epoch"] + 2
+        n_val = summary["validation_games"]
+        val_idx = np.random.default_rng(4).permutation(len(tensors))[:n_val]
+        assert evaluate(model, tensors, val_idx)["loss"] == pytest.approx(summary["validation"]["loss"], rel=1e-5)
+
+    def test_train_ensemble_wrapper(self):
+        model = train_ensemble(synthetic_games(50), config=ModelConfig(epochs=2))
+        assert model.trained_on_games == 50
+        assert len(model.accuracy_history) == 2
+
+
+class TestTrainingJob:
+    """Tests for background training jobs."""
+
+    def test_job_trains_saves_and_activates(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.services.neural_ensemble.MODEL_DIR", tmp_path)
+        monkeypatch.setattr(neural_training, "NEURAL_TRAINING_IN_PROCESS", False)
+        monkeypatch.setattr(neural_training, "_executor", None)
+        monkeypatch.setattr(ModelManager, "_active_model", None)
+        monkeypatch.setattr(ModelManager, "_active_id", None)
+        monkeypatch.setattr(ModelManager, "_loaded", {})
+        monkeypatch.setattr(ModelManager, "_split", {})
+        monkeypatch.setattr(ModelManager, "_pointer_mtime", None)
+
+        try:
+            status = start_training(synthetic_games(120), 0.2, ModelConfig(epochs=2))
+            assert status["state"] == "running"
+
+            deadline = time.time() + 60
+            while get_training_job()["state"] == "running" and time.time() < deadline:
+                time.sleep(0.05)
+
+            job = get_training_job()
+            assert job["state"] == "completed"
+            assert job["epochs_run"] == 2
+            assert list(tmp_path.glob("ensemble_*/manifest.json"))
+            assert (tmp_path / "active.json").exists()
+            assert ModelManager.get_active_model().trained_on_games == 120
+        finally:
+            neural_training.shutdown_training()
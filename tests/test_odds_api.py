@@ -0,0 +1,133 @@
+"""
+Tests for odds ingestion from The Odds API.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Market, Line, Team, OddsSnapshot
+from app.services import odds_api
+from app.services.odds_api import store_odds_bulk, fetch_and_store_odds
+from tests.conftest import QueryCounter
+
+
+BOOKS = ["DraftKings", "FanDuel", "BetMGM"]
+
+
+def make_payload(games, books=BOOKS, home_price=-110):
+    payload = []
+    for i in range(games):
+        home, away = f"Home {i}", f"Away {i}"
+        bookmakers = []
+        for book in books:
+            bookmakers.append({
+                "title": book,
+                "markets": [
+                    {"key": "h2h", "outcomes": [
+                        {"name": home, "price": home_price},
+                        {"name": away, "price": 100},
+                    ]},
+                    {"key": "spreads", "outcomes": [
+                        {"name": home, "price": -110, "point": -3.5},
+                        {"name": away, "price": -110, "point": 3.5},
+                    ]},
+                ],
+            })
+        payload.append({
+            "home_team": home,
+            "away_team": away,
+            "commence_time": (datetime(2026, 1, 5, 19) + timedelta(hours=i)).isoformat() + "Z",
+            "bookmakers": bookmakers,
+        })
+    return payload
+
+
+class TestStoreOddsBulk:
+    """Test bulk odds ingestion."""
+
+    def test_creates_rows(self, db_session):
+        new_games = store_odds_bulk(db_session, "NBA", make_payload(2))
+
+        assert new_games == 2
+        assert db_session.query(Team).count() == 4
+        assert db_session.query(Market).count() == 8
+        assert db_session.query(Line).count() == 24
+        assert db_session.query(OddsSnapshot).count() == 24
+
+        game = db_session.query(Game).order_by(Game.id).first()
+        assert game.start_time == datetime(2026, 1, 5, 19)
+
+    def test_rerun_updates_in_place(self, db_session):
+        """A second ingestion should update lines, not duplicate them."""
+        store_odds_bulk(db_session, "NBA", make_payload(2))
+        new_games = store_odds_bulk(db_session, "NBA", make_payload(2, home_price=-150))
+
+        assert new_games == 0
+        assert db_session.query(Game).count() == 2
+        assert db_session.query(Market).count() == 8
+        assert db_session.query(Line).count() == 24
+        # Only the moved h2h series get new points
+        assert db_session.query(OddsSnapshot).count() == 36
+
+        home_line = db_session.query(Line).join(Market).filter(
+            Market.market_type == "h2h", Market.selection == "Home 0", Line.sportsbook == "FanDuel"
+        ).one()
+        assert home_line.american_odds == -150
+
+    def test_matches_existing_team_by_substring(self, db_session):
+        """Existing teams are matched like ilike('%name%')."""
+        db_session.add(Team(sport="NBA", name="Los Angeles Home 0", short_name="LAH"))
+        db_session.add(Team(sport="NFL", name="Away 0", short_name="A0"))
+        db_session.commit()
+
+        store_odds_bulk(db_session, "NBA", make_payload(1))
+
+        assert db_session.query(Team).filter(Team.sport == "NBA").count() == 2
+        game = db_session.query(Game).one()
+        assert game.home_team.name == "Los Angeles Home 0"
+
+    def test_constant_query_count(self, db_session):
+        """Round trips should not grow with games, books or outcomes."""
+        engine = db_session.get_bind()
+
+        with QueryCounter(engine) as small:
+            store_odds_bulk(db_session, "NBA", make_payload(1, books=BOOKS[:1]))
+        with QueryCounter(engine) as large:
+            store_odds_bulk(db_session, "NHL", make_payload(10))
+
+        assert large.count == small.count
+
+    def test_failure_rolls_back(self, db_session, monkeypatch):
+        """A failure mid-ingestion should leave nothing behind."""
+        def boom(*args, **kwargs):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(odds_api, "bulk_upsert", boom)
+
+        with pytest.raises(RuntimeError):
+            store_odds_bulk(db_session, "NBA", make_payload(1))
+
+        assert db_session.query(Game).count() == 0
+        assert db_session.query(Team).count() == 0
+
+
+class TestFetchAndStoreOdds:
+    """Test the fetch-and-store entry point."""
+
+    @pytest.mark.asyncio
+    async def test_stores_fetched_payload(self, db_session, monkeypatch):
+        async def fake_fetch(sport):
+            return make_payload(3)
+
+        monkeypatch.setattr(odds_api, "fetch_odds", fake_fetch)
+
+        assert await fetch_and_store_odds(db_session, "NBA") == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_payload(self, db_session, monkeypatch):
+        async def fake_fetch(sport):
+            return []
+
+        monkeypatch.setattr(odds_api, "fetch_odds", fake_fetch)
+
+        assert await fetch_and_store_odds(db_session, "NBA") == 0
@@ -0,0 +1,221 @@
+"""
+Tests for the concurrent odds refresh scheduler.
+"""
+
+import time
+import asyncio
+import threading
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Team, OddsSnapshot, LineMovement
+from app.services import odds_scheduler
+from app.services.odds_scheduler import OddsScheduler, run_sport_refresh
+from app.utils.http_client import http_clients
+from tests.conftest import TestingSessionLocal
+from tests.conftest import QueryCounter
+
+
+START = datetime(2026, 1, 5, 19)
+
+
+def make_games(db, count, sport="NBA"):
+    games = []
+    for i in range(count):
+        home = Team(sport=sport, name=f"Home {i}")
+        away = Team(sport=sport, name=f"Away {i}")
+        db.add_all([home, away])
+        db.flush()
+        game = Game(sport=sport, home_team_id=home.id, away_team_id=away.id,
+                    start_time=START + timedelta(hours=i))
+        db.add(game)
+        games.append(game)
+    db.commit()
+    return games
+
+
+def make_payload(games, home_price=1.91):
+    """Odds API payload with decimal prices, as the scheduler converts them."""
+    return [
+        {
+            "commence_time": (START + timedelta(hours=i)).isoformat() + "Z",
+            "bookmakers": [
+                {"title": book, "markets": [
+                    {"key": "h2h", "outcomes": [
+                        {"name": f"Home {i}", "price": home_price},
+                    ]},
+                    {"key": "spreads", "outcomes": [
+                        {"name": f"Home {i}", "price": 1.91, "point": -3.5},
+                    ]},
+                ]}
+                for book in ("DraftKings", "FanDuel")
+            ],
+        }
+        for i in range(games)
+    ]
+
+
+@pytest.fixture
+def quota(monkeypatch):
+    metrics = http_clients.metrics("odds_api")
+    monkeypatch.setattr(metrics, "quota", {})
+    return metrics.quota
+
+
+class TestRunSportRefresh:
+    """Test concurrent fetching with a single writer."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_run_concurrently(self, monkeypatch, quota):
+        """Wall time should be close to the slowest sport, not the sum."""
+        async def fake_fetch(sport):
+            await asyncio.sleep(0.1)
+            return [{"sport": sport}]
+
+        monkeypatch.setattr(odds_scheduler, "fetch_odds", fake_fetch)
+        sports = ["NBA", "NFL", "NHL", "MLB", "SOCCER", "NCAA_BASKETBALL"]
+
+        start = time.perf_counter()
+        results = await run_sport_refresh(sports, lambda sport, data: {"games": len(data)}, concurrency=6)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.4
+        assert all(r["status"] == "ok" and r["games"] == 1 for r in results.values())
+        assert all(r["fetch_ms"] >= 100 for r in results.values())
+        assert all("write_ms" in r for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_single_writer(self, monkeypatch, quota):
+        """Batches should never be written concurrently."""
+        async def fake_fetch(sport):
+            return [{"sport": sport}]
+
+        lock = threading.Lock()
+        overlaps = []
+
+        def write(sport, data):
+            if not lock.acquire(blocking=False):
+                overlaps.append(sport)
+                return {}
+            try:
+                time.sleep(0.01)
+                return {}
+            finally:
+                lock.release()
+
+        monkeypatch.setattr(odds_scheduler, "fetch_odds", fake_fetch)
+        await run_sport_refresh(["NBA", "NFL", "NHL", "MLB"], write, concurrency=4)
+
+        assert overlaps == []
+
+    @pytest.mark.asyncio
+    async def test_failures_are_per_sport(self, monkeypatch, quota):
+        """A failing fetch or write should not affect other sports."""
+        async def fake_fetch(sport):
+            if sport == "NFL":
+                raise RuntimeError("upstream down")
+            return [] if sport == "NHL" else [{}]
+
+        def write(sport, data):
+            if sport == "MLB":
+                raise ValueError("bad batch")
+            return {"games": 1}
+
+        monkeypatch.setattr(odds_scheduler, "fetch_odds", fake_fetch)
+        results = await run_sport_refresh(["NBA", "NFL", "NHL", "MLB"], write)
+
+        assert results["NBA"]["status"] == "ok"
+        assert results["NFL"] == {"status": "error", "error": "upstream down", "fetch_ms": results["NFL"]["fetch_ms"]}
+        assert results["NHL"]["status"] == "empty"
+        assert results["MLB"]["status"] == "error"
+        assert results["MLB"]["error"] == "bad batch"
+
+    @pytest.mark.asyncio
+    async def test_quota_reserve_skips_fetches(self, monkeypatch, quota):
+        """Sports should be skipped once the provider quota is nearly spent."""
+        calls = []
+
+        async def fake_fetch(sport):
+            calls.append(sport)
+            return [{}]
+
+        monkeypatch.setattr(odds_scheduler, "fetch_odds", fake_fetch)
+        quota["x-requests-remaining"] = "10"
+
+        results = await run_sport_refresh(["NBA", "NFL"], lambda sport, data: {})
+
+        assert calls == []
+        assert {r["status"] for r in results.values()} == {"skipped"}
+        assert "10 left" in results["NBA"]["error"]
+
+
+class TestProcessGameOdds:
+    """Test the bulk snapshot and movement writer."""
+
+    def test_writes_snapshots_and_movements(self, db_session):
+        """Second batch should record movements against the latest snapshots."""
+        make_games(db_session, 2)
+        scheduler = OddsScheduler()
+
+        first = scheduler._process_game_odds(db_session, make_payload(2), "NBA")
+        db_session.commit()
+        assert first == {"games": 2, "snapshots": 8, "movements": 0}
+
+        second = scheduler._process_game_odds(db_session, make_payload(2, home_price=2.5), "NBA")
+        db_session.commit()
+        # Unchanged spread series are not stored again
+        assert second == {"games": 2, "snapshots": 4, "movements": 4}
+
+        movement = db_session.query(LineMovement).filter_by(market_type="h2h").first()
+        assert movement.previous_odds == -109
+        assert movement.current_odds == 150
+        assert movement.direction == "public"
+        assert db_session.query(OddsSnapshot).count() == 12
+
+    def test_unknown_games_skipped(self, db_session):
+        """Games not in the database should be ignored."""
+        make_games(db_session, 1)
+
+        counts = OddsScheduler()._process_game_odds(db_session, make_payload(3), "NBA")
+
+        assert counts["games"] == 1
+        assert counts["snapshots"] == 4
+
+    def test_constant_query_count(self, db_session):
+        """Round trips should not grow with the number of games."""
+        make_games(db_session, 20)
+        scheduler = OddsScheduler()
+        engine = db_session.get_bind()
+
+        scheduler._process_game_odds(db_session, make_payload(20), "NBA")
+        with QueryCounter(engine) as few:
+            scheduler._process_game_odds(db_session, make_payload(2, home_price=2.5), "NBA")
+        with QueryCounter(engine) as many:
+            scheduler._process_game_odds(db_session, make_payload(20, home_price=3.0), "NBA")
+
+        assert many.count == few.count
+
+
+class TestRefreshAllOdds:
+    """Test the full refresh cycle and status reporting."""
+
+    @pytest.mark.asyncio
+    async def test_status_reports_per_sport_results(self, db_session, monkeypatch, quota):
+        make_games(db_session, 2)
+
+        async def fake_fetch(sport):
+            return make_payload(2) if sport == "NBA" else []
+
+        monkeypatch.setattr(odds_scheduler, "fetch_odds", fake_fetch)
+        monkeypatch.setattr(odds_scheduler, "SessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(odds_scheduler, "run_analysis", lambda db: {})
+        scheduler = OddsScheduler()
+
+        await scheduler.refresh_all_odds()
+        status = scheduler.get_status()
+
+        assert status["sports"]["NBA"]["status"] == "ok"
+        assert status["sports"]["NBA"]["snapshots"] == 8
+        assert status["sports"]["NFL"]["status"] == "empty"
+        assert status["last_cycle_ms"] >= 0
+        assert db_session.query(OddsSnapshot).count() == 8
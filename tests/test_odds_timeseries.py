@@ -0,0 +1,208 @@
+"""
+Tests for odds time-series storage: change-only writes, rollups and retention.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Team, OddsSnapshot, OddsRollup
+from app.services import odds_timeseries
+from app.services.odds_timeseries import (
+    changed_rows,
+    compact_snapshots,
+    ensure_snapshot_partitions,
+    filter_unchanged,
+    get_odds_rollups,
+    get_timeseries_stats,
+    rollup_hourly,
+)
+
+
+@pytest.fixture
+def game(db_session):
+    home = Team(sport="NBA", name="Home")
+    away = Team(sport="NBA", name="Away")
+    db_session.add_all([home, away])
+    db_session.flush()
+    game = Game(sport="NBA", home_team_id=home.id, away_team_id=away.id,
+                start_time=datetime.utcnow() + timedelta(days=1))
+    db_session.add(game)
+    db_session.commit()
+    return game
+
+
+def add_points(db, game_id, points, sportsbook="DraftKings", market_type="spreads", selection=None):
+    for captured_at, odds, line in points:
+        db.add(OddsSnapshot(game_id=game_id, market_type=market_type, sportsbook=sportsbook,
+                            selection=selection, odds=odds, line_value=line, captured_at=captured_at))
+    db.commit()
+
+
+def expired_hour():
+    """Start of an hour well past the retention window, so +minutes stays in one bucket."""
+    return (datetime.utcnow() - timedelta(days=40)).replace(minute=0, second=0, microsecond=0)
+
+
+def row(game_id, odds, line=None, sportsbook="DraftKings", market_type="spreads"):
+    return {"game_id": game_id, "market_type": market_type, "sportsbook": sportsbook,
+            "odds": odds, "line_value": line}
+
+
+class TestChangeOnly:
+    """Test skipping unchanged series."""
+
+    def test_unchanged_series_dropped(self):
+        latest = {(1, "spreads", "DraftKings"): [(-110, -3.5), (-110, 3.5)]}
+        rows = [row(1, -110, 3.5), row(1, -110, -3.5), row(1, -120, None, market_type="h2h")]
+
+        assert changed_rows(rows, latest) == [rows[2]]
+
+    def test_any_outcome_change_keeps_whole_series(self):
+        latest = {(1, "spreads", "DraftKings"): [(-110, -3.5), (-110, 3.5)]}
+        rows = [row(1, -105, -3.5), row(1, -110, 3.5)]
+
+        assert changed_rows(rows, latest) == rows
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(odds_timeseries, "ODDS_SNAPSHOT_CHANGE_ONLY", False)
+        latest = {(1, "spreads", "DraftKings"): [(-110, -3.5)]}
+        rows = [row(1, -110, -3.5)]
+
+        assert changed_rows(rows, latest) == rows
+
+    def test_filter_against_latest_capture(self, db_session, game):
+        """Only the latest capture of a series should be compared."""
+        t0 = datetime(2026, 1, 5, 12)
+        add_points(db_session, game.id, [(t0, -110, -3.5), (t0 + timedelta(minutes=5), -115, -4.0)])
+
+        assert filter_unchanged(db_session, [row(game.id, -115, -4.0)]) == []
+        assert len(filter_unchanged(db_session, [row(game.id, -110, -3.5)])) == 1
+
+
+class TestRollups:
+    """Test hourly OHLC rollups."""
+
+    def test_hourly_ohlc(self, db_session, game):
+        t0 = datetime(2026, 1, 5, 12)
+        add_points(db_session, game.id, [
+            (t0 + timedelta(minutes=5), -110, -3.5),
+            (t0 + timedelta(minutes=20), -125, -4.5),
+            (t0 + timedelta(minutes=40), -105, -3.0),
+            (t0 + timedelta(minutes=55), -115, -4.0),
+            (t0 + timedelta(minutes=70), -120, -4.0),
+        ])
+
+        written = rollup_hourly(db_session, since=t0, until=t0 + timedelta(hours=3))
+
+        assert written == 2
+        bucket = db_session.query(OddsRollup).filter_by(bucket_start=t0).one()
+        assert (bucket.open_odds, bucket.high_odds, bucket.low_odds, bucket.close_odds) == (-110, -105, -125, -115)
+        assert (bucket.open_line, bucket.high_line, bucket.low_line, bucket.close_line) == (-3.5, -3.0, -4.5, -4.0)
+        assert bucket.samples == 4
+
+    def test_rerun_updates_buckets(self, db_session, game):
+        t0 = datetime(2026, 1, 5, 12)
+        add_points(db_session, game.id, [(t0 + timedelta(minutes=5), -110, -3.5)])
+        rollup_hourly(db_session, since=t0, until=t0 + timedelta(hours=1))
+        add_points(db_session, game.id, [(t0 + timedelta(minutes=30), -130, -5.0)])
+
+        rollup_hourly(db_session, since=t0, until=t0 + timedelta(hours=1))
+
+        bucket = db_session.query(OddsRollup).one()
+        assert bucket.close_odds == -130
+        assert bucket.samples == 2
+
+    def test_get_odds_rollups(self, db_session, game):
+        t0 = datetime(2026, 1, 5, 12)
+        add_points(db_session, game.id, [(t0, -110, -3.5)], sportsbook="FanDuel")
+        add_points(db_session, game.id, [(t0, -108, -3.5)])
+        rollup_hourly(db_session, since=t0, until=t0 + timedelta(hours=1))
+
+        history = get_odds_rollups(db_session, game.id, sportsbook="FanDuel")
+
+        assert len(history) == 1
+        assert history[0]["odds"]["close"] == -110
+        assert history[0]["bucket_start"] == t0.isoformat()
+
+    def test_outcomes_rolled_up_separately(self, db_session, game):
+        t0 = datetime(2026, 1, 5, 12)
+        add_points(db_session, game.id, [(t0, -110, -3.5), (t0 + timedelta(minutes=30), -110, -4.0)],
+                   selection="Home")
+        add_points(db_session, game.id, [(t0, -110, 3.5), (t0 + timedelta(minutes=30), -110, 4.0)],
+                   selection="Away")
+
+        assert rollup_hourly(db_session, since=t0, until=t0 + timedelta(hours=1)) == 2
+
+        lines = {
+            r["selection"]: r["line"]
+            for r in get_odds_rollups(db_session, game.id)
+        }
+        assert lines["Home"] == {"open": -3.5, "high": -3.5, "low": -4.0, "close": -4.0}
+        assert lines["Away"] == {"open": 3.5, "high": 4.0, "low": 3.5, "close": 4.0}
+
+
+class TestRetention:
+    """Test compaction of expired raw points."""
+
+    def test_compacts_old_points_keeping_last(self, db_session, game):
+        old = expired_hour()
+        recent = datetime.utcnow() - timedelta(hours=1)
+        add_points(db_session, game.id, [
+            (old, -110, -3.5),
+            (old + timedelta(minutes=10), -120, -4.0),
+            (old + timedelta(hours=2), -115, -4.0),
+        ])
+        add_points(db_session, game.id, [(old, -105, 2.5)], market_type="totals")
+        add_points(db_session, game.id, [(old, -110, 7.5), (recent, -112, 7.5)], sportsbook="FanDuel")
+
+        result = compact_snapshots(db_session, retention_days=30)
+
+        # Everything expired except the last point of each series
+        assert result["deleted"] == 3
+        remaining = {(s.market_type, s.sportsbook, s.odds) for s in db_session.query(OddsSnapshot)}
+        assert remaining == {
+            ("spreads", "DraftKings", -115),
+            ("totals", "DraftKings", -105),
+            ("spreads", "FanDuel", -112),
+        }
+        # Expired points are kept as rollups
+        assert result["rolled_up"] == 4
+        first_hour = db_session.query(OddsRollup).filter_by(
+            sportsbook="DraftKings", market_type="spreads"
+        ).order_by(OddsRollup.bucket_start).first()
+        assert (first_hour.open_odds, first_hour.close_odds, first_hour.samples) == (-110, -120, 2)
+
+    def test_second_run_keeps_existing_rollups(self, db_session, game):
+        """Rolling up again after compaction must not overwrite complete buckets."""
+        old = expired_hour()
+        add_points(db_session, game.id, [(old, -110, -3.5), (old + timedelta(minutes=1), -120, -4.0)])
+        add_points(db_session, game.id, [(old + timedelta(days=1), -118, -4.0)])
+
+        compact_snapshots(db_session, retention_days=30)
+        result = compact_snapshots(db_session, retention_days=30)
+
+        assert result["rolled_up"] == 0
+        assert result["deleted"] == 0
+        first = db_session.query(OddsRollup).order_by(OddsRollup.bucket_start).first()
+        assert first.samples == 2
+
+    def test_keeps_both_sides_of_closing_line(self, db_session, game):
+        old = expired_hour()
+        add_points(db_session, game.id, [(old, -110, -3.5), (old + timedelta(minutes=10), -110, -4.0)],
+                   selection="Home")
+        add_points(db_session, game.id, [(old, -110, 3.5), (old + timedelta(minutes=10), -110, 4.0)],
+                   selection="Away")
+
+        result = compact_snapshots(db_session, retention_days=30)
+
+        assert result["deleted"] == 2
+        remaining = {(s.selection, s.line_value) for s in db_session.query(OddsSnapshot)}
+        assert remaining == {("Home", -4.0), ("Away", 4.0)}
+
+
+class TestPartitions:
+    """Test partition management outside PostgreSQL."""
+
+    def test_noop_on_sqlite(self, db_session):
+        assert ensure_snapshot_partitions(db_session) == []
+        assert get_timeseries_stats(db_session)["partitioned"] is False
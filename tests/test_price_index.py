@@ -0,0 +1,154 @@
+"""
+Tests for the cross-book best-price index and index-backed arbitrage scan.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Team, Market, Line
+from app.services.arbitrage import scan_for_arbitrage
+from app.services.price_index import BestPriceIndex, GameInfo, PriceEntry
+from tests.conftest import QueryCounter
+
+
+INFO = GameInfo("NBA", "Home", "Away", datetime.utcnow() + timedelta(days=1), "scheduled")
+
+
+def quote(book, selection, odds, point=None, market_type="h2h", game_id=1):
+    return {"game_id": game_id, "market_type": market_type, "sportsbook": book,
+            "selection": selection, "odds": odds, "line_value": point}
+
+
+def make_index(ticks, games=(1,)):
+    index = BestPriceIndex()
+    index._games = {game_id: INFO for game_id in games}
+    index.apply(ticks)
+    return index
+
+
+class TestPriceEntry:
+    """Test top-price bookkeeping."""
+
+    def test_top_prices_sorted(self):
+        entry = PriceEntry()
+        for book, odds in [("A", -110), ("B", -105), ("C", 100), ("D", -120)]:
+            entry.set(book, odds)
+
+        assert entry.top == [(100, "C"), (-105, "B"), (-110, "A")]
+
+    def test_best_book_worsening_resorts(self):
+        entry = PriceEntry()
+        entry.set("A", 120)
+        entry.set("B", 110)
+        entry.set("A", 100)
+
+        assert entry.best == (110, "B")
+
+    def test_remove(self):
+        entry = PriceEntry()
+        entry.set("A", 120)
+        entry.set("B", 110)
+        entry.remove("A")
+
+        assert entry.top == [(110, "B")]
+
+
+class TestBestPriceIndex:
+    """Test incremental updates and scans."""
+
+    def test_moved_line_replaces_old_point(self):
+        index = make_index([quote("A", "Home", -110, -3.0, "spreads"), quote("A", "Away", -110, 3.0, "spreads")])
+        index.apply([quote("A", "Home", -110, -3.5, "spreads"), quote("A", "Away", -110, 3.5, "spreads")])
+
+        points = {side["point"] for side in index.get_best_prices(1)["spreads"]}
+        assert points == {-3.5, 3.5}
+        assert [rung[0] for rung in index.ladder(1, "spreads", "Home")] == [-3.5]
+
+    def test_h2h_arb(self):
+        index = make_index([
+            quote("A", "Home", 110), quote("A", "Away", -130),
+            quote("B", "Home", -130), quote("B", "Away", 115),
+        ])
+
+        arbs = index.scan()
+
+        assert len(arbs) == 1
+        assert arbs[0].market_type == "h2h"
+        assert {(arbs[0].bet1_sportsbook, arbs[0].bet1_odds), (arbs[0].bet2_sportsbook, arbs[0].bet2_odds)} == {
+            ("A", 110), ("B", 115)
+        }
+        assert arbs[0].profit_margin > 0
+
+    def test_three_way_h2h_arb(self):
+        index = make_index([
+            quote("A", "Home", 260), quote("B", "Away", 320), quote("C", "Draw", 350),
+        ])
+
+        arbs = index.scan()
+
+        assert len(arbs) == 1
+        assert arbs[0].bet3_odds is not None
+
+    def test_spread_and_total_arbs(self):
+        index = make_index([
+            quote("A", "Home", 105, -3.0, "spreads"), quote("B", "Away", 105, 3.0, "spreads"),
+            quote("A", "Home", -150, -3.5, "spreads"),
+            quote("A", "Over", 110, 220.5, "totals"), quote("B", "Under", 100, 220.5, "totals"),
+        ])
+
+        arbs = {arb.market_type: arb for arb in index.scan()}
+
+        assert arbs["spreads"].bet1_selection == "Home -3.0"
+        assert arbs["spreads"].bet2_selection == "Away +3.0"
+        assert arbs["totals"].bet1_selection == "Over 220.5"
+        assert arbs["totals"].bet2_sportsbook == "B"
+
+    def test_no_arb_with_standard_vig(self):
+        index = make_index([quote(book, side, -110) for book in "AB" for side in ("Home", "Away")])
+
+        assert index.scan() == []
+
+    def test_started_games_and_other_sports_skipped(self):
+        index = make_index([quote("A", "Home", 110), quote("B", "Away", 115)])
+
+        assert index.scan(sport="NFL") == []
+        index._games[1] = INFO._replace(start_time=datetime.utcnow() - timedelta(minutes=1))
+        assert index.scan() == []
+
+
+class TestScanForArbitrage:
+    """Test the index-backed scan against the database."""
+
+    def make_game(self, db, i, home_odds, away_odds):
+        home = Team(sport="NBA", name=f"Home {i}")
+        away = Team(sport="NBA", name=f"Away {i}")
+        db.add_all([home, away])
+        db.flush()
+        game = Game(sport="NBA", home_team_id=home.id, away_team_id=away.id,
+                    start_time=datetime.utcnow() + timedelta(days=1), status="scheduled")
+        db.add(game)
+        db.flush()
+        for selection, odds in ((f"Home {i}", home_odds), (f"Away {i}", away_odds)):
+            market = Market(game_id=game.id, market_type="h2h", selection=selection)
+            db.add(market)
+            db.flush()
+            for book, price in odds.items():
+                db.add(Line(market_id=market.id, sportsbook=book, odds_type="american", american_odds=price))
+        db.commit()
+        return game
+
+    def test_finds_arbs_with_constant_queries(self, db_session):
+        bind = db_session.get_bind()
+        self.make_game(db_session, 0, {"A": 110, "B": -130}, {"A": -130, "B": 115})
+
+        with QueryCounter(bind) as few:
+            arbs = scan_for_arbitrage(db_session)
+        assert len(arbs) == 1
+        assert arbs[0].home_team == "Home 0"
+
+        for i in range(1, 10):
+            self.make_game(db_session, i, {"A": -110, "B": -110}, {"A": -110, "B": -110})
+        with QueryCounter(bind) as many:
+            assert len(scan_for_arbitrage(db_session)) == 1
+
+        assert many.count == few.count
@@ -0,0 +1,104 @@
+"""
+Tests for hot-path indexes and the development query audit.
+
+Each hot query is run under the audit so dropping or reordering one of
+its indexes shows up here as a full-table scan.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Team, Market, Line, TrackedBet, LineMovement, BankrollHistory
+from app.services.auth import validate_session
+from app.services.edge_engine import get_upcoming_games
+from app.utils.query_audit import QueryAudit, scanned_tables
+
+
+@pytest.fixture
+def audit(db_session):
+    auditor = QueryAudit(repeat_threshold=3)
+    auditor.install(db_session.get_bind())
+    yield auditor
+    auditor.uninstall()
+
+
+def test_scanned_tables_parsing():
+    assert scanned_tables(["SCAN games"], "sqlite") == ["games"]
+    assert scanned_tables(["SCAN TABLE games"], "sqlite") == ["games"]
+    assert scanned_tables(["SCAN games USING COVERING INDEX ix_games_sport_start_status"], "sqlite") == ["games"]
+    assert scanned_tables(["SEARCH games USING INDEX ix_games_sport_start_status (sport=?)"], "sqlite") == []
+    assert scanned_tables(["Seq Scan on tracked_bets  (cost=0.00..1.01 rows=1 width=4)"], "postgresql") == [
+        "tracked_bets"
+    ]
+
+
+class TestHotPathIndexes:
+    """Hot queries should be served by an index, not a table scan."""
+
+    def assert_indexed(self, audit, db_session, run):
+        with audit.capture("test", db_session.get_bind()) as report:
+            run()
+        assert report.query_count > 0
+        assert report.seq_scans == {}
+
+    def test_upcoming_games(self, audit, db_session):
+        self.assert_indexed(audit, db_session, lambda: get_upcoming_games(db_session, "NBA"))
+
+    def test_settled_bets(self, audit, db_session):
+        self.assert_indexed(audit, db_session, lambda: db_session.query(TrackedBet).filter(
+            TrackedBet.user_id == 1,
+            TrackedBet.status == "settled",
+            TrackedBet.settled_at >= datetime.utcnow() - timedelta(days=30)
+        ).order_by(TrackedBet.settled_at).all())
+
+    def test_session_validation(self, audit, db_session):
+        self.assert_indexed(audit, db_session, lambda: validate_session(db_session, "token"))
+
+    def test_line_movement_series(self, audit, db_session):
+        self.assert_indexed(audit, db_session, lambda: db_session.query(LineMovement).filter(
+            LineMovement.game_id == 1,
+            LineMovement.sportsbook == "DraftKings",
+            LineMovement.market_type == "spread"
+        ).order_by(LineMovement.recorded_at).all())
+
+    def test_game_markets_and_lines(self, audit, db_session):
+        def run():
+            db_session.query(Market).filter(Market.game_id == 1, Market.market_type == "h2h").all()
+            db_session.query(Line).filter(Line.market_id == 1).all()
+
+        self.assert_indexed(audit, db_session, run)
+
+    def test_bankroll_history(self, audit, db_session):
+        self.assert_indexed(audit, db_session, lambda: db_session.query(BankrollHistory).filter(
+            BankrollHistory.user_id == 1
+        ).order_by(BankrollHistory.recorded_at).all())
+
+
+class TestQueryAudit:
+    """Test N+1 and scan reporting."""
+
+    def test_repeated_statement_flagged(self, audit, db_session):
+        for i in range(3):
+            team = Team(sport="NBA", name=f"Team {i}")
+            db_session.add(team)
+        db_session.commit()
+
+        with audit.capture("loop", db_session.get_bind()) as report:
+            for team_id in range(1, 4):
+                db_session.query(Team).filter(Team.id == team_id).first()
+
+        assert list(report.repeated.values()) == [3]
+
+    def test_unindexed_filter_flagged(self, audit, db_session):
+        with audit.capture("scan", db_session.get_bind()) as report:
+            db_session.query(Game).filter(Game.venue == "Arena").all()
+
+        assert list(report.seq_scans.values()) == [["games"]]
+
+    def test_outside_capture_not_recorded(self, audit, db_session):
+        db_session.query(Game).all()
+
+        with audit.capture("empty", db_session.get_bind()) as report:
+            pass
+
+        assert report.query_count == 0
@@ -14,6 +14,7 @@ from app.middleware.rate_limit import (
     TierLimits,
     EndpointLimits,
     RateLimitStorage,
+    SlidingWindowCounter,
     RateLimitMiddleware,
     AuthRateLimitMiddleware,
     get_user_tier,
@@ -206,16 +207,116 @@ class TestRateLimitStorage:
         storage._use_redis = False
         storage._last_cleanup = 0  # Force cleanup
 
-        # Add old entries
-        old_time = time.time() - 120  # 2 minutes ago
-        storage.minute_requests["old_ip"] = [old_time]
-        storage.hour_requests["old_ip"] = [old_time]
+        # Add an entry last touched 2 minutes ago
+        with patch("app.middleware.rate_limit.time.time", return_value=time.time() - 120):
+            storage.increment_minute("old_ip")
+        storage.increment_hour("new_ip")
 
         # Run cleanup
         storage.cleanup()
 
         # Old entries should be removed
-        assert "old_ip" not in storage.minute_requests or len(storage.minute_requests.get("old_ip", [])) == 0
+        assert storage.get_minute_count("old_ip") == 0
+        assert list(storage.counters) == [storage._redis_key("hour", "new_ip")]
+
+    def test_counter_memory_is_constant(self):
+        """Counters should not grow with the number of requests."""
+        storage = RateLimitStorage()
+        storage._use_redis = False
+
+        for _ in range(500):
+            storage.increment_minute("busy_ip")
+
+        counter = next(iter(storage.counters.values()))
+        assert len(storage.counters) == 1
+        assert counter.current == 500
+
+    def test_cleanup_caps_tracked_counters(self):
+        storage = RateLimitStorage()
+        storage._use_redis = False
+        storage._last_cleanup = 0
+
+        with patch("app.middleware.rate_limit.MAX_TRACKED_COUNTERS", 3):
+            for i in range(5):
+                storage.increment_minute(f"ip_{i}")
+            storage.cleanup()
+
+        assert len(storage.counters) == 3
+        assert storage.get_minute_count("ip_0") == 0
+        assert storage.get_minute_count("ip_4") == 1
+
+
+class TestSlidingWindow:
+    """Test sliding-window counting and the combined check."""
+
+    def test_previous_window_weighted(self):
+        """Half-way through a window, half the previous count still applies."""
+        counter = SlidingWindowCounter(60)
+        for _ in range(10):
+            counter.add(60.0)
+
+        assert counter.estimate(90.0) == 10
+        assert counter.estimate(150.0) == pytest.approx(5.0)
+        assert counter.estimate(240.0) == 0
+
+    def test_hit_rejects_at_minute_limit(self):
+        storage = RateLimitStorage()
+        storage._use_redis = False
+        limits = TierLimits(requests_per_minute=3, requests_per_hour=100, burst_limit=100)
+
+        decisions = [storage.hit("ip", "/games", limits) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert decisions[-1].exceeded == "minute"
+        assert decisions[2].counts == {"burst": 3, "minute": 3, "hour": 3}
+
+    def test_rejected_hit_not_recorded(self):
+        """A request rejected by one window should not count toward the others."""
+        storage = RateLimitStorage()
+        storage._use_redis = False
+        limits = TierLimits(requests_per_minute=100, requests_per_hour=100, burst_limit=2)
+
+        for _ in range(5):
+            storage.hit("ip", "/games", limits)
+
+        assert storage.get_burst_count("ip") == 2
+        assert storage.get_minute_count("ip", "/games") == 2
+
+    def test_burst_shared_across_endpoints(self):
+        storage = RateLimitStorage()
+        storage._use_redis = False
+        limits = TierLimits(requests_per_minute=100, requests_per_hour=100, burst_limit=2)
+
+        storage.hit("ip", "/games", limits)
+        storage.hit("ip", "/odds", limits)
+
+        assert storage.hit("ip", "/teams", limits).exceeded == "burst"
+
+    def test_redis_single_script_call(self):
+        """On Redis all windows are checked in one script invocation."""
+        storage = RateLimitStorage()
+        storage._use_redis = True
+        storage._script = MagicMock(return_value=[0, 2, 1, 30, 31])
+        limits = TierLimits(requests_per_minute=30, requests_per_hour=500, burst_limit=5)
+
+        decision = storage.hit("ip:1.2.3.4", "/games", limits)
+
+        storage._script.assert_called_once()
+        keys = storage._script.call_args.kwargs["keys"]
+        args = storage._script.call_args.kwargs["args"]
+        assert all("{ip:1.2.3.4}" in key for key in keys)
+        assert args == ["hit", 1, 5, 60, 30, 3600, 500]
+        assert decision.exceeded == "minute"
+        assert decision.counts == {"burst": 1, "minute": 30, "hour": 31}
+
+    def test_redis_error_falls_back_to_memory(self):
+        storage = RateLimitStorage()
+        storage._use_redis = True
+        storage._script = MagicMock(side_effect=ConnectionError("down"))
+        limits = TierLimits(requests_per_minute=30, requests_per_hour=500, burst_limit=5)
+
+        assert storage.hit("ip", "/games", limits).allowed is True
+        assert len(storage.counters) == 3
 
 
 class TestGetRateLimitStats:
@@ -0,0 +1,106 @@
+"""
+Tests for cache value serializers.
+"""
+
+import dataclasses
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.utils import serialization
+from app.utils.serialization import (
+    JsonSerializer,
+    MsgpackSerializer,
+    get_serializer,
+    register_prefix_serializer,
+    serializer_for,
+)
+
+
+@dataclasses.dataclass
+class Pick:
+    game_id: int
+    edge: Decimal
+    start_time: datetime
+    tags: set = dataclasses.field(default_factory=set)
+
+
+@pytest.fixture
+def msgpack_serializer():
+    pytest.importorskip("msgpack")
+    return MsgpackSerializer()
+
+
+class TestMsgpackSerializer:
+    """Test typed round-tripping."""
+
+    def test_typed_values_round_trip(self, msgpack_serializer):
+        value = {
+            "at": datetime(2026, 1, 5, 19, 30, tzinfo=timezone.utc),
+            "naive": datetime(2026, 1, 5, 19, 30),
+            "day": date(2026, 1, 5),
+            "price": Decimal("1.9091"),
+            "books": {"dk", "fd"},
+            "nested": [1, 2.5, None, "x", {3: "int key"}],
+        }
+
+        assert msgpack_serializer.decode(msgpack_serializer.encode(value)) == value
+
+    def test_dataclass_round_trip(self, msgpack_serializer, monkeypatch):
+        monkeypatch.setattr(serialization, "DATACLASS_MODULE_PREFIXES", (__name__,))
+        pick = Pick(1, Decimal("2.5"), datetime(2026, 1, 5), {"nba"})
+
+        result = msgpack_serializer.decode(msgpack_serializer.encode([pick]))
+
+        assert result == [pick]
+        assert isinstance(result[0], Pick)
+
+    def test_dataclass_outside_app_decodes_to_dict(self, msgpack_serializer):
+        """Classes from untrusted modules should not be instantiated."""
+        pick = Pick(1, Decimal("2.5"), datetime(2026, 1, 5))
+
+        result = msgpack_serializer.decode(msgpack_serializer.encode(pick))
+
+        assert result == {"game_id": 1, "edge": Decimal("2.5"), "start_time": datetime(2026, 1, 5), "tags": set()}
+
+
+class TestCompression:
+    """Test size-threshold compression."""
+
+    def test_large_payload_compressed(self, monkeypatch):
+        monkeypatch.setattr(serialization, "CACHE_COMPRESS_THRESHOLD", 100)
+        serializer = JsonSerializer()
+        value = [{"sportsbook": "draftkings", "price": -110}] * 100
+
+        data = serializer.encode(value)
+
+        assert data[:1] == b"\x01"
+        assert len(data) < len(serializer.dumps(value))
+        assert serializer.decode(data) == value
+
+    def test_small_payload_not_compressed(self):
+        data = JsonSerializer().encode({"a": 1})
+        assert data[:1] == b"\x00"
+
+    def test_unknown_header_rejected(self):
+        with pytest.raises(ValueError):
+            JsonSerializer().decode(b"\x09{}")
+
+
+class TestSerializerSelection:
+    """Test per-prefix serializer choice."""
+
+    def test_prefix_override(self, monkeypatch):
+        monkeypatch.setattr(serialization, "PREFIX_SERIALIZERS", {})
+        register_prefix_serializer("session", "json")
+
+        assert serializer_for("session:abc").name == "json"
+        assert serializer_for("odds:abc").name == serialization.CACHE_SERIALIZER
+
+    def test_unknown_serializer_rejected(self):
+        with pytest.raises(ValueError):
+            register_prefix_serializer("odds", "pickle")
+
+    def test_tags_differ_between_formats(self, msgpack_serializer):
+        assert get_serializer("json").tag != msgpack_serializer.tag
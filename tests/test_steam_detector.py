@@ -0,0 +1,176 @@
+"""
+Tests for the streaming steam detector, odds feed and replay harness.
+"""
+
+import threading
+import pytest
+from datetime import datetime, timedelta
+
+from app.db import Game, Team, OddsSnapshot
+from app.services.odds_feed import OddsBatch, OddsFeed
+from app.services.steam_detector import SteamDetector, replay_snapshots
+
+
+START = datetime(2026, 1, 5, 18)
+
+
+def ticks(minute, lines, game_id=1, market_type="spreads"):
+    """Home/away spread ticks per book at START + minute."""
+    return [
+        {"game_id": game_id, "market_type": market_type, "sportsbook": book,
+         "selection": side, "odds": -110, "line_value": line * sign,
+         "captured_at": START + timedelta(minutes=minute)}
+        for book, line in lines.items()
+        for side, sign in (("Home", 1), ("Away", -1))
+    ]
+
+
+class TestSteamDetector:
+    """Test incremental steam and sharp-book-first detection."""
+
+    def test_steam_across_books(self):
+        detector = SteamDetector()
+        detector.observe(ticks(0, {"Pinnacle": -3.0, "DraftKings": -3.0, "FanDuel": -3.0}))
+
+        events = detector.observe(ticks(5, {"Pinnacle": -4.0, "DraftKings": -4.0, "FanDuel": -4.0}), sport="NFL")
+
+        steam = [e for e in events if e.event_type == "steam"]
+        assert len(steam) == 1
+        assert steam[0].direction == "down"
+        assert steam[0].move == 1.0
+        assert set(steam[0].books) == {"Pinnacle", "DraftKings", "FanDuel"}
+        assert steam[0].sport == "NFL"
+
+    def test_sharp_book_first(self):
+        detector = SteamDetector()
+        detector.observe(ticks(0, {"Pinnacle": -3.0, "DraftKings": -3.0, "FanDuel": -3.0}))
+
+        events = detector.observe(ticks(2, {"Pinnacle": -3.5, "DraftKings": -3.0, "FanDuel": -3.0}))
+        assert [e.event_type for e in events] == ["sharp_book_first"]
+        assert events[0].first_book == "Pinnacle"
+
+        # Followers complete the steam; the sharp lead is not raised again
+        events = detector.observe(ticks(4, {"Pinnacle": -3.5, "DraftKings": -3.5, "FanDuel": -3.5}))
+        assert [e.event_type for e in events] == ["steam"]
+        assert events[0].first_book == "Pinnacle"
+
+    def test_public_book_first_is_not_sharp(self):
+        detector = SteamDetector()
+        detector.observe(ticks(0, {"Pinnacle": -3.0, "DraftKings": -3.0}))
+        detector.observe(ticks(1, {"Pinnacle": -3.0, "DraftKings": -3.5}))
+
+        events = detector.observe(ticks(2, {"Pinnacle": -3.5, "DraftKings": -3.5}))
+
+        assert events == []
+
+    def test_moves_outside_window_ignored(self):
+        detector = SteamDetector(window_minutes=10)
+        detector.observe(ticks(0, {"A": 44.0, "B": 44.0, "C": 44.0}, market_type="totals"))
+        detector.observe(ticks(1, {"A": 45.0, "B": 44.0, "C": 44.0}, market_type="totals"))
+
+        events = detector.observe(ticks(30, {"A": 45.0, "B": 45.0, "C": 45.0}, market_type="totals"))
+
+        assert events == []
+
+    def test_markets_without_points_skipped(self):
+        detector = SteamDetector()
+        h2h = [{"game_id": 1, "market_type": "h2h", "sportsbook": "A", "line_value": None,
+                "odds": -150, "captured_at": START}]
+
+        assert detector.observe(h2h) == []
+        assert detector.stats()["series"] == 0
+
+    def test_concurrent_publishers_and_prune(self):
+        """Batches from the scheduler thread and request handlers can overlap."""
+        detector = SteamDetector()
+        errors = []
+
+        def publish(offset):
+            try:
+                for i in range(300):
+                    detector.observe(ticks(i % 60, {"A": -3.0 - i % 2}, game_id=offset * 1000 + i))
+            except Exception as e:
+                errors.append(e)
+
+        def prune():
+            try:
+                for _ in range(300):
+                    detector.prune(now=0)
+                    detector.get_recent_events()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=publish, args=(n,)) for n in range(3)]
+        threads.append(threading.Thread(target=prune))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert detector.stats()["series"] == 900
+        assert detector.batches == 900
+
+
+class TestOddsFeed:
+    """Test feed fan-out."""
+
+    def test_failing_subscriber_does_not_block_others(self):
+        feed = OddsFeed()
+        received = []
+
+        def broken(batch):
+            raise RuntimeError("boom")
+
+        feed.subscribe(broken)
+        feed.subscribe(received.append)
+        feed.publish(OddsBatch("NFL", ticks(0, {"A": -3.0})))
+
+        assert len(received) == 1
+        assert received[0].sport == "NFL"
+
+    def test_empty_batches_not_published(self):
+        feed = OddsFeed()
+        received = []
+        feed.subscribe(received.append)
+
+        feed.publish(OddsBatch("NFL", []))
+
+        assert received == []
+
+
+class TestReplay:
+    """Test replaying stored snapshots through the detector."""
+
+    @pytest.fixture
+    def game(self, db_session):
+        home = Team(sport="NFL", name="Home")
+        away = Team(sport="NFL", name="Away")
+        db_session.add_all([home, away])
+        db_session.flush()
+        game = Game(sport="NFL", home_team_id=home.id, away_team_id=away.id, start_time=START + timedelta(days=1))
+        db_session.add(game)
+        db_session.commit()
+        return game
+
+    def test_replay_matches_live_detection(self, db_session, game):
+        history = [
+            ticks(0, {"Pinnacle": -3.0, "DraftKings": -3.0, "FanDuel": -3.0}, game_id=game.id),
+            ticks(3, {"Pinnacle": -4.0, "DraftKings": -3.0, "FanDuel": -3.0}, game_id=game.id),
+            ticks(6, {"Pinnacle": -4.0, "DraftKings": -4.0, "FanDuel": -4.0}, game_id=game.id),
+        ]
+        for batch in history:
+            db_session.add_all([
+                OddsSnapshot(game_id=t["game_id"], market_type=t["market_type"], sportsbook=t["sportsbook"],
+                             odds=t["odds"], line_value=t["line_value"], captured_at=t["captured_at"])
+                for t in batch
+            ])
+        db_session.commit()
+
+        live = SteamDetector()
+        live_events = [e.event_type for batch in history for e in live.observe(batch)]
+        result = replay_snapshots(db_session, game_ids=[game.id])
+
+        assert result["batches"] == 3
+        assert result["ticks"] == 18
+        assert [e["event_type"] for e in result["events"]] == live_events == ["sharp_book_first", "steam"]
@@ -1,9 +1,15 @@
 """
 Tests for webhooks router.
 """
+import asyncio
+from unittest.mock import MagicMock, patch
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.services.auth import create_user
+from app.services.webhooks import create_webhook, dispatch_event
+
 
 @pytest.fixture
 def auth_headers(client: TestClient):
@@ -230,3 +236,37 @@ class TestWebhookEvents:
         data = response.json()
         assert "events" in data
         assert isinstance(data["events"], list)
+
+
+class TestDispatchEvent:
+    """Tests for fanning an event out to subscribed webhooks."""
+
+    @pytest.mark.asyncio
+    async def test_posts_concurrently_and_commits_once(self, db_session):
+        user = create_user(db_session, "dispatch@example.com", "dispatchuser", "securepass123")
+        ok = create_webhook(db_session, user.id, "ok", "https://ok.example.com", ["steam.detected"])
+        broken = create_webhook(db_session, user.id, "broken", "https://broken.example.com", ["steam.detected"])
+        create_webhook(db_session, user.id, "other", "https://other.example.com", ["bet.won"])
+        in_flight = 0
+        peak = 0
+
+        async def post(provider, url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if url == broken.url:
+                raise ConnectionError("refused")
+            return MagicMock(status_code=200)
+
+        with patch("app.services.webhooks.http_clients.post", side_effect=post), \
+                patch.object(db_session, "commit", wraps=db_session.commit) as commit:
+            result = await dispatch_event(db_session, "steam.detected", {"game_id": 1})
+
+        assert result == {"sent": 1, "failed": 1}
+        assert peak == 2
+        assert commit.call_count == 1
+        db_session.expire_all()
+        assert (ok.last_status, ok.failure_count) == (200, 0)
+        assert (broken.last_status, broken.failure_count) == (0, 1)